@@ -10,6 +10,9 @@ import random
 import time
 from pathlib import Path
 from examples import get_agent_hint
+from registry import CATEGORY_META, slug_to_name, load_agents
+from llm_client import LLMClient
+from response_cache import ResponseCache, make_key
 from i18n import LOCALE_NAMES, get_translations
 from st_keyup import st_keyup
 
@@ -221,25 +224,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ─── Constants ──────────────────────────────────────────────────
-CATEGORY_META = {
-    "ai-ml-ops": ("🤖", "AI & ML Ops", "Machine learning operations and AI infrastructure"),
-    "api-integration": ("🔌", "API Integration", "API connectors and integration tools"),
-    "business-productivity": ("💼", "Business", "Business automation and productivity"),
-    "code-generation": ("⚡", "Code Generation", "Automated code generation tools"),
-    "code-quality": ("✅", "Code Quality", "Code analysis, linting, and quality tools"),
-    "content-writing": ("✍️", "Content", "Content creation and writing assistance"),
-    "data-analytics": ("📊", "Data Analytics", "Data processing and analytics"),
-    "design-frontend": ("🎨", "Design", "UI/UX design and frontend tools"),
-    "devops-infra": ("🏗️", "DevOps", "Infrastructure and DevOps automation"),
-    "documentation": ("📝", "Documentation", "Documentation generation and management"),
-    "file-conversion": ("📁", "File Conversion", "File format conversion tools"),
-    "fixers": ("🔧", "Fixers", "Code and configuration fixers"),
-    "learning-education": ("📚", "Education", "Learning and educational tools"),
-    "misc": ("🎯", "Miscellaneous", "Various utility agents"),
-    "personal-lifestyle": ("🌟", "Lifestyle", "Personal productivity and lifestyle"),
-    "security-privacy": ("🔒", "Security", "Security analysis and privacy tools"),
-}
-
 BASE_DIR = Path(__file__).parent.parent
 SCRIPTS_DIR = Path(__file__).parent
 
@@ -256,77 +240,20 @@ def _tr_agent(agent_key: str, field: str, locale: str, fallback: str) -> str:
 # ─── Discovery ──────────────────────────────────────────────────
 @st.cache_data
 def discover_agents():
-    """Discover all agents by scanning the directory structure."""
-    agents = {}
-    for cat_dir in sorted(BASE_DIR.iterdir()):
-        if not cat_dir.is_dir() or cat_dir.name.startswith(('.', '_')):
-            continue
-        if cat_dir.name in ('__pycache__', 'node_modules', '.git'):
-            continue
-
-        cat_name = cat_dir.name
-
-        # Handle misc subcategories
-        if cat_name == "misc":
-            for sub_cat in sorted(cat_dir.iterdir()):
-                if not sub_cat.is_dir() or sub_cat.name.startswith('.'):
-                    continue
-                for agent_dir in sorted(sub_cat.iterdir()):
-                    if not agent_dir.is_dir():
-                        continue
-                    main_py = agent_dir / "main.py"
-                    agents_md = agent_dir / "AGENTS.md"
-                    readme_md = agent_dir / "README.md"
-                    if main_py.exists() or agents_md.exists():
-                        desc = _extract_desc(agents_md) if agents_md.exists() else ""
-                        if not desc and readme_md.exists():
-                            desc = _extract_desc(readme_md)
-                        if not desc and main_py.exists():
-                            desc = _extract_desc_from_main(main_py)
-                        agents[f"misc/{sub_cat.name}/{agent_dir.name}"] = {
-                            "name": _slug_to_name(agent_dir.name),
-                            "category": f"misc/{sub_cat.name}",
-                            "category_display": f"Misc — {_slug_to_name(sub_cat.name)}",
-                            "path": str(agent_dir),
-                            "has_main": main_py.exists() or (agent_dir / "package.json").exists() or (agent_dir / "agent" / "main.py").exists() or (agent_dir / "app.py").exists(),
-                            "description": desc,
-                        }
-            continue
-
-        # Check if this is a category (has agent subdirectories)
-        icon, display, cat_desc = CATEGORY_META.get(cat_name, ("📦", _slug_to_name(cat_name), ""))
-
-        for agent_dir in sorted(cat_dir.iterdir()):
-            if not agent_dir.is_dir() or agent_dir.name.startswith('.'):
-                continue
-            main_py = agent_dir / "main.py"
-            agents_md = agent_dir / "AGENTS.md"
-            readme_md = agent_dir / "README.md"
-            if main_py.exists() or agents_md.exists():
-                desc = _extract_desc(agents_md) if agents_md.exists() else ""
-                if not desc and readme_md.exists():
-                    desc = _extract_desc(readme_md)
-                if not desc and main_py.exists():
-                    desc = _extract_desc_from_main(main_py)
-                agents[f"{cat_name}/{agent_dir.name}"] = {
-                    "name": _slug_to_name(agent_dir.name),
-                    "category": cat_name,
-                    "category_display": f"{icon} {display}",
-                    "path": str(agent_dir),
-                    "has_main": main_py.exists() or (agent_dir / "package.json").exists() or (agent_dir / "agent" / "main.py").exists() or (agent_dir / "app.py").exists(),
-                    "description": desc,
-                }
+    """Discover all agents via the persistent registry (see registry.py)."""
+    return load_agents(BASE_DIR)
+
 
-    return agents
+@st.cache_resource
+def _llm_client(api_key: str) -> LLMClient:
+    """Process-wide LLM client with a keep-alive connection pool (see llm_client.py)."""
+    return LLMClient(api_key)
 
 
-def _slug_to_name(slug: str) -> str:
-    acronyms = {"ai", "api", "css", "csv", "dns", "html", "http", "ip", "json",
-                "jwt", "llm", "ml", "npm", "pdf", "qa", "rag", "rss", "seo",
-                "sql", "ssh", "ssl", "svg", "ui", "url", "ux", "xml", "yaml",
-                "sop", "cors", "cli", "crm", "readme", "ci", "cd"}
-    words = slug.replace("-", " ").replace("_", " ").split()
-    return " ".join(w.upper() if w.lower() in acronyms else w.capitalize() for w in words)
+@st.cache_resource
+def _response_cache() -> ResponseCache:
+    """Process-wide response cache shared by all sessions (see response_cache.py)."""
+    return ResponseCache.from_env()
 
 
 def _render_copy_btn(text: str, key: str):
@@ -335,39 +262,6 @@ def _render_copy_btn(text: str, key: str):
         st.code(text, language=None)
 
 
-def _extract_desc(md_file: Path) -> str:
-    try:
-        content = md_file.read_text(encoding="utf-8")
-        for line in content.split("\n"):
-            line = line.strip()
-            if line and not line.startswith("#") and not line.startswith("---") and len(line) > 20:
-                clean = line.lstrip("- *>").strip()
-                return clean[:200]  # type: ignore
-    except Exception:
-        pass
-    return ""
-
-
-def _extract_desc_from_main(main_py: Path) -> str:
-    """Extract description from main.py argparse or docstring."""
-    try:
-        content = main_py.read_text(encoding="utf-8")
-        # Try argparse description
-        import re
-        m = re.search(r'description=["\']([^"\']+)["\']', content)
-        if m:
-            return m.group(1)[:200]  # type: ignore
-        # Try module docstring
-        m = re.search(r'^"""\s*\n?(.+?)(?:\n|""")', content)
-        if m:
-            desc = m.group(1).strip().rstrip(' —-')
-            if len(desc) > 10:
-                return desc[:200]  # type: ignore
-    except Exception:
-        pass
-    return ""
-
-
 # ─── Main App ──────────────────────────────────────────────────
 def main():
     # Fix browser back/forward: force reload when URL changes via popstate
@@ -437,7 +331,7 @@ def main():
         selected_cat = st.selectbox(
             f"📂 {tr['categories']}",
             ["All"] + categories,
-            format_func=lambda x: tr['all_categories'] if x == "All" else (tr.get('category_names', {}).get(x, CATEGORY_META.get(x, ("📦", _slug_to_name(x), ""))[1]) + f" ({sum(1 for a in agents.values() if a['category'] == x)})")
+            format_func=lambda x: tr['all_categories'] if x == "All" else (tr.get('category_names', {}).get(x, CATEGORY_META.get(x, ("📦", slug_to_name(x), ""))[1]) + f" ({sum(1 for a in agents.values() if a['category'] == x)})")
         )
 
         # Clear agent selection when category changes
@@ -505,6 +399,16 @@ def main():
                         st.markdown(run["output"])
                         st.caption(f"{tr.get('tokens_label', 'Tokens')}: `{run['tokens']}`")
 
+        # ─── Response Cache ─────────────────────────
+        rc_stats = _response_cache().stats()
+        if rc_stats["hits"] or rc_stats["misses"]:
+            st.caption(
+                f"⚡ {tr.get('response_cache', 'Response cache')}: "
+                f"{rc_stats['hits']} {tr.get('cache_hits', 'hits')} · "
+                f"{rc_stats['misses']} {tr.get('cache_misses', 'misses')} "
+                f"({rc_stats['hit_rate']:.0%}) · {rc_stats['entries']} {tr.get('cache_entries', 'entries')}"
+            )
+
         locale = st.session_state.get("locale", "en")
         locale_prefix = f"/{locale}" if locale != "en" else ""
         footer_links = (
@@ -800,34 +704,33 @@ def _render_agent_detail(agent, agent_key):
                     
                 with st.spinner(tr['running']):
                     try:
-                        import json as _json
-                        from urllib.request import Request, urlopen
-
-                        req_data = _json.dumps({
-                            "model": "gpt-4o-mini",
-                            "messages": [
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": user_input},
-                            ],
-                            "max_tokens": 1024,
-                            "temperature": 0.3,
-                        }).encode()
-
-                        req = Request(
-                            "https://api.openai.com/v1/chat/completions",
-                            data=req_data,
-                            headers={
-                                "Authorization": f"Bearer {_has_openai}",
-                                "Content-Type": "application/json",
-                            },
-                        )
-
-                        with urlopen(req, timeout=30) as resp:
-                            result = _json.loads(resp.read())
-
-                        reply = result["choices"][0]["message"]["content"]
-                        model = result.get("model", "gpt-4o-mini")
-                        tokens = result.get("usage", {}).get("total_tokens", "?")
+                        params = {"max_tokens": 1024, "temperature": 0.3}
+                        shared_cache = _response_cache()
+                        use_shared = shared_cache.enabled_for(agent_key)
+                        shared_key = make_key(agent_key, system_prompt, "gpt-4o-mini", user_input, **params)
+                        hit = shared_cache.get(shared_key) if use_shared else None
+
+                        if hit:
+                            reply, model, tokens = hit["output"], hit["model"], hit["tokens"]
+                        else:
+                            # Stream tokens into the page as they arrive; the shared
+                            # client reuses pooled connections across sessions.
+                            stream = _llm_client(_has_openai).stream_chat(
+                                [
+                                    {"role": "system", "content": system_prompt},
+                                    {"role": "user", "content": user_input},
+                                ],
+                                model="gpt-4o-mini",
+                                **params,
+                            )
+                            st.markdown(f"#### {tr['result']}")
+                            st.write_stream(stream)
+
+                            reply = stream.text
+                            model = stream.model or "gpt-4o-mini"
+                            tokens = stream.usage.get("total_tokens", "?")
+                            if use_shared:
+                                shared_cache.put(shared_key, {"output": reply, "model": model, "tokens": tokens})
 
                         # Cache result for this agent
                         st.session_state[cache_key] = {
@@ -835,6 +738,7 @@ def _render_agent_detail(agent, agent_key):
                             "output": reply,
                             "model": model,
                             "tokens": tokens,
+                            "from_cache": bool(hit),
                         }
 
                         # Save to run history
@@ -862,7 +766,10 @@ def _render_agent_detail(agent, agent_key):
                 st.divider()
                 st.markdown(f"#### {tr['result']}")
                 st.markdown(cached["output"])
-                st.caption(f"{tr.get('model_label', 'Model')}: `{cached['model']}` · {tr.get('tokens_label', 'Tokens')}: `{cached['tokens']}`")
+                st.caption(
+                    f"{tr.get('model_label', 'Model')}: `{cached['model']}` · {tr.get('tokens_label', 'Tokens')}: `{cached['tokens']}`"
+                    + (f" · ⚡ {tr.get('cached_label', 'cached')}" if cached.get("from_cache") else "")
+                )
                 _render_copy_btn(cached["output"], f"copy_cached_{agent_key}")
 
                 # Auto-scroll so "Result" heading is at top of viewport
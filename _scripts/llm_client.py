@@ -0,0 +1,269 @@
+"""
+🔌 Shared LLM client for the hub's "Run Agent" path.
+
+One client instance is shared by every Streamlit session (see
+`app._llm_client`). It keeps HTTPS connections alive in a small per-host pool,
+streams chat completions as server-sent events so tokens can be rendered as
+they arrive, and retries connection errors / 429 / 5xx responses with
+jittered exponential backoff.
+
+Only the standard library is used so the hub keeps its two-package
+requirements.txt. Point it at `llm_stub_server.py` for local testing:
+
+    python _scripts/llm_stub_server.py --port 8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run app.py
+"""
+
+import http.client
+import json
+import os
+import random
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """Raised when the API returns an error or retries are exhausted."""
+
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+class _ConnectionPool:
+    """Thread-safe LIFO pool of keep-alive connections to a single host."""
+
+    def __init__(self, scheme: str, host: str, port: int | None, timeout: float, maxsize: int):
+        self._cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._maxsize = maxsize
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> http.client.HTTPConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._cls(self._host, self._port, timeout=self._timeout)
+
+    def release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self._maxsize:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class ChatStream:
+    """
+    Iterable of text deltas from a streamed chat completion.
+
+    After iteration finishes, `text`, `model` and `usage` describe the full
+    response. `first_token_at` holds the perf_counter() timestamp of the first
+    delta, `started_at` the time the request was issued.
+    """
+
+    def __init__(self, client: "LLMClient", payload: dict):
+        self._client = client
+        self._payload = payload
+        self.text = ""
+        self.model = payload.get("model", "")
+        self.usage = {}
+        self.started_at = 0.0
+        self.first_token_at = None
+
+    def __iter__(self):
+        self.started_at = time.perf_counter()
+        parts = []
+        for event in self._client._request_events(self._payload):
+            self.model = event.get("model") or self.model
+            if event.get("usage"):
+                self.usage = event["usage"]
+            for choice in event.get("choices") or []:
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    if self.first_token_at is None:
+                        self.first_token_at = time.perf_counter()
+                    parts.append(delta)
+                    yield delta
+        self.text = "".join(parts)
+
+    @property
+    def ttft(self) -> float | None:
+        """Time to first token in seconds, or None if nothing was received."""
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+
+class LLMClient:
+    """OpenAI-compatible `/chat/completions` client with pooling, streaming and retries."""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str | None = None,
+        timeout: float = 30.0,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        pool_size: int = 8,
+    ):
+        base_url = (base_url or os.environ.get("OPENAI_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        parts = urlsplit(base_url)
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._path = f"{parts.path}/chat/completions"
+        self._pool = _ConnectionPool(parts.scheme, parts.hostname, parts.port, timeout, pool_size)
+
+    # ─── Public API ─────────────────────────────────
+    def chat(self, messages: list, model: str = "gpt-4o-mini", **params) -> dict:
+        """Non-streaming completion; returns the decoded JSON response."""
+        payload = {"model": model, "messages": messages, **params}
+        for attempt in range(self.max_retries + 1):
+            conn = self._pool.acquire()
+            try:
+                resp = self._send(conn, payload)
+                body = resp.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if attempt >= self.max_retries:
+                    raise LLMError(f"Connection failed: {e}") from e
+                self._sleep(attempt)
+                continue
+            if resp.status == 200:
+                self._pool.release(conn)
+                return json.loads(body)
+            self._pool.release(conn)
+            if resp.status not in RETRY_STATUSES or attempt >= self.max_retries:
+                raise LLMError(_error_message(resp.status, body), resp.status)
+            self._sleep(attempt, resp.getheader("Retry-After"))
+        raise LLMError("Retries exhausted")  # pragma: no cover
+
+    def stream_chat(self, messages: list, model: str = "gpt-4o-mini", **params) -> ChatStream:
+        """Streaming completion; iterate the returned ChatStream for text deltas."""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+            **params,
+        }
+        return ChatStream(self, payload)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    # ─── Internals ──────────────────────────────────
+    def _send(self, conn: http.client.HTTPConnection, payload: dict) -> http.client.HTTPResponse:
+        body = json.dumps(payload).encode()
+        conn.request("POST", self._path, body=body, headers={
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream" if payload.get("stream") else "application/json",
+            "Connection": "keep-alive",
+        })
+        return conn.getresponse()
+
+    def _sleep(self, attempt: int, retry_after: str | None = None) -> None:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After header."""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.max_backoff))
+            except ValueError:
+                pass
+        time.sleep(delay)
+
+    def _request_events(self, payload: dict):
+        """
+        Yield decoded SSE `data:` events. Retries happen only before the first
+        event is yielded — a stream that fails midway raises LLMError.
+        """
+        for attempt in range(self.max_retries + 1):
+            conn = self._pool.acquire()
+            try:
+                resp = self._send(conn, payload)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if attempt >= self.max_retries:
+                    raise LLMError(f"Connection failed: {e}") from e
+                self._sleep(attempt)
+                continue
+
+            if resp.status != 200:
+                body = resp.read()
+                self._pool.release(conn)
+                if resp.status not in RETRY_STATUSES or attempt >= self.max_retries:
+                    raise LLMError(_error_message(resp.status, body), resp.status)
+                self._sleep(attempt, resp.getheader("Retry-After"))
+                continue
+
+            completed = False
+            try:
+                for event in _iter_sse(resp):
+                    if event == "[DONE]":
+                        completed = True
+                        break
+                    yield json.loads(event)
+                else:
+                    completed = True
+            except (OSError, http.client.HTTPException, socket.timeout) as e:
+                raise LLMError(f"Stream interrupted: {e}") from e
+            finally:
+                # Only a fully drained response leaves the connection reusable
+                if completed and _drained(resp):
+                    self._pool.release(conn)
+                else:
+                    conn.close()
+            return
+
+
+def _iter_sse(resp: http.client.HTTPResponse):
+    """Yield the `data:` payload of each server-sent event in a response."""
+    data = []
+    while True:
+        line = resp.readline()
+        if not line:
+            break
+        line = line.rstrip(b"\r\n")
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+            continue
+        if line.startswith(b"data:"):
+            data.append(line[5:].lstrip().decode("utf-8"))
+    if data:
+        yield "\n".join(data)
+
+
+def _drained(resp: http.client.HTTPResponse) -> bool:
+    """True if the response body is fully consumed and the connection may be reused."""
+    try:
+        return resp.read() == b"" and not resp.will_close
+    except (OSError, http.client.HTTPException):
+        return False
+
+
+def _error_message(status: int, body: bytes) -> str:
+    try:
+        return f"HTTP {status}: {json.loads(body)['error']['message']}"
+    except Exception:
+        return f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}"
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+🧪 Local stand-in for the OpenAI `/v1/chat/completions` endpoint.
+
+Serves both regular and streamed (SSE) responses that echo the user message,
+with optional latency and injected failures, so the hub's run path and
+`llm_client.py` can be exercised without an API key or network access.
+
+Usage:
+    python _scripts/llm_stub_server.py --port 8765 --delay 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=sk-stub streamlit run app.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive + chunked streaming
+
+    # Overridden per server via make_server()
+    token_delay = 0.0
+    fail_first = 0
+    fail_status = 503
+    _failures = {"remaining": 0}
+    _lock = threading.Lock()
+
+    def log_message(self, format, *args):  # noqa: A002 - silence default stderr logging
+        pass
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        with self._lock:
+            if self._failures["remaining"] > 0:
+                self._failures["remaining"] -= 1
+                self._send_json(self.fail_status, {"error": {"message": "stub: injected failure"}})
+                return
+
+        user_msg = next((m["content"] for m in reversed(payload.get("messages", [])) if m.get("role") == "user"), "")
+        reply = f"**Stub reply** — you said: {user_msg}"
+        model = payload.get("model", "stub-model")
+        usage = {"prompt_tokens": len(user_msg.split()), "completion_tokens": len(reply.split()),
+                 "total_tokens": len(user_msg.split()) + len(reply.split())}
+
+        if payload.get("stream"):
+            self._stream(model, reply, usage)
+        else:
+            self._send_json(200, {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(self, model: str, reply: str, usage: dict):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for word in reply.split(" "):
+            event = {"model": model, "choices": [{"index": 0, "delta": {"content": word + " "}}]}
+            self._chunk(f"data: {json.dumps(event)}\n\n".encode())
+            if self.token_delay:
+                time.sleep(self.token_delay)
+        self._chunk(f"data: {json.dumps({'model': model, 'choices': [], 'usage': usage})}\n\n".encode())
+        self._chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def make_server(host: str = "127.0.0.1", port: int = 0, delay: float = 0.0, fail_first: int = 0,
+                fail_status: int = 503) -> ThreadingHTTPServer:
+    """Create (but do not start) a stub server; port 0 picks a free port."""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "token_delay": delay,
+        "fail_status": fail_status,
+        "_failures": {"remaining": fail_first},
+        "_lock": threading.Lock(),
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub for the OpenAI chat completions API.")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to sleep between streamed tokens")
+    parser.add_argument("--fail-first", type=int, default=0, help="Fail the first N requests")
+    parser.add_argument("--fail-status", type=int, default=503, help="HTTP status of injected failures (e.g. 429)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.delay, args.fail_first, args.fail_status)
+    print(f"🧪 Stub LLM listening on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
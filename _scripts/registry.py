@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+🗂️ Agent Registry — persistent, incrementally rebuilt index of all agents.
+
+Walking every category directory and regex-parsing AGENTS.md / README.md /
+main.py for ~190 agents is paid on every cold start of the hub. This module
+stores the discovery result in `agent_registry.json` next to this script,
+keyed by a cheap stat() signature per agent, so startup is a single JSON read
+plus a stat pass — only agents whose files changed are re-parsed.
+
+Usage:
+    python _scripts/registry.py              # incremental rebuild
+    python _scripts/registry.py --full       # ignore the existing registry
+    python _scripts/registry.py --benchmark  # cold-start discovery timing
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+REGISTRY_FILE = Path(__file__).parent / "agent_registry.json"
+REGISTRY_VERSION = 1
+
+CATEGORY_META = {
+    "ai-ml-ops": ("🤖", "AI & ML Ops", "Machine learning operations and AI infrastructure"),
+    "api-integration": ("🔌", "API Integration", "API connectors and integration tools"),
+    "business-productivity": ("💼", "Business", "Business automation and productivity"),
+    "code-generation": ("⚡", "Code Generation", "Automated code generation tools"),
+    "code-quality": ("✅", "Code Quality", "Code analysis, linting, and quality tools"),
+    "content-writing": ("✍️", "Content", "Content creation and writing assistance"),
+    "data-analytics": ("📊", "Data Analytics", "Data processing and analytics"),
+    "design-frontend": ("🎨", "Design", "UI/UX design and frontend tools"),
+    "devops-infra": ("🏗️", "DevOps", "Infrastructure and DevOps automation"),
+    "documentation": ("📝", "Documentation", "Documentation generation and management"),
+    "file-conversion": ("📁", "File Conversion", "File format conversion tools"),
+    "fixers": ("🔧", "Fixers", "Code and configuration fixers"),
+    "learning-education": ("📚", "Education", "Learning and educational tools"),
+    "misc": ("🎯", "Miscellaneous", "Various utility agents"),
+    "personal-lifestyle": ("🌟", "Lifestyle", "Personal productivity and lifestyle"),
+    "security-privacy": ("🔒", "Security", "Security analysis and privacy tools"),
+}
+
+# Entries whose mtime decides whether an agent must be re-parsed. The agent
+# directory itself covers files being added/removed (package.json, app.py);
+# the `agent` subdirectory covers `agent/main.py`.
+_SIGNATURE_ENTRIES = ("", "main.py", "AGENTS.md", "README.md", "agent")
+
+
+# ─── Parsing helpers ────────────────────────────────────────────
+def slug_to_name(slug: str) -> str:
+    acronyms = {"ai", "api", "css", "csv", "dns", "html", "http", "ip", "json",
+                "jwt", "llm", "ml", "npm", "pdf", "qa", "rag", "rss", "seo",
+                "sql", "ssh", "ssl", "svg", "ui", "url", "ux", "xml", "yaml",
+                "sop", "cors", "cli", "crm", "readme", "ci", "cd"}
+    words = slug.replace("-", " ").replace("_", " ").split()
+    return " ".join(w.upper() if w.lower() in acronyms else w.capitalize() for w in words)
+
+
+def _extract_desc(md_file: Path) -> str:
+    try:
+        content = md_file.read_text(encoding="utf-8")
+        for line in content.split("\n"):
+            line = line.strip()
+            if line and not line.startswith("#") and not line.startswith("---") and len(line) > 20:
+                clean = line.lstrip("- *>").strip()
+                return clean[:200]  # type: ignore
+    except Exception:
+        pass
+    return ""
+
+
+def _extract_desc_from_main(main_py: Path) -> str:
+    """Extract description from main.py argparse or docstring."""
+    try:
+        content = main_py.read_text(encoding="utf-8")
+        # Try argparse description
+        m = re.search(r'description=["\']([^"\']+)["\']', content)
+        if m:
+            return m.group(1)[:200]  # type: ignore
+        # Try module docstring
+        m = re.search(r'^"""\s*\n?(.+?)(?:\n|""")', content)
+        if m:
+            desc = m.group(1).strip().rstrip(' —-')
+            if len(desc) > 10:
+                return desc[:200]  # type: ignore
+    except Exception:
+        pass
+    return ""
+
+
+# ─── Scanning ───────────────────────────────────────────────────
+def _subdirs(path: str) -> list:
+    """Sorted (name, path) pairs of the non-hidden subdirectories of `path`."""
+    with os.scandir(path) as it:
+        return sorted((e.name, e.path) for e in it if e.is_dir() and not e.name.startswith('.'))
+
+
+def _iter_agent_dirs(base_dir: Path):
+    """Yield (key, category, category_display, agent_dir) for every candidate agent directory."""
+    for cat_name, cat_path in _subdirs(str(base_dir)):
+        if cat_name.startswith('_') or cat_name in ('__pycache__', 'node_modules'):
+            continue
+
+        # Handle misc subcategories
+        if cat_name == "misc":
+            for sub_name, sub_path in _subdirs(cat_path):
+                for agent_name, agent_path in _subdirs(sub_path):
+                    yield (f"misc/{sub_name}/{agent_name}", f"misc/{sub_name}",
+                           f"Misc — {slug_to_name(sub_name)}", agent_path)
+            continue
+
+        icon, display, _ = CATEGORY_META.get(cat_name, ("📦", slug_to_name(cat_name), ""))
+        for agent_name, agent_path in _subdirs(cat_path):
+            yield f"{cat_name}/{agent_name}", cat_name, f"{icon} {display}", agent_path
+
+
+def _signature(agent_dir: str) -> list:
+    """Return the stat() signature of an agent directory (0 for missing entries)."""
+    sig = []
+    for name in _SIGNATURE_ENTRIES:
+        try:
+            sig.append(os.stat(os.path.join(agent_dir, name) if name else agent_dir).st_mtime_ns)
+        except OSError:
+            sig.append(0)
+    return sig
+
+
+def _scan_agent(category: str, category_display: str, agent_dir: str) -> dict | None:
+    """Parse a single agent directory; returns None if it is not an agent."""
+    agent_dir = Path(agent_dir)
+    main_py = agent_dir / "main.py"
+    agents_md = agent_dir / "AGENTS.md"
+    readme_md = agent_dir / "README.md"
+    if not (main_py.exists() or agents_md.exists()):
+        return None
+    desc = _extract_desc(agents_md) if agents_md.exists() else ""
+    if not desc and readme_md.exists():
+        desc = _extract_desc(readme_md)
+    if not desc and main_py.exists():
+        desc = _extract_desc_from_main(main_py)
+    return {
+        "name": slug_to_name(agent_dir.name),
+        "category": category,
+        "category_display": category_display,
+        "path": str(agent_dir),
+        "has_main": main_py.exists() or (agent_dir / "package.json").exists() or (agent_dir / "agent" / "main.py").exists() or (agent_dir / "app.py").exists(),
+        "description": desc,
+    }
+
+
+def scan_agents(base_dir: Path = BASE_DIR) -> dict:
+    """Discover all agents by scanning the directory structure (no registry)."""
+    agents = {}
+    for key, category, category_display, agent_dir in _iter_agent_dirs(base_dir):
+        info = _scan_agent(category, category_display, agent_dir)
+        if info is not None:
+            agents[key] = info
+    return agents
+
+
+# ─── Registry ───────────────────────────────────────────────────
+def _read_registry(registry_file: Path) -> dict:
+    try:
+        data = json.loads(registry_file.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if data.get("version") != REGISTRY_VERSION:
+        return {}
+    return data.get("agents", {})
+
+
+def _write_registry(registry_file: Path, records: dict) -> None:
+    """Atomically replace the registry file; failures (read-only FS) are ignored."""
+    payload = {"version": REGISTRY_VERSION, "generated": time.time(), "agents": records}
+    tmp = registry_file.with_name(f"{registry_file.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, registry_file)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def update_registry(base_dir: Path = BASE_DIR, registry_file: Path = REGISTRY_FILE,
+                    full: bool = False) -> tuple[dict, dict]:
+    """
+    Load the registry, re-parse only agents whose signature changed and persist it.
+
+    Returns (agents, stats) where agents has the same shape as `scan_agents()` and
+    stats counts reused / rescanned / removed entries.
+    """
+    cached = {} if full else _read_registry(registry_file)
+    records = {}
+    stats = {"reused": 0, "rescanned": 0, "removed": 0}
+
+    for key, category, category_display, agent_dir in _iter_agent_dirs(base_dir):
+        sig = _signature(agent_dir)
+        prev = cached.get(key)
+        if prev and prev.get("signature") == sig:
+            records[key] = prev
+            stats["reused"] += 1
+            continue
+        info = _scan_agent(category, category_display, agent_dir)
+        stats["rescanned"] += 1
+        if info is None:
+            # Remember non-agent directories too, so they are not re-probed
+            records[key] = {"signature": sig, "agent": None}
+            continue
+        info.pop("path")
+        records[key] = {"signature": sig, "agent": info}
+
+    stats["removed"] = len(set(cached) - set(records))
+    if stats["rescanned"] or stats["removed"] or not registry_file.exists():
+        _write_registry(registry_file, records)
+
+    # Keys mirror the directory layout, so paths are rebuilt relative to base_dir
+    agents = {}
+    base = str(base_dir)
+    for key, rec in records.items():
+        if rec["agent"] is not None:
+            agents[key] = {**rec["agent"], "path": os.path.join(base, key)}
+    return agents, stats
+
+
+def load_agents(base_dir: Path = BASE_DIR, registry_file: Path = REGISTRY_FILE) -> dict:
+    """Return all agents, using (and refreshing) the on-disk registry."""
+    agents, _ = update_registry(base_dir, registry_file)
+    return agents
+
+
+# ─── CLI ────────────────────────────────────────────────────────
+def _benchmark(base_dir: Path, registry_file: Path, runs: int) -> None:
+    def _best(fn):
+        best = float("inf")
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        return best * 1000
+
+    scan_ms = _best(lambda: scan_agents(base_dir))
+    update_registry(base_dir, registry_file)
+    load_ms = _best(lambda: load_agents(base_dir, registry_file))
+    count = len(load_agents(base_dir, registry_file))
+
+    print(f"🗂️  Agent discovery benchmark ({count} agents, best of {runs})")
+    print(f"   Full scan      : {scan_ms:8.2f} ms")
+    print(f"   Registry load  : {load_ms:8.2f} ms")
+    if load_ms > 0:
+        print(f"   Speedup        : {scan_ms / load_ms:8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the persistent agent registry for the hub.")
+    parser.add_argument("--full", action="store_true", help="Rebuild from scratch, ignoring the existing registry")
+    parser.add_argument("--benchmark", action="store_true", help="Compare full scan vs registry load time")
+    parser.add_argument("--runs", type=int, default=5, help="Benchmark repetitions (best time is reported)")
+    parser.add_argument("--output", type=Path, default=REGISTRY_FILE, help="Registry file path")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        _benchmark(BASE_DIR, args.output, args.runs)
+        return 0
+
+    t0 = time.perf_counter()
+    agents, stats = update_registry(BASE_DIR, args.output, full=args.full)
+    elapsed = (time.perf_counter() - t0) * 1000
+    print(f"🗂️  {len(agents)} agents → {args.output} ({elapsed:.1f} ms)")
+    print(f"   reused: {stats['reused']} · rescanned: {stats['rescanned']} · removed: {stats['removed']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+⚡ Cross-session response cache for hub agent runs.
+
+Identical runs (same agent, system prompt incl. translate suffix, model,
+sampling params and input) are served from a process-wide LRU with a TTL,
+optionally backed by SQLite so entries survive restarts and are shared by
+replicas on the same volume. The curated examples in `examples.py` are the
+main beneficiary — every session loads the same inputs.
+
+Environment:
+    HUB_CACHE_DB          SQLite file for the disk tier (unset = memory only)
+    HUB_CACHE_TTL         Entry lifetime in seconds (default 86400)
+    HUB_CACHE_MAX         Max in-memory entries (default 512)
+    HUB_CACHE_DISK_MAX    Max on-disk entries (default 20000)
+    HUB_CACHE_OPT_OUT     Extra comma-separated agent keys never to cache
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Agents whose answers are expected to differ between runs of the same input
+OPT_OUT_AGENTS = frozenset({
+    "content-writing/lorem-ipsum-generator",
+    "data-analytics/uuid-generator",
+    "design-frontend/color-palette-generator",
+    "learning-education/code-kata-generator",
+    "learning-education/quiz-generator",
+})
+
+
+def make_key(agent_key: str, system_prompt: str, model: str, user_input: str, **params) -> str:
+    """Stable hash of everything that determines the model's reply."""
+    raw = json.dumps([agent_key, system_prompt, model, user_input, sorted(params.items())],
+                     ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU + TTL cache with an optional SQLite tier."""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 86400.0, db_path: str | None = None,
+                 disk_max_entries: int = 20000, opt_out=OPT_OUT_AGENTS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_max_entries = disk_max_entries
+        self.opt_out = frozenset(opt_out)
+        self.hits = 0
+        self.misses = 0
+        self._mem = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        extra = {a.strip() for a in os.environ.get("HUB_CACHE_OPT_OUT", "").split(",") if a.strip()}
+        return cls(
+            max_entries=int(os.environ.get("HUB_CACHE_MAX", 512)),
+            ttl=float(os.environ.get("HUB_CACHE_TTL", 86400)),
+            db_path=os.environ.get("HUB_CACHE_DB") or None,
+            disk_max_entries=int(os.environ.get("HUB_CACHE_DISK_MAX", 20000)),
+            opt_out=OPT_OUT_AGENTS | extra,
+        )
+
+    def enabled_for(self, agent_key: str) -> bool:
+        return agent_key not in self.opt_out
+
+    def get(self, key: str):
+        """Return the cached value or None; counts a hit or miss."""
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None:
+                if item[0] > now:
+                    self._mem.move_to_end(key)
+                    self.hits += 1
+                    return item[1]
+                del self._mem[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    self.hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: dict) -> None:
+        """Store a reply; empty ones (e.g. a stream cut off before any text) are skipped."""
+        if not str(value.get("output") or "").strip():
+            return
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires_at, now),
+                )
+                self._prune_disk(now)
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            disk = None
+            if self._db is not None:
+                disk = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "entries": len(self._mem),
+                "disk_entries": disk,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self.hits = self.misses = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    # ─── Internals (caller holds the lock) ──────────
+    def _remember(self, key: str, expires_at: float, value: dict) -> None:
+        self._mem[key] = (expires_at, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def _prune_disk(self, now: float) -> None:
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.disk_max_entries,),
+        )
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+⏱️ Startup benchmark — what every CLI agent loads before it does any work.
+
+Each agent's `main.py --help` runs in a fresh interpreter with `-X importtime`,
+so the report shows wall time and which imports dominate it. Three checks make
+the run fail:
+
+* the time `main.py`'s own imports take (the sum of its top-level entries in the
+  `-X importtime` output, interpreter startup excluded) exceeds the agent's budget
+  in `startup_budget.json`:
+
+    {"default_ms": 1500, "agents": {"data-analytics/foo": 420}, ...}
+
+  Agents without an entry get `default_ms`. `--write-budget` records today's
+  import time × 1.5 (at least 300 ms) for every measured agent.
+
+* `--help` loads one of the heavy modules listed in `startup_budget.json`
+  (langchain_openai, pandas, ...) that the agent is not allowed:
+
+    {"heavy_modules": ["langchain_openai", "pandas"], "allowed": {"documentation/foo": ["pandas"]}}
+
+* importing a module that binds names through `lazy_import(...)` (see
+  `_shared/lazy_import.py`) loads any of those modules anyway — each such
+  module is imported on its own, and the deferred ones must not be in
+  `sys.modules` afterwards.
+
+The last two look at `sys.modules`, not milliseconds, so they hold on any host.
+
+Streamlit apps (whose `main.py` re-launches itself under `streamlit run`) are
+skipped by the `--help` check.
+
+Usage:
+    python _scripts/startup_bench.py                     # all agents, run both checks
+    python _scripts/startup_bench.py data-analytics/ -n 5
+    python _scripts/startup_bench.py --write-budget      # record today's import times and heavy modules
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+DEFAULT_BUDGET_MS = 1500
+HEADROOM = 1.5          # --write-budget: measured import time x HEADROOM ...
+MIN_BUDGET_MS = 300     # ... but never below this, so fast agents don't fail on noise
+HEAVY_MODULES = ["langchain_openai", "openai", "langchain_google_genai", "google.generativeai", "anthropic",
+                 "pandas", "numpy", "matplotlib", "plotly", "scipy", "sklearn", "torch", "transformers"]
+
+_SKIP_DIRS = {".git", "_scripts", "node_modules", "__pycache__", ".pytest_cache", "venv", ".venv", "tests"}
+_STREAMLIT = re.compile(r"^\s*(?:import streamlit|from streamlit)", re.M)
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", re.M)
+_LAZY = re.compile(r"""^\w+\s*=\s*lazy_import\(\s*["']([\w.]+)["']""", re.M)
+# Imports one module of an agent and reports which of the given modules it loaded
+_PROBE = ("import importlib, json, sys; importlib.import_module(sys.argv[1]); "
+          "print(json.dumps([m for m in sys.argv[2:] if m in sys.modules]))")
+
+
+def _env() -> dict:
+    """Environment for agent subprocesses; `_shared` is importable even when it is not pip-installed."""
+    path = os.pathsep.join(filter(None, [os.path.join(BASE_DIR, "_shared"), os.environ.get("PYTHONPATH")]))
+    return dict(os.environ, PYTHONDONTWRITEBYTECODE="1", PYTHONPATH=path)
+
+
+def discover(base_dir: str = BASE_DIR) -> list[str]:
+    """Agent directories (relative) that have a main.py, two levels below the repo root."""
+    agents = []
+    for category in sorted(os.listdir(base_dir)):
+        cat_path = os.path.join(base_dir, category)
+        if category in _SKIP_DIRS or category.startswith(".") or not os.path.isdir(cat_path):
+            continue
+        for name in sorted(os.listdir(cat_path)):
+            if os.path.isfile(os.path.join(cat_path, name, "main.py")):
+                agents.append(f"{category}/{name}")
+    return agents
+
+
+def is_streamlit_app(agent_dir: str) -> bool:
+    with open(os.path.join(agent_dir, "main.py"), encoding="utf-8", errors="replace") as f:
+        return bool(_STREAMLIT.search(f.read()))
+
+
+def top_imports(stderr: str, n: int = 3) -> list[tuple[str, int]]:
+    """Heaviest top-level imports from `-X importtime` output as (module, cumulative ms)."""
+    top = {}
+    # Everything up to `site` is interpreter startup; later top-level entries are main.py's imports
+    entries = _IMPORTTIME.findall(stderr)
+    start = next((i + 1 for i, e in enumerate(entries) if e[3] == "site" and len(e[2]) == 1), 0)
+    for _self, cumulative, indent, module in entries[start:]:
+        if len(indent) == 1:  # nested imports are indented further
+            top[module] = max(top.get(module, 0), int(cumulative))
+    return [(m, us // 1000) for m, us in sorted(top.items(), key=lambda kv: -kv[1])[:n]]
+
+
+def import_ms(stderr: str) -> int:
+    """Time main.py's own imports took (ms): the sum of its top-level `-X importtime` entries."""
+    entries = _IMPORTTIME.findall(stderr)
+    start = next((i + 1 for i, e in enumerate(entries) if e[3] == "site" and len(e[2]) == 1), 0)
+    return round(sum(int(cumulative) for _self, cumulative, indent, _m in entries[start:] if len(indent) == 1) / 1000)
+
+
+def loaded_modules(stderr: str) -> set[str]:
+    """Every module main.py imported (directly or not), from `-X importtime` output."""
+    entries = _IMPORTTIME.findall(stderr)
+    start = next((i + 1 for i, e in enumerate(entries) if e[3] == "site" and len(e[2]) == 1), 0)
+    return {module for _self, _cumulative, _indent, module in entries[start:]}
+
+
+def heavy_imports(modules: set[str], heavy: list[str], allowed=()) -> list[str]:
+    """Heavy modules (or their submodules) in `modules` that are not in `allowed`."""
+    return [h for h in heavy if h not in allowed and any(m == h or m.startswith(h + ".") for m in modules)]
+
+
+def lazy_bindings(base_dir: str = BASE_DIR) -> dict[str, dict[str, list[str]]]:
+    """{agent: {module: [modules it binds through lazy_import()]}}; an agent is the nearest directory with a main.py."""
+    found = {}
+    for root, dirs, files in os.walk(base_dir):
+        dirs[:] = sorted(d for d in dirs if d not in _SKIP_DIRS and not d.startswith((".", "_")))
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(root, name)
+            with open(path, encoding="utf-8", errors="replace") as f:
+                deferred = sorted(set(_LAZY.findall(f.read())))
+            if not deferred:
+                continue
+            agent = root
+            while agent != base_dir and not os.path.isfile(os.path.join(agent, "main.py")):
+                agent = os.path.dirname(agent)
+            if agent == base_dir:
+                continue
+            module = os.path.relpath(path, agent)[:-3].replace(os.sep, ".").removesuffix(".__init__")
+            found.setdefault(os.path.relpath(agent, base_dir).replace(os.sep, "/"), {})[module] = deferred
+    return found
+
+
+def check_deferred(agent: str, module: str, deferred: list[str], timeout: float) -> dict:
+    """Import `module` alone in a fresh interpreter; `loaded` lists the deferred modules that came with it."""
+    result = {"agent": agent, "module": module, "status": "ok", "loaded": []}
+    try:
+        proc = subprocess.run([sys.executable, "-c", _PROBE, module, *deferred], cwd=os.path.join(BASE_DIR, agent),
+                              env=_env(), stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        result["status"] = "timeout"
+        return result
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        result["status"] = "error"
+        result["error"] = (proc.stderr.strip().splitlines() or [f"exit {proc.returncode}"])[-1][:200]
+        return result
+    result["loaded"] = json.loads(lines[-1])  # the module may print while importing; the probe prints last
+    return result
+
+
+def measure(agent: str, runs: int, timeout: float) -> dict:
+    """Best-of-`runs` wall time and import time for `python -X importtime main.py --help`."""
+    cwd = os.path.join(BASE_DIR, agent)
+    result = {"agent": agent, "status": "ok", "ms": None, "import_ms": None, "top": [], "modules": []}
+    if is_streamlit_app(cwd):
+        result["status"] = "streamlit"
+        return result
+    env = _env()
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        try:
+            proc = subprocess.run([sys.executable, "-X", "importtime", "main.py", "--help"], cwd=cwd, env=env,
+                                  stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            result["status"] = "timeout"  # waited for input instead of printing help
+            return result
+        elapsed = (time.perf_counter() - started) * 1000
+        if proc.returncode != 0:
+            result["status"] = "error"
+            lines = [line for line in proc.stderr.strip().splitlines() if not line.startswith("import time:")]
+            result["error"] = (lines or [f"exit {proc.returncode}"])[-1][:200]
+            return result
+        if best is None or elapsed < best:
+            best = elapsed
+            result["top"] = top_imports(proc.stderr)
+            result["modules"] = sorted(loaded_modules(proc.stderr))
+        spent = import_ms(proc.stderr)
+        if result["import_ms"] is None or spent < result["import_ms"]:
+            result["import_ms"] = spent
+    result["ms"] = round(best)
+    return result
+
+
+def load_budget(path: str = BUDGET_FILE) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"default_ms": DEFAULT_BUDGET_MS, "agents": {}, "heavy_modules": HEAVY_MODULES, "allowed": {}}
+
+
+def budget_ms(agent: str, budget: dict) -> int:
+    return budget.get("agents", {}).get(agent, budget.get("default_ms", DEFAULT_BUDGET_MS))
+
+
+def updated_budget(budget: dict, measured: list[dict]) -> dict:
+    """`budget` with each measured agent's time budget and allowed heavy modules set from today's run."""
+    heavy = budget.get("heavy_modules", HEAVY_MODULES)
+    agents, allowed = dict(budget.get("agents", {})), dict(budget.get("allowed", {}))
+    for r in measured:
+        agents[r["agent"]] = max(MIN_BUDGET_MS, round(r["import_ms"] * HEADROOM))
+        loaded = heavy_imports(set(r["modules"]), heavy)
+        if loaded:
+            allowed[r["agent"]] = loaded
+        else:
+            allowed.pop(r["agent"], None)
+    return {"default_ms": budget.get("default_ms", DEFAULT_BUDGET_MS), "agents": dict(sorted(agents.items())),
+            "heavy_modules": heavy, "allowed": dict(sorted(allowed.items()))}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check what every agent loads at startup.")
+    parser.add_argument("paths", nargs="*", help="Only agents under these path prefixes")
+    parser.add_argument("-n", "--runs", type=int, default=3, help="Runs per agent; the fastest counts")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Agents measured concurrently (1 = least noise)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-run timeout in seconds")
+    parser.add_argument("--top", type=int, default=15, help="Show the N slowest agents")
+    parser.add_argument("--write-budget", action="store_true",
+                        help="Set each measured agent's time budget and allowed heavy modules from this run")
+    parser.add_argument("--json", metavar="FILE", help="Also write raw results to FILE")
+    args = parser.parse_args(argv)
+
+    def selected(agents):
+        if not args.paths:
+            return list(agents)
+        prefixes = [os.path.normpath(p).strip("./") for p in args.paths]
+        return [a for a in agents if any(a == p or a.startswith(p + "/") for p in prefixes)]
+
+    agents = selected(discover())
+    bindings = lazy_bindings()
+    probes = [(a, m, d) for a in selected(sorted(bindings)) for m, d in sorted(bindings[a].items())]
+
+    print(f"⏱️  Measuring {len(agents)} agents ({args.runs} run(s) each), "
+          f"probing {len(probes)} modules with deferred imports...")
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        results = list(pool.map(lambda a: measure(a, args.runs, args.timeout), agents))
+        deferred = list(pool.map(lambda p: check_deferred(*p, args.timeout), probes))
+
+    budget = load_budget()
+    heavy = budget.get("heavy_modules", HEAVY_MODULES)
+    allowed = budget.get("allowed", {})
+    measured = sorted((r for r in results if r["ms"] is not None), key=lambda r: -r["ms"])
+    for r in measured:
+        r["heavy"] = heavy_imports(set(r["modules"]), heavy, allowed.get(r["agent"], ()))
+        r["budget_ms"] = budget_ms(r["agent"], budget)
+
+    print(f"\n🐢 SLOWEST {min(args.top, len(measured))} (best of {args.runs}; wall / imports / budget)")
+    for r in measured[:args.top]:
+        flag = "❌" if r["heavy"] or r["import_ms"] > r["budget_ms"] else "  "
+        top = ", ".join(f"{m} {ms}ms" for m, ms in r["top"])
+        print(f" {flag} {r['ms']:6d} / {r['import_ms']:5d} / {r['budget_ms']:5d} ms  {r['agent']:<55} {top}")
+
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    if measured:
+        ms = sorted(r["ms"] for r in measured)
+        print(f"\n📋 {counts.get('ok', 0)} measured · median {ms[len(ms) // 2]} ms · max {ms[-1]} ms"
+              f" · {counts.get('streamlit', 0)} streamlit apps skipped")
+    for status in ("error", "timeout"):
+        failing = [r for r in results + deferred if r["status"] == status]
+        if failing:
+            print(f"⚠️  {len(failing)} run(s) with status '{status}' (not checked):")
+            for r in failing:
+                where = f"{r['agent']} ({r['module']})" if "module" in r else r["agent"]
+                print(f"    • {where}" + (f": {r['error']}" if r.get("error") else ""))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"startup": results, "deferred": deferred}, f, indent=2)
+
+    if args.write_budget:
+        with open(BUDGET_FILE, "w", encoding="utf-8") as f:
+            json.dump(updated_budget(budget, measured), f, indent=2)
+            f.write("\n")
+        print(f"📄 Budgets written to {os.path.relpath(BUDGET_FILE, BASE_DIR)}")
+        return 0
+
+    slow = [r for r in measured if r["import_ms"] > r["budget_ms"]]
+    eager_help = [r for r in measured if r["heavy"]]
+    eager_lazy = [r for r in deferred if r["loaded"]]
+    for r in slow:
+        print(f"❌ {r['agent']}: imports take {r['import_ms']} ms, budget {r['budget_ms']} ms")
+    for r in eager_help:
+        print(f"❌ {r['agent']}: --help loads {', '.join(r['heavy'])}")
+    for r in eager_lazy:
+        print(f"❌ {r['agent']}: importing {r['module']} loads deferred {', '.join(r['loaded'])}")
+    if slow or eager_help or eager_lazy:
+        print(f"\n❌ {len(slow) + len(eager_help) + len(eager_lazy)} startup check(s) failed")
+        return 1
+    print(f"\n✅ All agents within their import budgets, no heavy imports at startup; "
+          f"{sum(r['status'] == 'ok' for r in deferred)} deferred-import probes clean")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
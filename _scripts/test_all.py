@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+🧪 Agent Test Runner — parallel, cached replacement for the old serial loop.
+
+Each agent's suite still runs in its own pytest process (agents share module
+names like `agent`, `config` and `main`, so they cannot share an interpreter),
+but suites run concurrently across a worker pool. A suite that passed is
+skipped on the next run until a content hash of the agent's files changes.
+Coverage is merged into `_scripts/coverage.json` — agents skipped via the cache
+or outside a filtered run keep their previous entries — and the slowest suites
+are reported by wall time.
+
+Usage:
+    python _scripts/test_all.py                  # all agents, cached
+    python _scripts/test_all.py --coverage       # also refresh coverage.json
+    python _scripts/test_all.py -j 8 --no-cache  # force a full run on 8 workers
+    python _scripts/test_all.py data-analytics/  # only agents under a path prefix
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COVERAGE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "coverage.json")
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".test_cache.json")
+CACHE_VERSION = 1
+
+_SKIP_DIRS = {".git", "node_modules", "__pycache__", ".pytest_cache", "venv", ".venv", "htmlcov"}
+# Files that test runs write into the agent directory (or, for `_scripts`, this runner's own cache);
+# hashing them would invalidate every cache entry
+_SKIP_FILES = {".coverage", "coverage.json", "coverage.xml", ".test_cache.json"}
+_TS_TEST_SUFFIXES = (".test.ts", ".test.js", ".spec.ts", ".spec.js")
+
+
+# ─── Discovery ──────────────────────────────────────────────────
+def discover(base_dir: str = BASE_DIR) -> list[tuple[str, str]]:
+    """Return sorted (agent_dir, kind) pairs, kind being 'pytest' or 'npm'.
+
+    Mirrors the old script: any `tests/` directory up to 5 levels deep marks its
+    parent as an agent; otherwise a root-level `test_main.py` (up to 4 levels) does.
+    """
+    found = {}
+    root_depth = base_dir.rstrip(os.sep).count(os.sep)
+    for root, dirs, files in os.walk(base_dir):
+        depth = root.count(os.sep) - root_depth
+        dirs[:] = sorted(d for d in dirs if d not in _SKIP_DIRS and not d.startswith("."))
+        if os.path.basename(root) == "tests" and 1 < depth <= 5:
+            agent = os.path.relpath(os.path.dirname(root), base_dir)
+            if any(f.startswith("test_") and f.endswith(".py") for f in files):
+                found.setdefault(agent, "pytest")
+            elif any(f.endswith(_TS_TEST_SUFFIXES) for f in files):
+                found.setdefault(agent, "npm")
+        elif "test_main.py" in files and 0 < depth < 4 and "tests" not in root.split(os.sep):
+            found.setdefault(os.path.relpath(root, base_dir), "pytest")
+    return sorted(found.items())
+
+
+def source_hash(agent_dir: str, extra: str = "") -> str:
+    """blake2b over every file path and content in the agent (cache key)."""
+    h = hashlib.blake2b(extra.encode(), digest_size=16)
+    for root, dirs, files in os.walk(agent_dir):
+        dirs[:] = sorted(d for d in dirs if d not in _SKIP_DIRS and not d.startswith("."))
+        for name in sorted(files):
+            if name in _SKIP_FILES or name.endswith((".pyc", ".pyo")):
+                continue
+            path = os.path.join(root, name)
+            h.update(os.path.relpath(path, agent_dir).encode() + b"\0")
+            try:
+                with open(path, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        h.update(block)
+            except OSError:
+                continue
+            h.update(b"\0")
+    return h.hexdigest()
+
+
+def _shared_inputs(base_dir: str) -> str:
+    """Things outside the agent that affect every run: root conftest, `_shared/` helpers and interpreter."""
+    conftest = os.path.join(base_dir, "conftest.py")
+    digest = ""
+    if os.path.exists(conftest):
+        with open(conftest, "rb") as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    shared = os.path.join(base_dir, "_shared")
+    if os.path.isdir(shared):
+        digest += "|" + source_hash(shared)
+    return f"{sys.version}|{digest}"
+
+
+# ─── Running ────────────────────────────────────────────────────
+def run_agent(base_dir: str, agent: str, kind: str, coverage: bool, timeout: float) -> dict:
+    """Run one agent's suite in a subprocess; returns a result dict."""
+    cwd = os.path.join(base_dir, agent)
+    started = time.perf_counter()
+    result = {"agent": agent, "status": "failed", "coverage": None, "seconds": 0.0, "output": ""}
+    cov_json = None
+    if kind == "npm":
+        cmd = ["npm", "test", "--silent"]
+    else:
+        cmd = [sys.executable, "-m", "pytest", "-q", "--disable-warnings", "-p", "no:cacheprovider"]
+        if coverage:
+            fd, cov_json = tempfile.mkstemp(suffix=".json", prefix="cov-")
+            os.close(fd)
+            cmd += ["--cov=.", "--cov-report=", f"--cov-report=json:{cov_json}"]
+    # Keep .coverage data files and bytecode out of the agent tree so they don't change its hash
+    data_file = os.path.join(tempfile.gettempdir(), f".coverage-{os.getpid()}-{agent.replace(os.sep, '_')}")
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1", COVERAGE_FILE=data_file,
+               PYTHONPATH=os.pathsep.join(filter(None, [os.path.join(base_dir, "_shared"), os.environ.get("PYTHONPATH")])))
+    try:
+        proc = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, timeout=timeout, env=env)
+        result["output"] = (proc.stdout + proc.stderr)[-4000:]
+        if proc.returncode == 0:
+            result["status"] = "passed"
+        elif kind == "npm":
+            result["status"] = "skipped"  # npm suites without a working toolchain don't fail the run
+        if cov_json and os.path.getsize(cov_json):
+            with open(cov_json) as f:
+                result["coverage"] = int(round(json.load(f)["totals"]["percent_covered"]))
+    except subprocess.TimeoutExpired:
+        result["status"] = "timeout"
+    except FileNotFoundError as e:  # npm not installed
+        result["status"] = "skipped"
+        result["output"] = str(e)
+    finally:
+        if cov_json:
+            try:
+                os.remove(cov_json)
+            except OSError:
+                pass
+        try:
+            os.remove(data_file)
+        except OSError:
+            pass
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+# ─── Cache & report files ───────────────────────────────────────
+def _load_json(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: str, data: dict):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def write_coverage(results: list[dict], counts: dict, path: str = COVERAGE_FILE):
+    """Merge this run's coverage into the report, keeping entries for agents not re-measured.
+
+    Agents outside this run (filtered out) keep their previous entry and count as
+    passed in the summary, which is what their entry last recorded.
+    """
+    previous = {a["agent"].lstrip("./"): a for a in _load_json(path).get("agents", [])}
+    for r in results:
+        if r["coverage"] is not None:
+            previous[r["agent"]] = {"agent": f"./{r['agent']}", "coverage": r["coverage"], "seconds": r["seconds"]}
+    agents = sorted(previous.values(), key=lambda a: a["coverage"], reverse=True)
+    covered = [a["coverage"] for a in agents]
+    total = len(set(previous) | {r["agent"] for r in results})
+    _write_json(path, {
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "summary": {
+            "total_agents": total,
+            "agents_with_coverage": len(covered),
+            "average_coverage": sum(covered) // len(covered) if covered else 0,
+            "passed": total - counts["failed"] - counts["skipped"],
+            "failed": counts["failed"],
+            "skipped": counts["skipped"],
+        },
+        "agents": agents,
+    })
+
+
+# ─── CLI ────────────────────────────────────────────────────────
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run every agent's test suite in parallel, with caching.")
+    parser.add_argument("paths", nargs="*", help="Only run agents under these path prefixes")
+    parser.add_argument("--coverage", action="store_true", help="Collect coverage and merge it into coverage.json")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 2, help="Parallel suites (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-run suites even if their sources are unchanged")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-agent timeout in seconds")
+    parser.add_argument("--slowest", type=int, default=10, help="Show the N slowest suites (0 to hide)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print output of failing suites")
+    args = parser.parse_args(argv)
+
+    targets = discover(BASE_DIR)
+    if args.paths:
+        prefixes = [os.path.normpath(p).lstrip("./") for p in args.paths]
+        targets = [(a, k) for a, k in targets if any(a == p or a.startswith(p.rstrip("/") + "/") for p in prefixes)]
+
+    print("=====================================")
+    print("🧪 Agent Test Runner")
+    if args.coverage:
+        print("📊 Coverage mode enabled")
+    print(f"   Found {len(targets)} test targets, {args.jobs} workers")
+    print("=====================================\n")
+
+    cache = _load_json(CACHE_FILE)
+    entries = cache.get("agents", {}) if cache.get("version") == CACHE_VERSION else {}
+    shared = _shared_inputs(BASE_DIR) + ("|cov" if args.coverage else "")
+
+    results, pending = [], []
+    for agent, kind in targets:
+        key = source_hash(os.path.join(BASE_DIR, agent), shared)
+        hit = entries.get(agent)
+        if not args.no_cache and hit and hit.get("key") == key and hit.get("status") == "passed":
+            results.append({**hit, "agent": agent, "cached": True, "output": ""})
+        else:
+            pending.append((agent, kind, key))
+
+    started = time.perf_counter()
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {pool.submit(run_agent, BASE_DIR, agent, kind, args.coverage, args.timeout): (agent, key)
+                   for agent, kind, key in pending}
+        for future in as_completed(futures):
+            agent, key = futures[future]
+            r = future.result()
+            r["cached"] = False
+            results.append(r)
+            done += 1
+            print(f"\r  Testing [{done}/{len(pending)}] {os.path.basename(agent):<40}", end="", flush=True)
+            if r["status"] == "passed":
+                entries[agent] = {"key": key, "status": "passed", "coverage": r["coverage"], "seconds": r["seconds"]}
+            else:
+                entries.pop(agent, None)
+    wall = time.perf_counter() - started
+    print("\r" + " " * 72 + "\r", end="")
+    _write_json(CACHE_FILE, {"version": CACHE_VERSION, "agents": entries})
+
+    results.sort(key=lambda r: r["agent"])
+    counts = {"total": len(results), "passed": 0, "failed": 0, "skipped": 0}
+    for r in results:
+        counts["failed" if r["status"] in ("failed", "timeout") else r["status"]] += 1
+    cached = sum(r["cached"] for r in results)
+
+    print("=====================================")
+    print("📋 RESULTS")
+    print("=====================================")
+    print(f"  Total tested : {counts['total']}")
+    print(f"  ✅ Passed    : {counts['passed']}" + (f" ({cached} cached)" if cached else ""))
+    if counts["failed"]:
+        print(f"  ❌ Failed    : {counts['failed']}")
+    if counts["skipped"]:
+        print(f"  ⏭️  Skipped   : {counts['skipped']}")
+    covered = [r["coverage"] for r in results if r["coverage"] is not None]
+    if args.coverage and covered:
+        print(f"  📊 Avg Coverage: {sum(covered) // len(covered)}% ({len(covered)} agents)")
+    serial = sum(r["seconds"] for r in results if not r["cached"])
+    print(f"  ⏱️  Wall time : {wall:.1f}s ({serial:.1f}s of suite time on {args.jobs} workers)")
+
+    failed = [r for r in results if r["status"] in ("failed", "timeout")]
+    if failed:
+        print("\n=====================================")
+        print("❌ FAILED AGENTS")
+        print("=====================================")
+        for r in failed:
+            print(f"  • {r['agent']}" + (" (timeout)" if r["status"] == "timeout" else ""))
+            if args.verbose and r["output"]:
+                print("    " + r["output"].strip().replace("\n", "\n    "))
+
+    if args.slowest:
+        ran = sorted((r for r in results if not r["cached"]), key=lambda r: r["seconds"], reverse=True)[:args.slowest]
+        if ran:
+            print("\n=====================================")
+            print(f"🐢 SLOWEST {len(ran)} SUITES")
+            print("=====================================")
+            for r in ran:
+                print(f"  {r['seconds']:7.2f}s  {r['agent']}")
+
+    if args.coverage:
+        below = [r for r in results if r["coverage"] is not None and r["coverage"] < 100]
+        if below:
+            print("\n=====================================")
+            print("⚠️  BELOW 100% COVERAGE")
+            print("=====================================")
+            for r in below:
+                print(f"  • {r['agent']} → {r['coverage']}%")
+        else:
+            print("\n🟢 All agents at 100% coverage!")
+        write_coverage(results, counts, COVERAGE_FILE)
+        print(f"📄 Report written to {os.path.relpath(COVERAGE_FILE, BASE_DIR)}")
+
+    print("=====================================")
+    if failed:
+        return 1
+    print("✅ All agents passing!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
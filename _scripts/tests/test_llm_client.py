@@ -0,0 +1,105 @@
+"""Tests for the shared LLM client, run against the local stub server."""
+import sys, os, threading, pytest
+from unittest.mock import patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from llm_client import LLMClient, LLMError
+from llm_stub_server import make_server
+
+MESSAGES = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "hello there"}]
+REPLY = "**Stub reply** — you said: hello there"
+
+@pytest.fixture
+def serve():
+    """Start stub servers on free ports; each one counts the connections it accepts."""
+    servers = []
+    def start(**options):
+        server = make_server(**options)
+        server.accepted = 0
+        accept = server.get_request
+        def counting_accept():
+            server.accepted += 1
+            return accept()
+        server.get_request = counting_accept
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+    yield start
+    for server in servers:
+        server.shutdown(); server.server_close()
+
+@pytest.fixture
+def sleeps():
+    """Record backoff delays instead of sleeping."""
+    with patch("llm_client.time.sleep") as sleep:
+        yield sleep
+
+def test_stream_yields_sse_chunks(serve):
+    _, url = serve()
+    client = LLMClient("sk-test", base_url=url)
+    stream = client.stream_chat(MESSAGES)
+    chunks = list(stream)
+    assert len(chunks) == len(REPLY.split(" "))  # one SSE event per word
+    assert "".join(chunks) == REPLY + " "
+    assert stream.text == REPLY + " "
+    assert stream.usage == {"prompt_tokens": 2, "completion_tokens": 7, "total_tokens": 9}
+    assert stream.ttft is not None and stream.ttft >= 0
+    client.close()
+
+def test_chat_non_streaming(serve):
+    _, url = serve()
+    client = LLMClient("sk-test", base_url=url)
+    assert client.chat(MESSAGES)["choices"][0]["message"]["content"] == REPLY
+    client.close()
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_stream_retries_with_backoff(serve, sleeps, status):
+    _, url = serve(fail_first=2, fail_status=status)
+    client = LLMClient("sk-test", base_url=url, max_retries=2, backoff=0.5, max_backoff=8.0)
+    assert "".join(client.stream_chat(MESSAGES)) == REPLY + " "
+    delays = [call.args[0] for call in sleeps.call_args_list]
+    assert len(delays) == 2
+    assert all(0 <= d <= 0.5 * 2 ** attempt for attempt, d in enumerate(delays))  # full jitter, doubling cap
+    client.close()
+
+def test_chat_retries_with_backoff(serve, sleeps):
+    _, url = serve(fail_first=1, fail_status=429)
+    client = LLMClient("sk-test", base_url=url, max_retries=1)
+    assert client.chat(MESSAGES)["choices"][0]["message"]["content"] == REPLY
+    assert sleeps.call_count == 1
+    client.close()
+
+def test_retries_exhausted(serve, sleeps):
+    _, url = serve(fail_first=3, fail_status=503)
+    client = LLMClient("sk-test", base_url=url, max_retries=2)
+    with pytest.raises(LLMError) as e:
+        list(client.stream_chat(MESSAGES))
+    assert e.value.status == 503 and "injected failure" in str(e.value)
+    assert sleeps.call_count == 2
+    client.close()
+
+def test_client_errors_not_retried(serve, sleeps):
+    _, url = serve(fail_first=1, fail_status=400)
+    client = LLMClient("sk-test", base_url=url)
+    with pytest.raises(LLMError) as e:
+        client.chat(MESSAGES)
+    assert e.value.status == 400
+    sleeps.assert_not_called()
+    client.close()
+
+def test_connection_reused(serve, sleeps):
+    server, url = serve(fail_first=1)
+    client = LLMClient("sk-test", base_url=url)
+    for _ in range(3):
+        assert "".join(client.stream_chat(MESSAGES)) == REPLY + " "  # the first one is retried once
+    client.chat(MESSAGES)
+    assert server.accepted == 1  # five requests, one keep-alive connection
+    client.close()
+
+def test_abandoned_stream_not_pooled(serve):
+    server, url = serve()
+    client = LLMClient("sk-test", base_url=url)
+    stream = iter(client.stream_chat(MESSAGES))
+    next(stream); stream.close()  # half-read response: its connection cannot be reused
+    assert "".join(client.stream_chat(MESSAGES)) == REPLY + " "
+    assert server.accepted == 2
+    client.close()
@@ -0,0 +1,74 @@
+"""Tests for the incremental agent registry."""
+import sys, os, json, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from registry import REGISTRY_VERSION, load_agents, scan_agents, slug_to_name, update_registry
+
+@pytest.fixture
+def hub(tmp_path):
+    """Two agents, a misc subcategory agent and a directory that is not an agent."""
+    base = tmp_path / "hub"
+    for agent, readme in (("data-analytics/csv-cleaner", "Cleans CSV files and fixes broken rows quickly."),
+                          ("fixers/seo-fixer", "Finds and fixes SEO problems in static sites."),
+                          ("misc/tools/api-pinger", "Pings API endpoints and reports their latency.")):
+        (base / agent).mkdir(parents=True)
+        (base / agent / "main.py").write_text("")
+        (base / agent / "README.md").write_text(f"# Title\n\n{readme}\n")
+    (base / "fixers" / "notes").mkdir()
+    return base, tmp_path / "agent_registry.json"
+
+def touch(path, bump=10**9):
+    """Move a file's mtime forward explicitly; writes can land within one mtime tick."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump))
+
+def test_slug_to_name_keeps_acronyms():
+    assert slug_to_name("seo-fixer") == "SEO Fixer"
+    assert slug_to_name("csv_cleaner") == "CSV Cleaner"
+
+def test_fresh_build_matches_full_scan(hub):
+    base, registry = hub
+    agents, stats = update_registry(base, registry)
+    assert stats == {"reused": 0, "rescanned": 4, "removed": 0}
+    assert agents == scan_agents(base)
+    assert sorted(agents) == ["data-analytics/csv-cleaner", "fixers/seo-fixer", "misc/tools/api-pinger"]
+    assert agents["misc/tools/api-pinger"]["category_display"] == "Misc — Tools"
+    data = json.loads(registry.read_text())
+    assert data["version"] == REGISTRY_VERSION and data["agents"]["fixers/notes"]["agent"] is None
+
+def test_unchanged_mtimes_reuse_every_entry(hub):
+    base, registry = hub
+    update_registry(base, registry)
+    written = registry.stat().st_mtime_ns
+    agents, stats = update_registry(base, registry)
+    assert stats == {"reused": 4, "rescanned": 0, "removed": 0}
+    assert registry.stat().st_mtime_ns == written  # nothing changed, nothing rewritten
+    assert agents == load_agents(base, registry) == scan_agents(base)
+
+def test_changed_file_rescans_only_that_agent(hub):
+    base, registry = hub
+    update_registry(base, registry)
+    readme = base / "fixers" / "seo-fixer" / "README.md"
+    readme.write_text("# Title\n\nRewrites meta tags and canonical links for SEO.\n")
+    touch(readme)
+    agents, stats = update_registry(base, registry)
+    assert stats == {"reused": 3, "rescanned": 1, "removed": 0}
+    assert agents["fixers/seo-fixer"]["description"] == "Rewrites meta tags and canonical links for SEO."
+
+def test_added_and_removed_agents(hub):
+    base, registry = hub
+    update_registry(base, registry)
+    (base / "fixers" / "notes" / "main.py").write_text("")  # the directory becomes an agent
+    touch(base / "fixers" / "notes")
+    for name in ("main.py", "README.md"):
+        (base / "data-analytics" / "csv-cleaner" / name).unlink()
+    (base / "data-analytics" / "csv-cleaner").rmdir()
+    agents, stats = update_registry(base, registry)
+    assert stats == {"reused": 2, "rescanned": 1, "removed": 1}
+    assert sorted(agents) == ["fixers/notes", "fixers/seo-fixer", "misc/tools/api-pinger"]
+
+def test_full_rebuild_and_version_mismatch_ignore_registry(hub):
+    base, registry = hub
+    update_registry(base, registry)
+    assert update_registry(base, registry, full=True)[1]["rescanned"] == 4
+    registry.write_text(json.dumps({"version": REGISTRY_VERSION + 1, "agents": {}}))
+    assert update_registry(base, registry)[1] == {"reused": 0, "rescanned": 4, "removed": 0}
@@ -0,0 +1,80 @@
+"""Tests for the cross-session response cache."""
+import sys, os, pytest
+from unittest.mock import patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from response_cache import ResponseCache, make_key, OPT_OUT_AGENTS
+
+REPLY = {"output": "Hello!", "model": "gpt-4o-mini", "tokens": 12}
+
+@pytest.fixture
+def clock():
+    """Controllable time.time() for the cache module."""
+    now = [1_700_000_000.0]
+    with patch("response_cache.time.time", side_effect=lambda: now[0]):
+        yield now
+
+def key(user_input="hi", **params):
+    return make_key("misc/echo", "You echo.", "gpt-4o-mini", user_input, **params)
+
+def test_miss_then_hit():
+    cache = ResponseCache()
+    assert cache.get(key()) is None
+    cache.put(key(), REPLY)
+    assert cache.get(key()) == REPLY
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1, "disk_entries": None}
+
+def test_empty_reply_not_cached():
+    cache = ResponseCache()
+    for output in ("", "  \n", None):
+        cache.put(key(), {**REPLY, "output": output})
+    assert cache.get(key()) is None
+    assert cache.stats()["entries"] == 0
+
+def test_ttl_expiry(clock):
+    cache = ResponseCache(ttl=60)
+    cache.put(key(), REPLY)
+    clock[0] += 59
+    assert cache.get(key()) == REPLY
+    clock[0] += 1
+    assert cache.get(key()) is None
+    assert cache.stats()["entries"] == 0  # expired entries are dropped on read
+
+def test_ttl_expiry_on_disk(tmp_path, clock):
+    db = str(tmp_path / "cache.db")
+    ResponseCache(ttl=60, db_path=db).put(key(), REPLY)
+    assert ResponseCache(ttl=60, db_path=db).get(key()) == REPLY  # survives a restart
+    clock[0] += 60
+    assert ResponseCache(ttl=60, db_path=db).get(key()) is None
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    for text in ("a", "b"): cache.put(key(text), {**REPLY, "output": text})
+    cache.get(key("a"))
+    cache.put(key("c"), {**REPLY, "output": "c"})
+    assert cache.get(key("b")) is None
+    assert cache.get(key("a"))["output"] == "a" and cache.get(key("c"))["output"] == "c"
+
+def test_keys_do_not_collide():
+    # Fields that would run together under plain concatenation stay distinct
+    keys = {
+        make_key("a", "bc", "m", "x"), make_key("ab", "c", "m", "x"),
+        make_key("a", "b", "m", "c x"), make_key("a", "b", "m c", "x"),
+        make_key("a", "b", "m", "x", temperature=0.3), make_key("a", "b", "m", "x", temperature=0.7),
+        make_key("a", "b", "m", "x", max_tokens=1), make_key("a", "b", "m", "x", temperature=1),
+    }
+    assert len(keys) == 8
+    assert key(temperature=0.3, max_tokens=1024) == key(max_tokens=1024, temperature=0.3)
+
+def test_distinct_keys_keep_their_own_replies():
+    cache = ResponseCache()
+    cache.put(key("hi"), REPLY)
+    cache.put(key("hi", temperature=0.9), {**REPLY, "output": "Hey!"})
+    assert cache.get(key("hi"))["output"] == "Hello!"
+    assert cache.get(key("hi", temperature=0.9))["output"] == "Hey!"
+
+def test_opt_out_from_env(monkeypatch):
+    monkeypatch.setenv("HUB_CACHE_OPT_OUT", "misc/echo, misc/dice")
+    cache = ResponseCache.from_env()
+    assert not cache.enabled_for("misc/echo") and not cache.enabled_for("misc/dice")
+    assert not cache.enabled_for(next(iter(OPT_OUT_AGENTS)))
+    assert cache.enabled_for("content-writing/word-counter")
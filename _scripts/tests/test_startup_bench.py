@@ -0,0 +1,69 @@
+"""Tests for the startup checks in startup_bench.py."""
+import sys, os, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from startup_bench import (MIN_BUDGET_MS, budget_ms, check_deferred, heavy_imports, import_ms,
+                           lazy_bindings, loaded_modules, updated_budget)
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 | _io
+import time:       300 |        900 | site
+import time:        80 |         80 |     pandas._libs
+import time:      2000 |       2080 |   pandas
+import time:       400 |        400 | agent.core
+"""
+
+@pytest.fixture
+def hub(tmp_path):
+    """A tiny hub with one agent: a heavy module, one module that defers it and one that does not."""
+    agent = tmp_path / "cat" / "demo"
+    (agent / "agent").mkdir(parents=True)
+    (agent / "main.py").write_text("")
+    (agent / "heavy_dep.py").write_text("VALUE = 1\n")
+    bootstrap = "from lazy_import import lazy_import\n"  # check_deferred puts _shared on PYTHONPATH
+    (agent / "agent" / "__init__.py").write_text("")
+    (agent / "agent" / "lazy.py").write_text(bootstrap + 'VALUE = lazy_import("heavy_dep", "VALUE")\n')
+    (agent / "agent" / "eager.py").write_text(bootstrap + 'VALUE = lazy_import("heavy_dep", "VALUE")\nimport heavy_dep\n')
+    (agent / "tests").mkdir()
+    (agent / "tests" / "test_x.py").write_text('X = lazy_import("heavy_dep")\n')  # tests are not probed
+    return tmp_path
+
+def test_loaded_modules_skips_interpreter_startup():
+    assert loaded_modules(IMPORTTIME) == {"pandas._libs", "pandas", "agent.core"}
+
+def test_import_ms_sums_top_level_entries_after_site():
+    stderr = IMPORTTIME + "import time:       100 |       1700 | agent.cli\n"
+    assert import_ms(stderr) == 2  # agent.core 400 us + agent.cli 1700 us; pandas is nested under agent.core
+
+def test_budget_per_agent_with_default():
+    budget = {"default_ms": 1500, "agents": {"cat/slow": 900}}
+    assert budget_ms("cat/slow", budget) == 900
+    assert budget_ms("cat/other", budget) == 1500
+    assert budget_ms("cat/other", {}) == 1500
+
+def test_updated_budget_records_headroom_and_heavy_modules():
+    budget = {"default_ms": 1000, "agents": {"cat/gone": 400}, "heavy_modules": ["pandas"], "allowed": {"cat/fast": ["pandas"]}}
+    measured = [{"agent": "cat/slow", "import_ms": 800, "modules": ["pandas.core"]},
+                {"agent": "cat/fast", "import_ms": 20, "modules": ["json"]}]
+    assert updated_budget(budget, measured) == {
+        "default_ms": 1000,
+        "agents": {"cat/fast": MIN_BUDGET_MS, "cat/gone": 400, "cat/slow": 1200},
+        "heavy_modules": ["pandas"],
+        "allowed": {"cat/slow": ["pandas"]},
+    }
+
+def test_heavy_imports_match_submodules_and_respect_allowed():
+    modules = {"pandas._libs", "agent.core", "numpyish"}
+    assert heavy_imports(modules, ["pandas", "numpy"]) == ["pandas"]
+    assert heavy_imports(modules, ["pandas", "numpy"], allowed=["pandas"]) == []
+
+def test_lazy_bindings_found_per_agent(hub):
+    assert lazy_bindings(str(hub)) == {"cat/demo": {"agent.eager": ["heavy_dep"], "agent.lazy": ["heavy_dep"]}}
+
+def test_deferred_module_not_in_sys_modules_after_import(hub):
+    agent = str(hub / "cat" / "demo")
+    assert check_deferred(agent, "agent.lazy", ["heavy_dep"], timeout=30)["loaded"] == []
+    assert check_deferred(agent, "agent.eager", ["heavy_dep"], timeout=30)["loaded"] == ["heavy_dep"]
+
+def test_probe_reports_import_errors(hub):
+    result = check_deferred(str(hub / "cat" / "demo"), "agent.missing", ["heavy_dep"], timeout=30)
+    assert result["status"] == "error" and "agent.missing" in result["error"]
@@ -0,0 +1,79 @@
+"""Tests for the parallel, cached test runner in test_all.py."""
+import sys, os, json, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import test_all
+from test_all import BASE_DIR, discover, source_hash, write_coverage
+
+@pytest.fixture
+def hub(tmp_path, monkeypatch):
+    """A tiny hub with two agents; suites are "run" by a fake that records which agents it was given."""
+    for agent in ("cat/alpha", "cat/beta"):
+        (tmp_path / agent / "tests").mkdir(parents=True)
+        (tmp_path / agent / "tests" / "test_x.py").write_text("def test_x():\n    pass\n")
+    monkeypatch.setattr(test_all, "BASE_DIR", str(tmp_path))
+    monkeypatch.setattr(test_all, "CACHE_FILE", str(tmp_path / ".test_cache.json"))
+    monkeypatch.setattr(test_all, "COVERAGE_FILE", str(tmp_path / "coverage.json"))
+    ran, failing = [], set()
+    def fake_run(base_dir, agent, kind, coverage, timeout):
+        ran.append(agent)
+        return {"agent": agent, "status": "failed" if agent in failing else "passed",
+                "coverage": 100 if coverage else None, "seconds": 0.1, "output": ""}
+    monkeypatch.setattr(test_all, "run_agent", fake_run)
+    return tmp_path, ran, failing
+
+def test_discover_includes_scripts_and_shared_suites():
+    agents = dict(discover(BASE_DIR))
+    assert agents["_scripts"] == "pytest" and agents["_shared"] == "pytest"
+
+def test_cache_hit_skips_unchanged_passing_suites(hub):
+    root, ran, _ = hub
+    assert test_all.main(["-j", "1"]) == 0
+    assert sorted(ran) == ["cat/alpha", "cat/beta"]
+    ran.clear()
+    assert test_all.main(["-j", "1"]) == 0
+    assert ran == []
+    assert test_all.main(["-j", "1", "--no-cache"]) == 0
+    assert sorted(ran) == ["cat/alpha", "cat/beta"]
+
+def test_cache_miss_on_changed_file_and_after_failure(hub):
+    root, ran, failing = hub
+    failing.add("cat/beta")
+    assert test_all.main(["-j", "1"]) == 1
+    ran.clear()
+    (root / "cat" / "alpha" / "helper.py").write_text("X = 1\n")
+    assert test_all.main(["-j", "1"]) == 1
+    assert sorted(ran) == ["cat/alpha", "cat/beta"]  # alpha changed, beta failed last time
+    cached = json.loads((root / ".test_cache.json").read_text())["agents"]
+    assert sorted(cached) == ["cat/alpha"]
+
+def test_coverage_mode_is_cached_separately(hub):
+    root, ran, _ = hub
+    test_all.main(["-j", "1"])
+    ran.clear()
+    test_all.main(["-j", "1", "--coverage"])
+    assert sorted(ran) == ["cat/alpha", "cat/beta"]  # a plain run recorded no coverage
+
+def test_source_hash_ignores_run_artifacts(tmp_path):
+    (tmp_path / "main.py").write_text("print('hi')\n")
+    before = source_hash(str(tmp_path))
+    for name in (".coverage", "coverage.json", ".test_cache.json"):
+        (tmp_path / name).write_text("{}")
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "main.cpython-311.pyc").write_bytes(b"\0")
+    assert source_hash(str(tmp_path)) == before
+    (tmp_path / "main.py").write_text("print('bye')\n")
+    assert source_hash(str(tmp_path)) != before
+    assert source_hash(str(tmp_path), "py3.12") != source_hash(str(tmp_path), "py3.11")
+
+def test_write_coverage_merges_with_previous_report(tmp_path):
+    path = tmp_path / "coverage.json"
+    path.write_text(json.dumps({"agents": [{"agent": "./cat/alpha", "coverage": 90, "seconds": 1.0},
+                                           {"agent": "./cat/beta", "coverage": 80, "seconds": 2.0}]}))
+    results = [{"agent": "cat/alpha", "coverage": 100, "seconds": 0.5},
+               {"agent": "cat/gamma", "coverage": None, "seconds": 0.1}]  # failed before reporting coverage
+    write_coverage(results, {"failed": 1, "skipped": 0}, str(path))
+    report = json.loads(path.read_text())
+    assert report["agents"] == [{"agent": "./cat/alpha", "coverage": 100, "seconds": 0.5},
+                                {"agent": "./cat/beta", "coverage": 80, "seconds": 2.0}]
+    assert report["summary"] == {"total_agents": 3, "agents_with_coverage": 2, "average_coverage": 90,
+                                 "passed": 2, "failed": 1, "skipped": 0}
@@ -0,0 +1,42 @@
+"""Deferred imports for heavy dependencies, shared by every agent in the hub.
+
+``ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")`` binds a module-level
+name that performs the import on first call or attribute access. Mock mode,
+``--help`` and tests that patch the name never pay for loading langchain.
+
+Agents import it like any installed module (``from lazy_import import lazy_import``).
+``pip install -e _shared`` (part of the hub's requirements.txt) makes it importable
+everywhere; ``_scripts/test_all.py`` and ``_scripts/startup_bench.py`` also put this
+directory on ``PYTHONPATH`` for the processes they start.
+"""
+import importlib
+
+
+class _LazyImport:
+    __slots__ = ("_module", "_attr", "_loaded")
+
+    def __init__(self, module: str, attr: str = None):
+        self._module = module
+        self._attr = attr
+        self._loaded = None
+
+    def _resolve(self):
+        if self._loaded is None:
+            self._loaded = importlib.import_module(self._module)
+        # Look the attribute up on every use, so patching the source module still takes effect
+        return getattr(self._loaded, self._attr) if self._attr else self._loaded
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __repr__(self):
+        name = f"{self._module}.{self._attr}" if self._attr else self._module
+        return f"<lazy {name}{' (loaded)' if self._loaded is not None else ''}>"
+
+
+def lazy_import(module: str, attr: str = None):
+    """Proxy for `module` (or `module.attr`) that is imported when first used."""
+    return _LazyImport(module, attr)
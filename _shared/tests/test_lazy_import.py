@@ -0,0 +1,42 @@
+"""Tests for the shared lazy_import helper."""
+import sys, os, subprocess, types, pytest
+from unittest.mock import patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from lazy_import import lazy_import
+
+@pytest.fixture
+def fake_module():
+    """A module that records whether it was imported, installed as `fake_heavy`."""
+    module = types.ModuleType("fake_heavy")
+    module.Client = lambda *args, **kwargs: ("client", args, kwargs)
+    module.VERSION = "1.0"
+    with patch.dict(sys.modules, {"fake_heavy": module}):
+        yield module
+
+def test_import_is_deferred_until_use(tmp_path):
+    (tmp_path / "heavy_dep.py").write_text("import sys\nsys.stdout.write('imported ')\nVALUE = 42\n")
+    code = ("import sys; from lazy_import import lazy_import; VALUE = lazy_import('heavy_dep', 'VALUE'); "
+            "print('heavy_dep' in sys.modules); print(VALUE.real); print('heavy_dep' in sys.modules)")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.dirname(os.path.dirname(__file__)), str(tmp_path)]))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True).stdout
+    assert out.split() == ["False", "imported", "42", "True"]
+
+def test_call_and_attribute_access(fake_module):
+    Client = lazy_import("fake_heavy", "Client")
+    heavy = lazy_import("fake_heavy")
+    assert Client(1, key="k") == ("client", (1,), {"key": "k"})
+    assert heavy.VERSION == "1.0"
+    assert repr(heavy) == "<lazy fake_heavy (loaded)>"
+
+def test_patching_source_module_takes_effect(fake_module):
+    Client = lazy_import("fake_heavy", "Client")
+    assert Client()[0] == "client"
+    with patch.object(fake_module, "Client", return_value="mock"):
+        assert Client() == "mock"
+    assert Client()[0] == "client"  # nothing stale is cached once the patch is undone
+
+def test_missing_module_raises_on_use():
+    missing = lazy_import("no_such_module_for_lazy_import_test", "Thing")
+    assert repr(missing) == "<lazy no_such_module_for_lazy_import_test.Thing>"
+    with pytest.raises(ModuleNotFoundError):
+        missing()
@@ -3,8 +3,11 @@ import json
 import re
 from typing import List, Dict, Any
 
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_community.vectorstores import FAISS
+import sys
+from lazy_import import lazy_import
+OpenAIEmbeddings = lazy_import("langchain_openai", "OpenAIEmbeddings")
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
+FAISS = lazy_import("langchain_community.vectorstores", "FAISS")
 from langchain_core.prompts import PromptTemplate
 
 # Add project root to sys.path for consistent imports from pytest and CLI
@@ -1,9 +1,10 @@
 from langchain.agents import AgentExecutor, create_tool_calling_agent  # pragma: no cover
 from langchain_core.prompts import ChatPromptTemplate  # pragma: no cover
 from langchain_core.tools import StructuredTool  # pragma: no cover
-from langchain_openai import ChatOpenAI  # pragma: no cover
+from lazy_import import lazy_import  # pragma: no cover
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")  # pragma: no cover
 from .analysis import Analyzer  # pragma: no cover
-import numpy as np  # pragma: no cover
+np = lazy_import("numpy")  # pragma: no cover
 
 class ChatAgent:  # pragma: no cover
     def __init__(self, embeddings, metadata, api_key, embedder):  # pragma: no cover
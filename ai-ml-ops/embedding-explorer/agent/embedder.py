@@ -1,7 +1,8 @@
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.embeddings import HuggingFaceEmbeddings
 import os
-import numpy as np
+from lazy_import import lazy_import
+OpenAIEmbeddings = lazy_import("langchain_openai", "OpenAIEmbeddings")
+HuggingFaceEmbeddings = lazy_import("langchain_community.embeddings", "HuggingFaceEmbeddings")
+np = lazy_import("numpy")
 
 class Embedder:
     def __init__(self, model_type="openai", model_name=None, api_key=None):
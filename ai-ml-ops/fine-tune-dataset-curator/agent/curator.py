@@ -4,7 +4,8 @@ import os
 # Add the project root to sys.path to allow imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_classic.agents import AgentExecutor, create_openai_tools_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
@@ -1,7 +1,8 @@
 import os
 import sys
 from typing import Dict, List, Any
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.output_parsers import StrOutputParser
 
 # Add project root to path
@@ -1,14 +1,16 @@
 import os
 from typing import List, Optional
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_community.vectorstores import Chroma
+import sys
+from lazy_import import lazy_import
+OpenAIEmbeddings = lazy_import("langchain_openai", "OpenAIEmbeddings")
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
+Chroma = lazy_import("langchain_community.vectorstores", "Chroma")
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 
 # Import Config correctly
-import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from config import Config
 
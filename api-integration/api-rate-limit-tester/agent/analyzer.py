@@ -1,10 +1,10 @@
 from typing import Dict, Any
 import pandas as pd
-from langchain_openai import ChatOpenAI
+import os, sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-import os
-import sys
 
 # Add parent directory to path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -1,8 +1,8 @@
-from langchain_openai import ChatOpenAI
+import os, sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-import os
-import sys
 
 # Ensure parent directory is in path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
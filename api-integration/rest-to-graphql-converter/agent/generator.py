@@ -1,5 +1,7 @@
 from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
+import os, sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.output_parsers import StrOutputParser
 
 try:
@@ -1,6 +1,7 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
 import os
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
+from langchain_core.messages import HumanMessage, SystemMessage
 
 class KPIAnalyst:
     def __init__(self, api_key=None, model="gpt-4o"):
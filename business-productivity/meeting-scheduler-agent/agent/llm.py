@@ -1,5 +1,7 @@
 import os
-from langchain_openai import ChatOpenAI
+import sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 
 try:
     from config import OPENAI_API_KEY
@@ -4,9 +4,12 @@ import sys
 # Add parent directory to path to allow imports from config and prompts
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+from lazy_import import lazy_import
+
+# langchain takes over a second to import; defer it until an LLM call is made
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
+ChatPromptTemplate = lazy_import("langchain_core.prompts", "ChatPromptTemplate")
+StrOutputParser = lazy_import("langchain_core.output_parsers", "StrOutputParser")
 
 try:
     from config import Config
@@ -1,5 +1,6 @@
 from typing import Dict, Any
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
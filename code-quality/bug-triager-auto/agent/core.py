@@ -3,7 +3,8 @@ import difflib
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import PromptTemplate
 try:
     from config import Config
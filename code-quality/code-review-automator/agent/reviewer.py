@@ -1,7 +1,9 @@
 import logging
 import json
 from typing import List, Dict, Any, Optional
-from langchain_openai import ChatOpenAI
+import os, sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from unidiff import PatchSet
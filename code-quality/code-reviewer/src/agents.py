@@ -1,5 +1,6 @@
 from crewai import Agent
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from agent_config import Config
 
 class CodeReviewerAgents:
@@ -1,5 +1,6 @@
-from langchain_community.tools import DuckDuckGoSearchRun
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+DuckDuckGoSearchRun = lazy_import("langchain_community.tools", "DuckDuckGoSearchRun")
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from typing import Dict, Any, List
 
 from config import OPENAI_API_KEY, DEFAULT_MODEL, DEFAULT_TEMPERATURE
@@ -1,4 +1,5 @@
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from typing import Dict, Any
 
 from config import OPENAI_API_KEY, DEFAULT_MODEL, DEFAULT_TEMPERATURE
@@ -1,10 +1,10 @@
-from langchain_openai import ChatOpenAI
+import os, sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any
-import sys
-import os
 
 # Add parent directory to path to allow imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -0,0 +1,180 @@
+"""Batch linting — many files across a process pool, with a content-hash cache and JSON/SARIF reports.
+
+The cache maps each file to its (mtime, size), a BLAKE2 digest of its bytes and the
+lint result. An unchanged stat is trusted without reading the file; a changed stat
+whose bytes hash the same (e.g. after a checkout) reuses the result without linting.
+The whole cache is dropped when the active rule set or any rule's `version` changes.
+"""
+from __future__ import annotations
+import glob, hashlib, json, os
+from concurrent.futures import ProcessPoolExecutor
+
+from agent.linter import LintIssue, LintResult, lint_markdown
+from agent.rules import resolve, signature
+
+EXTENSIONS = (".md", ".markdown")
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", ".venv", "venv", "__pycache__"}
+DEFAULT_CACHE = ".mdlint_cache.json"
+CACHE_FORMAT = 2  # 2: CRLF files are linted with normalised newlines
+PARALLEL_MIN_FILES = 32  # below this, starting worker processes costs more than it saves
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+# ─── Discovery ──────────────────────────────────────────────────────
+
+def discover(paths) -> list[str]:
+    """Markdown files named by `paths`: files as given, directories walked, glob patterns expanded."""
+    found: dict[str, None] = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+                for name in sorted(files):
+                    if name.lower().endswith(EXTENSIONS): found[os.path.join(root, name)] = None
+        elif glob.has_magic(path):
+            for match in sorted(glob.glob(path, recursive=True)):
+                if os.path.isfile(match): found[match] = None
+        else:
+            found[path] = None
+    return list(found)
+
+
+# ─── Cache ──────────────────────────────────────────────────────────
+
+def result_to_dict(r: LintResult) -> dict:
+    return {**r.to_dict(), "issues": [[i.line, i.rule, i.message, i.severity] for i in r.issues]}
+
+def result_from_dict(d: dict) -> LintResult:
+    return LintResult(issues=[LintIssue(*i) for i in d["issues"]], warnings=d["warnings"], errors=d["errors"],
+                      total_lines=d["total_lines"], is_valid=d["is_valid"])
+
+
+class LintCache:
+    """JSON file of per-path lint results, valid only for one rule-set signature."""
+
+    def __init__(self, path: str, rules_signature: str):
+        self.path, self.signature = path, rules_signature
+        self.files: dict[str, dict] = {}
+        self.dirty = False
+        try:
+            with open(path, encoding="utf-8") as f: data = json.load(f)
+            if data.get("format") == CACHE_FORMAT and data.get("rules") == rules_signature:
+                self.files = data["files"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def get(self, path: str, st: os.stat_result):
+        """Cached entry if the file's stat is unchanged, else None."""
+        entry = self.files.get(path)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry
+        return None
+
+    def put(self, path: str, st: os.stat_result, digest: str, result: dict):
+        self.files[path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "hash": digest, "result": result}
+        self.dirty = True
+
+    def save(self, seen=()):
+        """Write the cache atomically, dropping entries for deleted files not in `seen`."""
+        seen = set(seen)
+        gone = [p for p in self.files if p not in seen and not os.path.exists(p)]
+        for p in gone: del self.files[p]
+        if not (self.dirty or gone):
+            return
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"format": CACHE_FORMAT, "rules": self.signature, "files": self.files},
+                               separators=(",", ":")))  # dumps() uses the C encoder, dump() doesn't
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+# ─── Linting ────────────────────────────────────────────────────────
+
+def _lint_file(path: str, known_hash: str | None, rule_classes) -> tuple[str, dict | None]:
+    """Worker: (digest, result dict), or (digest, None) when the bytes still hash to `known_hash`."""
+    with open(path, "rb") as f: data = f.read()
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    if digest == known_hash:
+        return digest, None
+    # Newlines normalised the way text-mode open() does, so CRLF files lint like single-file mode
+    text = data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+    return digest, result_to_dict(lint_markdown(text, rules=rule_classes))
+
+
+def _lint_chunk(jobs, rule_classes) -> list[tuple[str, dict | None]]:
+    return [_lint_file(path, known, rule_classes) for path, known in jobs]
+
+
+def lint_paths(paths, rules=None, disable=(), workers: int | None = 1,
+               cache_path: str | None = DEFAULT_CACHE) -> list[tuple[str, LintResult]]:
+    """Lint every markdown file under `paths`; returns (path, result) in discovery order.
+
+    `workers` > 1 (or None for one per CPU) fans uncached files out to a process pool;
+    `cache_path=None` disables the cache.
+    """
+    rule_classes = resolve(rules, disable)
+    files = discover(paths)
+    cache = LintCache(cache_path, signature(rule_classes)) if cache_path else None
+    results: dict[str, dict] = {}
+    todo, stats = [], {}
+    for path in files:
+        st = stats[path] = os.stat(path)
+        entry = cache.get(path, st) if cache else None
+        if entry: results[path] = entry["result"]
+        else: todo.append((path, cache.files.get(path, {}).get("hash") if cache else None))
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(todo) >= PARALLEL_MIN_FILES:
+        step = max(1, len(todo) // (workers * 8))
+        chunks = [todo[i:i + step] for i in range(0, len(todo), step)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = [out for part in pool.map(_lint_chunk, chunks, [rule_classes] * len(chunks)) for out in part]
+    else:
+        done = _lint_chunk(todo, rule_classes)
+
+    for (path, _known), (digest, result) in zip(todo, done):
+        if result is None: result = cache.files[path]["result"]  # touched, but same bytes
+        results[path] = result
+        if cache: cache.put(path, stats[path], digest, result)
+    if cache: cache.save(seen=files)
+    return [(path, result_from_dict(results[path])) for path in files]
+
+
+# ─── Reports ────────────────────────────────────────────────────────
+
+def format_text(results: list[tuple[str, LintResult]]) -> str:
+    lines = [f"{path}:{i.line}: {i.severity} [{i.rule}] {i.message}" for path, r in results for i in r.issues]
+    errors = sum(r.errors for _, r in results); warnings = sum(r.warnings for _, r in results)
+    emoji = "✅" if errors == 0 else "❌"
+    lines.append(f"{emoji} {len(results)} files | {errors} errors | {warnings} warnings")
+    return "\n".join(lines)
+
+
+def format_json(results: list[tuple[str, LintResult]]) -> str:
+    return json.dumps({"files": [{"path": path, **r.to_dict(), "issues": [vars(i) for i in r.issues]}
+                                 for path, r in results],
+                       "errors": sum(r.errors for _, r in results),
+                       "warnings": sum(r.warnings for _, r in results)}, indent=2)
+
+
+def format_sarif(results: list[tuple[str, LintResult]], rules=None, disable=()) -> str:
+    """SARIF 2.1.0 log with one run; file URIs are relative to the working directory."""
+    rule_classes = resolve(rules, disable)
+    index = {cls.id: n for n, cls in enumerate(rule_classes)}
+    sarif_results = []
+    for path, r in results:
+        uri = path if path == "-" else os.path.relpath(path).replace(os.sep, "/")
+        for i in r.issues:
+            entry = {"ruleId": i.rule, "level": "error" if i.severity == "error" else "warning",
+                     "message": {"text": i.message},
+                     "locations": [{"physicalLocation": {"artifactLocation": {"uri": uri},
+                                                         "region": {"startLine": max(i.line, 1)}}}]}
+            if i.rule in index: entry["ruleIndex"] = index[i.rule]
+            sarif_results.append(entry)
+    driver = {"name": "markdown-linter",
+              "rules": [{"id": cls.id, "shortDescription": {"text": cls.description},
+                         "defaultConfiguration": {"level": "error" if cls.severity == "error" else "warning"}}
+                        for cls in rule_classes]}
+    return json.dumps({"$schema": SARIF_SCHEMA, "version": "2.1.0",
+                       "runs": [{"tool": {"driver": driver}, "results": sarif_results}]}, indent=2)
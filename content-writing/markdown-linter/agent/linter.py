@@ -1,6 +1,5 @@
 """Markdown linter — check markdown files for common issues and best practices."""
 from __future__ import annotations
-import re
 from dataclasses import dataclass, field
 
 @dataclass
@@ -14,47 +13,27 @@ class LintResult:
     is_valid: bool = True
     def to_dict(self) -> dict: return {"warnings": self.warnings, "errors": self.errors, "total_lines": self.total_lines, "is_valid": self.is_valid}
 
-RULES = {
-    "no-trailing-spaces": "Trailing whitespace",
-    "no-multiple-blanks": "Multiple consecutive blank lines",
-    "heading-style": "Heading should have space after #",
-    "no-bare-urls": "Bare URL should be wrapped in angle brackets or markdown link",
-    "list-marker": "List items should use consistent markers",
-    "heading-increment": "Heading levels should not skip levels",
-    "no-duplicate-heading": "Duplicate heading detected",
-}
+from agent.rules import HEADING, REGISTRY, resolve
 
-def lint_markdown(text: str) -> LintResult:
+RULES = {rule_id: cls.description for rule_id, cls in REGISTRY.items()}
+RULES["list-marker"] = "List items should use consistent markers"  # listed since the first release, not checked yet
+
+def lint_markdown(text: str, rules=None, disable=()) -> LintResult:
+    """Lint one document. `rules`: rule ids or Rule classes (default: every registered rule)."""
     r = LintResult()
     lines = text.split("\n")
     r.total_lines = len(lines)
-    prev_blank = False; headings = []; heading_levels = []; heading_texts = []
+    rule_set = [cls() for cls in resolve(rules, disable)]
+    line_checks = [rule.check for rule in rule_set if not rule.headings_only]
+    all_checks = [rule.check for rule in rule_set]
+    issues = r.issues
     for i, line in enumerate(lines, 1):
-        # Trailing spaces
-        if line.rstrip("\n") != line.rstrip():
-            r.issues.append(LintIssue(i, "no-trailing-spaces", "Trailing whitespace", "warning"))
-        # Multiple blank lines
-        is_blank = not line.strip()
-        if is_blank and prev_blank:
-            r.issues.append(LintIssue(i, "no-multiple-blanks", "Multiple consecutive blank lines", "warning"))
-        prev_blank = is_blank
-        # Heading style: #text without space
-        m = re.match(r'^(#{1,6})([^\s#])', line)
-        if m:
-            r.issues.append(LintIssue(i, "heading-style", f"Missing space after {m.group(1)}", "error"))
-        # Heading increment
-        hm = re.match(r'^(#{1,6})\s+(.+)', line)
-        if hm:
-            level = len(hm.group(1)); text_h = hm.group(2).lower()
-            if heading_levels and level > heading_levels[-1] + 1:
-                r.issues.append(LintIssue(i, "heading-increment", f"Heading skipped from h{heading_levels[-1]} to h{level}", "warning"))
-            heading_levels.append(level)
-            if text_h in heading_texts:
-                r.issues.append(LintIssue(i, "no-duplicate-heading", f"Duplicate heading: {hm.group(2)}", "warning"))
-            heading_texts.append(text_h)
-        # Bare URLs
-        if re.search(r'(?<!\[)\bhttps?://\S+(?!\])', line) and not re.search(r'^\s*[-*]?\s*https?://', line):
-            r.issues.append(LintIssue(i, "no-bare-urls", "Bare URL found", "warning"))
+        hm = HEADING.match(line) if line.startswith("#") else None
+        if hm: heading, checks = (len(hm.group(1)), hm.group(2)), all_checks
+        else: heading, checks = None, line_checks
+        for check in checks:
+            issue = check(i, line, heading)
+            if issue is not None: issues.append(issue)
     r.warnings = sum(1 for i in r.issues if i.severity == "warning")
     r.errors = sum(1 for i in r.issues if i.severity == "error")
     r.is_valid = r.errors == 0
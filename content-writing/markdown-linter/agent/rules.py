@@ -0,0 +1,128 @@
+"""Lint rules — a registry of line-oriented checks with precompiled patterns.
+
+A rule is a class with an `id`, a `description`, a `severity` and a `check` method
+called once per line that returns a LintIssue or None; a fresh instance is created for every document, so rules can
+keep per-document state on `self`. Rules with `headings_only = True` are only called
+for ATX heading lines. Register custom rules with `@register`; bump
+`version` when a rule's behaviour changes so cached results are invalidated.
+
+    @register
+    class NoTabs(Rule):
+        id = "no-tabs"; description = "Hard tab character"
+        def check(self, lineno, line, heading):
+            if "\\t" in line: return self.issue(lineno, "Hard tab")
+"""
+from __future__ import annotations
+import re
+from typing import Optional
+
+HEADING = re.compile(r'^(#{1,6})\s+(.+)')
+_HEADING_NO_SPACE = re.compile(r'^(#{1,6})([^\s#])')
+_BARE_URL = re.compile(r'(?<!\[)\bhttps?://\S+(?!\])')
+_URL_LIST_ITEM = re.compile(r'^\s*[-*]?\s*https?://')
+
+REGISTRY: dict[str, type["Rule"]] = {}
+
+
+def register(cls: type["Rule"]) -> type["Rule"]:
+    """Class decorator adding a rule to the default rule set (registration order = report order)."""
+    if not cls.id:
+        raise ValueError(f"{cls.__name__} has no rule id")
+    REGISTRY[cls.id] = cls
+    return cls
+
+
+class Rule:
+    id = ""
+    description = ""
+    severity = "warning"
+    version = 1
+    headings_only = False
+
+    def check(self, lineno: int, line: str, heading: Optional[tuple[int, str]]):
+        """Issue for one line, or None; `heading` is (level, text) for ATX headings, else None."""
+        return None
+
+    def issue(self, lineno: int, message: str):
+        from agent.linter import LintIssue
+        return LintIssue(lineno, self.id, message, self.severity)
+
+
+@register
+class TrailingSpaces(Rule):
+    id = "no-trailing-spaces"; description = "Trailing whitespace"
+
+    def check(self, lineno, line, heading):
+        if line and line[-1].isspace():
+            return self.issue(lineno, "Trailing whitespace")
+
+
+@register
+class MultipleBlanks(Rule):
+    id = "no-multiple-blanks"; description = "Multiple consecutive blank lines"
+
+    def __init__(self):
+        self.prev_blank = False
+
+    def check(self, lineno, line, heading):
+        is_blank = not line or line.isspace()
+        was_blank, self.prev_blank = self.prev_blank, is_blank
+        if is_blank and was_blank:
+            return self.issue(lineno, "Multiple consecutive blank lines")
+
+
+@register
+class HeadingStyle(Rule):
+    id = "heading-style"; description = "Heading should have space after #"; severity = "error"
+
+    def check(self, lineno, line, heading):
+        if line.startswith("#") and (m := _HEADING_NO_SPACE.match(line)):
+            return self.issue(lineno, f"Missing space after {m.group(1)}")
+
+
+@register
+class HeadingIncrement(Rule):
+    id = "heading-increment"; description = "Heading levels should not skip levels"; headings_only = True
+
+    def __init__(self):
+        self.last_level = 0
+
+    def check(self, lineno, line, heading):
+        level, last = heading[0], self.last_level
+        self.last_level = level
+        if last and level > last + 1:
+            return self.issue(lineno, f"Heading skipped from h{last} to h{level}")
+
+
+@register
+class DuplicateHeading(Rule):
+    id = "no-duplicate-heading"; description = "Duplicate heading detected"; headings_only = True
+
+    def __init__(self):
+        self.seen: set[str] = set()
+
+    def check(self, lineno, line, heading):
+        key = heading[1].lower()
+        if key in self.seen:
+            return self.issue(lineno, f"Duplicate heading: {heading[1]}")
+        self.seen.add(key)
+
+
+@register
+class BareUrls(Rule):
+    id = "no-bare-urls"; description = "Bare URL should be wrapped in angle brackets or markdown link"
+
+    def check(self, lineno, line, heading):
+        if "http" in line and _BARE_URL.search(line) and not _URL_LIST_ITEM.match(line):
+            return self.issue(lineno, "Bare URL found")
+
+
+def resolve(rules=None, disable=()) -> list[type[Rule]]:
+    """Rule classes to run: ids or classes from `rules` (default: all registered), minus `disable`."""
+    selected = list(REGISTRY.values()) if rules is None else [REGISTRY[r] if isinstance(r, str) else r for r in rules]
+    return [cls for cls in selected if cls.id not in set(disable)]
+
+
+def signature(rule_classes) -> str:
+    """Stable description of a rule set, used as part of the cache key."""
+    return ",".join(f"{cls.id}@{cls.version}" for cls in rule_classes)
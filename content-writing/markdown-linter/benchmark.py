@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Benchmark multi-file linting on a generated docs tree: one-at-a-time, batch (cold), batch with a warm cache."""
+import argparse, os, random, sys, tempfile, time  # pragma: no cover
+sys.path.append(os.path.dirname(__file__))  # pragma: no cover
+from agent.linter import lint_markdown  # pragma: no cover
+from agent.batch import discover, lint_paths  # pragma: no cover
+
+WORDS = "the linter checks headings links lists code blocks and trailing whitespace in every document".split()  # pragma: no cover
+
+def make_doc(rng: random.Random) -> str:  # pragma: no cover
+    lines = []  # pragma: no cover
+    for s in range(rng.randint(3, 12)):  # pragma: no cover
+        lines += [f"{'#' * rng.choice([1, 2, 2, 3])} Section {s} {rng.choice(WORDS)}", ""]  # pragma: no cover
+        for _ in range(rng.randint(2, 8)):  # pragma: no cover
+            line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 16)))  # pragma: no cover
+            if rng.random() < 0.05: line += "  "  # pragma: no cover
+            if rng.random() < 0.05: line += " see https://example.com/docs"  # pragma: no cover
+            lines.append(line)  # pragma: no cover
+        lines.append("")  # pragma: no cover
+    return "\n".join(lines)  # pragma: no cover
+
+def main():  # pragma: no cover
+    p = argparse.ArgumentParser(description="Benchmark batch markdown linting")  # pragma: no cover
+    p.add_argument("--files", type=int, default=8000)  # pragma: no cover
+    p.add_argument("--workers", type=int, default=0, help="Processes for the batch run (0 = one per CPU)")  # pragma: no cover
+    args = p.parse_args()  # pragma: no cover
+    rng = random.Random(3)  # pragma: no cover
+    with tempfile.TemporaryDirectory() as root:  # pragma: no cover
+        for n in range(args.files):  # pragma: no cover
+            d = os.path.join(root, f"section{n % 40}")  # pragma: no cover
+            os.makedirs(d, exist_ok=True)  # pragma: no cover
+            with open(os.path.join(d, f"page{n}.md"), "w") as f: f.write(make_doc(rng))  # pragma: no cover
+        cache = os.path.join(root, ".mdlint_cache.json")  # pragma: no cover
+        print(f"📊 {args.files:,} markdown files, {os.cpu_count()} CPU(s)")  # pragma: no cover
+
+        t0 = time.perf_counter()  # pragma: no cover
+        for path in discover([root]):  # pragma: no cover
+            lint_markdown(open(path).read())  # pragma: no cover
+        base = time.perf_counter() - t0  # pragma: no cover
+        print(f"  one file at a time     {base:8.2f} s")  # pragma: no cover
+        for label in ("batch, cold cache", "batch, warm cache"):  # pragma: no cover
+            t0 = time.perf_counter()  # pragma: no cover
+            lint_paths([root], workers=args.workers, cache_path=cache)  # pragma: no cover
+            elapsed = time.perf_counter() - t0  # pragma: no cover
+            print(f"  {label:<22} {elapsed:8.2f} s  ({base / elapsed:.1f}x)")  # pragma: no cover
+        for path in discover([root])[::100]:  # pragma: no cover
+            with open(path, "a") as f: f.write("\nedited\n")  # pragma: no cover
+        t0 = time.perf_counter()  # pragma: no cover
+        lint_paths([root], workers=args.workers, cache_path=cache)  # pragma: no cover
+        elapsed = time.perf_counter() - t0  # pragma: no cover
+        print(f"  {'batch, 1% edited':<22} {elapsed:8.2f} s  ({base / elapsed:.1f}x)")  # pragma: no cover
+
+if __name__ == "__main__": main()  # pragma: no cover
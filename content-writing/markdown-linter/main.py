@@ -1,12 +1,29 @@
 #!/usr/bin/env python3
-import argparse, sys, os
+import argparse, sys, os, glob
 sys.path.append(os.path.dirname(__file__))
 from agent.linter import lint_markdown, format_result_markdown
 def cmd_lint(args):
-    text = sys.stdin.read() if args.file == "-" else open(args.file).read()
-    print(format_result_markdown(lint_markdown(text)))
+    disable = [r.strip() for d in args.disable for r in d.split(",") if r.strip()]
+    single = len(args.files) == 1 and not os.path.isdir(args.files[0]) and not glob.has_magic(args.files[0])
+    if single and args.format == "text":
+        text = sys.stdin.read() if args.files[0] == "-" else open(args.files[0]).read()
+        print(format_result_markdown(lint_markdown(text, disable=disable))); return
+    from agent.batch import lint_paths, format_text, format_json, format_sarif
+    if args.files == ["-"]: results = [("-", lint_markdown(sys.stdin.read(), disable=disable))]
+    else: results = lint_paths(args.files, disable=disable, workers=args.jobs, cache_path=None if args.no_cache else args.cache)
+    if args.format == "sarif": print(format_sarif(results, disable=disable))
+    elif args.format == "json": print(format_json(results))
+    else: print(format_text(results))
+    if any(r.errors for _, r in results): sys.exit(1)
 def main():
     p = argparse.ArgumentParser(description="Markdown Linter"); s = p.add_subparsers(dest="command", required=True)
-    l = s.add_parser("lint"); l.add_argument("file", nargs="?", default="-"); l.set_defaults(func=cmd_lint)
+    l = s.add_parser("lint", help="Lint a file, stdin (-), directories or glob patterns")
+    l.add_argument("files", nargs="*", default=["-"], help="Files, directories or globs (default: stdin)")
+    l.add_argument("--format", choices=["text", "json", "sarif"], default="text")
+    l.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes for multi-file runs (0 = one per CPU)")
+    l.add_argument("--cache", default=".mdlint_cache.json", help="Result cache file for multi-file runs")
+    l.add_argument("--no-cache", action="store_true", help="Lint every file even if unchanged")
+    l.add_argument("--disable", action="append", default=[], metavar="RULE", help="Rule id(s) to skip, comma-separated")
+    l.set_defaults(func=cmd_lint)
     args = p.parse_args(); args.func(args)
 if __name__ == "__main__": main()
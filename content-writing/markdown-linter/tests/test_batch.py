@@ -0,0 +1,126 @@
+"""Tests for the rule registry and multi-file batch linting."""
+import sys, os, json, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from agent import rules
+from agent.linter import lint_markdown
+from agent.rules import REGISTRY, Rule, register, resolve, signature
+from agent.batch import discover, lint_paths, format_json, format_sarif, format_text, LintCache
+
+BAD = "#Bad\n\ntext  \n"
+GOOD = "# Good\n\nText.\n"
+
+@pytest.fixture
+def docs(tmp_path):
+    (tmp_path / "a.md").write_text(BAD)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.markdown").write_text(GOOD)
+    (tmp_path / "sub" / "notes.txt").write_text(BAD)
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.md").write_text(BAD)
+    return tmp_path
+
+@pytest.fixture
+def no_tabs():
+    @register
+    class NoTabs(Rule):
+        id = "no-tabs"; description = "Hard tab character"
+        def check(self, lineno, line, heading):
+            if "\t" in line: return self.issue(lineno, "Hard tab")
+    yield NoTabs
+    del REGISTRY["no-tabs"]
+
+def test_registry_order(): assert list(REGISTRY)[:2] == ["no-trailing-spaces", "no-multiple-blanks"]
+def test_resolve_disable(): assert "heading-style" not in [c.id for c in resolve(disable=["heading-style"])]
+def test_resolve_by_id(): assert resolve(["no-bare-urls"]) == [rules.BareUrls]
+def test_disable_in_lint(): assert lint_markdown(BAD, disable=["heading-style"]).is_valid
+def test_signature_tracks_version(monkeypatch):
+    before = signature(resolve()); monkeypatch.setattr(rules.BareUrls, "version", 2)
+    assert signature(resolve()) != before
+def test_custom_rule(no_tabs): assert [i.rule for i in lint_markdown("a\tb").issues] == ["no-tabs"]
+def test_register_requires_id():
+    with pytest.raises(ValueError): register(type("Nameless", (Rule,), {}))
+def test_duplicate_headings_case_insensitive():
+    r = lint_markdown("# A\n\n## Setup\n\n## setup\n"); assert [i.line for i in r.issues] == [5]
+
+def test_discover_dir(docs):
+    assert sorted(os.path.relpath(p, docs) for p in discover([str(docs)])) == ["a.md", os.path.join("sub", "b.markdown")]
+def test_discover_glob(docs): assert [os.path.basename(p) for p in discover([str(docs / "**" / "*.markdown")])] == ["b.markdown"]
+def test_discover_dedupes(docs): assert len(discover([str(docs / "a.md"), str(docs)])) == 2
+
+def test_crlf_matches_single_file_mode(tmp_path):
+    text = "# Title\n\nSome text.\n\n## Section\n\nMore text.  \n"
+    (tmp_path / "crlf.md").write_bytes(text.replace("\n", "\r\n").encode())
+    (tmp_path / "cr.md").write_bytes(text.replace("\n", "\r").encode())
+    expected = lint_markdown(text)
+    for path, r in lint_paths([str(tmp_path)], cache_path=None):
+        assert (r.warnings, r.errors, r.total_lines) == (expected.warnings, expected.errors, expected.total_lines) == (1, 0, 8)
+        assert [(i.line, i.rule) for i in r.issues] == [(7, "no-trailing-spaces")]
+
+def test_lint_paths(docs):
+    out = dict(lint_paths([str(docs)], cache_path=None))
+    assert out[str(docs / "a.md")].errors == 1 and out[str(docs / "sub" / "b.markdown")].is_valid
+
+def test_lint_paths_parallel(docs, monkeypatch):
+    import agent.batch as batch
+    monkeypatch.setattr(batch, "PARALLEL_MIN_FILES", 1)
+    serial = lint_paths([str(docs)], cache_path=None)
+    parallel = lint_paths([str(docs)], cache_path=None, workers=2)
+    assert [(p, r.to_dict()) for p, r in serial] == [(p, r.to_dict()) for p, r in parallel]
+
+def test_cache_skips_unchanged(docs, monkeypatch):
+    import agent.batch as batch
+    cache = str(docs / "cache.json")
+    first = lint_paths([str(docs)], cache_path=cache)
+    calls = []
+    monkeypatch.setattr(batch, "lint_markdown", lambda *a, **k: calls.append(a) or lint_markdown(*a, **k))
+    second = lint_paths([str(docs)], cache_path=cache)
+    assert calls == [] and [r.to_dict() for _, r in first] == [r.to_dict() for _, r in second]
+    assert [vars(i) for i in first[0][1].issues] == [vars(i) for i in second[0][1].issues]
+
+def test_cache_relints_changed(docs):
+    cache = str(docs / "cache.json")
+    lint_paths([str(docs)], cache_path=cache)
+    (docs / "a.md").write_text(GOOD + "\n")
+    assert all(r.is_valid for _, r in lint_paths([str(docs)], cache_path=cache))
+
+def test_cache_hash_hit_after_touch(docs, monkeypatch):
+    import agent.batch as batch
+    cache = str(docs / "cache.json")
+    lint_paths([str(docs)], cache_path=cache)
+    st = os.stat(docs / "a.md"); os.utime(docs / "a.md", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    monkeypatch.setattr(batch, "lint_markdown", lambda *a, **k: pytest.fail("relinted an unchanged file"))
+    assert lint_paths([str(docs)], cache_path=cache)[0][1].errors == 1
+
+def test_cache_invalidated_by_rules(docs):
+    cache = str(docs / "cache.json")
+    lint_paths([str(docs)], cache_path=cache)
+    assert LintCache(cache, signature(resolve(disable=["heading-style"]))).files == {}
+    assert lint_paths([str(docs)], disable=["heading-style"], cache_path=cache)[0][1].is_valid
+
+def test_cache_drops_deleted(docs):
+    cache = str(docs / "cache.json")
+    lint_paths([str(docs)], cache_path=cache)
+    (docs / "a.md").unlink()
+    lint_paths([str(docs)], cache_path=cache)
+    assert list(LintCache(cache, signature(resolve())).files) == [str(docs / "sub" / "b.markdown")]
+
+def test_corrupt_cache_ignored(docs):
+    (docs / "cache.json").write_text("{not json")
+    assert len(lint_paths([str(docs)], cache_path=str(docs / "cache.json"))) == 2
+
+def test_format_text(docs):
+    out = format_text(lint_paths([str(docs)], cache_path=None))
+    assert "a.md:1: error [heading-style]" in out and out.endswith("2 files | 1 errors | 1 warnings")
+
+def test_format_json(docs):
+    data = json.loads(format_json(lint_paths([str(docs)], cache_path=None)))
+    assert data["errors"] == 1 and data["files"][0]["issues"][0]["rule"] == "heading-style"
+
+def test_format_sarif(docs):
+    log = json.loads(format_sarif(lint_paths([str(docs)], cache_path=None)))
+    run = log["runs"][0]
+    assert log["version"] == "2.1.0" and run["tool"]["driver"]["name"] == "markdown-linter"
+    first = run["results"][0]
+    assert first["ruleId"] == "heading-style" and first["level"] == "error"
+    assert run["tool"]["driver"]["rules"][first["ruleIndex"]]["id"] == "heading-style"
+    assert first["locations"][0]["physicalLocation"]["region"]["startLine"] == 1
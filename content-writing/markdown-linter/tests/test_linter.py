@@ -2,6 +2,7 @@
 import sys, os, pytest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from agent.linter import lint_markdown, get_issues_by_rule, format_result_markdown, RULES
+from agent.rules import Rule
 
 CLEAN = "# Title\n\n## Section\n\nSome text here.\n"
 TRAILING = "# Title  \n\n## Section\n"
@@ -25,5 +26,7 @@ def test_by_rule(): d = get_issues_by_rule(lint_markdown(TRAILING)); assert "no-
 def test_empty(): r = lint_markdown(""); assert r.total_lines >= 0
 def test_warnings_count(): r = lint_markdown(TRAILING + BLANK); assert isinstance(r.warnings, int)
 def test_rules(): assert len(RULES) >= 5
+def test_rules_public_keys(): assert {"no-trailing-spaces", "list-marker", "no-duplicate-heading"} <= set(RULES)
 def test_format(): md = format_result_markdown(lint_markdown(CLEAN)); assert "Markdown Lint" in md
 def test_to_dict(): d = lint_markdown(CLEAN).to_dict(); assert "is_valid" in d
+def test_base_rule_reports_nothing(): assert Rule().check(1, "anything  ", None) is None
@@ -43,3 +43,21 @@ def test_main_block():
             runpy.run_path(os.path.join(os.path.dirname(__file__), "..", "main.py"), run_name="__main__")
         except SystemExit as e:
             assert e.code == 0
+
+def test_main_lint_directory_json(tmp_path, capsys):
+    (tmp_path / "a.md").write_text("#Bad\n")
+    (tmp_path / "b.md").write_text("# Good\n")
+    import main, json
+    with patch.object(sys, 'argv', ['main.py', 'lint', str(tmp_path), '--format', 'json', '--no-cache']):
+        with pytest.raises(SystemExit) as e:
+            main.main()
+    assert e.value.code == 1
+    assert json.loads(capsys.readouterr().out)["errors"] == 1
+
+def test_main_lint_directory_disable(tmp_path, capsys):
+    (tmp_path / "a.md").write_text("#Bad\n")
+    import main
+    with patch.object(sys, 'argv', ['main.py', 'lint', str(tmp_path), '--disable', 'heading-style', '--cache', str(tmp_path / "c.json")]):
+        main.main()
+    assert "1 files | 0 errors" in capsys.readouterr().out
+    assert (tmp_path / "c.json").exists()
@@ -0,0 +1,164 @@
+"""
+Single-pass SEO page auditor — one left-to-right traversal collects every signal.
+
+Feed the page in any number of chunks (e.g. straight from a socket or file) and
+call `close()`; nothing is re-scanned, and only the signals themselves are kept.
+"""
+from __future__ import annotations
+import re
+from dataclasses import dataclass, asdict
+from html import unescape
+
+
+@dataclass
+class PageAudit:
+    source: str = ""
+    title: str | None = None
+    description: str | None = None
+    h1_count: int = 0
+    images: int = 0
+    images_missing_alt: int = 0
+    canonical: str | None = None
+    status: int | None = None  # HTTP status when crawled
+    error: str = ""
+
+    def checks(self) -> list[str]:
+        """Human-readable check lines, in report order."""
+        if self.error:
+            return [f"❌ {self.error}"]
+        out = []
+        if self.title is not None:
+            t = self.title.strip()
+            if 10 <= len(t) <= 60:
+                out.append(f"✅ Title ({len(t)} chars): {t[:60]}")
+            else:
+                out.append(f"⚠️  Title length {len(t)} (ideal 10-60): {t[:60]}")
+        else:
+            out.append("❌ Missing <title> tag")
+        if self.description is not None:
+            n = len(self.description)
+            out.append(f"✅ Meta description ({n} chars)" if 50 <= n <= 160
+                       else f"⚠️  Meta description length {n} (ideal: 50-160)")
+        else:
+            out.append("❌ Missing meta description")
+        if self.h1_count == 1:
+            out.append("✅ Single <h1> tag")
+        elif self.h1_count == 0:
+            out.append("❌ No <h1> tag found")
+        else:
+            out.append(f"⚠️  Multiple <h1> tags ({self.h1_count}) — use only one")
+        if self.images_missing_alt:
+            out.append(f"⚠️  {self.images_missing_alt} image(s) missing alt text")
+        elif self.images:
+            out.append(f"✅ All {self.images} image(s) have alt text")
+        if self.canonical is not None:
+            out.append("✅ Canonical URL present")
+        else:
+            out.append("ℹ️  No canonical URL — recommended for avoiding duplicate content")
+        return out
+
+    def problems(self) -> list[str]:
+        """Short keys for every failed check (used for site-wide tallies)."""
+        if self.error:
+            return ["fetch-error"]
+        out = []
+        if self.title is None: out.append("missing-title")
+        elif not 10 <= len(self.title.strip()) <= 60: out.append("title-length")
+        if self.description is None: out.append("missing-description")
+        elif not 50 <= len(self.description) <= 160: out.append("description-length")
+        if self.h1_count == 0: out.append("missing-h1")
+        elif self.h1_count > 1: out.append("multiple-h1")
+        if self.images_missing_alt: out.append("missing-alt")
+        if self.canonical is None: out.append("missing-canonical")
+        return out
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "problems": self.problems()}
+
+
+_RAW_TEXT = ("script", "style", "textarea", "title")  # content is text, not markup
+_EVENTS = ("meta", "h1", "img", "link")  # start tags whose attributes the audit reads
+# "<!--", or a start tag of interest: group 1 = name, group 2 = attribute text (None if the ">" hasn't arrived).
+# Matched against a lowercased copy of the input, since case-insensitive matching is several times slower.
+_SCAN_PATTERN = r"""<(?:!--|(%s)(?=[\s/>])(?:((?:[^>"']|"[^"]*"|'[^']*')*)>|))""" % "|".join(_RAW_TEXT + _EVENTS)
+_SCAN = re.compile(_SCAN_PATTERN)
+_SCAN_ANY_CASE = re.compile(_SCAN_PATTERN, re.IGNORECASE)  # when lowercasing changes the length (e.g. "İ")
+_ATTR = re.compile(r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+_RAW_END = {tag: re.compile(f"</{tag}\\s*>") for tag in _RAW_TEXT}
+_RAW_END_ANY_CASE = {tag: re.compile(f"</{tag}\\s*>", re.IGNORECASE) for tag in _RAW_TEXT}
+_CARRY = 16  # enough to hold a tag name split across two chunks
+
+
+class SEOParser:
+    """Event handlers that fill a PageAudit as the document streams past.
+
+    A selective tokenizer drives the handlers: one compiled pattern jumps straight
+    to the next tag the audit cares about, comments and script/style bodies are
+    skipped whole, and attributes are only parsed for those tags — everything else
+    is never looked at in Python. Attribute values reach `handle_starttag` still
+    entity-escaped; handlers unescape the few they keep.
+    """
+
+    def __init__(self, source: str = ""):
+        self.audit = PageAudit(source=source)
+        self._buf = ""
+
+    def feed(self, data: str):
+        buf = self._buf + data if self._buf else data
+        self._buf = buf[self._scan(buf):]
+
+    def close(self) -> PageAudit:
+        self._buf = ""  # an unterminated <title>, comment or tag is ignored
+        return self.audit
+
+    def _scan(self, buf: str) -> int:
+        """Handle every complete construct in `buf`; returns the offset to carry into the next feed."""
+        low = buf.lower()
+        if len(low) == len(buf): scan, raw_end = _SCAN, _RAW_END
+        else: low, scan, raw_end = buf, _SCAN_ANY_CASE, _RAW_END_ANY_CASE
+        pos = 0
+        while m := scan.search(low, pos):
+            tag = m.group(1)
+            if tag is None:  # comment
+                end = low.find("-->", m.end())
+                if end < 0: return m.start()
+                pos = end + 3; continue
+            if m.group(2) is None: return m.start()
+            tag = tag.lower()
+            if tag in raw_end:
+                close = raw_end[tag].search(low, m.end())
+                if close is None: return m.start()
+                if tag == "title": self.handle_title(unescape(buf[m.end():close.start()]))
+                pos = close.end(); continue
+            attrs = _ATTR.findall(buf, m.start(2), m.end(2))
+            self.handle_starttag(tag, [(k.lower(), v1 or v2 or v3) for k, v1, v2, v3 in attrs])
+            pos = m.end()
+        return max(pos, len(buf) - _CARRY)
+
+    def handle_title(self, text: str):
+        if self.audit.title is None: self.audit.title = text
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str]]):
+        a = self.audit
+        if tag == "img":
+            a.images += 1
+            if not any(name == "alt" for name, _ in attrs): a.images_missing_alt += 1
+        elif tag == "h1":
+            a.h1_count += 1
+        elif tag == "meta":
+            if a.description is None:
+                d = dict(attrs)
+                if (d.get("name") or "").lower() == "description": a.description = unescape(d.get("content") or "")
+        elif tag == "link" and a.canonical is None:
+            d = dict(attrs)
+            if "canonical" in (d.get("rel") or "").lower().split(): a.canonical = unescape(d.get("href") or "")
+
+
+def audit_page(html, source: str = "input") -> PageAudit:
+    """Audit a page given as a string or an iterable of string chunks."""
+    parser = SEOParser(source)
+    if isinstance(html, str):
+        parser.feed(html)
+    else:
+        for chunk in html: parser.feed(chunk)
+    return parser.close()
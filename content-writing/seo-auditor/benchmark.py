@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark: crawl a generated site served locally (with simulated latency) vs. the old one-page-at-a-time audit."""
+import argparse, asyncio, os, random, re, subprocess, sys, tempfile, time  # pragma: no cover
+from urllib.request import urlopen, Request  # pragma: no cover
+sys.path.append(os.path.dirname(__file__))  # pragma: no cover
+from auditor import audit_page  # pragma: no cover
+from crawler import crawl, sitemap_urls  # pragma: no cover
+
+WORDS = "seo audit page content widget gadget product review guide price shipping store".split()  # pragma: no cover
+
+def make_page(n: int, rng: random.Random) -> str:  # pragma: no cover
+    alt = lambda: " alt='x'" if rng.random() < 0.9 else ""  # pragma: no cover
+    cards = "".join(f"<div class='card'><a href='/p/{rng.randint(1, 9999)}'>{' '.join(rng.choices(WORDS, k=8))}</a>"  # pragma: no cover
+                    f"<p>{' '.join(rng.choices(WORDS, k=40))}</p><img src='/i/{i}.png'{alt()}></div>"
+                    for i in range(rng.randint(20, 60)))
+    return (f"<!doctype html><html><head><title>{' '.join(rng.choices(WORDS, k=rng.randint(2, 9)))} {n}</title>"  # pragma: no cover
+            f"<meta name='description' content='{' '.join(rng.choices(WORDS, k=rng.randint(4, 20)))}'>"
+            f"<link rel='canonical' href='/page/{n}.html'><script>window.dataLayer = []; if (a < b) {{}}</script></head>"
+            f"<body><h1>Page {n}</h1>{cards}</body></html>")
+
+def serve(root: str, port: int, latency: float):  # pragma: no cover
+    """Subprocess entry point: HTTP/1.1 static server that sleeps `latency` seconds per request."""
+    from functools import partial  # pragma: no cover
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer  # pragma: no cover
+    class Handler(SimpleHTTPRequestHandler):  # pragma: no cover
+        protocol_version = "HTTP/1.1"  # pragma: no cover
+        def do_GET(self):  # pragma: no cover
+            time.sleep(latency); super().do_GET()  # pragma: no cover
+        def log_message(self, *args): pass  # pragma: no cover
+    ThreadingHTTPServer.request_queue_size = 1024  # pragma: no cover
+    ThreadingHTTPServer(("127.0.0.1", port), partial(Handler, directory=root)).serve_forever()  # pragma: no cover
+
+def audit_regex(html: str):  # pragma: no cover
+    """The five re.findall/DOTALL passes audit_html used before the single-pass parser."""
+    re.findall(r"<title[^>]*>(.*?)</title>", html, re.IGNORECASE | re.DOTALL)  # pragma: no cover
+    re.findall(r'<meta\s+name=["\']description["\']\s+content=["\'](.*?)["\']', html, re.IGNORECASE)  # pragma: no cover
+    re.findall(r"<h1[^>]*>.*?</h1>", html, re.IGNORECASE | re.DOTALL)  # pragma: no cover
+    [img for img in re.findall(r"<img[^>]+>", html, re.IGNORECASE) if "alt=" not in img.lower()]  # pragma: no cover
+    re.search(r'rel=["\']canonical["\']', html, re.IGNORECASE)  # pragma: no cover
+
+def main():  # pragma: no cover
+    p = argparse.ArgumentParser(description="Benchmark the concurrent SEO crawl")  # pragma: no cover
+    p.add_argument("--pages", type=int, default=2000)  # pragma: no cover
+    p.add_argument("--latency", type=float, default=50, help="Simulated server latency per request (ms)")  # pragma: no cover
+    p.add_argument("--concurrency", type=int, default=50)  # pragma: no cover
+    p.add_argument("--sequential-sample", type=int, default=100, help="Pages fetched one at a time, then extrapolated")  # pragma: no cover
+    p.add_argument("--serve", nargs=3, metavar=("ROOT", "PORT", "LATENCY"), help=argparse.SUPPRESS)  # pragma: no cover
+    args = p.parse_args()  # pragma: no cover
+    if args.serve:  # pragma: no cover
+        return serve(args.serve[0], int(args.serve[1]), float(args.serve[2]))  # pragma: no cover
+
+    rng = random.Random(5)  # pragma: no cover
+    with tempfile.TemporaryDirectory() as root:  # pragma: no cover
+        os.makedirs(os.path.join(root, "page"))  # pragma: no cover
+        pages = [make_page(n, rng) for n in range(args.pages)]  # pragma: no cover
+        for n, html in enumerate(pages):  # pragma: no cover
+            with open(os.path.join(root, "page", f"{n}.html"), "w") as f: f.write(html)  # pragma: no cover
+        port = 8000 + rng.randint(1000, 9000)  # pragma: no cover
+        base = f"http://127.0.0.1:{port}"  # pragma: no cover
+        with open(os.path.join(root, "sitemap.xml"), "w") as f:  # pragma: no cover
+            f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'  # pragma: no cover
+                    + "".join(f"<url><loc>{base}/page/{n}.html</loc></url>" for n in range(args.pages)) + "</urlset>")
+        server = subprocess.Popen([sys.executable, __file__, "--serve", root, str(port), str(args.latency / 1000)])  # pragma: no cover
+        try:  # pragma: no cover
+            for _ in range(100):  # pragma: no cover
+                try: urlopen(f"{base}/sitemap.xml", timeout=1).read(); break  # pragma: no cover
+                except OSError: time.sleep(0.05)  # pragma: no cover
+            size = sum(map(len, pages)) / len(pages)  # pragma: no cover
+            print(f"📊 {args.pages:,} pages (~{size / 1024:.0f} KB each), {args.latency:g} ms simulated latency")  # pragma: no cover
+
+            t0 = time.perf_counter()  # pragma: no cover
+            for html in pages: audit_regex(html)  # pragma: no cover
+            regex = (time.perf_counter() - t0) / len(pages)  # pragma: no cover
+            t0 = time.perf_counter()  # pragma: no cover
+            for html in pages: audit_page(html)  # pragma: no cover
+            single = (time.perf_counter() - t0) / len(pages)  # pragma: no cover
+            print(f"  parse only: regex passes {regex * 1000:.2f} ms/page, single-pass parser {single * 1000:.2f} ms/page")  # pragma: no cover
+
+            sample = [f"{base}/page/{n}.html" for n in range(min(args.sequential_sample, args.pages))]  # pragma: no cover
+            t0 = time.perf_counter()  # pragma: no cover
+            for url in sample:  # pragma: no cover
+                audit_regex(urlopen(Request(url, headers={"User-Agent": "SEO-Auditor/1.0"}), timeout=10).read().decode())  # pragma: no cover
+            sequential = (time.perf_counter() - t0) / len(sample) * args.pages  # pragma: no cover
+            print(f"  one page at a time     {sequential:8.2f} s  (extrapolated from {len(sample)} pages)")  # pragma: no cover
+
+            t0 = time.perf_counter()  # pragma: no cover
+            urls = asyncio.run(sitemap_urls(f"{base}/sitemap.xml"))  # pragma: no cover
+            audits = asyncio.run(crawl(urls, concurrency=args.concurrency))  # pragma: no cover
+            elapsed = time.perf_counter() - t0  # pragma: no cover
+            assert len(audits) == args.pages and not any(a.error for a in audits)  # pragma: no cover
+            print(f"  crawl, {args.concurrency:>3} concurrent   {elapsed:8.2f} s  ({args.pages / elapsed:,.0f} pages/s, {sequential / elapsed:.0f}x)")  # pragma: no cover
+        finally:
+            server.terminate(); server.wait()  # pragma: no cover
+
+if __name__ == "__main__": main()  # pragma: no cover
@@ -0,0 +1,309 @@
+"""
+Concurrent site crawl — audit every page of a sitemap or a directory of saved pages.
+
+Pages are fetched by a small asyncio HTTP/1.1 client (keep-alive connections per
+host, Content-Length and chunked bodies, redirects) and fed to the parser as the
+bytes arrive, so at most `concurrency` pages are in flight and no page is held in
+memory whole. Saved pages are read in chunks the same way.
+"""
+from __future__ import annotations
+import asyncio, codecs, os, re, ssl
+import xml.etree.ElementTree as ET
+from collections import Counter, defaultdict
+from urllib.parse import urljoin, urlsplit
+
+from auditor import PageAudit, SEOParser
+
+USER_AGENT = "SEO-Auditor/1.0"
+CHUNK = 64 * 1024
+MAX_REDIRECTS = 5
+PAGE_EXTENSIONS = (".html", ".htm")
+_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+
+# ─── HTTP ───────────────────────────────────────────────────────────
+
+class HTTPError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Idle keep-alive connections, keyed by (scheme, host, port)."""
+
+    def __init__(self):
+        self._idle: dict[tuple, list] = defaultdict(list)
+        self._ssl = None
+
+    async def acquire(self, scheme: str, host: str, port: int):
+        idle = self._idle[(scheme, host, port)]
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        ctx = None
+        if scheme == "https":
+            ctx = self._ssl = self._ssl or ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(host, port, ssl=ctx, limit=CHUNK * 4)
+        return reader, writer, False
+
+    def release(self, key: tuple, reader, writer):
+        self._idle[key].append((reader, writer))
+
+    def close(self):
+        for conns in self._idle.values():
+            for _reader, writer in conns: writer.close()
+        self._idle.clear()
+
+
+async def fetch(url: str, on_text, pool: ConnectionPool, timeout: float = 10.0,
+                decode: bool = True) -> tuple[int, str]:
+    """GET `url`, following redirects, passing decoded body text to `on_text` chunk by chunk.
+
+    Returns (status, final_url). Only 2xx bodies are passed on; `decode=False` passes raw bytes.
+    """
+    async def go():
+        target = url
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers, body = await _request(target, pool)
+            location = headers.get("location")
+            if 300 <= status < 400 and location:
+                async for _chunk in body: pass
+                target = urljoin(target, location)
+                continue
+            if 200 <= status < 300 and not decode:
+                async for chunk in body: on_text(chunk)
+            elif 200 <= status < 300:
+                m = _CHARSET.search(headers.get("content-type", ""))
+                decoder = _decoder(m.group(1) if m else "utf-8")
+                async for chunk in body: on_text(decoder.decode(chunk))
+                on_text(decoder.decode(b"", final=True))
+            else:
+                async for _chunk in body: pass
+            return status, target
+        raise HTTPError(f"Too many redirects from {url}")
+    return await asyncio.wait_for(go(), timeout)
+
+
+async def _request(url: str, pool: ConnectionPool):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise HTTPError(f"Unsupported URL: {url}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    key = (parts.scheme, parts.hostname, port)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+    request = (f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {USER_AGENT}\r\n"
+               f"Accept: text/html,application/xml;q=0.9,*/*;q=0.8\r\nConnection: keep-alive\r\n\r\n").encode()
+    for attempt in range(2):
+        reader, writer, reused = await pool.acquire(*key)
+        try:
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError("connection closed before response")
+        except (ConnectionError, OSError):
+            writer.close()
+            if reused and attempt == 0: continue  # the server dropped an idle keep-alive connection
+            raise
+        except BaseException:  # timed out or cancelled while waiting for the response
+            writer.close()
+            raise
+        break
+    try:
+        try:
+            version, status = status_line.split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise HTTPError(f"Malformed status line from {url}: {status_line[:80]!r}") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""): break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+    except BaseException:
+        writer.close()
+        raise
+    keep_alive = version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+    return status, headers, _body(reader, writer, status, headers, keep_alive, key, pool)
+
+
+async def _body(reader, writer, status, headers, keep_alive, key, pool):
+    """Yield the response body in raw chunks, then hand the connection back to the pool."""
+    try:
+        if status in (204, 304) or 100 <= status < 200:
+            pass
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""): pass
+                    break
+                while size:
+                    chunk = await reader.read(min(size, CHUNK))
+                    if not chunk: raise ConnectionResetError("truncated chunked body")
+                    size -= len(chunk)
+                    yield chunk
+                await reader.readline()
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining:
+                chunk = await reader.read(min(remaining, CHUNK))
+                if not chunk: raise ConnectionResetError("truncated body")
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            keep_alive = False
+            while chunk := await reader.read(CHUNK): yield chunk
+    except BaseException:
+        writer.close()
+        raise
+    if keep_alive: pool.release(key, reader, writer)
+    else: writer.close()
+
+
+def _decoder(charset: str):
+    try:
+        return codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+# ─── Targets ────────────────────────────────────────────────────────
+
+def discover_pages(directory: str) -> list[str]:
+    """Saved pages (*.html, *.htm) under `directory`, sorted."""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        found += [os.path.join(root, f) for f in sorted(files) if f.lower().endswith(PAGE_EXTENSIONS)]
+    return found
+
+
+def parse_sitemap(chunks) -> tuple[list[str], list[str]]:
+    """(page URLs, nested sitemap URLs) from a sitemap or sitemap index, fed as bytes chunks."""
+    parser = ET.XMLPullParser(events=("end",))
+    pages, sitemaps = [], []
+
+    def drain():
+        for _event, elem in parser.read_events():
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if tag in ("url", "sitemap"):
+                loc = next((c.text for c in elem if c.tag.rsplit("}", 1)[-1] == "loc" and c.text), None)
+                if loc: (pages if tag == "url" else sitemaps).append(loc.strip())
+                elem.clear()
+    for chunk in chunks:
+        parser.feed(chunk); drain()
+    parser.close(); drain()
+    return pages, sitemaps
+
+
+async def sitemap_urls(source: str, pool: ConnectionPool | None = None, timeout: float = 10.0) -> list[str]:
+    """Every page URL listed by a sitemap (local file or URL), following sitemap indexes."""
+    own_pool = pool is None
+    pool = pool or ConnectionPool()
+    try:
+        urls, queue, seen = [], [source], set()
+        while queue:
+            src = queue.pop(0)
+            if src in seen: continue
+            seen.add(src)
+            if src.startswith(("http://", "https://")):
+                chunks: list[bytes] = []
+                status, _ = await fetch(src, chunks.append, pool, timeout, decode=False)
+                if not 200 <= status < 300: raise HTTPError(f"Sitemap {src} returned HTTP {status}")
+                pages, nested = parse_sitemap(chunks)
+            else:
+                with open(src, "rb") as f:
+                    pages, nested = parse_sitemap(iter(lambda: f.read(CHUNK), b""))
+            urls += pages
+            queue += nested
+        return list(dict.fromkeys(urls))
+    finally:
+        if own_pool: pool.close()
+
+
+# ─── Crawl ──────────────────────────────────────────────────────────
+
+def audit_file(path: str) -> PageAudit:
+    parser = SEOParser(path)
+    decoder = _decoder("utf-8")
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK): parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b"", final=True))
+    return parser.close()
+
+
+async def audit_url(url: str, pool: ConnectionPool, timeout: float = 10.0) -> PageAudit:
+    parser = SEOParser(url)
+    try:
+        status, _final = await fetch(url, parser.feed, pool, timeout)
+    except asyncio.TimeoutError:
+        return PageAudit(source=url, error=f"Timed out after {timeout:g}s")
+    except (OSError, HTTPError, ValueError) as e:
+        return PageAudit(source=url, error=f"Fetch failed: {e}")
+    audit = parser.close()
+    audit.status = status
+    if not 200 <= status < 300: audit.error = f"HTTP {status}"
+    return audit
+
+
+async def crawl(targets, concurrency: int = 20, timeout: float = 10.0, on_page=None) -> list[PageAudit]:
+    """Audit URLs and/or saved-page paths with at most `concurrency` in flight; results in input order.
+
+    `on_page(audit)` is called as each page finishes (e.g. for progress output).
+    """
+    targets = list(targets)
+    results: list[PageAudit | None] = [None] * len(targets)
+    pool = ConnectionPool()
+    todo = iter(enumerate(targets))
+
+    async def worker():
+        for i, target in todo:  # workers share one iterator, so each target is taken once
+            if target.startswith(("http://", "https://")):
+                audit = await audit_url(target, pool, timeout)
+            else:
+                try: audit = await asyncio.to_thread(audit_file, target)
+                except OSError as e: audit = PageAudit(source=target, error=f"Read failed: {e}")
+            results[i] = audit
+            if on_page: on_page(audit)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(targets))))))
+    finally:
+        pool.close()
+    return results
+
+
+# ─── Reports ────────────────────────────────────────────────────────
+
+def summarize(audits: list[PageAudit]) -> dict:
+    """Site-wide tallies: pages per problem, plus titles/descriptions shared by several pages."""
+    problems = Counter(p for a in audits for p in a.problems())
+    titles, descriptions = defaultdict(list), defaultdict(list)
+    for a in audits:
+        if a.error: continue
+        if a.title and a.title.strip(): titles[a.title.strip()].append(a.source)
+        if a.description: descriptions[a.description].append(a.source)
+    return {"pages": len(audits), "clean": sum(1 for a in audits if not a.problems()),
+            "problems": dict(problems.most_common()),
+            "duplicate_titles": {t: s for t, s in titles.items() if len(s) > 1},
+            "duplicate_descriptions": {d: s for d, s in descriptions.items() if len(s) > 1}}
+
+
+def format_report(audits: list[PageAudit], summary: dict, limit: int = 20) -> str:
+    lines = [f"🔍 SEO Crawl: {summary['pages']} pages, {summary['clean']} with no issues", ""]
+    for problem, count in summary["problems"].items():
+        lines.append(f"  {count:>6}  {problem}")
+    for label, key in (("Duplicate titles", "duplicate_titles"), ("Duplicate descriptions", "duplicate_descriptions")):
+        if summary[key]:
+            lines += ["", f"{label} ({len(summary[key])}):"]
+            for text, sources in list(summary[key].items())[:limit]:
+                lines.append(f"  {len(sources)} pages: {text[:60]}")
+    worst = sorted((a for a in audits if a.problems()), key=lambda a: -len(a.problems()))[:limit]
+    if worst:
+        lines += ["", "Pages with the most issues:"]
+        lines += [f"  {a.source}: {', '.join(a.problems())}" for a in worst]
+    return "\n".join(lines)
@@ -1,12 +1,14 @@
 """
 SEO Auditor — analyzes SEO signals in HTML pages and sitemaps.
 Usage: python main.py <url_or_html_file>
+       python main.py --crawl <sitemap.xml | sitemap URL | directory of saved pages>
 """
-import argparse, sys, re, os
+import argparse, sys, os
 try:
     from urllib.request import urlopen, Request
 except ImportError:  # pragma: no cover
     pass  # pragma: no cover
+from auditor import audit_page
 
 
 def run(user_input: str, api_key: str = "", model: str = "gpt-4o-mini") -> str:
@@ -14,65 +16,46 @@ def run(user_input: str, api_key: str = "", model: str = "gpt-4o-mini") -> str:
 
 
 def audit_html(html: str, source: str = "input") -> None:
-    checks = []  # pragma: no cover
+    audit = audit_page(html, source)
+    print(f"\n🔍 SEO Audit: {source}\n")
+    for c in audit.checks():
+        print(f"  {c}")
 
-    # Title
-    titles = re.findall(r"<title[^>]*>(.*?)</title>", html, re.IGNORECASE | re.DOTALL)  # pragma: no cover
-    if titles:  # pragma: no cover
-        t = titles[0].strip()  # pragma: no cover
-        if 10 <= len(t) <= 60:  # pragma: no cover
-            checks.append(f"✅ Title ({len(t)} chars): {t[:60]}")  # pragma: no cover
-        else:
-            checks.append(f"⚠️  Title length {len(t)} (ideal 10-60): {t[:60]}")  # pragma: no cover
-    else:
-        checks.append("❌ Missing <title> tag")  # pragma: no cover
 
-    # Meta description
-    meta = re.findall(r'<meta\s+name=["\']description["\']\s+content=["\'](.*?)["\']', html, re.IGNORECASE)  # pragma: no cover
-    if meta:  # pragma: no cover
-        desc = meta[0]  # pragma: no cover
-        if 50 <= len(desc) <= 160:  # pragma: no cover
-            checks.append(f"✅ Meta description ({len(desc)} chars)")  # pragma: no cover
-        else:
-            checks.append(f"⚠️  Meta description length {len(desc)} (ideal: 50-160)")  # pragma: no cover
-    else:
-        checks.append("❌ Missing meta description")  # pragma: no cover
+def crawl_site(target: str, concurrency: int = 20, timeout: float = 10.0, fmt: str = "text", limit: int = 20) -> int:
+    """Audit every page of a sitemap (file or URL) or a directory of saved pages; returns pages with issues."""
+    import asyncio, json
+    from crawler import crawl, discover_pages, format_report, sitemap_urls, summarize
 
-    # H1
-    h1s = re.findall(r"<h1[^>]*>.*?</h1>", html, re.IGNORECASE | re.DOTALL)  # pragma: no cover
-    if len(h1s) == 1:  # pragma: no cover
-        checks.append("✅ Single <h1> tag")  # pragma: no cover
-    elif len(h1s) == 0:  # pragma: no cover
-        checks.append("❌ No <h1> tag found")  # pragma: no cover
-    else:
-        checks.append(f"⚠️  Multiple <h1> tags ({len(h1s)}) — use only one")  # pragma: no cover
+    async def go():
+        targets = discover_pages(target) if os.path.isdir(target) else await sitemap_urls(target, timeout=timeout)
+        if fmt == "text":
+            print(f"Auditing {len(targets)} pages ({concurrency} at a time)...", file=sys.stderr)
+        return await crawl(targets, concurrency=concurrency, timeout=timeout)
 
-    # Alt text
-    imgs = re.findall(r"<img[^>]+>", html, re.IGNORECASE)  # pragma: no cover
-    no_alt = [img for img in imgs if "alt=" not in img.lower()]  # pragma: no cover
-    if no_alt:  # pragma: no cover
-        checks.append(f"⚠️  {len(no_alt)} image(s) missing alt text")  # pragma: no cover
-    elif imgs:  # pragma: no cover
-        checks.append(f"✅ All {len(imgs)} image(s) have alt text")  # pragma: no cover
-
-    # Canonical
-    if re.search(r'rel=["\']canonical["\']', html, re.IGNORECASE):  # pragma: no cover
-        checks.append("✅ Canonical URL present")  # pragma: no cover
+    audits = asyncio.run(go())
+    summary = summarize(audits)
+    if fmt == "json":
+        print(json.dumps({"summary": summary, "pages": [a.to_dict() for a in audits]}, indent=2))
     else:
-        checks.append("ℹ️  No canonical URL — recommended for avoiding duplicate content")  # pragma: no cover
-
-    print(f"\n🔍 SEO Audit: {source}\n")  # pragma: no cover
-    for c in checks:  # pragma: no cover
-        print(f"  {c}")  # pragma: no cover
+        print(format_report(audits, summary, limit))
+    return summary["pages"] - summary["clean"]
 
 
 def main():
     parser = argparse.ArgumentParser(description="Audit SEO signals in HTML")
     parser.add_argument("input", nargs="?", help="URL or HTML file path")
+    parser.add_argument("--crawl", action="store_true", help="Audit every page of a sitemap or directory (implied for directories and *.xml)")
+    parser.add_argument("-c", "--concurrency", type=int, default=20, help="Pages fetched at once when crawling")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-page timeout in seconds")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="Crawl report format")
+    parser.add_argument("--limit", type=int, default=20, help="Rows per section in the text crawl report")
     args = parser.parse_args()
     if not args.input:
-        print("SEO Auditor\nUsage: python main.py <url> OR python main.py <file.html>")
+        print("SEO Auditor\nUsage: python main.py <url> OR python main.py <file.html> OR python main.py --crawl <sitemap|dir>")
         sys.exit(0)
+    if args.crawl or os.path.isdir(args.input) or args.input.lower().endswith(".xml"):
+        sys.exit(1 if crawl_site(args.input, args.concurrency, args.timeout, args.format, args.limit) else 0)
     html = ""  # pragma: no cover
     if os.path.isfile(args.input):  # pragma: no cover
         html = open(args.input).read()  # pragma: no cover
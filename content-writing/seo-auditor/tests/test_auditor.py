@@ -0,0 +1,79 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from auditor import audit_page, PageAudit
+
+GOOD = """<!doctype html><html><head>
+<title>Widgets &amp; Gadgets Store</title>
+<meta name="description" content="Buy the best widgets and gadgets online with free shipping on every order over fifty dollars.">
+<link rel="canonical" href="https://example.com/">
+</head><body><h1>Widgets</h1><img src="a.png" alt="A widget"><img src="b.png" alt=""></body></html>"""
+
+
+def test_good_page():
+    a = audit_page(GOOD)
+    assert a.title == "Widgets & Gadgets Store" and a.h1_count == 1 and a.canonical == "https://example.com/"
+    assert a.images == 2 and a.images_missing_alt == 0 and a.problems() == []
+
+
+def test_checks_text():
+    checks = audit_page(GOOD).checks()
+    assert checks[0] == "✅ Title (23 chars): Widgets & Gadgets Store"
+    assert "✅ Single <h1> tag" in checks and "✅ All 2 image(s) have alt text" in checks
+
+
+def test_missing_everything():
+    a = audit_page("<html><body><p>hi</p></body></html>")
+    assert a.problems() == ["missing-title", "missing-description", "missing-h1", "missing-canonical"]
+    assert a.checks()[0] == "❌ Missing <title> tag"
+
+
+def test_meta_attribute_order_and_case():
+    a = audit_page('<META CONTENT="short" NAME="Description">')
+    assert a.description == "short" and "description-length" in a.problems()
+
+
+def test_first_title_and_description_win():
+    a = audit_page("<title>First title here</title><title>Second</title>"
+                   '<meta name="description" content="one"><meta name="description" content="two">')
+    assert a.title == "First title here" and a.description == "one"
+
+
+def test_multiple_h1_and_missing_alt():
+    a = audit_page("<h1>a</h1><h1 class='x'>b</h1><img src=x><img src=y />")
+    assert a.h1_count == 2 and a.images_missing_alt == 2
+    assert "⚠️  Multiple <h1> tags (2) — use only one" in a.checks()
+
+
+def test_alt_inside_other_attribute_is_not_alt():
+    assert audit_page('<img data-alt="x" src="y">').images_missing_alt == 1
+
+
+def test_chunked_feed_matches_whole():
+    chunks = [GOOD[i:i + 7] for i in range(0, len(GOOD), 7)]
+    assert audit_page(chunks) == audit_page(GOOD)
+
+
+def test_canonical_rel_list():
+    assert audit_page('<link rel="alternate Canonical" href="/x">').canonical == "/x"
+
+
+def test_error_page():
+    a = PageAudit(source="u", error="HTTP 404")
+    assert a.checks() == ["❌ HTTP 404"] and a.problems() == ["fetch-error"]
+    assert a.to_dict()["problems"] == ["fetch-error"]
+
+
+def test_title_length_warning():
+    assert audit_page("<title>Hi</title>").checks()[0] == "⚠️  Title length 2 (ideal 10-60): Hi"
+
+
+def test_comment_split_across_chunks_is_skipped():
+    assert audit_page(["<!-- <title>Ignored</title> ", "--><title>Real page title</title>"]).title == "Real page title"
+
+
+def test_text_whose_lowercase_changes_length():
+    a = audit_page("<TITLE>İstanbul travel guide</TITLE><H1>x</H1>")  # "İ".lower() is two characters
+    assert a.title == "İstanbul travel guide" and a.h1_count == 1
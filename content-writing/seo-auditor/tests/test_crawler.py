@@ -0,0 +1,262 @@
+import asyncio
+import json
+import os
+import ssl
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import crawler
+from crawler import crawl, discover_pages, parse_sitemap, sitemap_urls, summarize, format_report
+
+
+def page(title, h1="Heading", desc="A description long enough to pass the fifty character minimum check."):
+    return (f"<html><head><title>{title}</title><meta name='description' content='{desc}'>"
+            f"<link rel='canonical' href='/'></head><body><h1>{h1}</h1></body></html>")
+
+
+class Site(BaseHTTPRequestHandler):
+    """Local stand-in for a real site: keep-alive, chunked pages, a redirect, a 404 and a sitemap index."""
+    protocol_version = "HTTP/1.1"
+    routes: dict = {}
+    requests: list = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.path == "/old":
+            self.send_response(301); self.send_header("Location", "/page/1"); self.send_header("Content-Length", "0")
+            self.end_headers(); return
+        body = self.routes.get(self.path)
+        if body is None:
+            self.send_response(404); self.send_header("Content-Length", "9"); self.end_headers()
+            self.wfile.write(b"not found"); return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml" if self.path.endswith(".xml") else "text/html; charset=utf-8")
+        if self.path.startswith("/chunked"):
+            self.send_header("Transfer-Encoding", "chunked"); self.end_headers()
+            for i in range(0, len(data), 10):
+                piece = data[i:i + 10]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(data))); self.end_headers()
+            self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Site)
+    base = f"http://127.0.0.1:{server.server_port}"
+    routes = {f"/page/{i}": page(f"Page number {i} title") for i in range(30)}
+    routes["/page/dup"] = page("Page number 1 title")
+    routes["/chunked"] = page("Chunked transfer page", h1="Ünïcode")
+    urls = [f"{base}/page/{i}" for i in range(30)]
+    routes["/sitemap-a.xml"] = ('<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                                + "".join(f"<url><loc>{u}</loc></url>" for u in urls[:15]) + "</urlset>")
+    routes["/sitemap-b.xml"] = ('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                                + "".join(f"<url><loc>{u}</loc></url>" for u in urls[15:] + [f"{base}/page/dup", f"{base}/chunked", f"{base}/old", f"{base}/missing"])
+                                + "</urlset>")
+    routes["/sitemap.xml"] = ('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                              f"<sitemap><loc>{base}/sitemap-a.xml</loc></sitemap><sitemap><loc>{base}/sitemap-b.xml</loc></sitemap></sitemapindex>")
+    Site.routes, Site.requests = routes, []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield base
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_sitemap_chunks():
+    xml = b'<urlset xmlns="x"><url><loc> https://a/1 </loc></url><url><loc>https://a/2</loc></url></urlset>'
+    assert parse_sitemap([xml[i:i + 5] for i in range(0, len(xml), 5)]) == (["https://a/1", "https://a/2"], [])
+
+
+def test_sitemap_index(site):
+    urls = asyncio.run(sitemap_urls(f"{site}/sitemap.xml"))
+    assert len(urls) == 34 and urls[0] == f"{site}/page/0" and urls[-1] == f"{site}/missing"
+
+
+def test_local_sitemap_file(tmp_path):
+    (tmp_path / "sitemap.xml").write_text('<urlset><url><loc>https://a/1</loc></url></urlset>')
+    assert asyncio.run(sitemap_urls(str(tmp_path / "sitemap.xml"))) == ["https://a/1"]
+
+
+def test_crawl_site(site):
+    urls = asyncio.run(sitemap_urls(f"{site}/sitemap.xml"))
+    seen = []
+    audits = asyncio.run(crawl(urls, concurrency=4, on_page=seen.append))
+    assert [a.source for a in audits] == urls and len(seen) == len(urls)
+    by_path = {a.source[len(site):]: a for a in audits}
+    assert by_path["/page/3"].problems() == [] and by_path["/page/3"].status == 200
+    assert by_path["/chunked"].title == "Chunked transfer page" and by_path["/chunked"].h1_count == 1
+    assert by_path["/old"].title == "Page number 1 title"  # followed the redirect
+    assert by_path["/missing"].error == "HTTP 404"
+    summary = summarize(audits)
+    assert summary["problems"] == {"fetch-error": 1}
+    assert sorted(summary["duplicate_titles"]["Page number 1 title"]) == sorted([f"{site}/page/1", f"{site}/page/dup", f"{site}/old"])
+    assert "Duplicate titles (1):\n  3 pages: Page number 1 title" in format_report(audits, summary)
+
+
+def test_crawl_reuses_connections(site):
+    opened = []
+    real = asyncio.open_connection
+    async def counting(*a, **k):
+        opened.append(a); return await real(*a, **k)
+    with patch.object(crawler.asyncio, "open_connection", counting):
+        asyncio.run(crawl([f"{site}/page/{i}" for i in range(30)], concurrency=3))
+    assert len(opened) <= 3
+
+
+def test_crawl_unreachable_host():
+    audits = asyncio.run(crawl(["http://127.0.0.1:1/"], timeout=2))
+    assert audits[0].error.startswith("Fetch failed") and audits[0].problems() == ["fetch-error"]
+
+
+class FakeConnection:
+    """A scripted server connection: each request gets the next reply (None: never answer), then the server hangs up."""
+
+    def __init__(self, replies):
+        self.reader, self.replies, self.closed = asyncio.StreamReader(), list(replies), False
+
+    def write(self, data):
+        reply = self.replies.pop(0)
+        if reply is None: return
+        self.reader.feed_data(reply)
+        if not self.replies: self.reader.feed_eof()
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def is_closing(self):
+        return self.closed
+
+
+@pytest.fixture
+def server():
+    """Append one list of replies per connection; returns (script, opened connections)."""
+    script, opened = [], []
+    async def open_connection(host, port, ssl=None, limit=None):
+        conn = FakeConnection(script.pop(0))
+        opened.append((host, port, ssl, conn))
+        return conn.reader, conn
+    with patch.object(crawler.asyncio, "open_connection", open_connection):
+        yield script, opened
+
+
+def audit_urls(*urls, timeout=2.0):
+    async def go():
+        pool = crawler.ConnectionPool()
+        try:
+            return [await crawler.audit_url(url, pool, timeout) for url in urls]
+        finally:
+            pool.close()
+    return asyncio.run(go())
+
+
+OK = b"HTTP/1.1 200 OK\r\nContent-Length: 31\r\n\r\n<title>Kept alive page</title>\n"
+REDIRECT = b"HTTP/1.1 302 Found\r\nLocation: /again\r\nContent-Length: 0\r\n\r\n"
+
+
+@pytest.mark.parametrize("connections,error", [
+    ([[b"garbage\r\n\r\n"]], "Fetch failed: Malformed status line from http://site.test/: b'garbage\\r\\n'"),
+    ([[b""]], "Fetch failed: connection closed before response"),
+    ([[b"HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\nshort"]], "Fetch failed: truncated body"),
+    ([[REDIRECT]] * 6, "Fetch failed: Too many redirects from http://site.test/"),
+    ([[None]], "Timed out after 0.2s"),
+])
+def test_fetch_errors(server, connections, error):
+    script, opened = server
+    script += connections
+    assert audit_urls("http://site.test/", timeout=0.2)[0].error == error
+    assert all(conn.closed for *_, conn in opened)
+
+
+def test_unsupported_url():
+    assert audit_urls("ftp://site.test/file")[0].error == "Fetch failed: Unsupported URL: ftp://site.test/file"
+
+
+def test_body_read_to_eof_with_unknown_charset(server):
+    script, opened = server
+    script.append([b"HTTP/1.0 200 OK\r\nContent-Type: text/html; charset=x-no-such-codec\r\n\r\n<title>Read until clos\xc3\xa9</title>"])
+    audit = audit_urls("http://site.test/")[0]
+    assert audit.title == "Read until closé" and audit.status == 200
+    assert opened[0][3].closed  # no Content-Length, so the connection is not reused
+
+
+def test_no_content_response(server):
+    script, _ = server
+    script.append([b"HTTP/1.1 204 No Content\r\n\r\n"])
+    audit = audit_urls("http://site.test/")[0]
+    assert audit.status == 204 and not audit.error
+
+
+def test_retry_when_idle_connection_was_dropped(server):
+    script, opened = server
+    script += [[OK, b""], [OK]]  # the server hangs up on the second request to the first connection
+    audits = audit_urls("http://site.test/a", "http://site.test/b")
+    assert [a.title for a in audits] == ["Kept alive page"] * 2 and len(opened) == 2
+
+
+def test_https_uses_tls(server):
+    script, opened = server
+    script.append([OK])
+    audit_urls("https://site.test/")
+    assert opened[0][:2] == ("site.test", 443) and isinstance(opened[0][2], ssl.SSLContext)
+
+
+def test_crawl_unreadable_file(tmp_path):
+    audit = asyncio.run(crawl([str(tmp_path / "gone.html")]))[0]
+    assert audit.error.startswith("Read failed") and audit.problems() == ["fetch-error"]
+
+
+def test_crawl_directory(tmp_path):
+    (tmp_path / "a.html").write_text(page("Saved page A title"))
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.htm").write_text("<html><body>bare</body></html>")
+    (tmp_path / "notes.txt").write_text("x")
+    pages = discover_pages(str(tmp_path))
+    assert [os.path.basename(p) for p in pages] == ["a.html", "b.htm"]
+    audits = asyncio.run(crawl(pages))
+    assert audits[0].problems() == [] and "missing-title" in audits[1].problems()
+    assert "1 with no issues" in format_report(audits, summarize(audits))
+
+
+def test_main_crawl_json(site, capsys):
+    import main
+    with patch("sys.argv", ["main.py", "--crawl", f"{site}/sitemap.xml", "--format", "json", "-c", "5"]):
+        with pytest.raises(SystemExit) as e:
+            main.main()
+    assert e.value.code == 1
+    out = json.loads(capsys.readouterr().out)
+    assert out["summary"]["pages"] == 34 and out["pages"][0]["problems"] == []
+
+
+def test_main_single_file(tmp_path, capsys):
+    import main
+    (tmp_path / "p.html").write_text(page("Single file page title"))
+    with patch("sys.argv", ["main.py", str(tmp_path / "p.html")]):
+        main.main()
+    assert "✅ Canonical URL present" in capsys.readouterr().out
+
+
+def test_main_crawl_directory_text(tmp_path, capsys):
+    import main
+    (tmp_path / "a.html").write_text(page("Saved page A title"))
+    with patch("sys.argv", ["main.py", str(tmp_path), "-c", "2"]):
+        with pytest.raises(SystemExit) as e:
+            main.main()
+    assert e.value.code == 0
+    out, err = capsys.readouterr()
+    assert err == "Auditing 1 pages (2 at a time)...\n" and out.startswith("🔍 SEO Crawl: 1 pages, 1 with no issues")
@@ -1,4 +1,5 @@
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.output_parsers import StrOutputParser
 from config import Config
 from prompts.sop_prompts import (
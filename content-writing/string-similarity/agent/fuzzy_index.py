@@ -0,0 +1,171 @@
+"""Fuzzy index — repeated nearest-match queries over a large, fixed candidate set.
+
+Candidates are indexed once by padded q-grams. A query then only verifies the
+candidates whose q-gram overlap and length could still beat the current best,
+using the banded `bounded_levenshtein`. Results are identical to a linear scan:
+ties keep the order in which candidates were added.
+"""
+from __future__ import annotations
+import heapq
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from agent.similarity import bounded_levenshtein
+
+
+def qgrams(text: str, q: int = 3) -> list[tuple[str, int]]:
+    """Padded q-grams of `text`; repeats are numbered so shared grams count as a multiset."""
+    padded = "\x00" * (q - 1) + text + "\x00" * (q - 1)
+    seen: dict[str, int] = {}
+    grams = []
+    for i in range(len(padded) - q + 1):
+        g = padded[i:i + q]
+        seen[g] = seen.get(g, 0) + 1
+        grams.append((g, seen[g]))
+    return grams
+
+
+class FuzzyIndex:
+    """Q-gram inverted index with length buckets for top-k and threshold edit-distance queries.
+
+    An edit touches at most q padded q-grams, so a candidate within distance d of the
+    query shares at least max(len) + q - 1 - d*q grams with it. That count, together
+    with the length difference, gives every candidate a lower bound on its distance;
+    candidates are verified in lower-bound order and the scan stops once the bound
+    exceeds what is still needed.
+
+    Small radii avoid even the counting: only the rarest grams' posting lists are read
+    (see `_rare_postings`), widening the radius one edit at a time until k hits are found.
+    """
+
+    def __init__(self, candidates: Iterable[str] = (), q: int = 3):
+        if q < 1: raise ValueError("q must be >= 1")
+        self.q = q
+        self.strings: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._postings: dict[tuple[str, int], list[int]] = defaultdict(list)
+        self._by_length: dict[int, list[int]] = defaultdict(list)
+        self.add_many(candidates)
+
+    def __len__(self) -> int: return len(self.strings)
+    def __contains__(self, text: str) -> bool: return text in self._ids
+
+    def add(self, text: str) -> int:
+        """Index `text` (duplicates are ignored) and return its id."""
+        if text in self._ids: return self._ids[text]
+        idx = self._ids[text] = len(self.strings)
+        self.strings.append(text)
+        for g in qgrams(text, self.q): self._postings[g].append(idx)
+        self._by_length[len(text)].append(idx)
+        return idx
+
+    def add_many(self, texts: Iterable[str]):
+        for t in texts: self.add(t)
+
+    # ─── Queries ─────────────────────────────────────────────────
+
+    def _lower_bound(self, qlen: int, clen: int, shared: int) -> int:
+        missing = max(qlen, clen) + self.q - 1 - shared
+        return max(abs(qlen - clen), -(-missing // self.q))
+
+    def _rare_postings(self, grams: list[tuple[str, int]], max_distance: int):
+        """Ids of every candidate that can be within `max_distance`, or None if the filter can't prune.
+
+        Such a candidate shares at least len(grams) - max_distance*q grams with the query,
+        so by pigeonhole it appears in one of the max_distance*q + 1 shortest posting lists.
+        """
+        probes = max_distance * self.q + 1
+        if probes >= len(grams): return None
+        lists = sorted((self._postings.get(g, ()) for g in grams), key=len)[:probes]
+        ids = set()
+        for postings in lists: ids.update(postings)
+        return ids
+
+    def _candidates(self, query: str, limit: int | None):
+        """Yield (lower bound, id) in ascending bound order; `limit` caps the bound."""
+        qlen = len(query)
+        shared = Counter()
+        for g in qgrams(query, self.q):
+            ids = self._postings.get(g)
+            if ids: shared.update(ids)  # Counter.update runs in C
+        strings = self.strings
+        heap = []
+        for idx, n in shared.items():
+            lb = self._lower_bound(qlen, len(strings[idx]), n)
+            if limit is None or lb <= limit: heap.append((lb, idx, -1))
+        # Candidates sharing no gram are bounded by length alone, so whole buckets are queued lazily
+        for length, ids in self._by_length.items():
+            lb = self._lower_bound(qlen, length, 0)
+            if limit is None or lb <= limit: heap.append((lb, -1, length))
+        heapq.heapify(heap)
+        while heap:
+            lb, idx, length = heapq.heappop(heap)
+            if idx >= 0:
+                yield lb, idx
+            else:
+                for idx in self._by_length[length]:
+                    if idx not in shared: yield lb, idx
+
+    def _top_k_scan(self, query: str, k: int, max_distance: int | None) -> list[tuple[int, int]]:
+        best: list[tuple[int, int]] = []  # max-heap of (-distance, -id) holding the k best so far
+        for lb, idx in self._candidates(query, max_distance):
+            if len(best) == k:
+                worst = -best[0][0]
+                if lb > worst: break
+                cutoff = worst
+            else:
+                cutoff = max_distance if max_distance is not None else max(len(query), len(self.strings[idx]))
+            d = bounded_levenshtein(query, self.strings[idx], cutoff)
+            if d > cutoff: continue
+            item = (-d, -idx)
+            if len(best) < k: heapq.heappush(best, item)
+            elif item > best[0]: heapq.heapreplace(best, item)
+        return sorted((-d, -i) for d, i in best)
+
+    def top_k(self, query: str, k: int = 1, max_distance: int | None = None) -> list[tuple[str, int]]:
+        """Up to `k` (candidate, distance) pairs nearest to `query`, closest first."""
+        if k < 1 or not self.strings: return []
+        grams = qgrams(query, self.q)
+        strings = self.strings
+        known: dict[int, int] = {}  # id -> distance, where a value above the last radius only means "further"
+        d = 0
+        # Typo-sized distances are answered from the rarest grams only, widening the radius until k hits
+        while (max_distance is None or d <= max_distance):
+            ids = self._rare_postings(grams, d)
+            if ids is None: break
+            for idx in ids:
+                prev = known.get(idx)
+                if prev is None or prev >= d:
+                    known[idx] = bounded_levenshtein(query, strings[idx], d)
+            hits = sorted((dist, idx) for idx, dist in known.items() if dist <= d)
+            if len(hits) >= k: return [(strings[i], dist) for dist, i in hits[:k]]
+            d += 1
+        else:
+            hits = sorted((dist, idx) for idx, dist in known.items() if dist <= max_distance)
+            return [(strings[i], dist) for dist, i in hits[:k]]
+        return [(strings[i], dist) for dist, i in self._top_k_scan(query, k, max_distance)]
+
+    def search(self, query: str, max_distance: int) -> list[tuple[str, int]]:
+        """Every candidate within `max_distance` of `query`, closest first."""
+        ids = self._rare_postings(qgrams(query, self.q), max_distance)
+        pool = ids if ids is not None else (idx for _lb, idx in self._candidates(query, max_distance))
+        hits = []
+        for idx in pool:
+            d = bounded_levenshtein(query, self.strings[idx], max_distance)
+            if d <= max_distance: hits.append((d, idx))
+        return [(self.strings[i], d) for d, i in sorted(hits)]
+
+    def closest(self, query: str) -> str:
+        """Drop-in for `closest_match(query, candidates)`."""
+        hit = self.top_k(query, 1)
+        return hit[0][0] if hit else ""
+
+    def batch_top_k(self, queries: Iterable[str], k: int = 1,
+                    max_distance: int | None = None) -> list[list[tuple[str, int]]]:
+        """`top_k` for each query, in order; repeated queries are answered once."""
+        cache: dict[str, list[tuple[str, int]]] = {}
+        out = []
+        for query in queries:
+            if query not in cache: cache[query] = self.top_k(query, k, max_distance)
+            out.append(cache[query])
+        return out
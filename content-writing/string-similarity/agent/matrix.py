@@ -0,0 +1,146 @@
+"""Pairwise similarity matrices — every string in one list against every string in another.
+
+Levenshtein uses bit-parallel kernels: with NumPy installed, rows whose string fits
+in 64 characters are computed as uint64 bit vectors for a whole block of row x column
+pairs at once, and everything else runs Myers' algorithm on Python ints with each
+row's masks built once. `max_distance` caps the reported distance; without NumPy it
+also skips pairs whose length gap already exceeds it, and long strings use the
+banded DP, which gives up on a pair as soon as it can't finish within the bound.
+Large matrices can be split across a process pool by rows.
+"""
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from agent.similarity import bounded_levenshtein, jaro_winkler, myers_levenshtein, pattern_masks
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+ALGORITHMS = ("levenshtein", "ratio", "jaro_winkler")
+WORD_BITS = 64
+BLOCK_CELLS = 1 << 20  # row x column pairs per NumPy block (~8 MB per uint64 array)
+PARALLEL_MIN_CELLS = 250_000  # below this, starting worker processes costs more than it saves
+
+
+def distance_matrix(list_a: list[str], list_b: list[str] | None = None, algorithm: str = "levenshtein",
+                    max_distance: int | None = None, workers: int | None = 1,
+                    use_numpy: bool = True) -> list[list]:
+    """`result[i][j]` compares `list_a[i]` with `list_b[j]` (`list_b` defaults to `list_a`).
+
+    algorithm: "levenshtein" (edit distance), "ratio" (the `similarity_ratio` of each pair)
+    or "jaro_winkler". With `max_distance`, Levenshtein distances above it are reported as
+    `max_distance + 1`. `workers` > 1 (or None for one per CPU) splits the rows across
+    processes once the matrix is large enough to pay for them.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {', '.join(ALGORITHMS)}")
+    if max_distance is not None and algorithm != "levenshtein":
+        raise ValueError("max_distance only applies to the levenshtein algorithm")
+    list_a = list(list_a)
+    list_b = list_a if list_b is None else list(list_b)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(list_a) > 1 and len(list_a) * len(list_b) >= PARALLEL_MIN_CELLS:
+        step = -(-len(list_a) // (workers * 4))  # a few chunks per worker evens out uneven row lengths
+        chunks = [list_a[i:i + step] for i in range(0, len(list_a), step)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = pool.map(_rows, chunks, [list_b] * len(chunks), [algorithm] * len(chunks),
+                             [max_distance] * len(chunks), [use_numpy] * len(chunks))
+            return [row for part in parts for row in part]
+    return _rows(list_a, list_b, algorithm, max_distance, use_numpy)
+
+
+def _rows(list_a: list[str], list_b: list[str], algorithm: str, max_distance: int | None,
+          use_numpy: bool) -> list[list]:
+    if algorithm == "jaro_winkler":
+        return [[jaro_winkler(a, b) for b in list_b] for a in list_a]
+    if use_numpy and np is not None and list_b:
+        rows = _numpy_levenshtein(list_a, list_b)
+    elif max_distance is not None:
+        rows = [_bounded_row(a, list_b, max_distance) for a in list_a]
+    else:
+        rows = [_myers_row(a, list_b) for a in list_a]
+    if max_distance is not None:
+        cap = max_distance + 1
+        return [[d if d < cap else cap for d in row] for row in rows]
+    if algorithm == "ratio":
+        return [[round(1 - d / max(len(a), len(b), 1), 4) for b, d in zip(list_b, row)]
+                for a, row in zip(list_a, rows)]
+    return rows
+
+
+def _myers_row(a: str, list_b: list[str]) -> list[int]:
+    if not a: return [len(b) for b in list_b]
+    peq = pattern_masks(a)
+    return [myers_levenshtein(a, b, peq) for b in list_b]
+
+
+def _bounded_row(a: str, list_b: list[str], max_distance: int) -> list[int]:
+    """Length filter first, then whichever exact kernel is cheaper for this pair."""
+    peq = pattern_masks(a) if a else None
+    row = []
+    for b in list_b:
+        if abs(len(a) - len(b)) > max_distance: row.append(max_distance + 1)
+        elif 2 * max_distance + 1 < len(a) // 8: row.append(bounded_levenshtein(a, b, max_distance))
+        else: row.append(myers_levenshtein(a, b, peq))
+    return row
+
+
+def _numpy_levenshtein(list_a: list[str], list_b: list[str]) -> list[list[int]]:
+    """Myers' algorithm on uint64 words, vectorised over blocks of (row, column) pairs.
+
+    Each row string is the pattern (<= 64 characters); column strings are streamed one
+    character position at a time. Columns are sorted longest first, so the ones that
+    still have a character at position t are always a prefix that can be sliced.
+    """
+    order = sorted(range(len(list_b)), key=lambda j: -len(list_b[j]))
+    alphabet: dict[str, int] = {}
+    for s in list_b:
+        for c in s: alphabet.setdefault(c, len(alphabet))
+    pad = len(alphabet)  # never present in any pattern, so its Peq is 0
+    width = len(list_b[order[0]])
+    codes = np.full((width, len(list_b)), pad, dtype=np.intp)  # codes[t, col]: character at position t
+    for col, j in enumerate(order):
+        s = list_b[j]
+        if s: codes[:len(s), col] = [alphabet[c] for c in s]
+    b_lens = np.array([len(list_b[j]) for j in order], dtype=np.int64)
+    active = [int(np.count_nonzero(b_lens > t)) for t in range(width)]
+    unsort = np.argsort(np.array(order))
+
+    out: list[list[int] | None] = [None] * len(list_a)
+    short = [i for i, a in enumerate(list_a) if 0 < len(a) <= WORD_BITS]
+    for i, a in enumerate(list_a):
+        if not a: out[i] = [len(b) for b in list_b]
+        elif len(a) > WORD_BITS: out[i] = _myers_row(a, list_b)
+    step = max(1, BLOCK_CELLS // len(list_b))
+    one = np.uint64(1)
+    for start in range(0, len(short), step):
+        block = [list_a[i] for i in short[start:start + step]]
+        peq = np.zeros((len(block), pad + 1), dtype=np.uint64)
+        for r, a in enumerate(block):
+            for k, c in enumerate(a):
+                if c in alphabet: peq[r, alphabet[c]] |= np.uint64(1 << k)
+        lens = np.array([len(a) for a in block], dtype=np.uint64)[:, None]
+        mask = np.where(lens == WORD_BITS, np.uint64(2**64 - 1), (one << (lens % WORD_BITS)) - one)
+        top = one << (lens - one)
+        pv = np.repeat(mask, len(list_b), axis=1)
+        mv = np.zeros_like(pv)
+        score = np.repeat(lens.astype(np.int64), len(list_b), axis=1)
+        for t in range(width):
+            n = active[t]
+            eq = np.take(peq, codes[t, :n], axis=1)
+            p, m = pv[:, :n], mv[:, :n]
+            xv = eq | m
+            xh = (((eq & p) + p) & mask ^ p) | eq
+            ph = m | (~(xh | p) & mask)
+            mh = p & xh
+            score[:, :n] += (ph & top != 0).view(np.int8) - (mh & top != 0).view(np.int8)
+            ph <<= one; ph |= one; ph &= mask
+            mh <<= one; mh &= mask
+            pv[:, :n] = mh | (~(xv | ph) & mask)
+            mv[:, :n] = ph & xv
+        for r, row in enumerate(score[:, unsort].tolist()):
+            out[short[start + r]] = row
+    return out
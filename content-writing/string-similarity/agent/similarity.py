@@ -8,34 +8,92 @@ class SimilarityResult:
     def to_dict(self) -> dict: return {"ratio": self.ratio, "distance": self.distance, "algorithm": self.algorithm}
 
 def levenshtein(s1: str, s2: str) -> int:
-    if len(s1) < len(s2): return levenshtein(s2, s1)
+    if len(s1) < len(s2): s1, s2 = s2, s1
     if not s2: return len(s1)
-    prev = list(range(len(s2) + 1))
-    for i, c1 in enumerate(s1):
-        curr = [i + 1]
-        for j, c2 in enumerate(s2):
-            curr.append(min(prev[j + 1] + 1, curr[j] + 1, prev[j] + (c1 != c2)))
-        prev = curr
-    return prev[-1]
+    return myers_levenshtein(s2, s1)
+
+def pattern_masks(pattern: str) -> dict[str, int]:
+    """Bit mask of the positions of each character in `pattern` (the Peq table of Myers' algorithm)."""
+    peq: dict[str, int] = {}
+    for i, c in enumerate(pattern): peq[c] = peq.get(c, 0) | (1 << i)
+    return peq
+
+def myers_levenshtein(pattern: str, text: str, peq: dict[str, int] | None = None) -> int:
+    """Bit-parallel Levenshtein distance (Myers 1999, Hyyrö's edit-distance variant).
+
+    One DP column is packed into an int and updated with a handful of word operations
+    per character of `text`; Python ints make this work for any pattern length, and it
+    is fastest with the shorter string as `pattern`. Pass `peq` to reuse the pattern's
+    masks across many texts.
+    """
+    m = len(pattern)
+    if not m: return len(text)
+    if peq is None: peq = pattern_masks(pattern)
+    mask, top = (1 << m) - 1, 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for c in text:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & top: score += 1
+        elif mh & top: score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+def bounded_levenshtein(s1: str, s2: str, max_distance: int) -> int:
+    """Levenshtein distance if it is <= max_distance, else max_distance + 1.
+
+    Only the diagonal band |i - j| <= max_distance is filled (Ukkonen), and the scan
+    stops as soon as a whole row exceeds the bound, so far-apart pairs are cheap.
+    """
+    if max_distance < 0: return 0 if s1 == s2 else max_distance + 1
+    if len(s1) < len(s2): s1, s2 = s2, s1
+    start, end = 0, len(s2)
+    while start < end and s1[start] == s2[start]: start += 1  # common prefix/suffix never cost anything
+    while end > start and s1[end - 1 + len(s1) - len(s2)] == s2[end - 1]: end -= 1
+    s1, s2 = s1[start:len(s1) - len(s2) + end], s2[start:end]
+    n, m, k = len(s1), len(s2), max_distance
+    if n - m > k: return k + 1
+    if not m: return n
+    big = k + 1
+    prev = [j if j <= k else big for j in range(m + 1)]
+    curr = [big] * (m + 1)
+    for i in range(1, n + 1):
+        c1 = s1[i - 1]
+        lo, hi = max(1, i - k), min(m, i + k)
+        curr[lo - 1] = i if lo == 1 and i <= k else big
+        row_min = curr[lo - 1]
+        for j in range(lo, hi + 1):
+            d = prev[j - 1] + (c1 != s2[j - 1])
+            if prev[j] + 1 < d: d = prev[j] + 1
+            if curr[j - 1] + 1 < d: d = curr[j - 1] + 1
+            curr[j] = d
+            if d < row_min: row_min = d
+        if hi < m: curr[hi + 1] = big  # next row reads one cell past this band
+        if row_min > k: return big
+        prev, curr = curr, prev
+    return prev[m] if prev[m] <= k else big
 
 def jaro_winkler(s1: str, s2: str) -> float:
     if s1 == s2: return 1.0
     l1, l2 = len(s1), len(s2)
     if not l1 or not l2: return 0.0
     window = max(l1, l2) // 2 - 1
-    m1 = [False] * l1; m2 = [False] * l2; matches = 0; transpositions = 0
-    for i in range(l1):
+    taken = bytearray(l2); matched1 = []
+    for i, c in enumerate(s1):
         lo, hi = max(0, i - window), min(l2, i + window + 1)
-        for j in range(lo, hi):
-            if m2[j] or s1[i] != s2[j]: continue
-            m1[i] = m2[j] = True; matches += 1; break
+        j = s2.find(c, lo, hi)
+        while j != -1 and taken[j]: j = s2.find(c, j + 1, hi)
+        if j != -1: taken[j] = 1; matched1.append(c)
+    matches = len(matched1)
     if not matches: return 0.0
-    k = 0
-    for i in range(l1):
-        if not m1[i]: continue
-        while not m2[k]: k += 1
-        if s1[i] != s2[k]: transpositions += 1
-        k += 1
+    matched2 = [s2[j] for j in range(l2) if taken[j]]
+    transpositions = sum(a != b for a, b in zip(matched1, matched2))
     jaro = (matches / l1 + matches / l2 + (matches - transpositions / 2) / matches) / 3
     prefix = sum(1 for i in range(min(4, min(l1, l2))) if s1[i] == s2[i])
     return round(jaro + prefix * 0.1 * (1 - jaro), 4)
@@ -53,8 +111,16 @@ def compare(s1: str, s2: str, algorithm: str = "levenshtein") -> SimilarityResul
     return r
 
 def closest_match(target: str, candidates: list[str]) -> str:
-    if not candidates: return ""
-    return min(candidates, key=lambda c: levenshtein(target, c))
+    """First candidate with the smallest edit distance; see FuzzyIndex for repeated queries."""
+    best, best_dist = "", None
+    for c in candidates:
+        if best_dist is None:
+            best, best_dist = c, levenshtein(target, c)
+        elif abs(len(c) - len(target)) < best_dist:
+            d = bounded_levenshtein(target, c, best_dist - 1)
+            if d < best_dist: best, best_dist = c, d
+        if best_dist == 0: break
+    return best
 
 def format_result_markdown(r: SimilarityResult) -> str:
     return f"## String Similarity 🔤\n**Ratio:** {r.ratio:.1%} | **Distance:** {r.distance} | **Algorithm:** {r.algorithm}"
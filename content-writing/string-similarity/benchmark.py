@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark FuzzyIndex against the linear closest_match scan, and distance_matrix kernels, on synthetic product names."""
+import argparse, os, random, sys, time
+sys.path.append(os.path.dirname(__file__))
+from agent.similarity import closest_match
+from agent.fuzzy_index import FuzzyIndex
+from agent.matrix import distance_matrix
+
+BRANDS = ["acme", "globex", "initech", "umbrella", "stark", "wayne", "hooli", "soylent", "tyrell", "wonka"]
+ITEMS = ["wireless mouse", "usb-c cable", "laptop stand", "mechanical keyboard", "noise cancelling headphones",
+         "portable charger", "webcam", "desk lamp", "monitor arm", "ergonomic chair", "smart speaker", "hdmi adapter"]
+
+def make_names(n: int, rng: random.Random) -> list[str]:
+    names = set()
+    while len(names) < n:
+        names.add(f"{rng.choice(BRANDS)} {rng.choice(ITEMS)} {rng.choice(['', 'pro ', 'mini ', 'max '])}{rng.randint(1, 9999)}".replace("  ", " "))
+    return list(names)
+
+def typo(s: str, rng: random.Random) -> str:
+    i = rng.randrange(len(s))
+    return rng.choice([s[:i] + s[i + 1:], s[:i] + rng.choice("aeiourst") + s[i:], s[:i] + rng.choice("aeiourst") + s[i + 1:]])
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark FuzzyIndex vs linear closest_match")
+    p.add_argument("--candidates", type=int, default=20_000)
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--linear-queries", type=int, default=5, help="Queries timed with the original full-DP scan")
+    p.add_argument("--matrix", type=int, default=0, metavar="N", help="Instead, time an N x N distance_matrix")
+    p.add_argument("--workers", type=int, default=1, help="Processes for --matrix")
+    args = p.parse_args()
+    if args.matrix:
+        return bench_matrix(args.matrix, args.workers)
+    rng = random.Random(7)
+    names = make_names(args.candidates, rng)
+    queries = [typo(rng.choice(names), rng) for _ in range(args.queries)]
+    print(f"📊 {len(names):,} candidates, {len(queries)} queries")
+
+    t0 = time.perf_counter()
+    index = FuzzyIndex(names)
+    print(f"  build index        {time.perf_counter() - t0:8.2f} s")
+
+    t0 = time.perf_counter()
+    hits = [index.closest(q) for q in queries]
+    per_index = (time.perf_counter() - t0) / len(queries)
+    print(f"  FuzzyIndex         {per_index * 1000:8.2f} ms/query")
+
+    sample = queries[:args.linear_queries]
+    t0 = time.perf_counter()
+    assert [closest_match(q, names) for q in sample] == hits[:len(sample)]
+    per_bounded = (time.perf_counter() - t0) / len(sample)
+    print(f"  closest_match      {per_bounded * 1000:8.2f} ms/query (banded linear scan)")
+
+    t0 = time.perf_counter()
+    for q in sample:
+        min(names, key=lambda c: levenshtein_dp(q, c))
+    per_full = (time.perf_counter() - t0) / len(sample)
+    print(f"  full DP scan       {per_full * 1000:8.2f} ms/query  → index is {per_full / per_index:,.0f}x faster")
+
+def bench_matrix(n: int, workers: int):
+    names = make_names(n, random.Random(7))
+    print(f"📊 {n:,} x {n:,} distance_matrix ({n * n:,} pairs)")
+    for label, kwargs in [("numpy bit-parallel", {}), ("python bit-parallel", {"use_numpy": False}),
+                          ("numpy, max_distance=3", {"max_distance": 3}),
+                          ("python, max_distance=3", {"use_numpy": False, "max_distance": 3}),
+                          ("jaro_winkler", {"algorithm": "jaro_winkler"})]:
+        t0 = time.perf_counter()
+        distance_matrix(names, workers=workers, **kwargs)
+        elapsed = time.perf_counter() - t0
+        print(f"  {label:<24} {elapsed:8.2f} s  {n * n / elapsed:>12,.0f} pairs/s")
+    sample = names[:max(1, 200_000 // n)]
+    t0 = time.perf_counter()
+    for a in sample:
+        for b in names: levenshtein_dp(a, b)
+    elapsed = time.perf_counter() - t0
+    print(f"  {'row-by-row DP (old)':<24} {elapsed * n / len(sample):8.2f} s  {len(sample) * n / elapsed:>12,.0f} pairs/s (extrapolated)")
+
+def levenshtein_dp(s1: str, s2: str) -> int:
+    """The list-per-row DP that levenshtein() used before the bit-parallel kernel."""
+    if len(s1) < len(s2): return levenshtein_dp(s2, s1)
+    if not s2: return len(s1)
+    prev = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        curr = [i + 1]
+        for j, c2 in enumerate(s2):
+            curr.append(min(prev[j + 1] + 1, curr[j] + 1, prev[j] + (c1 != c2)))
+        prev = curr
+    return prev[-1]
+
+if __name__ == "__main__": main()
@@ -0,0 +1,31 @@
+"""Tests for FuzzyIndex."""
+import random, sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from agent.similarity import levenshtein, closest_match
+from agent.fuzzy_index import FuzzyIndex, qgrams
+
+WORDS = ["apple", "apply", "ample", "maple", "applet", "pineapple", "grape", "grapes", "banana", "bandana", ""]
+
+def test_qgrams_multiset(): assert qgrams("aaa", 2) == [("\x00a", 1), ("aa", 1), ("aa", 2), ("a\x00", 1)]
+def test_empty_index(): assert FuzzyIndex().closest("x") == "" and FuzzyIndex().top_k("x") == []
+def test_duplicates_ignored(): assert len(FuzzyIndex(["a", "b", "a"])) == 2
+def test_bad_q():
+    with pytest.raises(ValueError): FuzzyIndex(q=0)
+def test_top_k(): assert FuzzyIndex(WORDS).top_k("appel", 2) == [("apple", 2), ("apply", 2)]
+def test_search(): assert FuzzyIndex(WORDS).search("grap", 1) == [("grape", 1)]
+def test_max_distance(): assert FuzzyIndex(WORDS).top_k("zzzzzz", 3, max_distance=2) == []
+def test_batch(): assert FuzzyIndex(WORDS).batch_top_k(["banan", "banan", "maple"]) == [[("banana", 1)], [("banana", 1)], [("maple", 0)]]
+
+@pytest.mark.parametrize("q", [1, 2, 3])
+def test_matches_linear_scan(q):
+    rng = random.Random(q)
+    rand = lambda: "".join(rng.choice("abcde") for _ in range(rng.randint(0, 10)))
+    cands = list(dict.fromkeys(rand() for _ in range(300)))
+    index = FuzzyIndex(cands, q=q)
+    for _ in range(100):
+        query = rand()
+        ranked = sorted((levenshtein(query, c), i) for i, c in enumerate(cands))
+        assert index.top_k(query, 5) == [(cands[i], d) for d, i in ranked[:5]]
+        assert index.search(query, 2) == [(cands[i], d) for d, i in ranked if d <= 2]
+        assert index.closest(query) == closest_match(query, cands)
@@ -0,0 +1,48 @@
+"""Tests for distance_matrix and the bit-parallel kernels."""
+import random, sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import agent.matrix as matrix
+from agent.matrix import distance_matrix
+from agent.similarity import myers_levenshtein, similarity_ratio, jaro_winkler
+
+def _dp(s1, s2):
+    prev = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        curr = [i + 1]
+        for j, c2 in enumerate(s2): curr.append(min(prev[j + 1] + 1, curr[j] + 1, prev[j] + (c1 != c2)))
+        prev = curr
+    return prev[-1]
+
+def _strings(seed, n):
+    rng = random.Random(seed)
+    # lengths straddle the 64-bit word so both kernels run
+    return ["".join(rng.choice("abcé ") for _ in range(rng.randint(0, rng.choice([8, 40, 64, 90])))) for _ in range(n)]
+
+A, B = _strings(1, 40), _strings(2, 30)
+EXPECTED = [[_dp(a, b) for b in B] for a in A]
+
+def test_myers_matches_dp():
+    for a, row in zip(A, EXPECTED):
+        assert [myers_levenshtein(a, b) for b in B] == row
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_levenshtein_matrix(use_numpy): assert distance_matrix(A, B, use_numpy=use_numpy) == EXPECTED
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("k", [0, 2, 50])
+def test_max_distance(use_numpy, k):
+    assert distance_matrix(A, B, max_distance=k, use_numpy=use_numpy) == [[min(d, k + 1) for d in row] for row in EXPECTED]
+
+def test_ratio(): assert distance_matrix(A, B, algorithm="ratio") == [[similarity_ratio(a, b) for b in B] for a in A]
+def test_jaro_winkler(): assert distance_matrix(A[:5], B, algorithm="jaro_winkler") == [[jaro_winkler(a, b) for b in B] for a in A[:5]]
+def test_square_default(): assert distance_matrix(["cat", "bat", ""]) == [[0, 1, 3], [1, 0, 3], [3, 3, 0]]
+def test_empty(): assert distance_matrix([], B) == [] and distance_matrix(["a"], []) == [[]]
+
+def test_process_pool(monkeypatch):
+    monkeypatch.setattr(matrix, "PARALLEL_MIN_CELLS", 1)
+    assert distance_matrix(A, B, workers=2) == EXPECTED
+
+def test_bad_arguments():
+    with pytest.raises(ValueError): distance_matrix(A, B, algorithm="hamming")
+    with pytest.raises(ValueError): distance_matrix(A, B, algorithm="ratio", max_distance=2)
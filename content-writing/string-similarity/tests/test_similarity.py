@@ -1,7 +1,7 @@
 """Tests for String Similarity."""
 import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from agent.similarity import levenshtein, jaro_winkler, similarity_ratio, compare, closest_match, format_result_markdown
+from agent.similarity import levenshtein, bounded_levenshtein, jaro_winkler, similarity_ratio, compare, closest_match, format_result_markdown
 
 def test_same(): assert levenshtein("abc", "abc") == 0
 def test_insert(): assert levenshtein("abc", "abcd") == 1
@@ -19,3 +19,7 @@ def test_closest(): assert closest_match("cat", ["bat", "dog", "car"]) == "bat"
 def test_closest_empty(): assert closest_match("x", []) == ""
 def test_format(): md = format_result_markdown(compare("a", "b")); assert "Similarity" in md
 def test_to_dict(): d = compare("a", "b").to_dict(); assert "ratio" in d
+def test_bounded_within(): assert bounded_levenshtein("kitten", "sitting", 3) == 3
+def test_bounded_cutoff(): assert bounded_levenshtein("kitten", "sitting", 2) == 3
+def test_bounded_length_gap(): assert bounded_levenshtein("a", "abcdef", 1) == 2
+def test_closest_tie_keeps_first(): assert closest_match("cat", ["cut", "bat", "cat "]) == "cut"
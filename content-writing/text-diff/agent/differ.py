@@ -1,7 +1,15 @@
 """Text diff — compare two texts and show additions, deletions, and changes."""
 from __future__ import annotations
 import difflib
+import mmap
+import os
+from array import array
 from dataclasses import dataclass, field
+from typing import Iterator
+
+from agent.engine import MAX_COST, diff_opcodes, grouped_opcodes, intern_lines
+
+EXACT_SIMILARITY_MAX_CHARS = 20_000  # above this, "auto" similarity uses the line-based estimate
 
 @dataclass
 class DiffLine:
@@ -14,17 +22,109 @@ class DiffResult:
     similarity: float = 0.0
     def to_dict(self) -> dict: return {"added": self.added, "removed": self.removed, "similarity": self.similarity}
 
-def diff_texts(text1: str, text2: str) -> DiffResult:
+@dataclass
+class Hunk:
+    """One changed region plus context, with 1-based start lines as in a unified diff header."""
+    old_start: int = 0; old_count: int = 0; new_start: int = 0; new_count: int = 0
+    lines: list[tuple[str, str]] = field(default_factory=list)  # (kind, raw line incl. newline)
+    def header(self) -> str: return f"@@ -{_range(self.old_start, self.old_count)} +{_range(self.new_start, self.new_count)} @@\n"
+    def __str__(self) -> str:
+        return self.header() + "".join(_PREFIX[kind] + line for kind, line in self.lines)
+
+_PREFIX = {"equal": " ", "removed": "-", "added": "+"}
+
+def _range(start: int, count: int) -> str:
+    if count == 1: return str(start)
+    return f"{start - 1 if not count else start},{count}"
+
+class _FileLines:
+    """Lines of a file read through mmap: only ids and offsets are kept, text is decoded on demand."""
+    def __init__(self, path: str, encoding: str = "utf-8"):
+        self.encoding = encoding
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.offsets = array("q", [0])
+    def split(self, table: dict) -> list[int]:
+        ids, offsets, readline = [], self.offsets, self._mm.readline if self._mm else (lambda: b"")
+        pos = 0
+        while line := readline():
+            ids.append(table.setdefault(line, len(table)))
+            pos += len(line); offsets.append(pos)
+        return ids
+    def __getitem__(self, i: int) -> str:
+        return self._mm[self.offsets[i]:self.offsets[i + 1]].decode(self.encoding, errors="replace")
+    def __enter__(self): return self
+    def __exit__(self, *exc):
+        if self._mm: self._mm.close()
+        self._file.close()
+
+def _hunks(lines1, lines2, opcodes, context: int) -> Iterator[Hunk]:
+    for group in grouped_opcodes(opcodes, context):
+        first, last = group[0], group[-1]
+        h = Hunk(first[1] + 1, last[2] - first[1], first[3] + 1, last[4] - first[3])
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                h.lines.extend(("equal", lines1[i]) for i in range(i1, i2)); continue
+            h.lines.extend(("removed", lines1[i]) for i in range(i1, i2))
+            h.lines.extend(("added", lines2[j]) for j in range(j1, j2))
+        yield h
+
+def iter_hunks(text1: str, text2: str, context: int = 3, algorithm: str = "patience") -> Iterator[Hunk]:
+    """Yield only the changed regions of `text1` -> `text2`, each with `context` surrounding lines."""
+    lines1 = text1.splitlines(keepends=True)
+    lines2 = text2.splitlines(keepends=True)
+    yield from _hunks(lines1, lines2, diff_opcodes(*intern_lines(lines1, lines2), algorithm), context)
+
+def iter_file_hunks(path1: str, path2: str, context: int = 3, algorithm: str = "patience",
+                    encoding: str = "utf-8", max_cost: int = MAX_COST) -> Iterator[Hunk]:
+    """`iter_hunks` for two files, memory-mapped rather than read into strings. Lines split on \\n only."""
+    with _FileLines(path1, encoding) as f1, _FileLines(path2, encoding) as f2:
+        table: dict = {}
+        ids1, ids2 = f1.split(table), f2.split(table)
+        del table  # only the ids are needed from here on
+        yield from _hunks(f1, f2, diff_opcodes(ids1, ids2, algorithm, max_cost), context)
+
+def iter_unified_diff(hunks, from_file: str = "original", to_file: str = "modified") -> Iterator[str]:
+    """Stream unified-diff text for `hunks`; nothing at all when there are no changes."""
+    header = f"--- {from_file}\n+++ {to_file}\n"
+    for h in hunks:
+        if header: yield header; header = ""
+        yield str(h)
+
+def diff_texts(text1: str, text2: str, similarity: str = "auto", context: int | None = None,
+               algorithm: str = "patience") -> DiffResult:
+    """Line diff of two texts.
+
+    similarity: "exact" (character-level SequenceMatcher ratio, quadratic), "fast" (share of
+    characters in unchanged lines) or "auto" (exact up to EXACT_SIMILARITY_MAX_CHARS).
+    context: keep only changed lines plus this many equal lines around them in `lines`;
+    None keeps every line. Counts always cover the whole diff.
+    """
     r = DiffResult()
     lines1 = text1.splitlines(keepends=True)
     lines2 = text2.splitlines(keepends=True)
-    r.similarity = round(difflib.SequenceMatcher(None, text1, text2).ratio() * 100, 1)
-    matcher = difflib.SequenceMatcher(None, lines1, lines2)
+    opcodes = diff_opcodes(*intern_lines(lines1, lines2), algorithm)
+    if similarity == "exact" or (similarity == "auto" and len(text1) + len(text2) <= EXACT_SIMILARITY_MAX_CHARS):
+        r.similarity = round(difflib.SequenceMatcher(None, text1, text2).ratio() * 100, 1)
+    elif similarity in ("fast", "auto"):
+        kept = sum(len(line) for tag, i1, i2, _, _ in opcodes if tag == "equal" for line in lines1[i1:i2])
+        total = len(text1) + len(text2)
+        r.similarity = round(200 * kept / total, 1) if total else 100.0
+    else:
+        raise ValueError(f"Unknown similarity mode {similarity!r}; expected 'auto', 'exact' or 'fast'")
+    keep = None
+    if context is not None:  # equal lines that fall within some hunk's context
+        keep = bytearray(len(lines1))
+        for group in grouped_opcodes(opcodes, context):
+            for tag, i1, i2, _, _ in group:
+                if tag == "equal": keep[i1:i2] = b"\x01" * (i2 - i1)
     line_num = 0
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in opcodes:
         if tag == "equal":
-            for line in lines1[i1:i2]:
-                line_num += 1; r.lines.append(DiffLine(line_num, line.rstrip(), "equal"))
+            for i in range(i1, i2):
+                line_num += 1
+                if keep is None or keep[i]: r.lines.append(DiffLine(line_num, lines1[i].rstrip(), "equal"))
         elif tag == "insert":
             for line in lines2[j1:j2]:
                 line_num += 1; r.lines.append(DiffLine(line_num, line.rstrip(), "added")); r.added += 1
@@ -40,9 +140,7 @@ def diff_texts(text1: str, text2: str) -> DiffResult:
     return r
 
 def unified_diff(text1: str, text2: str, from_file: str = "original", to_file: str = "modified") -> str:
-    lines1 = text1.splitlines(keepends=True)
-    lines2 = text2.splitlines(keepends=True)
-    return "".join(difflib.unified_diff(lines1, lines2, fromfile=from_file, tofile=to_file))
+    return "".join(iter_unified_diff(iter_hunks(text1, text2), from_file, to_file))
 
 def word_diff(text1: str, text2: str) -> list[tuple[str, str]]:
     words1 = text1.split(); words2 = text2.split()
@@ -0,0 +1,173 @@
+"""Diff engine — line sequences in, difflib-style opcodes out, in near-linear time on typical inputs.
+
+Lines are interned to ints first, so every comparison below is an int compare. The
+default "patience" algorithm trims the common prefix/suffix, anchors on lines that
+occur exactly once on both sides (longest increasing subsequence), and recurses
+between anchors; regions without unique lines fall back to Myers' O(ND) diff.
+"myers" runs Myers on the whole (trimmed) input. Either way, a region whose edit
+script would cost more than `max_cost` is reported as a plain replacement instead
+of searched exhaustively.
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from collections import Counter
+from typing import Hashable, Iterable, Iterator, Sequence
+
+ALGORITHMS = ("patience", "myers")
+MAX_COST = 2000  # edit distance beyond which a region is treated as wholly replaced
+
+Opcode = tuple[str, int, int, int, int]  # (tag, i1, i2, j1, j2) as in difflib.SequenceMatcher.get_opcodes
+
+
+def intern_lines(*sequences: Iterable[Hashable]) -> list[list[int]]:
+    """Map equal items across all sequences to the same small int."""
+    table: dict = {}
+    return [[table.setdefault(item, len(table)) for item in seq] for seq in sequences]
+
+
+def diff_opcodes(a: Sequence[int], b: Sequence[int], algorithm: str = "patience",
+                 max_cost: int = MAX_COST) -> list[Opcode]:
+    """Opcodes turning `a` into `b`; items must be hashable (ideally interned ints)."""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown diff algorithm {algorithm!r}; expected one of {', '.join(ALGORITHMS)}")
+    return _opcodes(matching_blocks(a, b, algorithm, max_cost), len(a), len(b))
+
+
+def matching_blocks(a: Sequence[int], b: Sequence[int], algorithm: str = "patience",
+                    max_cost: int = MAX_COST) -> list[tuple[int, int, int]]:
+    """Sorted, maximal (i, j, n) runs with a[i:i+n] == b[j:j+n], ending with (len(a), len(b), 0)."""
+    matches: list[tuple[int, int, int]] = []
+    regions = [(0, len(a), 0, len(b))]
+    while regions:
+        a0, a1, b0, b1 = regions.pop()
+        start = a0
+        while a0 < a1 and b0 < b1 and a[a0] == b[b0]: a0 += 1; b0 += 1
+        if a0 > start: matches.append((start, b0 - (a0 - start), a0 - start))
+        end = a1
+        while a1 > a0 and b1 > b0 and a[a1 - 1] == b[b1 - 1]: a1 -= 1; b1 -= 1
+        if a1 < end: matches.append((a1, b1, end - a1))
+        if a0 == a1 or b0 == b1: continue
+        anchors = _unique_anchors(a, b, a0, a1, b0, b1) if algorithm == "patience" else []
+        if anchors:
+            pa, pb = a0, b0
+            for i, j in anchors:
+                matches.append((i, j, 1))
+                regions.append((pa, i, pb, j))
+                pa, pb = i + 1, j + 1
+            regions.append((pa, a1, pb, b1))
+        else:
+            matches.extend(_myers(a, b, a0, a1, b0, b1, max_cost))
+    matches.sort()
+    merged: list[tuple[int, int, int]] = []
+    for i, j, n in matches:
+        if merged and merged[-1][0] + merged[-1][2] == i and merged[-1][1] + merged[-1][2] == j:
+            pi, pj, pn = merged[-1]; merged[-1] = (pi, pj, pn + n)
+        else:
+            merged.append((i, j, n))
+    merged.append((len(a), len(b), 0))
+    return merged
+
+
+def grouped_opcodes(opcodes: Iterable[Opcode], context: int = 3) -> Iterator[list[Opcode]]:
+    """Changed regions with up to `context` equal lines around them (like SequenceMatcher.get_grouped_opcodes)."""
+    codes = list(opcodes)
+    if not codes:
+        return
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+    gap = context + context
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > gap:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _unique_anchors(a, b, a0, a1, b0, b1) -> list[tuple[int, int]]:
+    """Longest increasing run of lines that occur exactly once in both a[a0:a1] and b[b0:b1]."""
+    count_a = Counter(a[a0:a1])
+    count_b = Counter(b[b0:b1])
+    pos_b = {b[j]: j for j in range(b0, b1) if count_b[b[j]] == 1}
+    pairs = [(i, pos_b[a[i]]) for i in range(a0, a1) if count_a[a[i]] == 1 and a[i] in pos_b]
+    if not pairs:
+        return []
+    # Patience sorting: tails[k] is the smallest j ending an increasing run of length k + 1
+    tails: list[int] = []
+    tail_idx: list[int] = []
+    prev = [-1] * len(pairs)
+    for n, (_i, j) in enumerate(pairs):
+        k = bisect_left(tails, j)
+        if k == len(tails): tails.append(j); tail_idx.append(n)
+        else: tails[k] = j; tail_idx[k] = n
+        prev[n] = tail_idx[k - 1] if k else -1
+    out = []
+    n = tail_idx[-1]
+    while n != -1:
+        out.append(pairs[n]); n = prev[n]
+    return out[::-1]
+
+
+def _myers(a, b, a0, a1, b0, b1, max_cost: int) -> list[tuple[int, int, int]]:
+    """Matching runs of a shortest edit script (Myers 1986), or none if it costs more than `max_cost`."""
+    n, m = a1 - a0, b1 - b0
+    limit = min(n + m, max_cost)
+    off = limit + 1
+    v = [0] * (2 * limit + 3)
+    trace = []
+    for d in range(limit + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[off + k - 1] < v[off + k + 1]):
+                x = v[off + k + 1]
+            else:
+                x = v[off + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[a0 + x] == b[b0 + y]: x += 1; y += 1
+            v[off + k] = x
+            if x >= n and y >= m:
+                trace.append(v[off - d:off + d + 1])
+                return _backtrack(trace, n, m, a0, b0)
+        trace.append(v[off - d:off + d + 1])
+    return []
+
+
+def _backtrack(trace, n: int, m: int, a0: int, b0: int) -> list[tuple[int, int, int]]:
+    runs = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        prev = trace[d - 1]  # indexed by k + (d - 1)
+        k = x - y
+        if k == -d or (k != d and prev[k - 1 + d - 1] < prev[k + 1 + d - 1]):
+            pk = k + 1
+            px = prev[pk + d - 1]; sx, sy = px, px - pk + 1  # step down: insertion from b
+        else:
+            pk = k - 1
+            px = prev[pk + d - 1]; sx, sy = px + 1, px - pk  # step right: deletion from a
+        if x > sx: runs.append((a0 + sx, b0 + sy, x - sx))
+        x, y = px, px - pk
+    if x > 0: runs.append((a0, b0, x))
+    return runs
+
+
+def _opcodes(blocks: list[tuple[int, int, int]], len_a: int, len_b: int) -> list[Opcode]:
+    i = j = 0
+    codes: list[Opcode] = []
+    for ai, bj, size in blocks:
+        tag = ""
+        if i < ai and j < bj: tag = "replace"
+        elif i < ai: tag = "delete"
+        elif j < bj: tag = "insert"
+        if tag: codes.append((tag, i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size: codes.append(("equal", ai, i, bj, j))
+    if not codes and not len_a and not len_b:
+        codes.append(("equal", 0, 0, 0, 0))
+    return codes
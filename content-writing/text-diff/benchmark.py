@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Benchmark file diffs: two large generated config dumps with scattered edits."""
+import argparse, os, random, sys, tempfile, time  # pragma: no cover
+sys.path.append(os.path.dirname(__file__))  # pragma: no cover
+from agent.differ import iter_file_hunks, iter_unified_diff  # pragma: no cover
+
+def write_dumps(directory: str, megabytes: int, edits: int, rng: random.Random) -> tuple[str, str]:  # pragma: no cover
+    lines = []  # pragma: no cover
+    size, i = 0, 0  # pragma: no cover
+    while size < megabytes * 1_000_000:  # pragma: no cover
+        line = f"service.{i // 50}.setting_{i % 50} = {rng.randint(0, 10**9)}  # tuned {i % 7}\n"  # pragma: no cover
+        lines.append(line); size += len(line); i += 1  # pragma: no cover
+    old = os.path.join(directory, "old.conf")  # pragma: no cover
+    with open(old, "w") as f: f.writelines(lines)  # pragma: no cover
+    for _ in range(edits):  # pragma: no cover
+        k = rng.randrange(len(lines))  # pragma: no cover
+        op = rng.random()  # pragma: no cover
+        if op < 0.4: lines[k] = lines[k].replace("tuned", "retuned")  # pragma: no cover
+        elif op < 0.7: del lines[k]  # pragma: no cover
+        else: lines.insert(k, f"service.new.{k} = {rng.randint(0, 99)}\n")  # pragma: no cover
+    new = os.path.join(directory, "new.conf")  # pragma: no cover
+    with open(new, "w") as f: f.writelines(lines)  # pragma: no cover
+    return old, new  # pragma: no cover
+
+def main():  # pragma: no cover
+    p = argparse.ArgumentParser(description="Benchmark text-diff on large files")  # pragma: no cover
+    p.add_argument("--mb", type=int, default=50, help="Size of each generated file")  # pragma: no cover
+    p.add_argument("--edits", type=int, default=500)  # pragma: no cover
+    p.add_argument("--algorithm", choices=["patience", "myers"], default="patience")  # pragma: no cover
+    args = p.parse_args()  # pragma: no cover
+    with tempfile.TemporaryDirectory() as tmp:  # pragma: no cover
+        old, new = write_dumps(tmp, args.mb, args.edits, random.Random(1))  # pragma: no cover
+        print(f"📊 {os.path.getsize(old) / 1e6:.0f} MB vs {os.path.getsize(new) / 1e6:.0f} MB, {args.edits} edits")  # pragma: no cover
+        t0 = time.perf_counter()  # pragma: no cover
+        out = sum(len(chunk) for chunk in iter_unified_diff(iter_file_hunks(old, new, algorithm=args.algorithm)))  # pragma: no cover
+        print(f"  {args.algorithm:<10} {time.perf_counter() - t0:6.2f} s  ({out:,} bytes of unified diff)")  # pragma: no cover
+
+if __name__ == "__main__": main()  # pragma: no cover
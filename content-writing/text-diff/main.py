@@ -13,6 +13,9 @@ from agent.differ import *
 def main():
     parser = argparse.ArgumentParser(description="Compare two texts and show differences")
     parser.add_argument("input", nargs="?", help="Input value")
+    parser.add_argument("other", nargs="?", help="Second file: stream a unified diff of input -> other")
+    parser.add_argument("-U", "--context", type=int, default=3, help="Context lines around each change")
+    parser.add_argument("--algorithm", choices=["patience", "myers"], default="patience", help="Diff algorithm")
     parser.add_argument("--help-agent", action="store_true", help="Show agent info")
     args = parser.parse_args()
 
@@ -20,9 +23,16 @@ def main():
         print("\nText Diff")
         print("=" * len("Text Diff"))
         print("Compare two texts and show differences")
-        print("\nUsage: python main.py <input>")
+        print("\nUsage: python main.py <input>\n       python main.py <old_file> <new_file> [-U N] [--algorithm patience|myers]")
         return
 
+    if args.other:
+        changed = False
+        hunks = iter_file_hunks(args.input, args.other, context=args.context, algorithm=args.algorithm)
+        for chunk in iter_unified_diff(hunks, args.input, args.other):
+            sys.stdout.write(chunk); changed = True
+        sys.exit(1 if changed else 0)  # like diff(1)
+
     print(f"Input: {args.input}")
     print("Agent ready — import from agent.differ for programmatic use.")
 
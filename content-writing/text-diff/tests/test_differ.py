@@ -24,3 +24,27 @@ def test_empty(): r = diff_texts("", ""); assert r.similarity == 100.0
 def test_to_empty(): r = diff_texts("line\n", ""); assert r.removed >= 1
 def test_format(): md = format_result_markdown(diff_texts(T1, T2)); assert "Text Diff" in md
 def test_to_dict(): d = diff_texts(T1, T2).to_dict(); assert "added" in d
+
+from agent.differ import iter_hunks, iter_file_hunks, iter_unified_diff
+import difflib
+
+BIG1 = "".join(f"key{i} = {i}\n" for i in range(200))
+BIG2 = BIG1.replace("key50 = 50\n", "key50 = 51\n").replace("key150 = 150\n", "")
+
+def test_unified_matches_difflib(): assert unified_diff(T1, T2) == "".join(difflib.unified_diff(T1.splitlines(True), T2.splitlines(True), "original", "modified"))
+def test_unified_no_changes(): assert unified_diff(T1, T1) == ""
+def test_hunks_only_changes():
+    hunks = list(iter_hunks(BIG1, BIG2, context=2))
+    assert len(hunks) == 2 and (hunks[0].old_start, hunks[0].old_count, hunks[0].new_count) == (49, 5, 5)
+    assert [k for k, _ in hunks[1].lines] == ["equal", "equal", "removed", "equal", "equal"]
+def test_context_trims_lines():
+    r = diff_texts(BIG1, BIG2, context=1)
+    assert (r.added, r.removed) == (1, 2) and len(r.lines) == 7
+def test_fast_similarity(): assert 98 < diff_texts(BIG1, BIG2, similarity="fast").similarity < 100
+def test_bad_similarity():
+    import pytest
+    with pytest.raises(ValueError): diff_texts("a", "b", similarity="nope")
+def test_file_hunks(tmp_path):
+    (tmp_path / "a").write_text(BIG1); (tmp_path / "b").write_text(BIG2); (tmp_path / "empty").write_text("")
+    assert "".join(iter_unified_diff(iter_file_hunks(tmp_path / "a", tmp_path / "b"))) == unified_diff(BIG1, BIG2)
+    assert "".join(map(str, iter_file_hunks(tmp_path / "empty", tmp_path / "a"))).count("\n+") == 200
@@ -0,0 +1,59 @@
+"""Tests for the diff engine."""
+import random, sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import difflib
+import pytest
+from agent.engine import diff_opcodes, grouped_opcodes, intern_lines, matching_blocks
+
+def _apply(a, b, ops):
+    out = []
+    for tag, i1, i2, j1, j2 in ops:
+        if tag == "equal": assert a[i1:i2] == b[j1:j2]
+        out += a[i1:i2] if tag == "equal" else b[j1:j2]
+    return out
+
+def _lcs(a, b):
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        cur = [0]
+        for j, y in enumerate(b): cur.append(prev[j] + 1 if x == y else max(prev[j + 1], cur[j]))
+        prev = cur
+    return prev[-1]
+
+def _pairs(seed, n=300):
+    rng = random.Random(seed)
+    for _ in range(n):
+        k = rng.choice([3, 10, 40])
+        yield [rng.randint(0, k) for _ in range(rng.randint(0, 30))], [rng.randint(0, k) for _ in range(rng.randint(0, 30))]
+
+def test_intern_lines(): assert intern_lines(["a", "b"], ["b", "c"]) == [[0, 1], [1, 2]]
+def test_identical(): assert diff_opcodes([1, 2], [1, 2]) == [("equal", 0, 2, 0, 2)]
+def test_both_empty(): assert diff_opcodes([], []) == [("equal", 0, 0, 0, 0)]
+def test_insert_delete(): assert diff_opcodes([1, 3], [1, 2, 3]) == [("equal", 0, 1, 0, 1), ("insert", 1, 1, 1, 2), ("equal", 1, 2, 2, 3)]
+def test_unknown_algorithm():
+    with pytest.raises(ValueError): diff_opcodes([1], [2], algorithm="histogram-ish")
+
+@pytest.mark.parametrize("algorithm", ["patience", "myers"])
+def test_opcodes_rebuild_target(algorithm):
+    for a, b in _pairs(1):
+        assert _apply(a, b, diff_opcodes(a, b, algorithm)) == b
+
+def test_myers_is_minimal():
+    for a, b in _pairs(2):
+        assert sum(n for _, _, n in matching_blocks(a, b, "myers")) == _lcs(a, b)
+
+def test_max_cost_gives_replace(): assert diff_opcodes(list(range(50)), list(range(50, 100)), "myers", max_cost=5) == [("replace", 0, 50, 0, 50)]
+
+def test_patience_anchors_on_unique_lines():
+    # the unique "b" anchors the match, so the whole first block is the deletion
+    a = ["{", "a", "}", "{", "b", "}"]
+    b = ["{", "b", "}"]
+    assert diff_opcodes(*intern_lines(a, b)) == [("equal", 0, 1, 0, 1), ("delete", 1, 4, 1, 1), ("equal", 4, 6, 1, 3)]
+
+def test_grouped_matches_difflib():
+    for a, b in _pairs(3):
+        sm = difflib.SequenceMatcher(None, a, b)
+        for n in (0, 3):
+            assert list(grouped_opcodes(sm.get_opcodes(), n)) == list(sm.get_grouped_opcodes(n))
+
+def test_grouped_empty_input(): assert list(grouped_opcodes([])) == []
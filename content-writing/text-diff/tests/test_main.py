@@ -37,3 +37,14 @@ def test_main_block():
     script_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "main.py")
     with patch("sys.argv", ["main.py", "--help-agent"]):
         runpy.run_path(script_path, run_name="__main__")
+
+def test_main_diff_files(capsys, tmp_path):
+    old, new = tmp_path / "old.txt", tmp_path / "new.txt"
+    old.write_text("a\nb\nc\n"); new.write_text("a\nB\nc\n")
+    with patch("sys.argv", ["main.py", str(old), str(new), "-U", "0"]):
+        try:
+            main()
+        except SystemExit as e:
+            assert e.code == 1
+    out = capsys.readouterr().out
+    assert "@@ -2 +2 @@\n-b\n+B\n" in out
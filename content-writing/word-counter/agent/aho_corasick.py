@@ -0,0 +1,105 @@
+"""Aho-Corasick automaton — count many keywords in one left-to-right scan of a text stream.
+
+Counts follow `re.findall(r'\\b' + re.escape(keyword) + r'\\b', text)` for every keyword
+independently: matches need a word boundary on both sides, and one keyword's matches
+never overlap each other (different keywords may overlap, e.g. "new york" and "york").
+"""
+from __future__ import annotations
+import re
+from collections import deque
+
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+class KeywordCounter:
+    """Feed text in pieces with `feed`, then `close`; `counts` maps keyword -> matches."""
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self.counts = {k: 0 for k in self.keywords}
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]  # keyword indexes ending at each state
+        for idx, kw in enumerate(self.keywords):
+            state = 0
+            for c in kw:
+                nxt = goto[state].get(c)
+                if nxt is None:
+                    nxt = goto[state][c] = len(goto)
+                    goto.append({}); out.append([])
+                state = nxt
+            out[state].append(idx)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and c not in goto[f]: f = fail[f]
+                fail[nxt] = goto[f].get(c, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        self._goto, self._fail, self._out = goto, fail, out
+        # From the root, only a keyword's first character can make progress; re skips to it in C
+        self._first = re.compile("[" + "".join(re.escape(c) for c in goto[0]) + "]") if goto[0] else None
+        self._lengths = [len(k) for k in self.keywords]
+        self._starts_word = [_is_word(k[0]) for k in self.keywords]
+        self._ends_word = [_is_word(k[-1]) for k in self.keywords]
+        self._last_end = [-1] * len(self.keywords)
+        self._state = 0
+        self._pos = 0  # absolute offset of the next character
+        self._window = ""  # recent text, for boundary checks before a match's first character
+        self._pending: list[tuple[int, int]] = []  # (keyword, start) ending at the last character seen
+
+    def feed(self, text: str):
+        if not self.keywords or not text:
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        lengths = self._lengths
+        window = self._window + text
+        base = self._pos - len(self._window)  # absolute offset of window[0]
+        if self._pending:
+            self._settle(self._pending, _is_word(text[0]), window, base)
+            self._pending = []
+        state = self._state
+        pos = self._pos
+        last = len(text) - 1
+        first = self._first
+        n = 0
+        while n <= last:
+            if not state:
+                m = first.search(text, n)
+                if m is None: break
+                n = m.start()
+            c = text[n]
+            while state and c not in goto[state]: state = fail[state]
+            state = goto[state].get(c, 0)
+            if out[state]:
+                ends = [(k, pos + n - lengths[k] + 1) for k in out[state]]
+                if n == last:
+                    self._pending = ends  # the character after the match hasn't arrived yet
+                else:
+                    self._settle(ends, _is_word(text[n + 1]), window, base)
+            n += 1
+        self._state = state
+        self._pos = pos + len(text)
+        keep = max(lengths) + 1
+        self._window = window[-keep:]
+
+    def close(self) -> dict[str, int]:
+        if self._pending:
+            self._settle(self._pending, False, self._window, self._pos - len(self._window))
+            self._pending = []
+        return self.counts
+
+    def _settle(self, ends, next_is_word: bool, window: str, base: int):
+        for k, start in ends:
+            if self._ends_word[k] == next_is_word:
+                continue  # \b after the match fails
+            before = start - base - 1
+            prev_is_word = before >= 0 and _is_word(window[before])
+            if prev_is_word == self._starts_word[k] or start < self._last_end[k]:
+                continue
+            self._last_end[k] = start + self._lengths[k]
+            self.counts[self.keywords[k]] += 1
@@ -1,8 +1,8 @@
 """Word counter — count words, characters, sentences, and reading time."""
 from __future__ import annotations
-import re
 from dataclasses import dataclass, field
-from collections import Counter
+
+from agent.stats import STOP_WORDS, TextStats, count_syllables, stats_for_file  # STOP_WORDS is re-exported as public API
 
 @dataclass
 class WordCountResult:
@@ -12,40 +12,39 @@ class WordCountResult:
     unique_words: int = 0; avg_word_length: float = 0
     def to_dict(self) -> dict: return {"words": self.words, "characters": self.characters, "sentences": self.sentences, "reading_time_min": self.reading_time_min}
 
-STOP_WORDS = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "is", "was", "it", "this", "that", "be", "are", "were", "i", "you", "we", "they"}
-
 def count_words(text: str, wpm: int = 200) -> WordCountResult:
+    return result_from_stats(TextStats().feed(text).close(), wpm)
+
+def count_file(path: str, wpm: int = 200, exact: bool = True) -> WordCountResult:
+    """count_words for a file streamed in chunks ("-" reads stdin); exact=False bounds memory."""
+    return result_from_stats(stats_for_file(path, exact=exact), wpm)
+
+def result_from_stats(stats: TextStats, wpm: int = 200) -> WordCountResult:
     r = WordCountResult()
-    r.characters = len(text)
-    r.characters_no_spaces = len(text.replace(" ", ""))
-    r.lines = text.count("\n") + 1 if text else 0
-    r.paragraphs = len([p for p in text.split("\n\n") if p.strip()])
-    words = re.findall(r'\b\w+\b', text.lower())
-    r.words = len(words)
-    r.sentences = len(re.findall(r'[.!?]+', text))
+    r.characters = stats.characters
+    r.characters_no_spaces = stats.characters - stats.spaces
+    r.lines = stats.newlines + 1 if stats.characters else 0
+    r.paragraphs = stats.paragraphs
+    r.words = stats.words
+    r.sentences = stats.sentences
     r.reading_time_min = round(r.words / wpm, 1)
-    r.unique_words = len(set(words))
-    r.avg_word_length = round(sum(len(w) for w in words) / max(len(words), 1), 1)
-    content_words = [w for w in words if w not in STOP_WORDS]
-    counter = Counter(content_words)
-    r.top_words = [(w, c) for w, c in counter.most_common(10)]
+    r.unique_words = stats.unique_words
+    r.avg_word_length = round(stats.word_chars / max(r.words, 1), 1)
+    r.top_words = stats.top_words(10)
     return r
 
 def keyword_density(text: str, keyword: str) -> float:
-    r = count_words(text)
-    kw_count = len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', text.lower()))
-    return round(kw_count / max(r.words, 1) * 100, 2)
+    return keyword_densities(text, [keyword]).get(keyword.lower(), 0.0)
+
+def keyword_densities(text: str, keywords: list[str]) -> dict[str, float]:
+    """Density (% of words) of every keyword, found in one Aho-Corasick scan; keys are lowercased."""
+    return TextStats(keywords).feed(text).close().keyword_densities()
 
 def flesch_reading_ease(text: str) -> float:
-    words = re.findall(r'\b\w+\b', text)
-    sentences = max(len(re.findall(r'[.!?]+', text)), 1)
-    syllables = sum(_count_syllables(w) for w in words)
-    if not words: return 0
-    return round(206.835 - 1.015 * (len(words) / sentences) - 84.6 * (syllables / len(words)), 1)
+    return TextStats().feed(text).close().flesch_reading_ease()
 
 def _count_syllables(word: str) -> int:
-    word = word.lower().rstrip("e")
-    return max(1, len(re.findall(r'[aeiou]', word)))
+    return count_syllables(word)
 
 def compare_texts(text1: str, text2: str) -> dict:
     r1, r2 = count_words(text1), count_words(text2)
@@ -0,0 +1,132 @@
+"""Single-pass text statistics — one tokenizer scan per chunk feeds every accumulator.
+
+`TextStats` accepts text in arbitrary pieces (a file read in chunks, a whole corpus)
+and produces the same numbers `count_words`, `flesch_reading_ease` and
+`keyword_density` compute for one string. Each piece is scanned once with a combined
+word/sentence-punctuation regex; syllables are computed once per distinct word per
+piece rather than per occurrence.
+"""
+from __future__ import annotations
+import re
+import sys
+from collections import Counter
+from typing import Iterable
+
+from agent.aho_corasick import KeywordCounter
+from agent.sketches import DistinctCounter, SpaceSaving
+
+CHUNK_SIZE = 1 << 20
+_TOKENS = re.compile(r"(\w+)|[.!?]+")  # sentence-ending runs come back as "" (no group match)
+_PARAGRAPH_BREAK = re.compile(r"\n\n+")
+_NON_SPACE = re.compile(r"\S")
+
+STOP_WORDS = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "is", "was", "it", "this", "that", "be", "are", "were", "i", "you", "we", "they"}
+
+
+def count_syllables(word: str) -> int:
+    word = word.lower().rstrip("e")
+    return max(1, sum(map(word.count, "aeiou")))
+
+
+class TextStats:
+    """Accumulates word, sentence, paragraph, syllable, top-word and keyword statistics.
+
+    exact=False bounds memory for very large corpora: unique words switch to a
+    HyperLogLog past `exact_limit` distinct words and top words are kept in a
+    `top_capacity`-entry SpaceSaving summary instead of a full Counter.
+    """
+
+    def __init__(self, keywords: Iterable[str] = (), exact: bool = True,
+                 exact_limit: int = 100_000, top_capacity: int = 10_000):
+        self.stop_words = STOP_WORDS
+        self.exact = exact
+        self.characters = self.spaces = self.newlines = 0
+        self.words = self.sentences = self.paragraphs = 0
+        self.word_chars = self.syllables = 0
+        self.counts: Counter = Counter()  # every lowercased word (exact mode)
+        self.distinct = None if exact else DistinctCounter(exact_limit)
+        self.top = None if exact else SpaceSaving(top_capacity)
+        self.keywords = KeywordCounter(k.lower() for k in keywords)
+        self._carry = ""  # unfinished token (and any newline run before it) held for the next piece
+        self._in_paragraph = False
+        self._closed = False
+
+    def feed(self, text: str) -> "TextStats":
+        if not text: return self
+        self.characters += len(text)
+        self.spaces += text.count(" ")
+        self.newlines += text.count("\n")
+        text = self._carry + text
+        # Process up to the last whitespace so no word, punctuation run or paragraph break is split
+        cut = len(text) - 1
+        while cut >= 0 and not text[cut].isspace(): cut -= 1
+        if cut < 0:
+            self._carry = text
+            return self
+        while cut and text[cut] == "\n" and text[cut - 1] == "\n": cut -= 1
+        self._carry = text[cut:]
+        self._scan(text[:cut])
+        return self
+
+    def close(self) -> "TextStats":
+        if not self._closed:
+            self._scan(self._carry)
+            self._carry = ""
+            if self._in_paragraph: self.paragraphs += 1
+            self.keywords.close()
+            self._closed = True
+        return self
+
+    def _scan(self, text: str):
+        if not text: return
+        tokens = Counter(_TOKENS.findall(text))
+        self.sentences += tokens.pop("", 0)
+        lowered: Counter = Counter()
+        for word, n in tokens.items(): lowered[word.lower()] += n
+        self.words += sum(lowered.values())
+        self.word_chars += sum(len(w) * n for w, n in lowered.items())
+        self.syllables += sum(count_syllables(w) * n for w, n in lowered.items())
+        if self.exact:
+            self.counts.update(lowered)
+        else:
+            self.distinct.update(lowered)
+            self.top.update({w: n for w, n in lowered.items() if w not in self.stop_words})
+        if self.keywords.keywords: self.keywords.feed(text.lower())
+        start = 0
+        for brk in _PARAGRAPH_BREAK.finditer(text):
+            if self._in_paragraph or _NON_SPACE.search(text, start, brk.start()): self.paragraphs += 1
+            self._in_paragraph = False
+            start = brk.end()
+        if not self._in_paragraph and _NON_SPACE.search(text, start): self._in_paragraph = True
+
+    # ─── Results ─────────────────────────────────────────────────
+
+    @property
+    def unique_words(self) -> int:
+        return len(self.counts) if self.exact else self.distinct.count()
+
+    def top_words(self, k: int = 10) -> list[tuple[str, int]]:
+        if not self.exact: return self.top.top(k)
+        content = Counter({w: n for w, n in self.counts.items() if w not in self.stop_words})
+        return content.most_common(k)
+
+    def flesch_reading_ease(self) -> float:
+        if not self.words: return 0
+        sentences = max(self.sentences, 1)
+        return round(206.835 - 1.015 * (self.words / sentences) - 84.6 * (self.syllables / self.words), 1)
+
+    def keyword_densities(self) -> dict[str, float]:
+        """Matches per 100 words for each keyword given to the constructor (keyed lowercased)."""
+        return {k: round(n / max(self.words, 1) * 100, 2) for k, n in self.keywords.counts.items()}
+
+
+def stats_for_file(path: str, keywords: Iterable[str] = (), exact: bool = True,
+                   chunk_size: int = CHUNK_SIZE, encoding: str = "utf-8") -> TextStats:
+    """Stream a file (or "-" for stdin) through TextStats without reading it whole."""
+    stats = TextStats(keywords, exact=exact)
+    f = sys.stdin if path == "-" else open(path, encoding=encoding, errors="replace")
+    try:
+        while chunk := f.read(chunk_size): stats.feed(chunk)
+    finally:
+        if f is not sys.stdin: f.close()
+    return stats.close()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Benchmark the streaming TextStats engine against the per-metric passes it replaced."""
+import argparse, os, random, re, sys, time  # pragma: no cover
+from collections import Counter  # pragma: no cover
+sys.path.append(os.path.dirname(__file__))  # pragma: no cover
+from agent.stats import TextStats  # pragma: no cover
+
+WORDS = ["the", "install", "package", "configuration", "server", "client", "request", "response", "timeout",  # pragma: no cover
+         "retry", "cache", "token", "deploy", "cluster", "node", "error", "returns", "value", "default", "option"]
+
+def make_corpus(mb: int, rng: random.Random) -> str:  # pragma: no cover
+    parts, size = [], 0  # pragma: no cover
+    while size < mb * 1_000_000:  # pragma: no cover
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 20))).capitalize() + rng.choice([".", "!", "?"])  # pragma: no cover
+        parts.append(sentence + ("\n\n" if rng.random() < 0.2 else " ")); size += len(parts[-1])  # pragma: no cover
+    return "".join(parts)  # pragma: no cover
+
+def legacy(text: str, keywords: list[str]):  # pragma: no cover
+    """What count_words + flesch_reading_ease + one keyword_density per keyword used to do."""
+    def count(text):  # pragma: no cover
+        words = re.findall(r'\b\w+\b', text.lower())  # pragma: no cover
+        len(text.replace(" ", "")); [p for p in text.split("\n\n") if p.strip()]; len(re.findall(r'[.!?]+', text))  # pragma: no cover
+        Counter(w for w in words if w not in ("the",)).most_common(10); len(set(words))  # pragma: no cover
+        return len(words)  # pragma: no cover
+    count(text)  # pragma: no cover
+    words = re.findall(r'\b\w+\b', text)  # pragma: no cover
+    sum(max(1, len(re.findall(r'[aeiou]', w.lower().rstrip("e")))) for w in words)  # pragma: no cover
+    for kw in keywords:  # pragma: no cover
+        count(text); len(re.findall(r'\b' + re.escape(kw) + r'\b', text.lower()))  # pragma: no cover
+
+def main():  # pragma: no cover
+    p = argparse.ArgumentParser(description="Benchmark word-counter on a generated corpus")  # pragma: no cover
+    p.add_argument("--mb", type=int, default=20)  # pragma: no cover
+    p.add_argument("--keywords", type=int, default=10, help="Keywords for density (taken from the vocabulary, plus phrases)")  # pragma: no cover
+    args = p.parse_args()  # pragma: no cover
+    text = make_corpus(args.mb, random.Random(1))  # pragma: no cover
+    keywords = (WORDS + [f"{a} {b}" for a in WORDS for b in WORDS])[:args.keywords]  # pragma: no cover
+    print(f"📊 {len(text) / 1e6:.0f} MB corpus, {len(keywords)} keywords")  # pragma: no cover
+    for label, kws in [("stats only", []), (f"+ {len(keywords)} keywords", keywords)]:  # pragma: no cover
+        t0 = time.perf_counter()  # pragma: no cover
+        stats = TextStats(kws)  # pragma: no cover
+        for i in range(0, len(text), 1 << 20): stats.feed(text[i:i + (1 << 20)])  # pragma: no cover
+        stats.close(); stats.flesch_reading_ease(); stats.keyword_densities()  # pragma: no cover
+        new = time.perf_counter() - t0  # pragma: no cover
+        t0 = time.perf_counter()  # pragma: no cover
+        legacy(text, kws)  # pragma: no cover
+        old = time.perf_counter() - t0  # pragma: no cover
+        print(f"  {label:<16} streaming {new:6.2f} s   legacy passes {old:6.2f} s   ({old / new:.1f}x)")  # pragma: no cover
+
+if __name__ == "__main__": main()  # pragma: no cover
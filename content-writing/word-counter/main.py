@@ -1,12 +1,20 @@
 #!/usr/bin/env python3
 import argparse, sys, os
 sys.path.append(os.path.dirname(__file__))
-from agent.counter import count_words, format_result_markdown
+from agent.counter import format_result_markdown, result_from_stats
+from agent.stats import stats_for_file
 def cmd_count(args):
-    text = sys.stdin.read() if args.file == "-" else open(args.file).read()
-    print(format_result_markdown(count_words(text)))
+    keywords, exact = getattr(args, "keyword", None) or [], not getattr(args, "approx", False)
+    stats = stats_for_file(args.file, keywords, exact=exact)  # file or stdin, streamed in chunks, never read whole
+    print(format_result_markdown(result_from_stats(stats)))
+    if keywords:
+        print("\n### Keyword Density")
+        print(", ".join(f"`{k}` {d}%" for k, d in stats.keyword_densities().items()))
 def main():
     p = argparse.ArgumentParser(description="Word Counter"); s = p.add_subparsers(dest="command", required=True)
-    c = s.add_parser("count"); c.add_argument("file", nargs="?", default="-"); c.set_defaults(func=cmd_count)
+    c = s.add_parser("count"); c.add_argument("file", nargs="?", default="-")
+    c.add_argument("-k", "--keyword", action="append", help="Report density of this keyword or phrase (repeatable)")
+    c.add_argument("--approx", action="store_true", help="Bounded memory: HyperLogLog unique count, approximate top words")
+    c.set_defaults(func=cmd_count)
     args = p.parse_args(); args.func(args)
 if __name__ == "__main__": main()
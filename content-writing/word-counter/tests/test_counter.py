@@ -1,7 +1,7 @@
 """Tests for Word Counter."""
 import sys, os, pytest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from agent.counter import count_words, keyword_density, flesch_reading_ease, compare_texts, format_result_markdown, STOP_WORDS
+from agent.counter import count_words, keyword_density, flesch_reading_ease, compare_texts, format_result_markdown, STOP_WORDS, _count_syllables
 
 TEXT = "Hello world. This is a test sentence. Another sentence here."
 PARA = "First paragraph.\n\nSecond paragraph.\n\nThird paragraph."
@@ -18,7 +18,9 @@ def test_empty(): r = count_words(""); assert r.words == 0
 def test_avg_length(): r = count_words("hello world"); assert r.avg_word_length > 0
 def test_keyword_density(): d = keyword_density("test test other", "test"); assert abs(d - 66.67) < 1
 def test_density_zero(): assert keyword_density("hello world", "missing") == 0
+def test_density_empty_keyword(): assert keyword_density("hello world", "") == 0
 def test_flesch(): score = flesch_reading_ease("The cat sat. The dog ran."); assert isinstance(score, float)
+def test_syllables(): assert [_count_syllables(w) for w in ("cat", "banana", "the")] == [1, 3, 1]
 def test_compare(): d = compare_texts("hello", "hello world"); assert d["words_diff"] == 1
 def test_format(): md = format_result_markdown(count_words(TEXT)); assert "Word Count" in md
 def test_to_dict(): d = count_words(TEXT).to_dict(); assert "words" in d
@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import patch, mock_open
+import io
 import sys
 import runpy
 
@@ -13,13 +14,24 @@ def test_cmd_count_stdin(capsys):
     class Args:
         file = "-"
     
-    with patch("sys.stdin.read", return_value="hello world"):
+    with patch("sys.stdin", io.StringIO("hello world")):
         cmd_count(Args())
     
     captured = capsys.readouterr()
     assert "Word Count" in captured.out
     assert "2" in captured.out
 
+def test_cmd_count_stdin_in_chunks(capsys):
+    class Args:
+        file = "-"
+
+    stdin = io.StringIO("word " * 200_000)
+    with patch("sys.stdin", stdin), patch.object(stdin, "read", wraps=stdin.read) as read:
+        cmd_count(Args())
+
+    assert all(call.args and call.args[0] > 0 for call in read.call_args_list)  # never one unbounded read()
+    assert "**Words:** 200000" in capsys.readouterr().out
+
 def test_cmd_count_file(capsys):
     class Args:
         file = "dummy.txt"
@@ -33,10 +45,16 @@ def test_cmd_count_file(capsys):
 
 def test_main():
     with patch("sys.argv", ["main.py", "count", "-"]), \
-         patch("sys.stdin.read", return_value="test text"):
+         patch("sys.stdin", io.StringIO("test text")):
         main()
 
 def test_main_block():
     with patch("sys.argv", ["main.py", "count", "-"]), \
-         patch("sys.stdin.read", return_value="test text"):
+         patch("sys.stdin", io.StringIO("test text")):
         runpy.run_module("main", run_name="__main__")
+
+def test_main_keyword_density(capsys):
+    with patch("sys.argv", ["main.py", "count", "-", "-k", "cat"]), \
+         patch("sys.stdin", io.StringIO("the cat sat on the cat mat")):
+        main()
+    assert "### Keyword Density\n`cat` 28.57%" in capsys.readouterr().out
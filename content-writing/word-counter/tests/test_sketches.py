@@ -0,0 +1,46 @@
+"""Tests for the bounded-memory sketches."""
+import sys, os, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from agent.sketches import DistinctCounter, HyperLogLog, SpaceSaving
+
+def _hll(values, p=10):
+    hll = HyperLogLog(p)
+    for v in values: hll.add(v)
+    return hll
+
+def test_hll_merge_is_union():
+    a, b = _hll(f"w{i}" for i in range(3000)), _hll(f"w{i}" for i in range(2000, 5000))
+    a.merge(b)
+    assert a.registers == _hll(f"w{i}" for i in range(5000)).registers
+    assert abs(a.count() - 5000) / 5000 < 0.1
+
+def test_distinct_add_promotes_past_limit():
+    dc = DistinctCounter(exact_limit=3, p=10)
+    for v in "abcc": dc.add(v)
+    assert dc.exact and dc.count() == 3
+    for v in "de": dc.add(v)
+    assert not dc.exact and not dc.values and dc.count() == 5
+
+@pytest.mark.parametrize("left,right", [(2, 2), (2, 50), (50, 2), (50, 50)])
+def test_distinct_merge_exact_and_sketched(left, right):
+    a, b = DistinctCounter(exact_limit=10), DistinctCounter(exact_limit=10)
+    a.update(f"a{i}" for i in range(left))
+    b.update(f"b{i}" for i in range(right))
+    a.merge(b)
+    assert a.exact == (left + right <= 10)
+    assert a.count() == left + right if a.exact else abs(a.count() - (left + right)) <= 1
+
+def test_distinct_merge_exact_overflow_promotes():
+    a, b = DistinctCounter(exact_limit=5, p=10), DistinctCounter(exact_limit=5, p=10)
+    a.update("abc"); b.update("def")
+    a.merge(b)
+    assert not a.exact and a.count() == 6
+
+def test_space_saving_merge_adds_other_floor_to_untracked_items():
+    mine, other = SpaceSaving(capacity=2), SpaceSaving(capacity=2)
+    mine.update({"a": 10, "b": 1})
+    other.update({"c": 5, "d": 3})  # full, so anything it does not track was seen at most 3 times
+    mine.merge(other)
+    assert mine.counts == {"a": 13, "c": 6}  # a may have been one of other's unseen items; c enters at mine's floor
+    assert mine.errors == {"a": 3, "c": 1}
+    assert all(c - mine.errors[w] <= {"a": 10, "c": 5}[w] <= c for w, c in mine.counts.items())
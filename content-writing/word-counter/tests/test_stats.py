@@ -0,0 +1,75 @@
+"""Tests for the streaming TextStats engine and keyword scanning."""
+import sys, os, re, random, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from agent.stats import TextStats, stats_for_file
+from agent.aho_corasick import KeywordCounter
+from agent.counter import count_words, count_file, keyword_densities, result_from_stats
+
+DOC = "The cat sat.  The cat ran!\n\n\nA new paragraph... about cats?\n\nEnd"
+
+def _chunked(text, seed, **kw):
+    rng, stats, i = random.Random(seed), TextStats(**kw), 0
+    while i < len(text):
+        j = i + rng.randint(1, 5); stats.feed(text[i:j]); i = j
+    return stats.close()
+
+@pytest.mark.parametrize("seed", range(5))
+def test_chunking_does_not_change_results(seed):
+    assert vars(result_from_stats(_chunked(DOC, seed))) == vars(count_words(DOC))
+
+def test_counts():
+    r = count_words(DOC)
+    assert (r.words, r.sentences, r.paragraphs, r.lines) == (12, 4, 3, 6)
+    assert r.top_words[0] == ("cat", 2)
+
+def test_paragraph_break_split_across_chunks():
+    stats = TextStats().feed("one\n").feed("\ntwo").close()
+    assert stats.paragraphs == 2
+
+def test_flesch(): assert TextStats().feed("The cat sat. The dog ran.").close().flesch_reading_ease() == 119.2
+
+def test_keyword_densities():
+    d = keyword_densities("New York is not york. new york!", ["New York", "york", "missing"])
+    assert d == {"new york": 28.57, "york": 42.86, "missing": 0.0}
+
+def test_keyword_counter_matches_regex():
+    rng = random.Random(7)
+    for _ in range(300):
+        text = "".join(rng.choice("ab -.") for _ in range(rng.randint(0, 40)))
+        kws = list({"".join(rng.choice("ab -.") for _ in range(rng.randint(1, 3))) for _ in range(4)})
+        kc = KeywordCounter(kws)
+        for i in range(0, len(text), 3): kc.feed(text[i:i + 3])
+        assert kc.close() == {k: len(re.findall(r"\b" + re.escape(k) + r"\b", text)) for k in kws}
+
+def test_approximate_mode():
+    text = " ".join(f"w{i % 5000}" + (" zebra" if i % 100 == 0 else "") for i in range(20000))
+    stats = TextStats(exact=False, exact_limit=1000, top_capacity=50)
+    for i in range(0, len(text), 4096): stats.feed(text[i:i + 4096])
+    stats.close()
+    assert abs(stats.unique_words - 5001) / 5001 < 0.05
+    assert stats.top_words(1)[0][0] == "zebra"
+
+def test_approximate_top_word_spread_across_chunks():
+    # "zebra" is the rarest word of every piece, but the most common one overall
+    stats = TextStats(exact=False, exact_limit=1000, top_capacity=50)
+    stats.feed(" ".join(f"w{i} w{i} w{i}" for i in range(50)) + " zebra ")
+    for i in range(500): stats.feed(f"zebra x{i} ")
+    stats.close()
+    assert stats.top_words(1)[0][0] == "zebra"  # 501 of 1,151 words > N / capacity, so always tracked
+
+def test_count_crlf_file(tmp_path):
+    text = "First paragraph.\n\nSecond one.\n\nThird."
+    p = tmp_path / "crlf.txt"; p.write_bytes(text.replace("\n", "\r\n").encode())
+    stats = stats_for_file(str(p), chunk_size=5)  # chunk borders fall inside "\r\n" pairs
+    assert vars(count_file(str(p))) == vars(count_words(text))
+    assert (stats.paragraphs, stats.characters) == (3, len(text))  # "\r" is not counted
+
+def test_count_file(tmp_path):
+    p = tmp_path / "doc.txt"; p.write_text(DOC, encoding="utf-8")
+    assert vars(count_file(str(p))) == vars(count_words(DOC))
+    assert stats_for_file(str(p), ["cat"], chunk_size=4).keyword_densities() == {"cat": 16.67}
+
+def test_keyword_counter_ignores_empty_chunks():
+    kc = KeywordCounter(["cat"])
+    for chunk in ("", "the c", "", "at", ""): kc.feed(chunk)
+    assert kc.close() == {"cat": 1}
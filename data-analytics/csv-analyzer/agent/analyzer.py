@@ -1,13 +1,21 @@
 """CSV analyzer — analyze CSV data with statistics and column profiling."""
 from __future__ import annotations
-import csv, io, statistics
-from dataclasses import dataclass, field
+import csv, io, itertools, math
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO
+from .sketches import RunningStats, DistinctCounter, SpaceSaving
+
+CHUNK_ROWS = 50_000
+MAX_ISSUES = 100
+TOP_CAPACITY = 1_000  # heavy-hitter counters per column: values seen in > 0.1% of rows are always tracked
 
 @dataclass
 class ColumnProfile:
     name: str = ""; dtype: str = ""; unique: int = 0; nulls: int = 0; total: int = 0
     min_val: str = ""; max_val: str = ""; mean: float = 0; top_values: list = field(default_factory=list)
+    std: float = 0; unique_exact: bool = True
 
 @dataclass
 class CSVResult:
@@ -24,35 +32,113 @@ def _is_number(s: str) -> bool:
     try: float(s); return True
     except: return False
 
+class ColumnAccumulator:
+    """One-pass, mergeable profile of a single column."""
+    def __init__(self, name: str, exact_distinct_limit: int = 10_000, top_capacity: int = TOP_CAPACITY):
+        self.name = name; self.total = 0; self.nulls = 0
+        self.stats = RunningStats()
+        self.str_min = None; self.str_max = None
+        self.distinct = DistinctCounter(exact_distinct_limit)
+        self.top = SpaceSaving(top_capacity)
+    def add_many(self, values: list[str]):
+        # Count the batch once in C, then feed every sketch per distinct value
+        counts = Counter(values)
+        self.total += len(values)
+        nums, weights = [], []
+        for v, c in list(counts.items()):
+            if not v.strip(): self.nulls += c; del counts[v]; continue
+            try: nums.append(float(v)); weights.append(c)
+            except ValueError: pass
+        if not counts: return
+        self.stats.add_batch(nums, weights)
+        lo, hi = min(counts), max(counts)
+        if self.str_min is None or lo < self.str_min: self.str_min = lo
+        if self.str_max is None or hi > self.str_max: self.str_max = hi
+        self.distinct.update(counts); self.top.update(counts)
+    def merge(self, other: ColumnAccumulator):
+        self.total += other.total; self.nulls += other.nulls
+        self.stats.merge(other.stats)
+        if other.str_min is not None and (self.str_min is None or other.str_min < self.str_min): self.str_min = other.str_min
+        if other.str_max is not None and (self.str_max is None or other.str_max > self.str_max): self.str_max = other.str_max
+        self.distinct.merge(other.distinct); self.top.merge(other.top)
+    def profile(self) -> ColumnProfile:
+        p = ColumnProfile(name=self.name, total=self.total, nulls=self.nulls)
+        p.unique = self.distinct.count(); p.unique_exact = self.distinct.exact
+        non_null = self.total - self.nulls
+        p.dtype = "numeric" if self.stats.n > non_null * 0.8 else "string"
+        if non_null:
+            p.top_values = [v for v, _ in self.top.top(5)]
+            if p.dtype == "numeric":
+                p.min_val = str(self.stats.min); p.max_val = str(self.stats.max)
+                p.mean = self.stats.mean; p.std = math.sqrt(self.stats.variance)
+            else: p.min_val = self.str_min; p.max_val = self.str_max
+        return p
+
 def profile_column(name: str, values: list[str]) -> ColumnProfile:
-    p = ColumnProfile(name=name, total=len(values))
-    p.nulls = sum(1 for v in values if not v.strip())
-    non_null = [v for v in values if v.strip()]
-    p.unique = len(set(non_null))
-    p.dtype = detect_type(non_null)
-    if non_null:
-        counter = Counter(non_null)
-        p.top_values = [v for v, _ in counter.most_common(5)]
-        if p.dtype == "numeric":
-            nums = [float(v) for v in non_null if _is_number(v)]
-            if nums: p.min_val = str(min(nums)); p.max_val = str(max(nums)); p.mean = statistics.mean(nums)
-        else: p.min_val = min(non_null); p.max_val = max(non_null)
-    return p
+    acc = ColumnAccumulator(name)
+    acc.add_many(values)
+    return acc.profile()
 
-def analyze_csv(text: str) -> CSVResult:
+def _profile_chunk(names: list[str], columns: list[list[str]], exact_distinct_limit: int, top_capacity: int) -> list[ColumnAccumulator]:
+    """Worker task: fresh accumulators for one chunk of one column group."""
+    accs = []
+    for name, values in zip(names, columns):
+        acc = ColumnAccumulator(name, exact_distinct_limit, top_capacity)
+        acc.add_many(values); accs.append(acc)
+    return accs
+
+def profile_stream(f: IO[str], chunk_rows: int = CHUNK_ROWS, workers: int = 0, delimiter: str = ",",
+                   exact_distinct_limit: int = 10_000, top_capacity: int = TOP_CAPACITY) -> CSVResult:
+    """Profile a CSV stream in one pass, `chunk_rows` rows at a time.
+
+    Memory is bounded by one chunk plus the per-column sketches. With `workers` > 0,
+    each chunk is split into column groups that are profiled in a process pool and
+    merged back (every accumulator is mergeable).
+    """
     r = CSVResult()
-    reader = csv.reader(io.StringIO(text))
-    rows = list(reader)
-    if not rows: return r
-    r.column_names = rows[0]; r.columns = len(rows[0]); r.rows = len(rows) - 1
-    data = rows[1:]
-    for i, col_name in enumerate(r.column_names):
-        values = [row[i] if i < len(row) else "" for row in data]
-        r.profiles.append(profile_column(col_name, values))
-    for row in data:
-        if len(row) != r.columns: r.issues.append(f"Row has {len(row)} columns, expected {r.columns}")
+    reader = csv.reader(f, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None: return r
+    r.column_names = header; r.columns = len(header)
+    accs = [ColumnAccumulator(n, exact_distinct_limit, top_capacity) for n in header]
+    bad_rows = 0
+    pool = ProcessPoolExecutor(workers) if workers > 0 else None
+    groups = [list(range(r.columns))[g::workers] for g in range(workers)] if pool else []
+    pending = []
+    try:
+        while True:
+            rows = list(itertools.islice(reader, chunk_rows))
+            if not rows: break
+            r.rows += len(rows)
+            for row in rows:
+                if len(row) != r.columns:
+                    bad_rows += 1
+                    if bad_rows <= MAX_ISSUES: r.issues.append(f"Row has {len(row)} columns, expected {r.columns}")
+            columns = [[row[i] if i < len(row) else "" for row in rows] for i in range(r.columns)]
+            if pool is None:
+                for acc, values in zip(accs, columns): acc.add_many(values)
+                continue
+            for idx in groups:
+                if idx: pending.append((idx, pool.submit(_profile_chunk, [header[i] for i in idx], [columns[i] for i in idx], exact_distinct_limit, top_capacity)))
+            # Bound in-flight chunks so memory stays proportional to the pool size
+            while len(pending) > 2 * workers:
+                idx, fut = pending.pop(0)
+                for i, part in zip(idx, fut.result()): accs[i].merge(part)
+        for idx, fut in pending:
+            for i, part in zip(idx, fut.result()): accs[i].merge(part)
+    finally:
+        if pool is not None: pool.shutdown()
+    if bad_rows > MAX_ISSUES: r.issues.append(f"... and {bad_rows - MAX_ISSUES} more rows with the wrong column count")
+    r.profiles = [acc.profile() for acc in accs]
     return r
 
+def analyze_csv(text: str) -> CSVResult:
+    return profile_stream(io.StringIO(text))
+
+def analyze_file(path: str, chunk_rows: int = CHUNK_ROWS, workers: int = 0) -> CSVResult:
+    with open(path, newline="", encoding="utf-8") as f:
+        return profile_stream(f, chunk_rows=chunk_rows, workers=workers)
+
 def get_column_stats(text: str, column: str) -> dict:
     r = analyze_csv(text)
     for p in r.profiles:
@@ -63,6 +149,6 @@ def format_result_markdown(r: CSVResult) -> str:
     lines = [f"## CSV Analysis 📊", f"**Rows:** {r.rows} | **Columns:** {r.columns}", ""]
     for p in r.profiles:
         lines.append(f"### `{p.name}` ({p.dtype})")
-        lines.append(f"- Unique: {p.unique} | Nulls: {p.nulls}")
-        if p.dtype == "numeric": lines.append(f"- Range: {p.min_val} - {p.max_val} | Mean: {p.mean:.2f}")
+        lines.append(f"- Unique: {'' if p.unique_exact else '~'}{p.unique} | Nulls: {p.nulls}")
+        if p.dtype == "numeric": lines.append(f"- Range: {p.min_val} - {p.max_val} | Mean: {p.mean:.2f} | Std: {p.std:.2f}")
     return "\n".join(lines)
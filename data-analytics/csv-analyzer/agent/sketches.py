@@ -0,0 +1,127 @@
+"""Mergeable streaming accumulators used by the column profiler."""
+from __future__ import annotations
+import hashlib, heapq, math
+
+class RunningStats:
+    """Count / min / max / Welford mean & variance over a stream of floats."""
+    __slots__ = ("n", "mean", "m2", "min", "max")
+    def __init__(self):
+        self.n = 0; self.mean = 0.0; self.m2 = 0.0; self.min = math.inf; self.max = -math.inf
+    def add(self, x: float):
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+        if x < self.min: self.min = x
+        if x > self.max: self.max = x
+    def add_batch(self, xs: list[float], weights: list[int] | None = None):
+        """Fold in a batch (optionally weighted by occurrence count) via a two-pass batch summary."""
+        if not xs: return
+        batch = RunningStats()
+        if weights is None:
+            batch.n = len(xs); batch.mean = math.fsum(xs) / batch.n
+            batch.m2 = math.fsum((x - batch.mean) ** 2 for x in xs)
+        else:
+            batch.n = sum(weights); batch.mean = math.fsum(x * w for x, w in zip(xs, weights)) / batch.n
+            batch.m2 = math.fsum(w * (x - batch.mean) ** 2 for x, w in zip(xs, weights))
+        batch.min = min(xs); batch.max = max(xs)
+        self.merge(batch)
+    def merge(self, other: RunningStats):
+        if not other.n: return
+        if not self.n:
+            self.n, self.mean, self.m2, self.min, self.max = other.n, other.mean, other.m2, other.min, other.max; return
+        n = self.n + other.n
+        d = other.mean - self.mean
+        # Chan et al. parallel combination
+        self.m2 += other.m2 + d * d * self.n * other.n / n
+        self.mean += d * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min); self.max = max(self.max, other.max)
+    @property
+    def variance(self) -> float: return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+class HyperLogLog:
+    """HyperLogLog cardinality estimator (2**p registers, ~1.04/sqrt(2**p) relative error)."""
+    __slots__ = ("p", "m", "registers")
+    def __init__(self, p: int = 14):
+        self.p = p; self.m = 1 << p; self.registers = bytearray(self.m)
+    def add(self, value: str):
+        h = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+        idx = h >> (64 - self.p)
+        w = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - w.bit_length() + 1
+        if rank > self.registers[idx]: self.registers[idx] = rank
+    def merge(self, other: HyperLogLog):
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        est = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if est <= 2.5 * m and zeros: est = m * math.log(m / zeros)  # linear counting for small ranges
+        return int(round(est))
+
+class DistinctCounter:
+    """Exact set of values until `exact_limit`, then a HyperLogLog."""
+    __slots__ = ("exact_limit", "p", "values", "hll")
+    def __init__(self, exact_limit: int = 10_000, p: int = 14):
+        self.exact_limit = exact_limit; self.p = p; self.values = set(); self.hll = None
+    def add(self, value: str):
+        if self.hll is not None: self.hll.add(value); return
+        self.values.add(value)
+        if len(self.values) > self.exact_limit: self._promote()
+    def update(self, values):
+        if self.hll is None:
+            self.values.update(values)
+            if len(self.values) > self.exact_limit: self._promote()
+        else:
+            for v in values: self.hll.add(v)
+    def _promote(self):
+        self.hll = HyperLogLog(self.p)
+        for v in self.values: self.hll.add(v)
+        self.values = set()
+    def merge(self, other: DistinctCounter):
+        if self.hll is None and other.hll is None:
+            self.values |= other.values
+            if len(self.values) > self.exact_limit: self._promote()
+            return
+        if self.hll is None: self._promote()
+        if other.hll is not None: self.hll.merge(other.hll)
+        else:
+            for v in other.values: self.hll.add(v)
+    @property
+    def exact(self) -> bool: return self.hll is None
+    def count(self) -> int: return len(self.values) if self.hll is None else self.hll.count()
+
+class SpaceSaving:
+    """Space-saving heavy hitters: at most `capacity` counters, exact while distinct <= capacity.
+
+    Once the table is full, an item that is not tracked enters with the smallest tracked
+    count plus its own (the most it could have had unseen), and that floor is kept as
+    its error. Every count is an upper bound, count - error a lower bound, and any item
+    seen more than N / capacity times is tracked. Batches of exact counts and partial
+    summaries from other workers fold in with the same mergeable rule.
+    """
+    __slots__ = ("capacity", "counts", "errors")
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity; self.counts = {}; self.errors = {}
+    @property
+    def floor(self) -> int:
+        """Most times an untracked item can have been seen."""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+    def update(self, counts: dict[str, int]): self._fold(counts, {}, 0)
+    def merge(self, other: SpaceSaving): self._fold(other.counts, other.errors, other.floor)
+    def _fold(self, counts: dict[str, int], errors: dict[str, int], other_floor: int):
+        mine, err, floor = self.counts, self.errors, self.floor
+        if other_floor:
+            for item in mine:
+                if item not in counts: mine[item] += other_floor; err[item] += other_floor
+        for item, c in counts.items():
+            if item in mine: mine[item] += c; err[item] += errors.get(item, 0)
+            else: mine[item] = floor + c; err[item] = floor + errors.get(item, 0)
+        if len(mine) > self.capacity:
+            self.counts = dict(heapq.nlargest(self.capacity, mine.items(), key=lambda kv: kv[1]))
+            self.errors = {item: err[item] for item in self.counts}
+    def top(self, k: int) -> list[tuple[str, int]]:
+        # sorted() is stable, so ties keep first-seen order like Counter.most_common
+        return sorted(self.counts.items(), key=lambda kv: -kv[1])[:k]
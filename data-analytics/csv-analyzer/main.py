@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 import argparse, sys, os
 sys.path.append(os.path.dirname(__file__))
-from agent.analyzer import analyze_csv, format_result_markdown
+from agent.analyzer import analyze_file, profile_stream, format_result_markdown, CHUNK_ROWS
 def cmd_analyze(args):
-    text = sys.stdin.read() if args.file == "-" else open(args.file).read()
-    print(format_result_markdown(analyze_csv(text)))
+    chunk_rows, workers = getattr(args, "chunk_rows", CHUNK_ROWS), getattr(args, "workers", 0)
+    r = profile_stream(sys.stdin, chunk_rows, workers) if args.file == "-" else analyze_file(args.file, chunk_rows, workers)
+    print(format_result_markdown(r))
 def main():
     p = argparse.ArgumentParser(description="CSV Analyzer"); s = p.add_subparsers(dest="command", required=True)
-    a = s.add_parser("analyze"); a.add_argument("file", nargs="?", default="-"); a.set_defaults(func=cmd_analyze)
+    a = s.add_parser("analyze"); a.add_argument("file", nargs="?", default="-")
+    a.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows read per chunk")
+    a.add_argument("--workers", type=int, default=0, help="Profile column groups in N processes"); a.set_defaults(func=cmd_analyze)
     args = p.parse_args(); args.func(args)
 if __name__ == "__main__": main()
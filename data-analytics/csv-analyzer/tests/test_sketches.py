@@ -0,0 +1,86 @@
+"""Tests for the streaming profiler sketches."""
+import sys, os, io, statistics, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from agent.sketches import RunningStats, HyperLogLog, DistinctCounter, SpaceSaving
+from agent.analyzer import profile_stream, analyze_csv
+
+def test_running_stats_matches_statistics():
+    xs = [1.5, 2.0, 8.25, -3.0, 4.0, 4.0]
+    s = RunningStats()
+    for x in xs[:3]: s.add(x)
+    s.add_batch(xs[3:])
+    assert s.n == 6 and s.min == -3.0 and s.max == 8.25
+    assert s.mean == pytest.approx(statistics.mean(xs)) and s.variance == pytest.approx(statistics.variance(xs))
+
+def test_running_stats_weighted_merge():
+    a, b = RunningStats(), RunningStats()
+    a.add_batch([1.0, 2.0], [2, 1]); b.add_batch([3.0])
+    a.merge(b)
+    assert a.n == 4 and a.mean == pytest.approx(statistics.mean([1, 1, 2, 3]))
+
+def test_hll_estimate():
+    h = HyperLogLog()
+    for i in range(50_000): h.add(f"v{i}")
+    assert abs(h.count() - 50_000) / 50_000 < 0.03
+
+def test_hll_merge():
+    a, b = HyperLogLog(), HyperLogLog()
+    for i in range(20_000): a.add(str(i)); b.add(str(i + 10_000))
+    a.merge(b)
+    assert abs(a.count() - 30_000) / 30_000 < 0.03
+
+def test_distinct_counter_promotes():
+    d = DistinctCounter(exact_limit=100)
+    d.update(str(i) for i in range(50))
+    assert d.exact and d.count() == 50
+    d.update(str(i) for i in range(1000))
+    assert not d.exact and abs(d.count() - 1000) < 30
+
+def test_space_saving_top():
+    s = SpaceSaving(capacity=3)
+    s.update({"a": 5, "b": 1, "c": 2}); s.update({"a": 1, "d": 4, "e": 1})
+    assert [k for k, _ in s.top(2)] == ["a", "d"] and len(s.counts) == 3
+
+def test_space_saving_bounds_and_merge():
+    import random
+    from collections import Counter
+    rng = random.Random(5)
+    stream = [f"v{min(int(rng.paretovariate(1.1)), 5000)}" for _ in range(20_000)]
+    truth = Counter(stream)
+    parts = []
+    for i in range(0, len(stream), 500):
+        part = SpaceSaving(capacity=50); part.update(Counter(stream[i:i + 500])); parts.append(part)
+    s = parts[0]
+    for part in parts[1:]: s.merge(part)
+    assert len(s.counts) == 50
+    for item, count in s.counts.items():
+        assert count - s.errors[item] <= truth[item] <= count
+    for item, count in truth.items():
+        if count > len(stream) / 50: assert item in s.counts
+
+def test_heavy_hitter_spread_across_chunks():
+    # HOT is 200 of 60,200 rows, once per chunk, against 150 new values a chunk seen twice each
+    rows, n = [], 0
+    for _ in range(200):
+        rows.append("HOT")
+        for _ in range(150): rows += [f"v{n}", f"v{n}"]; n += 1
+    r = profile_stream(io.StringIO("c\n" + "\n".join(rows)), chunk_rows=301)
+    assert r.profiles[0].top_values[0] == "HOT"
+
+def test_profile_stream_chunks():
+    text = "n,s\n" + "\n".join(f"{i},{'x' if i % 2 else 'y'}" for i in range(1000))
+    r = profile_stream(io.StringIO(text), chunk_rows=64)
+    assert r.rows == 1000 and r.profiles[0].mean == pytest.approx(499.5)
+    assert r.profiles[1].unique == 2 and r.profiles[1].dtype == "string"
+
+def test_profile_stream_workers():
+    text = "a,b,c\n" + "\n".join(f"{i},{i % 7},z{i % 3}" for i in range(500))
+    serial, parallel = analyze_csv(text), profile_stream(io.StringIO(text), chunk_rows=100, workers=2)
+    for p, q in zip(serial.profiles, parallel.profiles):
+        assert (p.unique, p.nulls, p.min_val, p.max_val) == (q.unique, q.nulls, q.min_val, q.max_val)
+        assert p.mean == pytest.approx(q.mean)
+
+def test_issues_capped():
+    text = "a,b\n" + "\n".join("1" for _ in range(150))
+    r = analyze_csv(text)
+    assert len(r.issues) == 101 and "50 more" in r.issues[-1]
@@ -13,6 +13,8 @@ import chardet
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ENCODING_SAMPLE_BYTES = 1024 * 1024
+
 
 @dataclass
 class CleaningReport:
@@ -61,6 +63,18 @@ class CleaningReport:
         return "\n".join(lines)
 
 
+@dataclass
+class ChunkPlan:
+    """Column decisions made once from a sample and applied identically to every chunk."""
+    columns: list[str] = field(default_factory=list)
+    numeric_cols: list[str] = field(default_factory=list)
+    float_cols: list[str] = field(default_factory=list)
+    string_cols: list[str] = field(default_factory=list)
+    date_cols: list[str] = field(default_factory=list)
+    type_fix_cols: list[str] = field(default_factory=list)
+    fill_values: dict = field(default_factory=dict)
+
+
 class CSVCleaner:
     """Clean messy CSV files: encoding, duplicates, missing values, types, whitespace."""
 
@@ -95,21 +109,22 @@ class CSVCleaner:
         self.report.original_columns = len(df.columns)
         return df
 
-    def trim_whitespace(self, df: pd.DataFrame) -> pd.DataFrame:
+    def trim_whitespace(self, df: pd.DataFrame, columns: list[str] | None = None) -> pd.DataFrame:
         """Strip leading/trailing whitespace from all string columns and column names."""
-        count = 0
         # Clean column names
         df.columns = df.columns.str.strip()
 
-        # Clean string values
-        for col in df.select_dtypes(include=["object"]).columns:
-            original = df[col].copy()
-            df[col] = df[col].str.strip()
-            changed = (original != df[col]).sum()
-            count += changed
+        # Clean string values — one vectorised pass over all object columns
+        cols = list(columns) if columns is not None else list(df.select_dtypes(include=["object"]).columns)
+        count = 0
+        if cols:
+            original = df[cols]
+            stripped = original.apply(lambda s: s.str.strip())
+            count = int((stripped.ne(original) & original.notna()).to_numpy().sum())
+            df[cols] = stripped
 
         if count > 0:
-            self.report.whitespace_trimmed = int(count)
+            self.report.whitespace_trimmed += count
             self.report.actions.append(f"Trimmed whitespace in {count} cells")
 
         return df
@@ -121,16 +136,18 @@ class CSVCleaner:
         removed = before - len(df)
 
         if removed > 0:
-            self.report.duplicates_removed = removed
+            self.report.duplicates_removed += removed
             self.report.actions.append(f"Removed {removed} duplicate rows")
 
         return df
 
-    def handle_missing_values(self, df: pd.DataFrame, strategy: str = "drop") -> pd.DataFrame:
+    def handle_missing_values(self, df: pd.DataFrame, strategy: str = "drop",
+                              fill_values: dict | None = None) -> pd.DataFrame:
         """Handle missing values.
 
         Args:
             strategy: 'drop' (remove rows), 'fill_mean' (numeric), 'fill_mode', 'fill_empty'
+            fill_values: Precomputed per-column means/modes (chunked mode); computed from df if omitted
         """
         missing_before = int(df.isnull().sum().sum())
 
@@ -140,15 +157,19 @@ class CSVCleaner:
         if strategy == "drop":
             df = df.dropna().reset_index(drop=True)
         elif strategy == "fill_mean":
-            for col in df.select_dtypes(include=["number"]).columns:
-                df[col] = df[col].fillna(df[col].mean())
+            if fill_values is None:
+                fill_values = df.select_dtypes(include=["number"]).mean().to_dict()
+            df = df.fillna(fill_values)
             # Fill non-numeric with empty string
             df = df.fillna("")
         elif strategy == "fill_mode":
-            for col in df.columns:
-                mode = df[col].mode()
-                if not mode.empty:
-                    df[col] = df[col].fillna(mode[0])
+            if fill_values is None:
+                fill_values = {}
+                for col in df.columns:
+                    mode = df[col].mode()
+                    if not mode.empty:
+                        fill_values[col] = mode[0]
+            df = df.fillna(fill_values)
         elif strategy == "fill_empty":
             df = df.fillna("")
         else:
@@ -158,7 +179,7 @@ class CSVCleaner:
         filled = missing_before - missing_after
 
         if filled > 0:
-            self.report.missing_values_filled = filled
+            self.report.missing_values_filled += filled
             self.report.actions.append(f"Handled {filled} missing values (strategy: {strategy})")
 
         return df
@@ -166,36 +187,39 @@ class CSVCleaner:
     def standardize_dates(self, df: pd.DataFrame, columns: list[str] | None = None,
                          target_format: str = "%Y-%m-%d") -> pd.DataFrame:
         """Standardize date columns to a consistent format."""
-        count = 0
-        date_cols = columns or []
+        parsed_cols = {}
 
-        if not date_cols:
-            # Auto-detect date columns
+        if columns:
+            # Explicit columns: convert every parseable cell, keep the rest unchanged
+            for col in columns:
+                try:
+                    parsed = pd.to_datetime(df[col], format="mixed", errors="coerce")
+                except (ValueError, TypeError):
+                    continue
+                if parsed.notna().any():
+                    parsed_cols[col] = parsed
+        else:
+            # Auto-detect date columns; the successful parse is reused for the conversion
             for col in df.select_dtypes(include=["object"]).columns:
                 try:
-                    pd.to_datetime(df[col], format="mixed")
-                    date_cols.append(col)
+                    parsed_cols[col] = pd.to_datetime(df[col], format="mixed")
                 except (ValueError, TypeError):
                     pass
 
-        for col in date_cols:
-            try:
-                parsed = pd.to_datetime(df[col], format="mixed")
-                df[col] = parsed.dt.strftime(target_format)
-                count += 1
-            except (ValueError, TypeError):
-                pass
+        for col, parsed in parsed_cols.items():
+            df[col] = parsed.dt.strftime(target_format).where(parsed.notna(), df[col])
 
+        count = len(parsed_cols)
         if count > 0:
             self.report.date_standardized = count
             self.report.actions.append(f"Standardized {count} date column(s) to {target_format}")
 
         return df
 
-    def fix_column_types(self, df: pd.DataFrame) -> pd.DataFrame:
+    def fix_column_types(self, df: pd.DataFrame, columns: list[str] | None = None) -> pd.DataFrame:
         """Attempt to convert columns to appropriate types."""
         count = 0
-        for col in df.select_dtypes(include=["object"]).columns:
+        for col in (columns if columns is not None else df.select_dtypes(include=["object"]).columns):
             # Try numeric
             try:
                 df[col] = pd.to_numeric(df[col])
@@ -239,6 +263,164 @@ class CSVCleaner:
 
         return df
 
+    # ─── Chunked mode ─────────────────────────────────────────────
+
+    def infer_plan(self, filepath: str, encoding: str, sample_rows: int = 10_000) -> ChunkPlan:
+        """Infer numeric/date/type-fix columns from the first `sample_rows` rows."""
+        sample = pd.read_csv(filepath, nrows=sample_rows, encoding=encoding, encoding_errors="replace")
+        sample.columns = sample.columns.str.strip()
+        plan = ChunkPlan(columns=list(sample.columns))
+        plan.numeric_cols = list(sample.select_dtypes(include=["number"]).columns)
+        plan.float_cols = list(sample.select_dtypes(include=["floating"]).columns)
+        plan.string_cols = [c for c in plan.columns if c not in plan.numeric_cols]
+
+        probe = CSVCleaner()
+        sample = probe.trim_whitespace(sample, columns=plan.string_cols)
+        for col in plan.string_cols:
+            values = sample[col].dropna()
+            if values.empty:
+                continue
+            try:
+                pd.to_numeric(values)
+                plan.type_fix_cols.append(col)
+                continue
+            except (ValueError, TypeError):
+                pass
+            try:
+                pd.to_datetime(values, format="mixed")
+                plan.date_cols.append(col)
+            except (ValueError, TypeError):
+                pass
+        return plan
+
+    def _trimmed_unique_chunks(self, filepath: str, encoding: str, plan: ChunkPlan,
+                               chunksize: int, remove_dupes: bool):
+        """Yield (chunk, step_cleaner) after whitespace trimming and cross-chunk dedup."""
+        seen_rows = set()
+        reader = pd.read_csv(filepath, chunksize=chunksize, dtype=str, encoding=encoding,
+                             encoding_errors="replace")
+        for chunk in reader:
+            step = CSVCleaner()
+            step.report.original_rows = len(chunk)
+            chunk = step.trim_whitespace(chunk, columns=plan.string_cols)
+            if remove_dupes:
+                hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+                keep = ~pd.Series(hashes).duplicated().to_numpy()
+                keep &= [h not in seen_rows for h in hashes.tolist()]
+                seen_rows.update(hashes[keep].tolist())
+                step.report.duplicates_removed = int((~keep).sum())
+                chunk = chunk[keep].reset_index(drop=True)
+            yield chunk, step
+
+    def _column_fill_values(self, filepath: str, encoding: str, plan: ChunkPlan, strategy: str,
+                            chunksize: int, remove_dupes: bool) -> dict:
+        """Streaming pre-pass for fill values: global means or modes of the deduplicated rows."""
+        numeric = plan.numeric_cols + plan.type_fix_cols
+        cols = numeric if strategy == "fill_mean" else plan.columns
+        sums = {c: 0.0 for c in cols}
+        counts = {c: 0 for c in cols}
+        tallies = {c: {} for c in cols}
+        for chunk, _ in self._trimmed_unique_chunks(filepath, encoding, plan, chunksize, remove_dupes):
+            if strategy == "fill_mean":
+                for c in cols:
+                    values = pd.to_numeric(chunk[c], errors="coerce").astype(float)
+                    sums[c] += float(values.sum())
+                    counts[c] += int(values.count())
+            else:
+                for c in cols:
+                    for value, n in chunk[c].value_counts().items():
+                        tallies[c][value] = tallies[c].get(value, 0) + int(n)
+        if strategy == "fill_mean":
+            return {c: sums[c] / counts[c] for c in cols if counts[c]}
+        fill = {}
+        for c in cols:
+            if tallies[c]:
+                # Like Series.mode(): most frequent, smallest value on ties
+                best = max(tallies[c].values())
+                tied = [v for v, n in tallies[c].items() if n == best]
+                fill[c] = min(pd.to_numeric(pd.Series(tied))) if c in numeric else min(tied)
+        return fill
+
+    def clean_file_chunked(self, input_path: str, output_path: str | None, chunksize: int = 100_000,
+                           missing_strategy: str = "drop", remove_dupes: bool = True,
+                           fix_types: bool = True, standardize_dates_flag: bool = True,
+                           sample_rows: int = 10_000) -> CleaningReport:
+        """Clean a CSV larger than memory, `chunksize` rows at a time.
+
+        Column types and date columns are inferred once from a sample so every chunk is
+        converted the same way; fill values for fill_mean/fill_mode come from a streaming
+        pre-pass; duplicates are tracked across chunks by 64-bit row hash. Cleaned chunks
+        are appended to `output_path` as they are produced (None = don't write) and the
+        report aggregates all chunks.
+        """
+        with open(input_path, "rb") as f:
+            encoding = self.detect_encoding(f.read(ENCODING_SAMPLE_BYTES))
+        if encoding.lower() not in ("utf-8", "ascii"):
+            self.report.encoding_fixed = True
+            self.report.actions.append(f"Converted encoding from {encoding} to UTF-8")
+
+        plan = self.infer_plan(input_path, encoding, sample_rows)
+        self.report.original_columns = len(plan.columns)
+        if missing_strategy in ("fill_mean", "fill_mode"):
+            plan.fill_values = self._column_fill_values(input_path, encoding, plan, missing_strategy,
+                                                        chunksize, remove_dupes)
+
+        logger.info(f"Starting chunked CSV cleaning ({chunksize} rows per chunk)...")
+        type_fixed = set()
+        out = open(output_path, "w", encoding="utf-8", newline="") if output_path else None
+        try:
+            chunks = self._trimmed_unique_chunks(input_path, encoding, plan, chunksize, remove_dupes)
+            for i, (chunk, step) in enumerate(chunks):
+                for col in plan.numeric_cols:
+                    chunk[col] = self._to_numeric_lossless(chunk[col], col, i)
+                    # Keep the whole column's dtype stable across chunks (41.0, never 41 in one chunk)
+                    if col in plan.float_cols and pd.api.types.is_numeric_dtype(chunk[col]):
+                        chunk[col] = chunk[col].astype(float)
+                chunk = step.handle_missing_values(chunk, strategy=missing_strategy,
+                                                   fill_values=plan.fill_values or None)
+                if standardize_dates_flag and plan.date_cols:
+                    chunk = step.standardize_dates(chunk, columns=plan.date_cols)
+                if fix_types:
+                    for col in plan.type_fix_cols:
+                        converted = self._to_numeric_lossless(chunk[col], col, i)
+                        if pd.api.types.is_numeric_dtype(converted):
+                            type_fixed.add(col)
+                        chunk[col] = converted
+
+                self.report.original_rows += step.report.original_rows
+                self.report.duplicates_removed += step.report.duplicates_removed
+                self.report.missing_values_filled += step.report.missing_values_filled
+                self.report.whitespace_trimmed += step.report.whitespace_trimmed
+                self.report.date_standardized = max(self.report.date_standardized, step.report.date_standardized)
+                self.report.final_rows += len(chunk)
+                if out is not None:
+                    chunk.to_csv(out, header=(i == 0), index=False)
+        finally:
+            if out is not None:
+                out.close()
+
+        self.report.type_fixes = len(type_fixed)
+        r = self.report
+        for count, action in ((r.whitespace_trimmed, f"Trimmed whitespace in {r.whitespace_trimmed} cells"),
+                              (r.duplicates_removed, f"Removed {r.duplicates_removed} duplicate rows"),
+                              (r.missing_values_filled, f"Handled {r.missing_values_filled} missing values (strategy: {missing_strategy})"),
+                              (r.date_standardized, f"Standardized {r.date_standardized} date column(s) to %Y-%m-%d"),
+                              (r.type_fixes, f"Fixed types for {r.type_fixes} column(s)")):
+            if count > 0:
+                r.actions.append(action)
+        if output_path:
+            r.actions.append(f"Saved to {output_path}")
+        logger.info(f"Cleaning complete: {r.original_rows} → {r.final_rows} rows")
+        return r
+
+    def _to_numeric_lossless(self, series: pd.Series, col: str, chunk_index: int) -> pd.Series:
+        """Numeric conversion that leaves the chunk's column untouched if any value would be lost."""
+        converted = pd.to_numeric(series, errors="coerce")
+        if (converted.isna() & series.notna()).any():
+            logger.warning(f"Column '{col}' has non-numeric values in chunk {chunk_index}; left as text")
+            return series
+        return converted
+
     def save(self, df: pd.DataFrame, filepath: str, encoding: str = "utf-8"):
         """Save cleaned DataFrame to CSV."""
         df.to_csv(filepath, index=False, encoding=encoding)
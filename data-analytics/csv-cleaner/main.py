@@ -7,15 +7,33 @@ Usage:
     python main.py input.csv --strategy fill_mean   # Fill missing values
     python main.py input.csv --report               # Print quality report
     python main.py input.csv --report --markdown     # Markdown report
+    python main.py big.csv --chunksize 100000       # Stream files larger than RAM
 """
 import argparse
 import sys
 import os
 import json
+from typing import TYPE_CHECKING
 
 sys.path.append(os.path.dirname(__file__))
 
-from agent.cleaner import CSVCleaner
+if TYPE_CHECKING:
+    from agent.cleaner import CSVCleaner
+
+
+def _print_report(cleaner: "CSVCleaner", args):
+    if args.report or args.markdown:
+        if args.markdown:
+            print(cleaner.report.to_markdown())
+        else:
+            report = cleaner.report.to_dict()
+            print(f"\nCleaning Report:")
+            print(f"  Original: {report['original_rows']} rows")
+            print(f"  Final: {report['final_rows']} rows")
+            print(f"  Removed: {report['rows_removed']} rows")
+            print(f"\nActions:")
+            for action in report["actions"]:
+                print(f"  • {action}")
 
 
 def main():
@@ -33,6 +51,7 @@ def main():
     parser.add_argument("--report", action="store_true", help="Print quality report")
     parser.add_argument("--markdown", action="store_true", help="Output report as Markdown")
     parser.add_argument("--dry-run", action="store_true", help="Analyze only, don't save")
+    parser.add_argument("--chunksize", type=int, help="Clean in chunks of N rows, writing output incrementally")
 
     args = parser.parse_args()
 
@@ -40,7 +59,29 @@ def main():
         print(f"Error: File '{args.input}' not found.", file=sys.stderr)
         sys.exit(1)
 
+    # pandas is imported only once there is work to do (keeps --help and usage errors fast)
+    from agent.cleaner import CSVCleaner
+
     cleaner = CSVCleaner()
+    output_path = args.output or args.input.replace(".csv", "_cleaned.csv")
+
+    if args.chunksize:
+        print(f"Cleaning {args.input} in chunks of {args.chunksize} rows...")
+        cleaner.clean_file_chunked(
+            args.input,
+            None if args.dry_run else output_path,
+            chunksize=args.chunksize,
+            missing_strategy=args.strategy,
+            remove_dupes=not args.no_dedup,
+            fix_types=not args.no_types,
+            standardize_dates_flag=not args.no_dates,
+        )
+        _print_report(cleaner, args)
+        if not args.dry_run:
+            print(f"\n✅ Saved cleaned CSV to {output_path}")
+        else:
+            print(f"\n📋 Dry run — no file saved.")
+        return
 
     # Load
     print(f"Loading {args.input}...")
@@ -70,22 +111,10 @@ def main():
     )
 
     # Report
-    if args.report or args.markdown:
-        if args.markdown:
-            print(cleaner.report.to_markdown())
-        else:
-            report = cleaner.report.to_dict()
-            print(f"\nCleaning Report:")
-            print(f"  Original: {report['original_rows']} rows")
-            print(f"  Final: {report['final_rows']} rows")
-            print(f"  Removed: {report['rows_removed']} rows")
-            print(f"\nActions:")
-            for action in report["actions"]:
-                print(f"  • {action}")
+    _print_report(cleaner, args)
 
     # Save
     if not args.dry_run:
-        output_path = args.output or args.input.replace(".csv", "_cleaned.csv")
         cleaner.save(df, output_path)
         print(f"\n✅ Saved cleaned CSV to {output_path}")
     else:
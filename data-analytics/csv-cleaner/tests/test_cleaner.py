@@ -229,3 +229,60 @@ def test_save_and_load_roundtrip():
         assert list(df2.columns) == list(df.columns)
     finally:
         os.unlink(path)
+
+
+# --- Chunked Mode Tests ---
+
+def _write(tmp_path, text, name="in.csv"):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+@pytest.mark.parametrize("strategy", ["drop", "fill_mean", "fill_mode"])
+def test_chunked_matches_in_memory(tmp_path, strategy):
+    """Chunked cleaning produces the same CSV and counts as the in-memory pipeline."""
+    rows = ["name,age,joined"]
+    for i in range(60):
+        n = i % 23
+        rows.append(f"  user{n} ,{'' if n % 5 == 0 else 20 + n},{'2023-01-15' if n % 2 else 'Jan 20 2023'}")
+    src = _write(tmp_path, "\n".join(rows) + "\n")
+
+    full = CSVCleaner()
+    df = full.clean(full.load_csv(filepath=src), missing_strategy=strategy)
+    full.save(df, str(tmp_path / "full.csv"))
+
+    chunked = CSVCleaner()
+    report = chunked.clean_file_chunked(src, str(tmp_path / "chunked.csv"), chunksize=7,
+                                        missing_strategy=strategy)
+    assert (tmp_path / "chunked.csv").read_text() == (tmp_path / "full.csv").read_text()
+    for key in ("original_rows", "final_rows", "duplicates_removed", "missing_values_filled",
+                "whitespace_trimmed", "date_standardized"):
+        assert getattr(report, key) == getattr(full.report, key)
+
+
+def test_chunked_duplicates_across_chunks(tmp_path):
+    """Duplicates split across chunk boundaries are still removed."""
+    src = _write(tmp_path, "a,b\n1,x\n2,y\n1,x\n3,z\n2,y\n")
+    cleaner = CSVCleaner()
+    report = cleaner.clean_file_chunked(src, str(tmp_path / "out.csv"), chunksize=2)
+    assert report.duplicates_removed == 2
+    assert pd.read_csv(tmp_path / "out.csv")["a"].tolist() == [1, 2, 3]
+
+
+def test_chunked_plan_from_sample(tmp_path):
+    """Type decisions come from the sample; later non-numeric values are kept, not coerced."""
+    src = _write(tmp_path, "code,when\n1,2023-01-01\n2,2023-02-01\nX9,2023/03/01\n")
+    cleaner = CSVCleaner()
+    plan = cleaner.infer_plan(src, "utf-8", sample_rows=2)
+    assert plan.numeric_cols == ["code"] and plan.date_cols == ["when"]
+    cleaner.clean_file_chunked(src, str(tmp_path / "out.csv"), chunksize=2, sample_rows=2)
+    out = (tmp_path / "out.csv").read_text().splitlines()
+    assert out[-1] == "X9,2023-03-01"
+
+
+def test_chunked_dry_run(tmp_path):
+    """output_path=None cleans without writing."""
+    src = _write(tmp_path, "a\n1\n1\n")
+    report = CSVCleaner().clean_file_chunked(src, None, chunksize=1)
+    assert report.final_rows == 1 and not any(a.startswith("Saved") for a in report.actions)
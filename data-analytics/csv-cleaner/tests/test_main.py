@@ -166,3 +166,28 @@ def test_main_block(tmp_path):
     csv_file.write_text("name,age\nAlice,30\n")
     with patch('sys.argv', ['main', str(csv_file), '-o', str(tmp_path / 'out.csv')]):
         runpy.run_module('main', run_name='__main__', alter_sys=True)
+
+
+def test_main_chunked(tmp_path):
+    csv_file = tmp_path / "data.csv"
+    csv_file.write_text("name,age\nAlice,30\nAlice,30\nBob,25\n")
+    out = tmp_path / "out.csv"
+    with patch('sys.argv', ['main', str(csv_file), '--chunksize', '1', '--report', '-o', str(out)]):
+        import main
+        captured = StringIO()
+        with patch('sys.stdout', captured):
+            main.main()
+        assert "Removed 1 duplicate rows" in captured.getvalue()
+        assert out.read_text().splitlines() == ["name,age", "Alice,30", "Bob,25"]
+
+
+def test_main_chunked_dry_run(tmp_path):
+    csv_file = tmp_path / "data.csv"
+    csv_file.write_text("name,age\nAlice,30\n")
+    with patch('sys.argv', ['main', str(csv_file), '--chunksize', '10', '--dry-run']):
+        import main
+        captured = StringIO()
+        with patch('sys.stdout', captured):
+            main.main()
+        assert "Dry run" in captured.getvalue()
+        assert not (tmp_path / "data_cleaned.csv").exists()
@@ -1,7 +1,13 @@
 """CSV deduplicator — remove duplicate rows from CSV data."""
 from __future__ import annotations
-import csv, io, hashlib
+import csv, io, hashlib, heapq, os, tempfile
 from dataclasses import dataclass, field
+from typing import IO
+
+DIGEST_SIZE = 16
+# Rough per-key cost of a bytes digest held in a Python set (object header + hash slot)
+SET_ENTRY_OVERHEAD = 100
+SPILL_PARTITIONS = 64
 
 @dataclass
 class DedupeResult:
@@ -10,6 +16,7 @@ class DedupeResult:
     duplicates_removed: int = 0
     duplicate_groups: int = 0
     columns: list[str] = field(default_factory=list)
+    spilled: bool = False
     def to_dict(self) -> dict:
         return {"total_rows": self.total_rows, "unique_rows": self.unique_rows, "duplicates_removed": self.duplicates_removed}
 
@@ -19,27 +26,120 @@ def parse_csv(text: str, delimiter: str = ",") -> tuple[list[str], list[list[str
     if not rows: return [], []
     return rows[0], rows[1:]
 
+def row_digest(row: list[str], columns: list[int] | None = None, digest_size: int = DIGEST_SIZE) -> bytes:
+    """Compact binary blake2b digest of a row (or of its key columns)."""
+    fields = [row[i] for i in columns if i < len(row)] if columns else row
+    # NUL separator: unlike "|", it cannot appear inside CSV text fields
+    return hashlib.blake2b("\x00".join(fields).encode(), digest_size=digest_size).digest()
+
 def row_hash(row: list[str], columns: list[int] | None = None) -> str:
+    """MD5 hex of the "|"-joined row (or key columns); a published value, so it keeps its format.
+
+    Deduplication itself uses `row_digest`.
+    """
     if columns: key = "|".join(row[i] for i in columns if i < len(row))
     else: key = "|".join(row)
     return hashlib.md5(key.encode()).hexdigest()
 
 def deduplicate(headers: list[str], rows: list[list[str]], key_columns: list[int] | None = None, keep: str = "first") -> tuple[list[list[str]], DedupeResult]:
     result = DedupeResult(total_rows=len(rows), columns=headers)
-    seen = {}
+    seen, dup_keys = set(), set()
     unique = []
-    for i, row in enumerate(rows):
-        h = row_hash(row, key_columns)
+    for row in rows:
+        h = row_digest(row, key_columns)
         if h not in seen:
-            seen[h] = [i]
+            seen.add(h)
             unique.append(row)
         else:
-            seen[h].append(i)
+            dup_keys.add(h)
     result.unique_rows = len(unique)
     result.duplicates_removed = result.total_rows - result.unique_rows
-    result.duplicate_groups = sum(1 for indices in seen.values() if len(indices) > 1)
+    result.duplicate_groups = len(dup_keys)
     return unique, result
 
+def dedupe_stream(infile: IO[str], outfile: IO[str], key_columns: list[int] | None = None, delimiter: str = ",",
+                  memory_budget: int | None = None, digest_size: int = DIGEST_SIZE, spill_dir: str | None = None,
+                  partitions: int = SPILL_PARTITIONS) -> DedupeResult:
+    """Stream unique rows from infile to outfile (first occurrence wins, input order kept).
+
+    Only digests are held in memory. If `memory_budget` (bytes) would be exceeded, rows with
+    unseen keys are spilled to `partitions` temp files by digest; each partition is then
+    deduplicated on its own and the survivors are merged back in input order.
+    """
+    reader = csv.reader(infile, delimiter=delimiter)
+    writer = csv.writer(outfile, delimiter=delimiter, lineterminator="\n")  # same line endings as before streaming
+    headers = next(reader, [])
+    result = DedupeResult(columns=headers)
+    if not headers: return result
+    writer.writerow(headers)
+    max_keys = memory_budget // (digest_size + SET_ENTRY_OVERHEAD) if memory_budget else None
+    seen, dup_keys = set(), set()
+    spill = None
+    for ordinal, row in enumerate(reader):
+        result.total_rows += 1
+        h = row_digest(row, key_columns, digest_size)
+        if h in seen:
+            dup_keys.add(h)
+        elif spill is None:
+            seen.add(h)
+            writer.writerow(row)
+            result.unique_rows += 1
+            if max_keys is not None and len(seen) + len(dup_keys) >= max_keys:
+                spill = _SpillPartitions(partitions, spill_dir, delimiter)
+                result.spilled = True
+        else:
+            spill.add(ordinal, h, row)
+    result.duplicate_groups = len(dup_keys)
+    if spill is not None:
+        seen = dup_keys = None  # free before the per-partition passes
+        with spill:
+            unique, groups = spill.merge_into(writer)
+        result.unique_rows += unique
+        result.duplicate_groups += groups
+    result.duplicates_removed = result.total_rows - result.unique_rows
+    return result
+
+class _SpillPartitions:
+    """Digest-partitioned temp files for the out-of-core dedupe path."""
+    def __init__(self, count: int, spill_dir: str | None, delimiter: str):
+        self.dir = tempfile.TemporaryDirectory(prefix="csv-dedupe-", dir=spill_dir)
+        self.delimiter = delimiter
+        self.files = [open(os.path.join(self.dir.name, f"part-{i}.csv"), "w+", newline="", encoding="utf-8") for i in range(count)]
+        self.writers = [csv.writer(f, delimiter=delimiter) for f in self.files]
+    def __enter__(self): return self
+    def __exit__(self, *exc):
+        for f in self.files: f.close()
+        self.dir.cleanup()
+    def add(self, ordinal: int, digest: bytes, row: list[str]):
+        self.writers[digest[0] % len(self.files)].writerow([ordinal, digest.hex(), *row])
+    def _survivors(self, f: IO[str], counts: list[int]):
+        """Yield (ordinal, row) for first occurrences within one partition; counts = [unique, groups]."""
+        f.seek(0)
+        seen, dup_keys = set(), set()
+        for rec in csv.reader(f, delimiter=self.delimiter):
+            h = bytes.fromhex(rec[1])
+            if h in seen:
+                if h not in dup_keys: dup_keys.add(h); counts[1] += 1
+                continue
+            seen.add(h); counts[0] += 1
+            yield int(rec[0]), rec[2:]
+    def merge_into(self, writer) -> tuple[int, int]:
+        for f in self.files: f.flush()
+        kept = []
+        counts = [0, 0]
+        # Deduplicate each partition into its own "kept" file (already in input order) ...
+        for i, f in enumerate(self.files):
+            k = open(os.path.join(self.dir.name, f"kept-{i}.csv"), "w+", newline="", encoding="utf-8")
+            w = csv.writer(k, delimiter=self.delimiter)
+            for ordinal, row in self._survivors(f, counts): w.writerow([ordinal, *row])
+            f.truncate(0)
+            k.seek(0); kept.append(k)
+        self.files.extend(kept)
+        # ... then k-way merge them back by ordinal
+        streams = [((int(rec[0]), rec[1:]) for rec in csv.reader(k, delimiter=self.delimiter)) for k in kept]
+        for _, row in heapq.merge(*streams, key=lambda item: item[0]): writer.writerow(row)
+        return counts[0], counts[1]
+
 def find_duplicates(headers: list[str], rows: list[list[str]], key_columns: list[int] | None = None) -> list[list[list[str]]]:
     groups = {}
     for row in rows:
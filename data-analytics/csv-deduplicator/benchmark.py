@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Benchmark csv-deduplicator: in-memory vs streaming vs disk-spilling on synthetic CSVs."""
+import argparse, csv, io, os, random, sys, tempfile, time, tracemalloc
+sys.path.append(os.path.dirname(__file__))
+from agent.deduplicator import parse_csv, deduplicate, to_csv_string, dedupe_stream
+
+def make_csv(path: str, rows: int, dup_ratio: float, seed: int = 42):
+    rng = random.Random(seed)
+    distinct = max(1, int(rows * (1 - dup_ratio)))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f); w.writerow(["id", "name", "email", "amount"])
+        for _ in range(rows):
+            i = rng.randrange(distinct)
+            w.writerow([i, f"user{i}", f"user{i}@example.com", i % 997])
+
+def run(label: str, fn, trace: bool):
+    if trace: tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    mem = ""
+    if trace: mem = f"  peak {tracemalloc.get_traced_memory()[1] / 2**20:8.1f} MiB"; tracemalloc.stop()
+    print(f"  {label:<22} {elapsed:8.2f} s  {result.total_rows / elapsed:>12,.0f} rows/s{mem}  unique {result.unique_rows:,}")
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark csv-deduplicator")
+    p.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    p.add_argument("--dup-ratio", type=float, default=0.3)
+    p.add_argument("--memory-mb", type=int, default=16, help="Budget for the spilling run")
+    p.add_argument("--trace-memory", action="store_true", help="Report tracemalloc peak (slows every run down)")
+    p.add_argument("--skip-in-memory", action="store_true", help="Skip the whole-file baseline (needs several GB at 10M rows)")
+    args = p.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.rows:
+            src, dst = os.path.join(tmp, f"in-{n}.csv"), os.path.join(tmp, "out.csv")
+            make_csv(src, n, args.dup_ratio)
+            print(f"📊 {n:,} rows ({os.path.getsize(src) / 2**20:.0f} MiB), dup ratio {args.dup_ratio}")
+            if not args.skip_in_memory:
+                def in_memory():
+                    headers, rows = parse_csv(open(src, encoding="utf-8").read())
+                    unique, result = deduplicate(headers, rows)
+                    open(dst, "w", encoding="utf-8").write(to_csv_string(headers, unique))
+                    return result
+                run("in-memory (list)", in_memory, args.trace_memory)
+            def streaming(budget=None):
+                with open(src, newline="", encoding="utf-8") as i, open(dst, "w", newline="", encoding="utf-8") as o:
+                    return dedupe_stream(i, o, memory_budget=budget)
+            run("streaming", streaming, args.trace_memory)
+            run(f"spilling ({args.memory_mb} MiB)", lambda: streaming(args.memory_mb * 2**20), args.trace_memory)
+
+if __name__ == "__main__": main()
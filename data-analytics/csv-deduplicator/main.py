@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
 import argparse, sys, os
 sys.path.append(os.path.dirname(__file__))
-from agent.deduplicator import parse_csv, deduplicate, to_csv_string, format_result_markdown
+from agent.deduplicator import dedupe_stream, format_result_markdown
 def cmd_dedupe(args):
-    text = sys.stdin.read() if args.file == "-" else open(args.file).read()
-    headers, rows = parse_csv(text)
-    unique, result = deduplicate(headers, rows)
+    output, memory_mb = getattr(args, "output", None), getattr(args, "memory_mb", None)
+    keys = [int(c) for c in args.key_columns.split(",")] if getattr(args, "key_columns", None) else None
+    infile = sys.stdin if args.file == "-" else open(args.file, newline="", encoding="utf-8")
+    outfile = open(os.devnull, "w") if args.report and not output else open(output, "w", newline="", encoding="utf-8") if output else sys.stdout
+    try:
+        result = dedupe_stream(infile, outfile, key_columns=keys, memory_budget=memory_mb * 1024 * 1024 if memory_mb else None)
+    finally:
+        if infile is not sys.stdin: infile.close()
+        if outfile is not sys.stdout: outfile.close()
     if args.report: print(format_result_markdown(result))
-    else: print(to_csv_string(headers, unique))
 def main():
     p = argparse.ArgumentParser(description="CSV Deduplicator"); s = p.add_subparsers(dest="command", required=True)
-    d = s.add_parser("dedupe"); d.add_argument("file", nargs="?", default="-"); d.add_argument("--report", action="store_true"); d.set_defaults(func=cmd_dedupe)
+    d = s.add_parser("dedupe"); d.add_argument("file", nargs="?", default="-"); d.add_argument("--report", action="store_true")
+    d.add_argument("-o", "--output", help="Write unique rows to this file instead of stdout")
+    d.add_argument("-k", "--key-columns", help="Comma-separated column indices that define a duplicate (default: whole row)")
+    d.add_argument("--memory-mb", type=int, help="Key memory budget; spill to temp files beyond it"); d.set_defaults(func=cmd_dedupe)
     args = p.parse_args(); args.func(args)
 if __name__ == "__main__": main()
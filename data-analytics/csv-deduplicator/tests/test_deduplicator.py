@@ -1,7 +1,8 @@
 """Tests for CSV Deduplicator."""
 import sys, os, pytest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from agent.deduplicator import parse_csv, deduplicate, find_duplicates, to_csv_string, row_hash, format_result_markdown
+import io
+from agent.deduplicator import parse_csv, deduplicate, find_duplicates, to_csv_string, row_hash, row_digest, dedupe_stream, format_result_markdown
 
 CSV_DATA = """name,email,age
 Alice,alice@example.com,30
@@ -52,6 +53,7 @@ def test_row_hash():
     h2 = row_hash(["a", "b"])
     h3 = row_hash(["a", "c"])
     assert h1 == h2 and h1 != h3
+    assert h1 == "d0726241020676b14aa6298ce6a18b21"  # md5("a|b"): the value is part of the public output
 
 def test_hash_column_specific():
     h1 = row_hash(["a", "b", "c"], columns=[0])
@@ -90,3 +92,35 @@ def test_to_dict():
 def test_empty():
     headers, rows = parse_csv("")
     assert headers == [] and rows == []
+
+def test_row_digest_compact():
+    d = row_digest(["a", "b"])
+    assert isinstance(d, bytes) and len(d) == 16
+    assert row_digest(["a|b"]) != row_digest(["a", "b"])
+
+def test_dedupe_stream():
+    out = io.StringIO()
+    result = dedupe_stream(io.StringIO(CSV_DATA), out)
+    headers, rows = parse_csv(out.getvalue())
+    assert headers == ["name", "email", "age"] and len(rows) == 3
+    assert result.unique_rows == 3 and result.duplicates_removed == 2 and result.duplicate_groups == 2
+    assert not result.spilled
+
+def test_dedupe_stream_key_columns():
+    out = io.StringIO()
+    result = dedupe_stream(io.StringIO("name,age\nAlice,30\nAlice,31\nBob,2"), out, key_columns=[0])
+    assert result.unique_rows == 2 and "Alice,30" in out.getvalue() and "Alice,31" not in out.getvalue()
+
+def test_dedupe_stream_spill_matches_in_memory():
+    rows = [[str(i % 37), f"v{i % 11}"] for i in range(2000)]
+    src = to_csv_string(["a", "b"], rows)
+    unique, expected = deduplicate(["a", "b"], rows)
+    out = io.StringIO()
+    result = dedupe_stream(io.StringIO(src), out, memory_budget=1500, partitions=4)
+    assert result.spilled
+    assert parse_csv(out.getvalue())[1] == unique
+    assert (result.unique_rows, result.duplicate_groups) == (expected.unique_rows, expected.duplicate_groups)
+
+def test_dedupe_stream_empty():
+    result = dedupe_stream(io.StringIO(""), io.StringIO())
+    assert result.total_rows == 0 and result.columns == []
@@ -35,3 +35,12 @@ def test_main_entry_point(tmp_path):
         with patch("builtins.print"):
             with patch.dict("sys.modules", {"__main__": None}):
                 runpy.run_module("main", run_name="__main__", alter_sys=True)
+
+def test_cmd_dedupe_output_and_keys(tmp_path):
+    f = tmp_path / "data.csv"; f.write_text("name,age\nAlice,30\nAlice,31\nBob,2")
+    out = tmp_path / "out.csv"
+    args = type('A', (), {'file': str(f), 'report': True, 'output': str(out), 'key_columns': "0", 'memory_mb': 1})()
+    with patch("builtins.print") as p: cmd_dedupe(args)
+    assert "Removed 1" in p.call_args[0][0]
+    assert out.read_text().splitlines() == ["name,age", "Alice,30", "Bob,2"]
+    assert b"\r" not in out.read_bytes()  # \n line endings, as before
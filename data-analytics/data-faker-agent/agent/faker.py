@@ -1,6 +1,6 @@
 """Data faker — generate realistic fake data for testing and development."""
 from __future__ import annotations
-import random, string, json, uuid
+import csv, io, random, string, json, uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
@@ -64,9 +64,8 @@ def export_csv(data: list[dict]) -> str:
             else: flat_row[k] = v
         flat.append(flat_row)
     headers = list(flat[0].keys())
-    lines = [",".join(headers)]
-    for row in flat:
-        lines.append(",".join(str(row.get(h, "")) for h in headers))
-    return "\n".join(lines)
+    buf = io.StringIO(); w = csv.writer(buf, lineterminator="\n")
+    w.writerow(headers); w.writerows([row.get(h, "") for h in headers] for row in flat)
+    return buf.getvalue()[:-1]
 
 def list_schemas() -> list[str]: return sorted(GENERATORS.keys())
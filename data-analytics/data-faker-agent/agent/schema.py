@@ -0,0 +1,317 @@
+"""Columnar fake data — schema-driven, seeded, vectorised with NumPy.
+
+A schema maps field names to field specs (JSON-friendly dicts; a bare string is
+shorthand for {"type": ...}). Rows are generated a chunk at a time as columns:
+every (chunk, field) pair gets its own NumPy RNG derived from the seed, so output
+is reproducible, independent of how chunks are spread over worker processes, and
+adding a field never changes the values of the others. Columns drawn from a fixed
+set of values stay dictionary-encoded (int codes + categories) all the way to the
+writers.
+
+    {"name": "customer",
+     "fields": {"id": "uuid", "name": "name", "email": {"type": "email", "from": "name"},
+                "age": {"type": "int", "min": 18, "max": 90, "nulls": 0.05},
+                "tier": {"type": "choice", "values": ["free", "pro"], "weights": [0.9, 0.1]},
+                "address": {"type": "object", "fields": {"city": "city", "zip": "zip"}}}}
+"""
+from __future__ import annotations
+import json, zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+from agent.faker import FIRST_NAMES, LAST_NAMES, DOMAINS, CITIES, COUNTRIES, COMPANIES, PRODUCTS
+
+CHUNK_ROWS = 100_000
+POOLS = {"first_name": FIRST_NAMES, "last_name": LAST_NAMES, "domain": DOMAINS, "city": CITIES,
+         "country": COUNTRIES, "company": COMPANIES, "product": PRODUCTS}
+STREETS = ["Main", "Oak", "Elm", "Park", "Cedar"]
+
+
+# ─── Schema ─────────────────────────────────────────────────────────
+
+@dataclass
+class Field:
+    path: tuple[str, ...]
+    type: str
+    spec: dict = field(default_factory=dict)
+
+    @property
+    def name(self) -> str: return ".".join(self.path)
+
+
+@dataclass
+class Schema:
+    name: str
+    tree: dict  # field name -> Field, or nested dict for "object" fields
+    fields: list[Field] = field(default_factory=list)  # leaves in output order
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Schema":
+        if not isinstance(d.get("fields"), dict) or not d["fields"]:
+            raise ValueError("Schema needs a non-empty 'fields' object")
+        leaves: list[Field] = []
+        return cls(name=str(d.get("name", "custom")), tree=_parse_fields(d["fields"], (), leaves), fields=leaves)
+
+    @property
+    def columns(self) -> list[str]:
+        """Flat column names, nested fields joined with "_" (as export_csv flattens them)."""
+        return ["_".join(f.path) for f in self.fields]
+
+
+def _parse_fields(fields: dict, prefix: tuple, leaves: list[Field]) -> dict:
+    tree = {}
+    for name, spec in fields.items():
+        spec = {"type": spec} if isinstance(spec, str) else dict(spec)
+        kind = spec.get("type")
+        path = prefix + (str(name),)
+        if kind == "object":
+            tree[name] = _parse_fields(spec.get("fields") or {}, path, leaves)
+            continue
+        if kind not in FIELD_TYPES:
+            raise ValueError(f"Field {'.'.join(path)!r}: unknown type {kind!r}; expected one of {', '.join(sorted(FIELD_TYPES))}, object")
+        if "from" in spec and spec["from"] not in {f.name for f in leaves}:
+            raise ValueError(f"Field {'.'.join(path)!r}: 'from' must name an earlier field, got {spec['from']!r}")
+        if not 0 <= float(spec.get("nulls", 0)) <= 1:
+            raise ValueError(f"Field {'.'.join(path)!r}: 'nulls' must be between 0 and 1")
+        tree[name] = f = Field(path, kind, spec)
+        leaves.append(f)
+    return tree
+
+
+def load_schema(name_or_path: str) -> Schema:
+    """A built-in schema by name, or a JSON schema file."""
+    if name_or_path.lower() in BUILTIN_SCHEMAS:
+        return Schema.from_dict(BUILTIN_SCHEMAS[name_or_path.lower()])
+    try:
+        with open(name_or_path, encoding="utf-8") as f: data = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"No built-in schema or schema file named {name_or_path!r}") from None
+    return Schema.from_dict(data)
+
+
+# ─── Columns ────────────────────────────────────────────────────────
+
+@dataclass
+class Column:
+    kind: str  # "int" | "float" | "bool" | "str"
+    data: Any  # numpy array, list[str], or int codes into `categories`
+    categories: list | None = None
+    decimals: int | None = None
+    nulls: np.ndarray | None = None  # bool mask, True = null
+    safe: bool = False  # str values known to need no CSV quoting or JSON escaping
+
+    def __len__(self): return len(self.data)
+
+    def to_pylist(self) -> list:
+        if self.categories is not None: values = [self.categories[c] for c in self.data.tolist()]
+        elif isinstance(self.data, np.ndarray): values = self.data.tolist()
+        else: values = list(self.data)
+        if self.kind == "float" and self.decimals is not None: values = [round(v, self.decimals) for v in values]
+        if self.nulls is not None:
+            for i in np.flatnonzero(self.nulls).tolist(): values[i] = None
+        return values
+
+
+def _categorical(codes: np.ndarray, categories: list, safe: bool = False) -> Column:
+    kinds = {type(c) for c in categories}
+    kind = "bool" if kinds == {bool} else "int" if kinds == {int} else "float" if kinds <= {int, float} else "str"
+    return Column(kind, codes, categories=list(categories), safe=safe)
+
+
+def _byte_strings(chars: np.ndarray) -> list[str]:
+    """Rows of an (n, width) uint8 ASCII matrix as str."""
+    width = chars.shape[1]
+    text = chars.tobytes().decode("ascii")
+    return [text[i:i + width] for i in range(0, len(text), width)]
+
+
+def _template(template: str, n: int, columns: list[np.ndarray]) -> list[str]:
+    """Strings shaped like `template`, its "#" positions filled in order from uint8 ASCII `columns`."""
+    chars = np.empty((n, len(template)), dtype=np.uint8)
+    fill = iter(columns)
+    for i, c in enumerate(template):
+        chars[:, i] = next(fill) if c == "#" else ord(c)
+    return _byte_strings(chars)
+
+
+def _digits(values: np.ndarray, width: int) -> list[np.ndarray]:
+    """ASCII digit columns (most significant first) of zero-padded non-negative ints."""
+    out = []
+    for p in range(width - 1, -1, -1):
+        out.append((values // 10 ** p % 10 + 48).astype(np.uint8))
+    return out
+
+
+# ─── Field types ────────────────────────────────────────────────────
+# Each takes (rng, n, spec, ctx) and returns a Column; ctx has "columns" (earlier fields by name) and "start".
+
+def _uuid(rng, n, spec, ctx) -> Column:
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = raw[:, 6] & 0x0F | 0x40  # version 4
+    raw[:, 8] = raw[:, 8] & 0x3F | 0x80  # RFC 4122 variant
+    hexchars = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+    pairs = np.stack([hexchars[raw >> 4], hexchars[raw & 15]], axis=2).reshape(n, 32)
+    chars = np.full((n, 36), ord("-"), dtype=np.uint8)
+    chars[:, [i for i in range(36) if i not in (8, 13, 18, 23)]] = pairs
+    return Column("str", _byte_strings(chars), safe=True)
+
+def _int(rng, n, spec, ctx) -> Column:
+    return Column("int", rng.integers(int(spec.get("min", 0)), int(spec.get("max", 1000)) + 1, n))
+
+def _float(rng, n, spec, ctx) -> Column:
+    decimals = int(spec.get("decimals", 2))
+    return Column("float", np.round(rng.uniform(float(spec.get("min", 0)), float(spec.get("max", 1)), n), decimals),
+                  decimals=decimals)
+
+def _bool(rng, n, spec, ctx) -> Column:
+    return Column("bool", rng.random(n) < float(spec.get("p", 0.5)))
+
+def _choice(rng, n, spec, ctx) -> Column:
+    values = spec.get("values") or POOLS.get(spec.get("pool", ""))
+    if not values: raise ValueError(f"choice field needs 'values' or a 'pool' ({', '.join(POOLS)})")
+    weights = spec.get("weights")
+    if weights is not None:
+        if len(weights) != len(values): raise ValueError("choice 'weights' must match 'values'")
+        weights = np.asarray(weights, dtype=float) / np.sum(weights)
+    return _categorical(rng.choice(len(values), n, p=weights), values)
+
+def _pool(pool: str) -> Callable:
+    return lambda rng, n, spec, ctx: _categorical(rng.integers(0, len(POOLS[pool]), n), POOLS[pool], safe=True)
+
+def _name(rng, n, spec, ctx) -> Column:
+    first, last = rng.integers(0, len(FIRST_NAMES), n), rng.integers(0, len(LAST_NAMES), n)
+    return _categorical(first * len(LAST_NAMES) + last, [f"{f} {l}" for f in FIRST_NAMES for l in LAST_NAMES], safe=True)
+
+def _email_user(name) -> str:
+    parts = str(name).lower().split()
+    return f"{parts[0]}.{parts[-1]}" if len(parts) > 1 else parts[0] if parts else "user"
+
+def _email(rng, n, spec, ctx) -> Column:
+    domains = rng.integers(0, len(DOMAINS), n)
+    source = ctx["columns"].get(spec.get("from", ""))
+    if source is not None and source.categories is not None:  # derive per category, not per row
+        cats = [f"{_email_user(c)}@{d}" for c in source.categories for d in DOMAINS]
+        return _categorical(source.data * len(DOMAINS) + domains, cats, safe=source.safe)
+    if source is not None:
+        users = [_email_user(s) for s in source.to_pylist()]
+        return Column("str", [f"{u}@{DOMAINS[d]}" for u, d in zip(users, domains.tolist())], safe=source.safe)
+    cats = [f"user{u}@{d}" for u in range(100, 1000) for d in DOMAINS]
+    return _categorical(rng.integers(0, 900, n) * len(DOMAINS) + domains, cats, safe=True)
+
+def _phone(rng, n, spec, ctx) -> Column:
+    digits = _digits(rng.integers(200, 1000, n), 3) + _digits(rng.integers(100, 1000, n), 3) + _digits(rng.integers(1000, 10000, n), 4)
+    return Column("str", _template("+1-###-###-####", n, digits), safe=True)
+
+def _pattern(rng, n, spec, ctx) -> Column:
+    """'#' -> digit, '?' -> uppercase letter, anything else literal (e.g. "SKU-####-??")."""
+    pattern = str(spec.get("pattern", ""))
+    if not pattern: raise ValueError("pattern field needs a 'pattern'")
+    chars = np.empty((n, len(pattern)), dtype=np.uint8)
+    for i, c in enumerate(pattern):
+        if c == "#": chars[:, i] = rng.integers(48, 58, n, dtype=np.uint8)
+        elif c == "?": chars[:, i] = rng.integers(65, 91, n, dtype=np.uint8)
+        else: chars[:, i] = ord(c) if ord(c) < 128 else ord("?")
+    safe = all(" " <= c <= "~" and c not in ',"\\' for c in pattern)  # printable ASCII needs no escaping
+    return Column("str", _byte_strings(chars), safe=safe)
+
+def _zip(rng, n, spec, ctx) -> Column:
+    return Column("str", _template("#####", n, _digits(rng.integers(10000, 100000, n), 5)), safe=True)
+
+def _street(rng, n, spec, ctx) -> Column:
+    numbers, streets = rng.integers(1, 1000, n), rng.integers(0, len(STREETS), n)
+    return _categorical((numbers - 1) * len(STREETS) + streets, [f"{k} {s} St" for k in range(1, 1000) for s in STREETS], safe=True)
+
+def _parse_day(value, default: str) -> np.datetime64:
+    return np.datetime64(str(value or default)[:10], "D")
+
+def _date(rng, n, spec, ctx) -> Column:
+    start, end = _parse_day(spec.get("start"), "2020-01-01"), _parse_day(spec.get("end"), "2025-12-31")
+    span = int((end - start).astype(int)) + 1
+    if span < 1: raise ValueError("date field 'end' is before 'start'")
+    days = rng.integers(0, span, n)
+    if span <= 4 * n:  # few distinct days: keep them as categories
+        return _categorical(days, np.datetime_as_string(start + np.arange(span)).tolist(), safe=True)
+    return Column("str", np.datetime_as_string(start + days).tolist(), safe=True)
+
+def _datetime(rng, n, spec, ctx) -> Column:
+    start = np.datetime64(str(spec.get("start") or "2020-01-01T00:00:00"), "s")
+    end = np.datetime64(str(spec.get("end") or "2025-12-31T23:59:59"), "s")
+    seconds = rng.integers(0, int((end - start).astype(int)) + 1, n)
+    return Column("str", np.datetime_as_string(start + seconds).tolist(), safe=True)
+
+def _sequence(rng, n, spec, ctx) -> Column:
+    step = int(spec.get("step", 1))
+    return Column("int", int(spec.get("start", 1)) + (ctx["start"] + np.arange(n, dtype=np.int64)) * step)
+
+def _constant(rng, n, spec, ctx) -> Column:
+    return _categorical(np.zeros(n, dtype=np.intp), [spec.get("value")])
+
+FIELD_TYPES: dict[str, Callable] = {
+    "uuid": _uuid, "int": _int, "float": _float, "bool": _bool, "choice": _choice, "name": _name,
+    "email": _email, "phone": _phone, "pattern": _pattern, "zip": _zip, "street": _street,
+    "date": _date, "datetime": _datetime, "sequence": _sequence, "constant": _constant,
+    **{pool: _pool(pool) for pool in POOLS},
+}
+
+
+# ─── Generation ─────────────────────────────────────────────────────
+
+def _rng(seed: int, chunk: int, f: Field) -> np.random.Generator:
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk, zlib.crc32(f.name.encode()))))
+
+
+def generate_columns(schema: Schema, start: int, n: int, seed: int = 0, chunk: int | None = None) -> dict[str, Column]:
+    """Columns for rows [start, start + n), keyed by dotted field name; `chunk` picks the RNG streams."""
+    chunk = start // max(n, 1) if chunk is None else chunk
+    columns: dict[str, Column] = {}
+    ctx = {"columns": columns, "start": start}
+    for f in schema.fields:
+        rng = _rng(seed, chunk, f)
+        col = FIELD_TYPES[f.type](rng, n, f.spec, ctx)
+        rate = float(f.spec.get("nulls", 0))
+        if rate: col.nulls = rng.random(n) < rate
+        columns[f.name] = col
+    return columns
+
+
+def iter_chunks(schema: Schema, rows: int, seed: int = 0, chunk_size: int = CHUNK_ROWS) -> Iterator[tuple[int, dict[str, Column]]]:
+    """(start row, columns) per chunk of `chunk_size` rows."""
+    for k, start in enumerate(range(0, rows, chunk_size)):
+        yield start, generate_columns(schema, start, min(chunk_size, rows - start), seed, chunk=k)
+
+
+def to_records(schema: Schema, columns: dict[str, Column]) -> list[dict]:
+    """Row dicts (nested like the schema) — for small outputs and tests."""
+    values = {name: col.to_pylist() for name, col in columns.items()}
+    n = len(next(iter(values.values()))) if values else 0
+
+    def build(tree: dict, i: int) -> dict:
+        return {k: build(v, i) if isinstance(v, dict) else values[v.name][i] for k, v in tree.items()}
+    return [build(schema.tree, i) for i in range(n)]
+
+
+def generate_records(schema: Schema | str, rows: int, seed: int = 0, chunk_size: int = CHUNK_ROWS) -> list[dict]:
+    schema = load_schema(schema) if isinstance(schema, str) else schema
+    return [r for _, cols in iter_chunks(schema, rows, seed, chunk_size) for r in to_records(schema, cols)]
+
+
+# ─── Built-in schemas (the same shapes as fake_user / fake_product / fake_order) ───
+
+BUILTIN_SCHEMAS = {
+    "user": {"name": "user", "fields": {
+        "id": "uuid", "name": "name", "email": {"type": "email", "from": "name"}, "phone": "phone",
+        "address": {"type": "object", "fields": {"street": "street", "city": "city", "country": "country", "zip": "zip"}},
+        "created_at": {"type": "date", "start": "2020-01-01", "end": "2025-12-31"},
+        "active": {"type": "bool", "p": 0.75}}},
+    "product": {"name": "product", "fields": {
+        "id": "uuid", "name": "product", "price": {"type": "float", "min": 9.99, "max": 499.99, "decimals": 2},
+        "category": {"type": "choice", "values": ["Software", "Hardware", "Service", "Subscription"]},
+        "in_stock": {"type": "bool", "p": 2 / 3}, "rating": {"type": "float", "min": 1, "max": 5, "decimals": 1}}},
+    "order": {"name": "order", "fields": {
+        "id": "uuid", "user_id": "uuid", "product": "product", "quantity": {"type": "int", "min": 1, "max": 10},
+        "total": {"type": "float", "min": 10, "max": 2000, "decimals": 2},
+        "status": {"type": "choice", "values": ["pending", "shipped", "delivered", "cancelled"]},
+        "date": {"type": "date", "start": "2020-01-01", "end": "2025-12-31"}}},
+}
@@ -0,0 +1,179 @@
+"""Streaming writers — CSV, NDJSON and Parquet, one chunk of columns at a time.
+
+Text formats are rendered column-wise: each column is encoded to strings once
+(dictionary-encoded columns encode only their categories), then rows are joined in
+C. CSV quoting follows the csv module's QUOTE_MINIMAL rules. With `workers` > 1,
+chunks are generated and rendered in a process pool and written in order, so the
+output is byte-identical to a single-process run with the same seed.
+"""
+from __future__ import annotations
+import json, os, sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from agent.schema import CHUNK_ROWS, Column, Schema, generate_columns
+
+FORMATS = ("csv", "ndjson", "parquet")
+_CSV_SPECIAL = (",", '"', "\n", "\r")
+
+
+# ─── Column encoding ────────────────────────────────────────────────
+
+def _csv_quote(v: str) -> str:
+    return '"' + v.replace('"', '""') + '"' if any(c in v for c in _CSV_SPECIAL) else v
+
+
+def _json_str(v) -> str:
+    return json.dumps(str(v), ensure_ascii=False)
+
+
+def _bare_json(col: Column) -> bool:
+    """Safe strings without nulls go into NDJSON unquoted; the row template supplies the quotes."""
+    return col.kind == "str" and col.safe and col.categories is None and col.nulls is None
+
+
+def encode_column(col: Column, fmt: str) -> list[str]:
+    """One encoded string per row: CSV field text, or a JSON value (see `_bare_json`)."""
+    null = "null" if fmt == "ndjson" else ""
+    if col.categories is not None:
+        cats = []
+        for c in col.categories:
+            if c is None: cats.append(null)
+            elif isinstance(c, bool): cats.append(("false", "true")[c] if fmt == "ndjson" else str(c))
+            elif isinstance(c, (int, float)): cats.append(json.dumps(c) if fmt == "ndjson" else str(c))
+            elif fmt == "ndjson": cats.append(f'"{c}"' if col.safe else _json_str(c))
+            else: cats.append(c if col.safe else _csv_quote(str(c)))
+        out = np.array(cats, dtype=object)[col.data].tolist()
+    elif col.kind == "str":
+        if col.safe: out = col.data
+        else: out = list(map(_json_str if fmt == "ndjson" else _csv_quote, col.data))
+    elif col.kind == "bool":
+        out = np.array(["false", "true"] if fmt == "ndjson" else ["False", "True"], dtype=object)[col.data.astype(np.intp)].tolist()
+    elif col.kind == "float" and col.decimals is not None:
+        out = list(map(f"%.{col.decimals}f".__mod__, col.data.tolist()))
+    else:
+        out = list(map(str, col.data.tolist()))
+    if col.nulls is not None:
+        out = list(out)
+        for i in np.flatnonzero(col.nulls).tolist(): out[i] = null
+    return out
+
+
+# ─── Text formats ───────────────────────────────────────────────────
+
+def csv_header(schema: Schema) -> str:
+    return ",".join(map(_csv_quote, schema.columns)) + "\n"
+
+
+def _ndjson_template(tree: dict, columns: dict[str, Column]) -> str:
+    parts = []
+    for key, node in tree.items():
+        name = json.dumps(str(key)).replace("%", "%%")
+        if isinstance(node, dict): value = _ndjson_template(node, columns)
+        else: value = '"%s"' if _bare_json(columns[node.name]) else "%s"
+        parts.append(f"{name}:{value}")
+    return "{" + ",".join(parts) + "}"
+
+
+def render_chunk(schema: Schema, columns: dict[str, Column], fmt: str) -> bytes:
+    """A chunk of CSV rows (no header) or NDJSON lines, UTF-8 encoded."""
+    cols = [encode_column(columns[f.name], fmt) for f in schema.fields]
+    if fmt == "csv":
+        body = "\n".join(map(",".join, zip(*cols)))
+    elif fmt == "ndjson":
+        body = "\n".join(map(_ndjson_template(schema.tree, columns).__mod__, zip(*cols)))
+    else:
+        raise ValueError(f"render_chunk handles text formats only, not {fmt!r}")
+    return (body + "\n").encode("utf-8") if body else b""
+
+
+# ─── Parquet ────────────────────────────────────────────────────────
+
+def _arrow_column(pa, col: Column):
+    mask = col.nulls  # pragma: no cover
+    if col.categories is not None:  # pragma: no cover
+        codes = pa.array(col.data.astype(np.int32), mask=mask)  # pragma: no cover
+        categories = [None if c is None else str(c) for c in col.categories] if col.kind == "str" else col.categories  # pragma: no cover
+        return pa.DictionaryArray.from_arrays(codes, pa.array(categories))  # pragma: no cover
+    if col.kind == "str":  # pragma: no cover
+        return pa.array(col.data, type=pa.string(), mask=mask)  # pragma: no cover
+    return pa.array(col.data, mask=mask)  # pragma: no cover
+
+
+def _arrow_table(pa, schema: Schema, columns: dict[str, Column]):
+    def build(tree: dict):  # pragma: no cover
+        names, arrays = [], []  # pragma: no cover
+        for key, node in tree.items():  # pragma: no cover
+            if isinstance(node, dict):  # pragma: no cover
+                sub_names, sub_arrays = build(node)  # pragma: no cover
+                arrays.append(pa.StructArray.from_arrays(sub_arrays, names=sub_names))  # pragma: no cover
+            else:
+                arrays.append(_arrow_column(pa, columns[node.name]))  # pragma: no cover
+            names.append(str(key))  # pragma: no cover
+        return names, arrays  # pragma: no cover
+    names, arrays = build(schema.tree)  # pragma: no cover
+    return pa.Table.from_arrays(arrays, names=names)  # pragma: no cover
+
+
+# ─── Driver ─────────────────────────────────────────────────────────
+
+def _chunk_job(schema: Schema, fmt: str, seed: int, k: int, start: int, n: int):
+    columns = generate_columns(schema, start, n, seed, chunk=k)
+    return columns if fmt == "parquet" else render_chunk(schema, columns, fmt)
+
+
+def _chunk_results(schema: Schema, rows: int, fmt: str, seed: int, chunk_size: int, workers: int):
+    """Per-chunk results in order; in parallel, at most 2 chunks per worker are held at once."""
+    jobs = [(k, start, min(chunk_size, rows - start)) for k, start in enumerate(range(0, rows, chunk_size))]
+    if workers <= 1 or len(jobs) < 2:
+        for k, start, n in jobs: yield _chunk_job(schema, fmt, seed, k, start, n)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for k, start, n in jobs:
+            pending.append(pool.submit(_chunk_job, schema, fmt, seed, k, start, n))
+            if len(pending) >= workers * 2:
+                yield pending.pop(0).result()
+        for future in pending: yield future.result()
+
+
+def write_dataset(schema: Schema, rows: int, out, fmt: str = "csv", seed: int = 0,
+                  chunk_size: int = CHUNK_ROWS, workers: int | None = 1, header: bool = True) -> int:
+    """Stream `rows` generated rows to `out` (a path, "-" for stdout, or a binary file); returns rows written."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    if chunk_size < 1: raise ValueError("chunk_size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    results = _chunk_results(schema, rows, fmt, seed, chunk_size, workers)
+    if fmt == "parquet":
+        return _write_parquet(schema, results, out)
+    own = isinstance(out, (str, os.PathLike)) and out != "-"
+    stream = open(out, "wb") if own else sys.stdout.buffer if out == "-" else out
+    try:
+        if fmt == "csv" and header: stream.write(csv_header(schema).encode("utf-8"))
+        for data in results: stream.write(data)
+    finally:
+        if own: stream.close()
+        else: stream.flush()
+    return rows
+
+
+def _write_parquet(schema: Schema, results, out) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq  # pragma: no cover
+    except ImportError:
+        raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow") from None
+    if not isinstance(out, (str, os.PathLike)) or out == "-":  # pragma: no cover
+        raise ValueError("Parquet output needs a file path")  # pragma: no cover
+    writer, rows = None, 0  # pragma: no cover
+    try:  # pragma: no cover
+        for columns in results:  # pragma: no cover
+            table = _arrow_table(pa, schema, columns)  # pragma: no cover
+            if writer is None: writer = pq.ParquetWriter(out, table.schema)  # pragma: no cover
+            writer.write_table(table)  # pragma: no cover
+            rows += table.num_rows  # pragma: no cover
+    finally:
+        if writer is not None: writer.close()  # pragma: no cover
+    return rows  # pragma: no cover
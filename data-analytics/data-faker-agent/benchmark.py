@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Benchmark: per-row fake_* + export_csv vs. the columnar generator and streaming writers."""
+import argparse, io, os, sys, time  # pragma: no cover
+sys.path.append(os.path.dirname(__file__))  # pragma: no cover
+from agent.faker import generate_fake_data, export_csv  # pragma: no cover
+from agent.schema import load_schema  # pragma: no cover
+from agent.writers import write_dataset  # pragma: no cover
+
+class Counter(io.RawIOBase):  # pragma: no cover
+    """Binary sink that only counts bytes, so the timings measure generation and encoding."""
+    def __init__(self): self.bytes = 0  # pragma: no cover
+    def writable(self): return True  # pragma: no cover
+    def write(self, b): self.bytes += len(b); return len(b)  # pragma: no cover
+
+def main():  # pragma: no cover
+    p = argparse.ArgumentParser(description="Benchmark bulk fake data generation")  # pragma: no cover
+    p.add_argument("--rows", type=int, default=1_000_000)  # pragma: no cover
+    p.add_argument("--baseline-rows", type=int, default=100_000, help="Rows for the per-row baseline (then extrapolated)")  # pragma: no cover
+    p.add_argument("--schemas", default="user,order")  # pragma: no cover
+    p.add_argument("--workers", type=int, default=1)  # pragma: no cover
+    args = p.parse_args()  # pragma: no cover
+    print(f"📊 {args.rows:,} rows per schema, {args.workers} worker(s), {os.cpu_count()} CPU(s)")  # pragma: no cover
+    for name in args.schemas.split(","):  # pragma: no cover
+        t0 = time.perf_counter()  # pragma: no cover
+        export_csv(generate_fake_data(name, args.baseline_rows))  # pragma: no cover
+        old = (time.perf_counter() - t0) / args.baseline_rows * args.rows  # pragma: no cover
+        print(f"  {name:<8} fake_* + export_csv  {old:7.2f} s  (extrapolated from {args.baseline_rows:,})")  # pragma: no cover
+        for fmt in ("csv", "ndjson"):  # pragma: no cover
+            sink = Counter(); t0 = time.perf_counter()  # pragma: no cover
+            write_dataset(load_schema(name), args.rows, sink, fmt, seed=1, workers=args.workers)  # pragma: no cover
+            elapsed = time.perf_counter() - t0  # pragma: no cover
+            print(f"  {name:<8} write_dataset {fmt:<6} {elapsed:7.2f} s  ({args.rows / elapsed:,.0f} rows/s, {sink.bytes / elapsed / 1e6:.0f} MB/s)")  # pragma: no cover
+
+if __name__ == "__main__": main()  # pragma: no cover
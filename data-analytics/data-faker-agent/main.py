@@ -5,8 +5,21 @@ from agent.faker import generate_fake_data, export_json, export_csv, list_schema
 def cmd_generate(args):
     data = generate_fake_data(args.schema, count=args.count)
     print(export_csv(data) if args.csv else export_json(data))
+def cmd_bulk(args):
+    from agent.schema import load_schema
+    from agent.writers import write_dataset
+    try:
+        schema = load_schema(args.schema)
+        write_dataset(schema, args.rows, args.output, fmt=args.format, seed=args.seed, chunk_size=args.chunk_size, workers=args.workers)
+    except (ValueError, RuntimeError) as e: print(f"Error: {e}", file=sys.stderr); sys.exit(2)
+    if args.output != "-": print(f"Wrote {args.rows:,} {schema.name} rows to {args.output}", file=sys.stderr)
 def main():
     p = argparse.ArgumentParser(description="Data Faker"); s = p.add_subparsers(dest="command", required=True)
     g = s.add_parser("generate"); g.add_argument("schema", choices=["user","product","order"]); g.add_argument("--count", type=int, default=10); g.add_argument("--csv", action="store_true"); g.set_defaults(func=cmd_generate)
+    b = s.add_parser("bulk", help="Stream a large seeded dataset from a built-in schema or a JSON schema file")
+    b.add_argument("schema", help="user, product, order, or a path to a JSON schema"); b.add_argument("--rows", type=int, default=1_000_000)
+    b.add_argument("--format", choices=["csv","ndjson","parquet"], default="csv"); b.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    b.add_argument("--seed", type=int, default=0); b.add_argument("-j", "--workers", type=int, default=1, help="Worker processes (0 = one per CPU)")
+    b.add_argument("--chunk-size", type=int, default=100_000); b.set_defaults(func=cmd_bulk)
     args = p.parse_args(); args.func(args)
 if __name__ == "__main__": main()
@@ -0,0 +1,77 @@
+"""Tests for the schema-driven columnar generator."""
+import sys, os, json, re, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from agent.schema import Schema, load_schema, generate_records, generate_columns, BUILTIN_SCHEMAS
+from agent.faker import fake_user, fake_product, fake_order
+
+CUSTOM = {"name": "customer", "fields": {
+    "id": {"type": "sequence", "start": 1000}, "name": "name", "email": {"type": "email", "from": "name"},
+    "age": {"type": "int", "min": 18, "max": 90, "nulls": 0.3},
+    "tier": {"type": "choice", "values": ["free", "pro"], "weights": [0.9, 0.1]},
+    "sku": {"type": "pattern", "pattern": "SKU-??##"},
+    "seen": {"type": "datetime", "start": "2024-01-01", "end": "2024-12-31"},
+    "address": {"type": "object", "fields": {"city": "city", "zip": "zip"}}}}
+
+def test_builtins_match_fake_shapes():
+    for name, make in (("user", fake_user), ("product", fake_product), ("order", fake_order)):
+        rec = generate_records(name, 1)[0]
+        old = make()
+        assert list(rec) == list(old)
+        for k, v in old.items():
+            if isinstance(v, dict): assert list(rec[k]) == list(v)
+            else: assert type(rec[k]) is type(v), (name, k)
+
+def test_user_values():
+    for u in generate_records("user", 200, seed=1):
+        assert len(u["id"]) == 36 and u["id"][14] == "4" and u["phone"].startswith("+1-")
+        first, last = u["name"].lower().split()
+        assert u["email"].startswith(f"{first}.{last}") and "@" in u["email"]
+        assert re.fullmatch(r"\d{4}-\d\d-\d\d", u["created_at"]) and re.fullmatch(r"\d{5}", u["address"]["zip"])
+
+def test_seeded_and_chunking_independent_of_size():
+    assert generate_records("order", 500, seed=7) == generate_records("order", 500, seed=7)
+    assert generate_records("order", 500, seed=7) != generate_records("order", 500, seed=8)
+    assert generate_records("order", 500, seed=7, chunk_size=100)[:100] == generate_records("order", 100, seed=7, chunk_size=100)
+
+def test_custom_schema():
+    rows = generate_records(Schema.from_dict(CUSTOM), 1000, seed=3)
+    assert [r["id"] for r in rows[:3]] == [1000, 1001, 1002]
+    ages = [r["age"] for r in rows]
+    assert 200 < ages.count(None) < 400 and all(18 <= a <= 90 for a in ages if a is not None)
+    assert sum(r["tier"] == "pro" for r in rows) < 200
+    assert all(re.fullmatch(r"SKU-[A-Z]{2}\d\d", r["sku"]) for r in rows)
+    assert all(r["seen"].startswith("2024-") for r in rows) and "city" in rows[0]["address"]
+
+def test_adding_a_field_keeps_other_values():
+    extended = {"name": "c", "fields": {**CUSTOM["fields"], "extra": "uuid"}}
+    a = generate_records(Schema.from_dict(CUSTOM), 50, seed=2)
+    b = generate_records(Schema.from_dict(extended), 50, seed=2)
+    assert [{k: v for k, v in r.items() if k != "extra"} for r in b] == a
+
+def test_email_sources_and_narrow_dates():
+    schema = Schema.from_dict({"fields": {"handle": {"type": "pattern", "pattern": "AB ##"}, "derived": {"type": "email", "from": "handle"},
+                                          "plain": "email", "day": {"type": "date", "start": "2024-03-01", "end": "2024-03-03"}}})
+    rows = generate_records(schema, 100, seed=1)
+    assert all(r["derived"].startswith(r["handle"].lower().replace(" ", ".") + "@") for r in rows)
+    assert all(re.fullmatch(r"user\d{3}@[\w.]+", r["plain"]) for r in rows)
+    assert {r["day"] for r in rows} == {"2024-03-01", "2024-03-02", "2024-03-03"}
+
+def test_columns_flatten_nested():
+    assert load_schema("user").columns[4:8] == ["address_street", "address_city", "address_country", "address_zip"]
+
+def test_categorical_columns():
+    cols = generate_columns(load_schema("order"), 0, 10)
+    assert cols["status"].categories is not None and cols["product"].categories is not None
+
+@pytest.mark.parametrize("fields, msg", [
+    ({}, "non-empty"), ({"x": "nope"}, "unknown type"),
+    ({"e": {"type": "email", "from": "later"}, "later": "name"}, "earlier field"),
+    ({"x": {"type": "int", "nulls": 2}}, "nulls"),
+])
+def test_schema_validation(fields, msg):
+    with pytest.raises(ValueError, match=msg): Schema.from_dict({"fields": fields})
+
+def test_load_schema_file(tmp_path):
+    path = tmp_path / "s.json"; path.write_text(json.dumps(CUSTOM))
+    assert load_schema(str(path)).name == "customer" and load_schema("USER").name == "user"
+    with pytest.raises(ValueError): load_schema(str(tmp_path / "missing.json"))
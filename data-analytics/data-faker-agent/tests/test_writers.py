@@ -0,0 +1,87 @@
+"""Tests for the streaming CSV / NDJSON / Parquet writers."""
+import sys, os, io, csv, json, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unittest.mock import patch
+from agent.schema import Schema, load_schema, generate_columns, generate_records
+from agent.writers import render_chunk, write_dataset
+from agent.faker import export_csv
+
+TRICKY = Schema.from_dict({"name": "tricky", "fields": {
+    "n": "sequence", "note": {"type": "choice", "values": ['plain', 'a,b', 'say "hi"', 'two\nlines', 'ünï']},
+    "score": {"type": "float", "min": 0, "max": 1, "decimals": 3, "nulls": 0.2},
+    "ok": {"type": "bool", "nulls": 0.1}, "meta": {"type": "object", "fields": {"code": {"type": "constant", "value": "x\"y"}}}}})
+
+def dump(schema, rows, fmt, **kw):
+    buf = io.BytesIO(); write_dataset(schema, rows, buf, fmt, **kw); return buf.getvalue()
+
+def test_csv_round_trip():
+    out = dump(TRICKY, 300, "csv", seed=4, chunk_size=64).decode()
+    rows = list(csv.DictReader(io.StringIO(out)))
+    recs = generate_records(TRICKY, 300, seed=4, chunk_size=64)
+    assert list(rows[0]) == ["n", "note", "score", "ok", "meta_code"] and len(rows) == 300
+    for row, rec in zip(rows, recs):
+        assert row["note"] == rec["note"] and row["meta_code"] == 'x"y' and row["n"] == str(rec["n"])
+        assert row["score"] == ("" if rec["score"] is None else f"{rec['score']:.3f}")
+        assert row["ok"] == ("" if rec["ok"] is None else str(rec["ok"]))
+
+@pytest.mark.parametrize("name", ["user", "product", "order"])
+def test_ndjson_matches_records(name):
+    schema = load_schema(name)
+    lines = dump(schema, 250, "ndjson", seed=9, chunk_size=100).decode().splitlines()
+    assert [json.loads(l) for l in lines] == generate_records(schema, 250, seed=9, chunk_size=100)
+
+def test_ndjson_escapes_and_nulls():
+    lines = [json.loads(l) for l in dump(TRICKY, 200, "ndjson", seed=1).decode().splitlines()]
+    assert lines == generate_records(TRICKY, 200, seed=1)
+    assert any(r["score"] is None for r in lines) and {r["note"] for r in lines} >= {'two\nlines', 'ünï'}
+
+@pytest.mark.parametrize("pattern", ["A\t#?", "x\x01#", "#\x7f", "a,b#", 'q"#', "back\\#", "ü-##", "line\r\n#"])
+def test_pattern_with_special_characters_stays_valid(pattern):
+    schema = Schema.from_dict({"name": "p", "fields": {"code": {"type": "pattern", "pattern": pattern}}})
+    recs = generate_records(schema, 2500, seed=2)
+    assert [json.loads(l) for l in dump(schema, 2500, "ndjson", seed=2).decode().split("\n") if l] == recs
+    rows = list(csv.reader(io.StringIO(dump(schema, 2500, "csv", seed=2).decode(), newline="")))
+    assert [r[0] for r in rows[1:]] == [r["code"] for r in recs]
+
+def test_output_independent_of_workers():
+    schema = load_schema("user")
+    assert dump(schema, 1000, "csv", seed=5, chunk_size=128) == dump(schema, 1000, "csv", seed=5, chunk_size=128, workers=2)
+
+def test_csv_header_flag_and_empty():
+    assert dump(load_schema("product"), 0, "csv") == b"id,name,price,category,in_stock,rating\n"
+    assert dump(load_schema("product"), 3, "csv", header=False).count(b"\n") == 3
+
+def test_write_to_path(tmp_path):
+    path = tmp_path / "out.ndjson"
+    assert write_dataset(load_schema("order"), 10, str(path), "ndjson") == 10
+    assert len(path.read_text().splitlines()) == 10
+
+def test_bad_format():
+    with pytest.raises(ValueError): write_dataset(load_schema("user"), 1, io.BytesIO(), "xml")
+    with pytest.raises(ValueError, match="text formats only"): render_chunk(TRICKY, generate_columns(TRICKY, 0, 3), "parquet")
+
+def test_parquet_without_pyarrow(tmp_path):
+    with patch.dict(sys.modules, {"pyarrow": None, "pyarrow.parquet": None}):
+        with pytest.raises(RuntimeError, match="pip install pyarrow"): write_dataset(TRICKY, 5, str(tmp_path / "x.parquet"), "parquet")
+
+def test_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"  # pragma: no cover
+    write_dataset(TRICKY, 500, str(path), "parquet", seed=2, chunk_size=200)  # pragma: no cover
+    assert pq.read_table(path).to_pylist() == generate_records(TRICKY, 500, seed=2, chunk_size=200)  # pragma: no cover
+    write_dataset(load_schema("user"), 50, str(path), "parquet", seed=3)  # pragma: no cover
+    assert pq.read_table(path).to_pylist() == generate_records("user", 50, seed=3)  # pragma: no cover
+    with pytest.raises(ValueError, match="file path"): write_dataset(TRICKY, 5, io.BytesIO(), "parquet")  # pragma: no cover
+
+def test_export_csv_quotes_fields():
+    out = export_csv([{"a": "x,y", "b": {"c": 'q"'}}])
+    assert list(csv.reader(io.StringIO(out))) == [["a", "b_c"], ["x,y", 'q"']]
+
+def test_main_bulk(tmp_path, capsys):
+    from main import main
+    out = tmp_path / "users.csv"
+    with patch("sys.argv", ["main", "bulk", "user", "--rows", "50", "-o", str(out), "--seed", "1"]): main()
+    assert len(out.read_text().splitlines()) == 51 and "Wrote 50 user rows" in capsys.readouterr().err
+    with patch("sys.argv", ["main", "bulk", "nope.json"]):
+        with pytest.raises(SystemExit) as e: main()
+    assert e.value.code == 2
@@ -1,9 +1,10 @@
-from langchain_openai import ChatOpenAI
+import os
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import PromptTemplate
 from typing import Dict, Any, List
 import pandas as pd
 import json
-import os
 
 class LLMAnalyzer:
     def __init__(self, api_key: str = None):
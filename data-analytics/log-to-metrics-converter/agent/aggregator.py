@@ -0,0 +1,282 @@
+"""Incremental metric aggregation: apply extracted metric definitions to parsed log records.
+
+Series are cumulative (what Prometheus expects to scrape) and additionally keep a
+fixed ring of time slots so recent-window rates, means and quantiles can be read
+without storing individual observations. Memory is bounded by `max_series` per
+metric times the slot count.
+"""
+import bisect
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+OVERFLOW_LABEL = "__overflow__"
+METRIC_TYPES = ("COUNTER", "GAUGE", "HISTOGRAM", "SUMMARY")
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+_LEVEL_WORDS = {"error": ("ERROR", "CRITICAL", "FATAL", "EMERGENCY", "ALERT"), "warn": ("WARN",)}
+
+
+@dataclass
+class MetricDefinition:
+    """One metric as proposed by MetricExtractor, plus optional aggregation settings."""
+    name: str
+    type: str = "COUNTER"
+    description: str = ""
+    labels: List[str] = field(default_factory=list)
+    source_field: Optional[str] = None
+    unit: str = ""
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    match: Dict[str, Any] = field(default_factory=dict)  # field -> value or list of values
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetricDefinition":
+        mtype = str(data.get("type", "COUNTER")).upper()
+        if mtype not in METRIC_TYPES:
+            raise ValueError(f"Unsupported metric type for {data.get('name')!r}: {mtype}")
+        metric = cls(
+            name=_INVALID_NAME_CHARS.sub("_", data["name"]),
+            type=mtype,
+            description=data.get("description", ""),
+            labels=list(data.get("labels") or []),
+            source_field=data.get("source_field"),
+            unit=data.get("unit", ""),
+            buckets=tuple(sorted(float(b) for b in data.get("buckets", DEFAULT_BUCKETS))),
+            match=dict(data.get("match") or {}),
+        )
+        if not metric.match and mtype == "COUNTER" and metric.source_field == "level":
+            # "log_error_count" sourced from `level` means: count error-level records
+            for word, levels in _LEVEL_WORDS.items():
+                if word in metric.name.lower():
+                    metric.match = {"level": list(levels)}
+                    break
+        return metric
+
+
+def field_value(record: Dict[str, Any], path: Optional[str]) -> Any:
+    """Resolve 'level', 'metadata.duration' or a bare metadata key like 'duration'."""
+    if not path:
+        return None
+    value: Any = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    if value is None and "." not in path:
+        metadata = record.get("metadata")
+        if isinstance(metadata, dict):
+            value = metadata.get(path)
+    return value
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+class _Series:
+    """Cumulative totals plus a ring of `slots` time slots for windowed reads."""
+    __slots__ = ("count", "sum", "last", "buckets", "ring")
+
+    def __init__(self, n_buckets: int, slots: int):
+        self.count = 0
+        self.sum = 0.0
+        self.last = 0.0
+        self.buckets = [0] * n_buckets  # non-cumulative per-bucket counts; +Inf = count
+        self.ring = [[-1, 0, 0.0, None] for _ in range(slots)]  # [slot, count, sum, bucket counts]
+
+    def add(self, value: float, bucket: Optional[int], slot: int):
+        self.count += 1
+        self.sum += value
+        self.last = value
+        if bucket is not None and bucket < len(self.buckets):
+            self.buckets[bucket] += 1
+        entry = self.ring[slot % len(self.ring)]
+        if entry[0] != slot:
+            entry[0], entry[1], entry[2], entry[3] = slot, 0, 0.0, None
+        entry[1] += 1
+        entry[2] += value
+        if bucket is not None:
+            if entry[3] is None:
+                entry[3] = [0] * (len(self.buckets) + 1)
+            entry[3][bucket] += 1
+
+
+class Aggregator:
+    """Thread-safe streaming aggregator over parsed log records."""
+
+    def __init__(self, definitions, window_seconds: float = 300.0, slots: int = 30,
+                 max_series: int = 1000, clock: Callable[[], float] = time.time):
+        self.metrics = [d if isinstance(d, MetricDefinition) else MetricDefinition.from_dict(d) for d in definitions]
+        self.window_seconds = window_seconds
+        self.slots = slots
+        self.slot_width = window_seconds / slots
+        self.max_series = max_series
+        self.clock = clock
+        self.records = 0
+        self.skipped = 0  # observations dropped because the source value wasn't numeric
+        self._series: Dict[str, Dict[Tuple[str, ...], _Series]] = {m.name: {} for m in self.metrics}
+        self._lock = threading.Lock()
+
+    def observe(self, record: Dict[str, Any]):
+        self.observe_many((record,))
+
+    def observe_many(self, records):
+        with self._lock:
+            slot = int(self.clock() // self.slot_width)
+            for record in records:
+                self.records += 1
+                for metric in self.metrics:
+                    self._apply(metric, record, slot)
+
+    def _apply(self, metric: MetricDefinition, record: Dict[str, Any], slot: int):
+        for key, expected in metric.match.items():
+            actual = field_value(record, key)
+            allowed = expected if isinstance(expected, (list, tuple, set)) else (expected,)
+            if actual not in allowed:
+                return
+        raw = field_value(record, metric.source_field)
+        if metric.type == "COUNTER":
+            if metric.source_field and raw is None:
+                return
+            # A numeric source (bytes sent, rows written) is added up; anything else counts records
+            value = _as_number(raw)
+            if value is None:
+                value = 1.0
+            elif value < 0:
+                self.skipped += 1  # counters never go down
+                return
+        else:
+            value = _as_number(raw)
+            if value is None:
+                if raw is not None:
+                    self.skipped += 1
+                return
+        bucket = bisect.bisect_left(metric.buckets, value) if metric.type == "HISTOGRAM" else None
+
+        series = self._series[metric.name]
+        key = tuple("" if (v := field_value(record, label)) is None else str(v) for label in metric.labels)
+        entry = series.get(key)
+        if entry is None:
+            if len(series) >= self.max_series:
+                key = (OVERFLOW_LABEL,) * len(metric.labels)
+                entry = series.get(key)
+            if entry is None:
+                entry = series[key] = _Series(len(metric.buckets), self.slots)
+        entry.add(value, bucket, slot)
+
+    # ─── Reads ───────────────────────────────────────────────────
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4) of the cumulative series."""
+        out = []
+        with self._lock:
+            for metric in self.metrics:
+                series = self._series[metric.name]
+                ptype = {"COUNTER": "counter", "GAUGE": "gauge", "HISTOGRAM": "histogram", "SUMMARY": "summary"}[metric.type]
+                if metric.description:
+                    out.append(f"# HELP {metric.name} {_escape_help(metric.description)}")
+                out.append(f"# TYPE {metric.name} {ptype}")
+                names = _label_names(metric)
+                for key, s in series.items():
+                    labels = list(zip(names, key))
+                    if metric.type == "COUNTER":
+                        out.append(f"{metric.name}{_labels(labels)} {_num(s.sum)}")
+                    elif metric.type == "GAUGE":
+                        out.append(f"{metric.name}{_labels(labels)} {_num(s.last)}")
+                    else:
+                        if metric.type == "HISTOGRAM":
+                            cumulative = 0
+                            for bound, n in zip(metric.buckets, s.buckets):
+                                cumulative += n
+                                out.append(f"{metric.name}_bucket{_labels(labels + [('le', _num(bound))])} {cumulative}")
+                            out.append(f"{metric.name}_bucket{_labels(labels + [('le', '+Inf')])} {s.count}")
+                        out.append(f"{metric.name}_sum{_labels(labels)} {_num(s.sum)}")
+                        out.append(f"{metric.name}_count{_labels(labels)} {s.count}")
+            out.append("# TYPE log_to_metrics_records_total counter")
+            out.append(f"log_to_metrics_records_total {self.records}")
+            out.append("# TYPE log_to_metrics_skipped_values_total counter")
+            out.append(f"log_to_metrics_skipped_values_total {self.skipped}")
+        return "\n".join(out) + "\n"
+
+    def window_stats(self, quantiles=(0.5, 0.95, 0.99)) -> List[Dict[str, Any]]:
+        """Per-series count, rate/s, mean and (histograms) quantiles over the last window.
+
+        A counter's rate is how fast its value grows, which differs from the record
+        rate when it adds up a numeric source field.
+        """
+        with self._lock:
+            current = int(self.clock() // self.slot_width)
+            rows = []
+            for metric in self.metrics:
+                names = _label_names(metric)
+                for key, s in self._series[metric.name].items():
+                    live = [e for e in s.ring if current - self.slots < e[0] <= current]
+                    count = sum(e[1] for e in live)
+                    total = sum(e[2] for e in live)
+                    growth = total if metric.type == "COUNTER" else count
+                    row = {"metric": metric.name, "labels": dict(zip(names, key)), "count": count,
+                           "rate": growth / self.window_seconds, "mean": total / count if count else None}
+                    if metric.type == "HISTOGRAM":
+                        merged = [0] * (len(metric.buckets) + 1)
+                        for e in live:
+                            if e[3]:
+                                merged = [a + b for a, b in zip(merged, e[3])]
+                        for q in quantiles:
+                            row[f"p{q * 100:g}"] = _bucket_quantile(q, metric.buckets, merged)
+                    rows.append(row)
+            return rows
+
+
+def _bucket_quantile(q: float, bounds, counts) -> Optional[float]:
+    """Linear interpolation within buckets, like PromQL's histogram_quantile."""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    cumulative, lower = 0, 0.0
+    for bound, n in zip(list(bounds) + [math.inf], counts):
+        if n and cumulative + n >= rank:
+            if bound == math.inf:
+                return lower
+            return lower + (bound - lower) * (rank - cumulative) / n
+        cumulative += n
+        if bound != math.inf:
+            lower = bound
+    return lower
+
+
+def _label_names(metric: MetricDefinition) -> List[str]:
+    # 'metadata.status' -> 'status'
+    return [_INVALID_NAME_CHARS.sub("_", label.rsplit(".", 1)[-1]) for label in metric.labels]
+
+
+def _num(value: float) -> str:
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r'\"').replace("\n", r"\n")
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in pairs) + "}"
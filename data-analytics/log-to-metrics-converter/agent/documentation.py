@@ -1,9 +1,11 @@
 import json
 from typing import List, Dict, Any
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
 from prompts.system_prompts import DOC_GENERATOR_SYSTEM_PROMPT
 from config import Config
+from lazy_import import lazy_import
+
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
+ChatPromptTemplate = lazy_import("langchain_core.prompts", "ChatPromptTemplate")
 
 class DocGenerator:
     def __init__(self, api_key: str = None, model: str = Config.DEFAULT_MODEL):
@@ -0,0 +1,123 @@
+"""Tail log files into an Aggregator and serve the result on a local `/metrics` endpoint."""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List, Optional
+
+from agent.aggregator import Aggregator
+from agent.patterns import PatternEngine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def tail_batches(path: str, from_start: bool = False, poll_interval: float = 0.25,
+                 stop: Optional[threading.Event] = None) -> Iterator[List[str]]:
+    """Yield the complete lines appended to `path`, one list per read, following rotation and truncation.
+
+    Partial trailing lines are held back until their newline arrives. The generator
+    ends once `stop` is set.
+    """
+    stop = stop or threading.Event()
+    f, inode, pending = None, None, ""
+    while not stop.is_set():
+        if f is None:
+            try:
+                f = open(path, "r", encoding="utf-8", errors="replace", newline="")
+            except FileNotFoundError:
+                stop.wait(poll_interval)
+                continue
+            inode = os.fstat(f.fileno()).st_ino
+            if not from_start:
+                f.seek(0, os.SEEK_END)
+            from_start = True  # files that appear after rotation are read from the top
+        chunk = f.read(65536)
+        if chunk:
+            lines = (pending + chunk).split("\n")
+            pending = lines.pop()
+            if lines:
+                yield [line.rstrip("\r") for line in lines]
+            continue
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = None
+        if st is None or st.st_ino != inode or st.st_size < f.tell():
+            f.close()  # rotated or truncated: reopen on the next pass
+            f, pending = None, ""
+            continue
+        stop.wait(poll_interval)
+    if f is not None:
+        f.close()
+
+
+class LogFeeder:
+    """Parses tailed lines with the local pattern engine and feeds them to an Aggregator in batches."""
+
+    def __init__(self, aggregator: Aggregator, service: Optional[str] = None, batch_size: int = 500,
+                 engine: Optional[PatternEngine] = None):
+        self.aggregator = aggregator
+        self.service = service
+        self.batch_size = batch_size
+        self.engine = engine or PatternEngine()
+        self.unparsed = 0
+
+    def feed(self, lines) -> int:
+        """Consume an iterable of lines; returns how many records were aggregated."""
+        parse_line = self.engine.parse_line
+        batch, total = [], 0
+        for line in lines:
+            if not line.strip():
+                continue
+            record, _ = parse_line(line)
+            if record is None:
+                self.unparsed += 1
+                continue
+            if self.service and not record.get("service"):
+                record["service"] = self.service
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                self.aggregator.observe_many(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            self.aggregator.observe_many(batch)
+            total += len(batch)
+        return total
+
+    def follow(self, path: str, from_start: bool = False, stop: Optional[threading.Event] = None,
+               poll_interval: float = 0.25):
+        """Tail `path` into the aggregator until `stop` is set."""
+        for lines in tail_batches(path, from_start=from_start, poll_interval=poll_interval, stop=stop):
+            self.feed(lines)
+
+
+def make_server(aggregator: Aggregator, host: str = "127.0.0.1", port: int = 9108,
+                feeders=()) -> ThreadingHTTPServer:
+    """Create (but do not start) the exporter; port 0 picks a free port."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):  # noqa: A002 - scrapes would flood stderr
+            pass
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                unparsed = sum(feeder.unparsed for feeder in feeders)
+                body = (aggregator.render()
+                        + f"# TYPE log_to_metrics_unparsed_lines_total counter\nlog_to_metrics_unparsed_lines_total {unparsed}\n")
+                self._send(body, CONTENT_TYPE)
+            elif path == "/window":
+                self._send(json.dumps(aggregator.window_stats()), "application/json")
+            else:
+                self.send_error(404)
+
+        def _send(self, body: str, content_type: str):
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return ThreadingHTTPServer((host, port), MetricsHandler)
@@ -1,9 +1,11 @@
 import json
 from typing import List, Dict, Any
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
 from prompts.system_prompts import METRIC_EXTRACTOR_SYSTEM_PROMPT
 from config import Config
+from lazy_import import lazy_import
+
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
+ChatPromptTemplate = lazy_import("langchain_core.prompts", "ChatPromptTemplate")
 
 class MetricExtractor:
     def __init__(self, api_key: str = None, model: str = Config.DEFAULT_MODEL):
@@ -18,8 +20,7 @@ class MetricExtractor:
         if not logs:
             return []
 
-        # Take a sample for analysis (e.g., first 10 logs)
-        sample_logs = json.dumps(logs[:10], indent=2)
+        sample_logs = json.dumps(self._sample(logs), indent=2)
 
         if not self.llm:
             return self._mock_extract(logs)  # pragma: no cover
@@ -43,6 +44,27 @@ class MetricExtractor:
             print(f"Error extracting metrics: {e}")  # pragma: no cover
             return []  # pragma: no cover
 
+    @staticmethod
+    def _sample(logs: List[Dict[str, Any]], size: int = 10) -> List[Dict[str, Any]]:
+        """Up to `size` logs covering as many distinct (level, service, metadata keys) shapes as possible.
+
+        The first N lines of a large file are usually all the same kind of event, so a
+        plain head would hide error paths and fields that only appear later.
+        """
+        sample, seen = [], set()
+        for log in logs:
+            metadata = log.get("metadata")
+            shape = (log.get("level"), log.get("service"),
+                     tuple(sorted(metadata)) if isinstance(metadata, dict) else ())
+            if shape not in seen:
+                seen.add(shape)
+                sample.append(log)
+                if len(sample) == size:
+                    return sample
+        chosen = {id(log) for log in sample}
+        sample += [log for log in logs if id(log) not in chosen][:size - len(sample)]
+        return sample
+
     def _mock_extract(self, logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         # Mock metrics
         return [  # pragma: no cover
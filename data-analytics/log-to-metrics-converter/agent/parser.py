@@ -1,28 +1,127 @@
 import json
 import os
-from typing import List, Dict, Any
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
 from prompts.system_prompts import LOG_PARSER_SYSTEM_PROMPT
 from config import Config
+from lazy_import import lazy_import
+from agent.patterns import PatternEngine
+
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
+ChatPromptTemplate = lazy_import("langchain_core.prompts", "ChatPromptTemplate")
+
+
+@dataclass
+class ParseStats:
+    total_lines: int = 0
+    by_pattern: Dict[str, int] = field(default_factory=dict)
+    learned_templates: int = 0
+    llm_lines: int = 0
+    llm_batches: int = 0
+    fallback_lines: int = 0
+    local_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    @property
+    def matched_lines(self) -> int:
+        return sum(self.by_pattern.values())
+
+    @property
+    def lines_per_sec(self) -> float:
+        """Throughput of the local pattern engine."""
+        return self.matched_lines / self.local_seconds if self.local_seconds else 0.0
+
 
 class LogParser:
-    def __init__(self, api_key: str = None, model: str = Config.DEFAULT_MODEL):
+    def __init__(self, api_key: str = None, model: str = Config.DEFAULT_MODEL,
+                 learn_sample: int = Config.LEARN_SAMPLE_LINES, batch_lines: int = Config.LLM_BATCH_LINES):
         self.api_key = api_key or Config.OPENAI_API_KEY
         self.model = model
+        self.learn_sample = learn_sample
+        self.batch_lines = batch_lines
+        self.engine = PatternEngine()
+        self.last_stats = ParseStats()
         if self.api_key:
             self.llm = ChatOpenAI(api_key=self.api_key, model=self.model, temperature=0)
         else:
             self.llm = None  # pragma: no cover
 
     def parse(self, raw_logs: str) -> List[Dict[str, Any]]:
+        """Parse locally with compiled patterns; only lines no pattern knows go to the LLM.
+
+        A small sample of unmatched lines is labelled by the LLM and turned into
+        templates, then whatever is still unmatched is sent in batches of `batch_lines`.
+        """
         if not raw_logs or not raw_logs.strip():
             return []
 
-        if not self.llm:
-            # Fallback for demo/testing without key
-            return self._mock_parse(raw_logs)  # pragma: no cover
+        started = time.perf_counter()
+        stats = ParseStats()
+        lines = [(i, line) for i, line in enumerate(raw_logs.split('\n')) if line.strip()]
+        records: List[Optional[Dict[str, Any]]] = [None] * len(lines)
+        unmatched = self._match_local(lines, records, range(len(lines)), stats)
+
+        if unmatched and self.llm:
+            sample = unmatched[:self.learn_sample]
+            labelled = self._llm_parse([lines[k][1] for k in sample], stats)
+            if labelled is not None:
+                for k, record in zip(sample, labelled):
+                    records[k] = record
+                    if self.engine.learn(lines[k][1], record) is not None:
+                        stats.learned_templates += 1
+            rest = [k for k in unmatched if records[k] is None]
+            rest = self._match_local(lines, records, rest, stats) if stats.learned_templates else rest
+            for b in range(0, len(rest), self.batch_lines):
+                batch = rest[b:b + self.batch_lines]
+                parsed = self._llm_parse([lines[k][1] for k in batch], stats)
+                if parsed is not None:
+                    for k, record in zip(batch, parsed):
+                        records[k] = record
+            unmatched = [k for k in unmatched if records[k] is None]
+
+        if unmatched:
+            # Fallback for demo/testing without key (or when the LLM reply was unusable)
+            stats.fallback_lines = len(unmatched)
+            mocked = self._mock_parse('\n'.join(lines[k][1] for k in unmatched))
+            for k, record in zip(unmatched, mocked):
+                record["metadata"]["line_number"] = lines[k][0] + 1
+                records[k] = record
+
+        stats.total_lines = len(lines)
+        stats.total_seconds = time.perf_counter() - started
+        self.last_stats = stats
+        return records
+
+    def _match_local(self, lines, records, indices, stats: ParseStats) -> List[int]:
+        """Fill `records` for the given indices the engine can parse; return the rest."""
+        started = time.perf_counter()
+        parse_line = self.engine.parse_line
+        counts = Counter()
+        unmatched = []
+        for k in indices:
+            record, name = parse_line(lines[k][1])
+            if record is None:
+                unmatched.append(k)
+            else:
+                records[k] = record
+                counts[name] += 1
+        for name, n in counts.items():
+            stats.by_pattern[name] = stats.by_pattern.get(name, 0) + n
+        stats.local_seconds += time.perf_counter() - started
+        return unmatched
+
+    def _llm_parse(self, lines: List[str], stats: ParseStats) -> Optional[List[Dict[str, Any]]]:
+        """One LLM call for a batch of lines; None unless it returns one record per line."""
+        stats.llm_batches += 1
+        stats.llm_lines += len(lines)
+        parsed = self._llm_call('\n'.join(lines))
+        if not isinstance(parsed, list) or len(parsed) != len(lines) or not all(isinstance(r, dict) for r in parsed):
+            return None
+        return parsed
 
+    def _llm_call(self, raw_logs: str):
         try:
             prompt = ChatPromptTemplate.from_messages([
                 ("system", LOG_PARSER_SYSTEM_PROMPT),
@@ -42,8 +141,7 @@ class LogParser:
             return json.loads(content)
         except Exception as e:  # pragma: no cover
             print(f"Error parsing logs: {e}")  # pragma: no cover
-            # Return a basic structure on failure
-            return self._mock_parse(raw_logs)  # pragma: no cover
+            return None  # pragma: no cover
 
     def _mock_parse(self, raw_logs: str) -> List[Dict[str, Any]]:
         # Simple mock parser for demonstration
@@ -0,0 +1,306 @@
+"""Local log parsing engine: compiled grok patterns for common formats plus templates learned from LLM-labelled lines.
+
+Every matcher returns records in the same shape the LLM parser produces:
+``{"timestamp", "level", "service", "message", "metadata"}``.
+"""
+import json
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+# Base grok vocabulary (subset of the Logstash core patterns)
+GROK_BASE = {
+    "INT": r"[+-]?\d+",
+    "POSINT": r"\d+",
+    "NUMBER": r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)",
+    "WORD": r"\w+",
+    "NOTSPACE": r"\S+",
+    "DATA": r".*?",
+    "GREEDYDATA": r".*",
+    "QS": r'"(?:[^"\\]|\\.)*"',
+    "IP": r"(?:\d{1,3}\.){3}\d{1,3}|[0-9A-Fa-f]*:[0-9A-Fa-f:.]+",
+    "IPORHOST": r"%{IP}|[\w.-]+",
+    "PROG": r"[\w./-]+",
+    "HTTPDATE": r"\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2} [+-]\d{4}",
+    "SYSLOGTIMESTAMP": r"\w{3} +\d{1,2} \d{2}:\d{2}:\d{2}",
+    "TIMESTAMP_ISO8601": r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:[.,]\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?",
+    "LOGLEVEL": r"(?i:TRACE|DEBUG|INFO|NOTICE|WARN(?:ING)?|ERROR|ERR|CRIT(?:ICAL)?|FATAL|ALERT|EMERG(?:ENCY)?)",
+}
+
+_GROK_REF = re.compile(r"%\{(\w+)(?::([\w.]+))?(?::(int|float))?\}")
+_CONVERTERS = {"int": int, "float": float}
+_LEVEL_ALIASES = {"WARNING": "WARN", "ERR": "ERROR", "CRIT": "CRITICAL", "EMERG": "EMERGENCY"}
+_SYSLOG_SEVERITY = ("EMERGENCY", "ALERT", "CRITICAL", "ERROR", "WARN", "NOTICE", "INFO", "DEBUG")
+_TOP_LEVEL = ("timestamp", "level", "service", "message")
+_KEY_ALIASES = {
+    "timestamp": ("timestamp", "@timestamp", "time", "ts", "date"),
+    "level": ("level", "lvl", "severity", "loglevel", "levelname"),
+    "message": ("message", "msg", "event"),
+    "service": ("service", "app", "logger", "component"),
+}
+_KV_PAIR = re.compile(r'([\w.-]+)=("(?:[^"\\]|\\.)*"|\S*)')
+_LOGFMT_LINE = re.compile(r'^\s*(?:[\w.-]+=(?:"(?:[^"\\]|\\.)*"|\S*)\s*)+$')
+_NUMERIC = re.compile(r"[+-]?\d+(?:\.\d+)?$")
+_TIMESTAMP_ANY = re.compile("|".join(GROK_BASE[k] for k in ("TIMESTAMP_ISO8601", "HTTPDATE", "SYSLOGTIMESTAMP")))
+
+
+def expand_grok(pattern: str) -> tuple[str, Dict[str, Callable]]:
+    """Expand %{NAME:field:type} references into a Python regex and per-field converters."""
+    converters = {}
+
+    def repl(m):
+        name, field, conv = m.groups()
+        body = GROK_BASE[name]
+        while "%{" in body:
+            body = _GROK_REF.sub(lambda r: f"(?:{GROK_BASE[r.group(1)]})", body)
+        if conv:
+            converters[field] = _CONVERTERS[conv]
+        return f"(?P<{field}>{body})" if field else f"(?:{body})"
+
+    return _GROK_REF.sub(repl, pattern), converters
+
+
+def normalize_level(level: Optional[str]) -> Optional[str]:
+    if not level:
+        return level
+    level = level.upper()
+    return _LEVEL_ALIASES.get(level, level)
+
+
+def coerce(value: str) -> Any:
+    """'120' -> 120, '0.25' -> 0.25, anything else unchanged."""
+    if _NUMERIC.match(value):
+        return float(value) if "." in value else int(value)
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _httpdate_to_iso(value: str) -> str:
+    return datetime.strptime(value, "%d/%b/%Y:%H:%M:%S %z").isoformat()
+
+
+def _record(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Split flat fields into the standard top-level keys and `metadata`."""
+    record = {key: fields.pop(key, None) for key in _TOP_LEVEL}
+    record["level"] = normalize_level(record["level"])
+    record["metadata"] = {k: v for k, v in fields.items() if v is not None}
+    return record
+
+
+def _from_mapping(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a JSON/logfmt object onto the standard fields using common key aliases."""
+    fields = dict(data)
+    for target, aliases in _KEY_ALIASES.items():
+        for alias in aliases:
+            if isinstance(fields.get(alias), (str, int, float)):
+                if alias != target:
+                    fields[target] = fields.pop(alias)
+                break
+    return _record(fields)
+
+
+class GrokPattern:
+    """A compiled grok expression with optional post-processing of the captured fields."""
+
+    def __init__(self, name: str, grok: str, post: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.name = name
+        regex, self.converters = expand_grok(grok)
+        self.regex = re.compile(regex)
+        self.post = post
+
+    @classmethod
+    def from_regex(cls, name: str, regex: str, converters: Dict[str, Callable]) -> "GrokPattern":
+        pattern = cls(name, "")
+        pattern.regex = re.compile(regex)
+        pattern.converters = converters
+        return pattern
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        m = self.regex.fullmatch(line)
+        if m is None:
+            return None
+        fields = {k: v for k, v in m.groupdict().items() if v is not None}
+        for key, conv in self.converters.items():
+            if key in fields:
+                fields[key] = conv(fields[key])
+        if self.post:
+            self.post(fields)
+        return _record(fields)
+
+
+class JsonLinesMatcher:
+    name = "json"
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        if not line.startswith("{"):
+            return None
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return None
+        return _from_mapping(data) if isinstance(data, dict) else None
+
+
+class LogfmtMatcher:
+    name = "logfmt"
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        if "=" not in line or not _LOGFMT_LINE.match(line):
+            return None
+        pairs = {k: coerce(v[1:-1] if v.startswith('"') else v) for k, v in _KV_PAIR.findall(line)}
+        return _from_mapping(pairs) if len(pairs) >= 2 else None
+
+
+# ─── Post-processing for the built-in patterns ──────────────────
+
+def _post_access(fields):
+    fields["timestamp"] = _httpdate_to_iso(fields["timestamp"])
+    for key in ("referrer", "user_agent"):
+        if key in fields:
+            fields[key] = fields[key][1:-1]
+    for key in ("ident", "auth"):
+        if fields.get(key) == "-":
+            del fields[key]
+    status = fields["status"]
+    fields["level"] = "ERROR" if status >= 500 else "WARN" if status >= 400 else "INFO"
+    fields["message"] = fields.pop("request", None) or f"{fields.get('method')} {fields.get('path')}"
+
+
+def _post_syslog(fields):
+    if "pri" in fields:
+        fields["level"] = _SYSLOG_SEVERITY[fields["pri"] & 7]
+    for key in ("procid", "msgid", "version"):
+        if fields.get(key) == "-":
+            del fields[key]
+
+
+def _post_app(fields):
+    # Trailing key=value pairs in free-text app logs become metadata (latency=120 status=500 ...)
+    message = fields.get("message", "")
+    if "=" in message:
+        for k, v in _KV_PAIR.findall(message):
+            if k not in _TOP_LEVEL:
+                fields[k] = coerce(v[1:-1] if v.startswith('"') else v)
+
+
+BUILTIN_PATTERNS = [
+    GrokPattern(
+        "access_combined",
+        r'%{IPORHOST:remote_addr} %{NOTSPACE:ident} %{NOTSPACE:auth} \[%{HTTPDATE:timestamp}\] '
+        r'"(?:%{WORD:method} %{NOTSPACE:path}(?: HTTP/%{NUMBER:http_version})?|%{DATA:request})" '
+        r'%{INT:status:int} (?:%{INT:bytes:int}|-)(?: %{QS:referrer} %{QS:user_agent})?(?: %{NUMBER:duration:float})?',
+        _post_access,
+    ),
+    GrokPattern(
+        "syslog_rfc5424",
+        r"<%{POSINT:pri:int}>%{POSINT:version} %{TIMESTAMP_ISO8601:timestamp} %{NOTSPACE:hostname} "
+        r"%{NOTSPACE:service} %{NOTSPACE:procid} %{NOTSPACE:msgid} (?:-|\[.*?\])(?: %{GREEDYDATA:message})?",
+        _post_syslog,
+    ),
+    GrokPattern(
+        "syslog_rfc3164",
+        r"(?:<%{POSINT:pri:int}>)?%{SYSLOGTIMESTAMP:timestamp} %{NOTSPACE:hostname} "
+        r"%{PROG:service}(?:\[%{POSINT:pid:int}\])?: %{GREEDYDATA:message}",
+        _post_syslog,
+    ),
+    GrokPattern(
+        "app",
+        r"%{TIMESTAMP_ISO8601:timestamp}\s+\[?%{LOGLEVEL:level}\]?\s+(?:\[%{NOTSPACE:service}\]\s+)?"
+        r"(?:%{PROG:logger}:\s+)?%{GREEDYDATA:message}",
+        _post_app,
+    ),
+]
+
+
+class PatternEngine:
+    """Matches lines against built-in and learned patterns, most recently successful first."""
+
+    MIN_TEMPLATE_LITERAL = 3  # learned templates need this many literal non-space chars to anchor them
+
+    def __init__(self, patterns: Optional[list] = None):
+        self.matchers = [JsonLinesMatcher(), LogfmtMatcher(), *(patterns if patterns is not None else BUILTIN_PATTERNS)]
+        self.learned: List[GrokPattern] = []
+        self._last = None
+
+    def parse_line(self, line: str):
+        """Return (record, matcher_name) or (None, None)."""
+        line = line.rstrip("\r\n")
+        last = self._last
+        # Logs are usually homogeneous, so the last hit is tried before the full list
+        if last is not None:
+            record = last.parse(line)
+            if record is not None:
+                return record, last.name
+        for matcher in self.matchers:
+            if matcher is last:
+                continue
+            record = matcher.parse(line)
+            if record is not None:
+                self._last = matcher
+                return record, matcher.name
+        return None, None
+
+    def learn(self, line: str, record: Dict[str, Any]) -> Optional[GrokPattern]:
+        """Derive a template from one LLM-labelled line; returns it if it was added."""
+        line = line.rstrip("\r\n")
+        if self.parse_line(line)[0] is not None:
+            return None
+        template = self._template_from(line, record)
+        if template is None:
+            return None
+        self.learned.append(template)
+        self.matchers.append(template)
+        return template
+
+    def _template_from(self, line: str, record: Dict[str, Any]) -> Optional[GrokPattern]:
+        values = [(k, record.get(k)) for k in ("timestamp", "level", "service")]
+        values += [(k, v) for k, v in (record.get("metadata") or {}).items() if isinstance(v, (str, int, float))]
+        spans = []  # (start, end, field, capture regex)
+
+        def claim(start, end, field, regex):
+            if start < 0 or any(s < end and start < e for s, e, _, _ in spans):
+                return False
+            spans.append((start, end, field, regex))
+            return True
+
+        for field, value in values:
+            if value is None or value == "" or isinstance(value, bool) or not re.fullmatch(r"[A-Za-z_]\w*", field):
+                continue
+            text = str(value)
+            kind = ("LOGLEVEL" if field == "level" else "INT" if isinstance(value, int)
+                    else "NUMBER" if isinstance(value, float) else "DATA" if any(c.isspace() for c in text) else "NOTSPACE")
+            start = line.find(text)
+            while start >= 0 and not claim(start, start + len(text), field, GROK_BASE[kind]):
+                start = line.find(text, start + 1)
+        if not any(field == "timestamp" for _, _, field, _ in spans):
+            # The LLM usually rewrites timestamps to ISO 8601; capture the literal one instead
+            m = _TIMESTAMP_ANY.search(line)
+            if m:
+                claim(m.start(), m.end(), "timestamp", _TIMESTAMP_ANY.pattern)
+        message = str(record.get("message") or "")
+        if message:
+            start = line.rfind(message)
+            end = start + len(message)
+            claim(start, end, "message", GROK_BASE["GREEDYDATA" if end == len(line) else "DATA"])
+        if not spans:
+            return None
+        spans.sort()
+
+        parts, converters, pos = [], {}, 0
+        for start, end, field, regex in spans:
+            parts.append(line[pos:start])
+            parts.append((field, regex))
+            if regex in (GROK_BASE["INT"], GROK_BASE["NUMBER"]):
+                converters[field] = int if regex == GROK_BASE["INT"] else float
+            pos = end
+        parts.append(line[pos:])
+        literals = [p for p in parts if isinstance(p, str)]
+        if sum(not c.isspace() for lit in literals for c in lit) < self.MIN_TEMPLATE_LITERAL:
+            return None
+
+        # Literal digits (pids, ports, ...) are generalised so the template covers sibling lines
+        regex = "".join(re.sub(r"\d+", r"\\d+", re.escape(p)) if isinstance(p, str)
+                        else f"(?P<{p[0]}>{p[1]})" for p in parts)
+        template = GrokPattern.from_regex(f"learned_{len(self.learned) + 1}", regex, converters)
+        return template if template.regex.fullmatch(line) else None
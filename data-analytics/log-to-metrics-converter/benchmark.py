@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Benchmark the local parsing engine: lines/sec per built-in format and for a mixed stream."""
+import argparse, json, os, random, sys, time
+sys.path.append(os.path.dirname(__file__))
+from agent.patterns import PatternEngine
+
+def make_lines(fmt: str, n: int, rng: random.Random) -> list[str]:
+    out = []
+    for i in range(n):
+        status, ms = rng.choice([200, 200, 200, 404, 500]), rng.randint(1, 900)
+        if fmt == "access_combined":
+            out.append(f'10.0.{i % 256}.{rng.randint(1, 254)} - - [27/Oct/2023:10:{i % 60:02d}:{i % 60:02d} +0000] '
+                       f'"GET /api/items/{i} HTTP/1.1" {status} {ms * 10} "-" "Mozilla/5.0"')
+        elif fmt == "syslog_rfc3164":
+            out.append(f"<{rng.choice([11, 13, 14])}>Oct 27 10:00:{i % 60:02d} web01 nginx[{1000 + i % 50}]: request {i} took {ms}ms")
+        elif fmt == "app":
+            out.append(f"2023-10-27 10:00:{i % 60:02d},{ms:03d} {rng.choice(['INFO', 'WARN', 'ERROR'])} [api] handled request latency={ms} status={status}")
+        elif fmt == "json":
+            out.append(json.dumps({"ts": "2023-10-27T10:00:00Z", "level": "info", "msg": "handled", "latency": ms, "status": status}))
+        elif fmt == "logfmt":
+            out.append(f'time=2023-10-27T10:00:00Z level=info msg="handled request" latency={ms} status={status}')
+    return out
+
+def run(label: str, lines: list[str]):
+    engine = PatternEngine()
+    t0 = time.perf_counter()
+    matched = sum(engine.parse_line(line)[0] is not None for line in lines)
+    elapsed = time.perf_counter() - t0
+    print(f"  {label:<18} {len(lines) / elapsed:>12,.0f} lines/s  matched {matched / len(lines):6.1%}")
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark the log-to-metrics pattern engine")
+    p.add_argument("--lines", type=int, default=200_000, help="Lines per format")
+    args = p.parse_args()
+    rng = random.Random(42)
+    formats = ["access_combined", "syslog_rfc3164", "app", "json", "logfmt"]
+    data = {fmt: make_lines(fmt, args.lines, rng) for fmt in formats}
+    print(f"📊 {args.lines:,} lines per format")
+    for fmt in formats:
+        run(fmt, data[fmt])
+    mixed = [line for fmt in formats for line in data[fmt]]
+    rng.shuffle(mixed)
+    run("mixed (shuffled)", mixed)
+
+if __name__ == "__main__": main()
@@ -11,5 +11,9 @@ class Config:
     APP_NAME = "Log to Metrics Converter"
     VERSION = "1.0.0"
 
+    # Local parsing: unmatched lines labelled by the LLM to learn templates, and LLM batch size for the rest
+    LEARN_SAMPLE_LINES = int(os.getenv("LEARN_SAMPLE_LINES", 20))
+    LLM_BATCH_LINES = int(os.getenv("LLM_BATCH_LINES", 50))
+
     # Default Prometheus scrape interval
     DEFAULT_SCRAPE_INTERVAL = "15s"
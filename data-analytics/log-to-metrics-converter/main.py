@@ -20,6 +20,7 @@ from agent.metrics import MetricExtractor
 from agent.prometheus import PrometheusGenerator
 from agent.grafana import GrafanaGenerator
 from agent.documentation import DocGenerator
+from agent.aggregator import Aggregator
 
 st.set_page_config(
     page_title=Config.APP_NAME,
@@ -69,6 +70,13 @@ if st.button("Analyze Logs", type="primary"):  # pragma: no cover
         else:
             st.session_state['parsed_logs'] = parsed_logs  # pragma: no cover
             st.success(f"Successfully parsed {len(parsed_logs)} log lines.")  # pragma: no cover
+            stats = parser.last_stats  # pragma: no cover
+            st.caption(  # pragma: no cover
+                f"⚡ {stats.matched_lines} lines parsed locally ({stats.lines_per_sec:,.0f} lines/s; "
+                + ", ".join(f"{name}: {n}" for name, n in stats.by_pattern.items())
+                + f") · {stats.llm_lines} sent to the LLM in {stats.llm_batches} call(s)"
+                + (f" · {stats.learned_templates} template(s) learned" if stats.learned_templates else "")
+            )
 
 # Results Section
 if 'parsed_logs' in st.session_state:  # pragma: no cover
@@ -90,6 +98,15 @@ if 'parsed_logs' in st.session_state:  # pragma: no cover
 
         metrics = st.session_state['metrics']  # pragma: no cover
         st.json(metrics)  # pragma: no cover
+        st.download_button("Download metrics.json", data=json.dumps(metrics, indent=2), file_name="metrics.json", mime="application/json")  # pragma: no cover
+        with st.expander("Preview values (Prometheus exposition over the parsed logs)"):  # pragma: no cover
+            try:  # pragma: no cover
+                preview = Aggregator(metrics)  # pragma: no cover
+                preview.observe_many(parsed_logs)  # pragma: no cover
+                st.code(preview.render(), language="text")  # pragma: no cover
+            except (KeyError, ValueError, TypeError) as e:  # pragma: no cover
+                st.warning(f"Could not aggregate these metric definitions: {e}")  # pragma: no cover
+            st.caption("Serve them live with `python serve.py app.log --metrics metrics.json`.")  # pragma: no cover
 
     with tabs[2]:  # pragma: no cover
         st.subheader("Prometheus Configuration")  # pragma: no cover
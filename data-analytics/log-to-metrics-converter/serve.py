@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tail log files, aggregate them with the metric definitions from the Metrics tab,
+and serve Prometheus samples on http://HOST:PORT/metrics (recent-window rates and
+quantiles as JSON on /window).
+
+Usage:
+    python serve.py /var/log/app.log --metrics metrics.json --port 9108
+    python serve.py access.log app.log --metrics metrics.json --from-start --service checkout
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent.aggregator import Aggregator
+from agent.exporter import LogFeeder, make_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Prometheus metrics computed from log files.")
+    parser.add_argument("logs", nargs="+", help="Log files to tail")
+    parser.add_argument("--metrics", required=True, help="JSON file with metric definitions (Metrics tab download)")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=9108, help="Port for /metrics")
+    parser.add_argument("--from-start", action="store_true", help="Read existing file contents before tailing")
+    parser.add_argument("--service", help="Service label for records that don't name one")
+    parser.add_argument("--window", type=float, default=300.0, help="Sliding window in seconds for the /window stats")
+    parser.add_argument("--max-series", type=int, default=1000, help="Label combinations kept per metric")
+    args = parser.parse_args()
+
+    with open(args.metrics, encoding="utf-8") as f:
+        definitions = json.load(f)
+    aggregator = Aggregator(definitions, window_seconds=args.window, max_series=args.max_series)
+    feeders = [LogFeeder(aggregator, service=args.service) for _ in args.logs]
+    stop = threading.Event()
+    for path, feeder in zip(args.logs, feeders):
+        threading.Thread(target=feeder.follow, args=(path,), kwargs={"from_start": args.from_start, "stop": stop},
+                         daemon=True, name=f"tail:{path}").start()
+
+    server = make_server(aggregator, args.host, args.port, feeders)
+    print(f"📊 Serving {len(aggregator.metrics)} metric(s) from {len(args.logs)} file(s) on "
+          f"http://{args.host}:{server.server_address[1]}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import pytest
+from agent.aggregator import Aggregator, MetricDefinition, OVERFLOW_LABEL, field_value
+
+LOGS = [
+    {"level": "INFO", "service": "api", "message": "ok", "metadata": {"duration": 0.02, "status": 200}},
+    {"level": "ERROR", "service": "api", "message": "boom", "metadata": {"duration": 0.7, "status": 500}},
+    {"level": "INFO", "service": "web", "message": "ok", "metadata": {"duration": "0.3", "status": 200}},
+    {"level": "INFO", "service": "web", "message": "no timing", "metadata": {}},
+]
+
+DEFINITIONS = [
+    {"name": "http_request_duration_seconds", "type": "HISTOGRAM", "description": "Request latency",
+     "labels": ["service"], "source_field": "metadata.duration", "buckets": [0.1, 0.5, 1]},
+    {"name": "log_error_count", "type": "COUNTER", "labels": ["service"], "source_field": "level"},
+    {"name": "last_status", "type": "GAUGE", "labels": [], "source_field": "status"},
+]
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_field_value_paths():
+    assert field_value(LOGS[0], "level") == "INFO"
+    assert field_value(LOGS[0], "metadata.duration") == 0.02
+    assert field_value(LOGS[0], "status") == 200
+    assert field_value(LOGS[0], "metadata.missing.deep") is None
+
+
+def test_error_counter_infers_level_filter():
+    metric = MetricDefinition.from_dict(DEFINITIONS[1])
+    assert "ERROR" in metric.match["level"]
+    with pytest.raises(ValueError):
+        MetricDefinition.from_dict({"name": "x", "type": "METER"})
+
+
+def test_render_exposition():
+    agg = Aggregator(DEFINITIONS)
+    agg.observe_many(LOGS)
+    text = agg.render()
+    assert "# HELP http_request_duration_seconds Request latency" in text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert 'http_request_duration_seconds_bucket{service="api",le="0.1"} 1' in text
+    assert 'http_request_duration_seconds_bucket{service="api",le="1"} 2' in text
+    assert 'http_request_duration_seconds_bucket{service="api",le="+Inf"} 2' in text
+    assert 'http_request_duration_seconds_count{service="web"} 1' in text
+    assert 'log_error_count{service="api"} 1' in text
+    assert 'log_error_count{service="web"}' not in text
+    assert "last_status 200" in text
+    assert "log_to_metrics_records_total 4" in text
+
+
+def test_counter_adds_numeric_source_field():
+    clock = FakeClock()
+    agg = Aggregator([{"name": "bytes_sent_total", "type": "COUNTER", "labels": ["service"], "source_field": "bytes"}],
+                     window_seconds=60, clock=clock)
+    agg.observe_many([
+        {"service": "api", "metadata": {"bytes": 512}},
+        {"service": "api", "metadata": {"bytes": "1024.5"}},
+        {"service": "api", "metadata": {"bytes": -10}},  # a counter cannot decrease
+        {"service": "api", "metadata": {}},
+        {"service": "web", "metadata": {"bytes": 100}},
+    ])
+    text = agg.render()
+    assert 'bytes_sent_total{service="api"} 1536.5' in text
+    assert 'bytes_sent_total{service="web"} 100' in text
+    assert agg.skipped == 1
+    stats = {row["labels"]["service"]: row for row in agg.window_stats()}
+    assert stats["api"]["count"] == 2
+    assert stats["api"]["rate"] == pytest.approx(1536.5 / 60)
+
+
+def test_non_numeric_values_are_skipped():
+    agg = Aggregator([DEFINITIONS[0]])
+    agg.observe({"service": "api", "metadata": {"duration": "fast"}})
+    assert agg.skipped == 1
+    assert "http_request_duration_seconds_count" not in agg.render()
+
+
+def test_label_escaping_and_names():
+    agg = Aggregator([{"name": "events-total", "labels": ["metadata.path"]}])
+    agg.observe({"metadata": {"path": 'a"b\\c'}})
+    assert 'events_total{path="a\\"b\\\\c"} 1' in agg.render()
+
+
+def test_series_cap_folds_into_overflow():
+    agg = Aggregator([{"name": "hits", "labels": ["metadata.user"]}], max_series=2)
+    agg.observe_many({"metadata": {"user": f"u{i}"}} for i in range(5))
+    text = agg.render()
+    assert f'hits{{user="{OVERFLOW_LABEL}"}} 3' in text
+    assert text.count("hits{") == 3
+
+
+def test_sliding_window_expires_old_slots():
+    clock = FakeClock()
+    agg = Aggregator([DEFINITIONS[0]], window_seconds=60, slots=6, clock=clock)
+    agg.observe_many(LOGS[:2])
+    clock.now += 30
+    agg.observe(LOGS[2])
+    stats = {row["labels"]["service"]: row for row in agg.window_stats()}
+    assert stats["api"]["count"] == 2 and stats["web"]["count"] == 1
+    assert stats["api"]["rate"] == pytest.approx(2 / 60)
+    assert 0.1 < stats["api"]["p95"] <= 1.0
+
+    clock.now += 45  # the first observations are now older than the window
+    stats = {row["labels"]["service"]: row for row in agg.window_stats()}
+    assert stats["api"]["count"] == 0 and stats["api"]["p50"] is None
+    assert stats["web"]["count"] == 1
+    # cumulative series are unaffected by the window
+    assert 'http_request_duration_seconds_count{service="api"} 2' in agg.render()
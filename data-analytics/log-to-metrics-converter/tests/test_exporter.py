@@ -0,0 +1,71 @@
+import os
+import threading
+import time
+import urllib.request
+
+from agent.aggregator import Aggregator
+from agent.exporter import LogFeeder, make_server, tail_batches
+
+
+def _collect(path, stop, out, **kwargs):
+    for lines in tail_batches(path, poll_interval=0.01, stop=stop, **kwargs):
+        out.extend(lines)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_tail_follows_appends_and_rotation(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("old line\n")
+    stop, seen = threading.Event(), []
+    t = threading.Thread(target=_collect, args=(str(path), stop, seen), daemon=True)
+    t.start()
+    time.sleep(0.05)
+    with open(path, "a") as f:
+        f.write("first\nsec")
+        f.flush()
+        time.sleep(0.05)
+        f.write("ond\n")
+    assert _wait_for(lambda: seen == ["first", "second"])
+
+    os.rename(path, tmp_path / "app.log.1")
+    path.write_text("after rotate\n")
+    assert _wait_for(lambda: seen[-1:] == ["after rotate"])
+    stop.set()
+    t.join(2)
+    assert "old line" not in seen
+
+
+def test_feeder_and_metrics_endpoint():
+    agg = Aggregator([{"name": "log_error_count", "type": "COUNTER", "labels": ["service"], "source_field": "level"}])
+    feeder = LogFeeder(agg, service="checkout", batch_size=2)
+    fed = feeder.feed([
+        "2023-10-27 10:00:00 ERROR payment failed",
+        "2023-10-27 10:00:01 INFO payment ok",
+        "2023-10-27 10:00:02 ERROR [billing] card declined",
+        "not a log line",
+    ])
+    assert fed == 3 and feeder.unparsed == 1
+
+    server = make_server(agg, port=0, feeders=[feeder])
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(url + "/metrics") as resp:
+            body = resp.read().decode()
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert 'log_error_count{service="checkout"} 1' in body
+        assert 'log_error_count{service="billing"} 1' in body
+        assert "log_to_metrics_unparsed_lines_total 1" in body
+        with urllib.request.urlopen(url + "/window") as resp:
+            assert resp.headers["Content-Type"] == "application/json"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -24,3 +24,57 @@ def test_mock_parser_whitespace_logs():
     parser = LogParser(api_key=None)
     result = parser.parse("   \n   ")
     assert result == []
+
+def _fake_llm(parser, replies):
+    calls = []
+
+    def call(raw_logs):
+        lines = raw_logs.split("\n")
+        calls.append(lines)
+        return [replies(line) for line in lines]
+
+    parser.llm = object()
+    parser._llm_call = call
+    return calls
+
+def test_known_formats_skip_llm():
+    parser = LogParser(api_key=None)
+    calls = _fake_llm(parser, lambda line: {})
+    raw = '\n'.join([
+        '2023-10-27 10:00:00 INFO [api] request done latency=12',
+        '{"level": "error", "msg": "db down"}',
+        '10.0.0.1 - - [27/Oct/2023:10:00:00 +0000] "GET / HTTP/1.1" 200 512',
+    ])
+    result = parser.parse(raw)
+    assert calls == []
+    assert [r['level'] for r in result] == ["INFO", "ERROR", "INFO"]
+    assert parser.last_stats.matched_lines == 3
+    assert parser.last_stats.by_pattern == {"app": 1, "json": 1, "access_combined": 1}
+
+def test_unmatched_lines_learned_then_batched():
+    parser = LogParser(api_key=None, learn_sample=1, batch_lines=2)
+
+    def label(line):
+        words = line.split()
+        if words[0] != "job":
+            return {"timestamp": None, "level": "WARN", "service": None, "message": line, "metadata": {}}
+        return {"timestamp": None, "level": "INFO", "service": None,
+                "message": " ".join(words[2:4]), "metadata": {"job_id": int(words[1])}}
+
+    calls = _fake_llm(parser, label)
+    raw = '\n'.join(f"job {i} finished ok" for i in range(5)) + "\n???\n!!!\n%%%"
+    result = parser.parse(raw)
+    # 1 labelling call teaches the template; the 3 odd lines go out in batches of 2
+    assert calls == [["job 0 finished ok"], ["???", "!!!"], ["%%%"]]
+    assert [r['metadata'].get('job_id') for r in result[:5]] == [0, 1, 2, 3, 4]
+    assert parser.last_stats.learned_templates == 1
+    assert parser.last_stats.llm_lines == 4
+
+def test_bad_llm_reply_falls_back_to_mock():
+    parser = LogParser(api_key=None)
+    parser.llm = object()
+    parser._llm_call = lambda raw_logs: {"not": "a list"}
+    result = parser.parse("first odd line\nsecond ERROR line")
+    assert [r['level'] for r in result] == ["INFO", "ERROR"]
+    assert result[1]['metadata']['line_number'] == 2
+    assert parser.last_stats.fallback_lines == 2
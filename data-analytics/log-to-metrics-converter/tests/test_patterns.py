@@ -0,0 +1,79 @@
+import pytest
+from agent.patterns import PatternEngine, expand_grok, coerce
+
+
+ACCESS = '127.0.0.1 - frank [10/Oct/2000:13:55:36 -0700] "GET /index.html HTTP/1.1" 503 2326 "-" "curl/8.0"'
+
+
+def test_expand_grok_named_and_typed():
+    regex, converters = expand_grok("%{IPORHOST:host} %{INT:status:int}")
+    assert "(?P<host>" in regex and "%{" not in regex
+    assert converters == {"status": int}
+
+
+def test_coerce():
+    assert coerce("120") == 120
+    assert coerce("0.25") == 0.25
+    assert coerce("12ms") == "12ms"
+
+
+def test_access_log():
+    record, name = PatternEngine().parse_line(ACCESS)
+    assert name == "access_combined"
+    assert record["timestamp"] == "2000-10-10T13:55:36-07:00"
+    assert record["level"] == "ERROR"
+    assert record["message"] == "GET /index.html"
+    assert record["metadata"]["status"] == 503
+    assert record["metadata"]["bytes"] == 2326
+    assert record["metadata"]["user_agent"] == "curl/8.0"
+
+
+def test_syslog_formats():
+    engine = PatternEngine()
+    record, name = engine.parse_line("<11>Oct 11 22:14:15 web01 nginx[123]: upstream timed out")
+    assert name == "syslog_rfc3164"
+    assert record["service"] == "nginx" and record["level"] == "ERROR"
+    assert record["metadata"]["pid"] == 123
+    record, name = engine.parse_line("<165>1 2003-10-11T22:14:15.003Z host app - ID47 - started")
+    assert name == "syslog_rfc5424"
+    assert record["level"] == "NOTICE" and record["message"] == "started"
+
+
+def test_app_log_with_key_values():
+    record, name = PatternEngine().parse_line("2023-10-27 10:00:00 WARNING [api] slow query latency=1.5 rows=20")
+    assert name == "app"
+    assert record["level"] == "WARN" and record["service"] == "api"
+    assert record["metadata"] == {"latency": 1.5, "rows": 20}
+
+
+def test_json_and_logfmt():
+    engine = PatternEngine()
+    record, name = engine.parse_line('{"ts": "2023-01-01T00:00:00Z", "lvl": "error", "msg": "boom", "code": 7}')
+    assert name == "json"
+    assert (record["timestamp"], record["level"], record["message"]) == ("2023-01-01T00:00:00Z", "ERROR", "boom")
+    assert record["metadata"] == {"code": 7}
+    record, name = engine.parse_line('time=2023-01-01 level=info msg="hello world" duration=0.2')
+    assert name == "logfmt"
+    assert record["message"] == "hello world" and record["metadata"] == {"duration": 0.2}
+
+
+def test_unknown_line_is_unmatched():
+    assert PatternEngine().parse_line("job 42 finished in 350ms on worker-7") == (None, None)
+
+
+def test_learn_template_from_labelled_line():
+    engine = PatternEngine()
+    labelled = {"timestamp": None, "level": None, "service": None, "message": "finished in 350ms",
+                "metadata": {"job_id": 42, "worker": "worker-7"}}
+    template = engine.learn("job 42 finished in 350ms on worker-7", labelled)
+    assert template is not None
+    record, name = engine.parse_line("job 7 finished in 12ms on worker-3")
+    assert name == template.name
+    assert record["message"] == "finished in 12ms"
+    assert record["metadata"] == {"job_id": 7, "worker": "worker-3"}
+
+
+def test_learn_rejects_unanchored_template():
+    engine = PatternEngine()
+    assert engine.learn("hello", {"message": "hello", "metadata": {}}) is None
+    assert engine.learn(ACCESS, {"message": "x", "metadata": {}}) is None  # already matched
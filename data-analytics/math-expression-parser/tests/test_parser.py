@@ -22,3 +22,50 @@ def test_batch(): results = evaluate_batch(["1+1", "2*3"]); assert results[0].re
 def test_gcd(): n, d = simplify_fraction(6, 4); assert n == 3 and d == 2
 def test_format(): md = format_result_markdown(evaluate("2+2")); assert "Math Parser" in md
 def test_to_dict(): d = evaluate("1+1").to_dict(); assert "result" in d
+
+import pytest
+import numpy as np
+from agent.parser import compile_expression, evaluate_array
+
+def test_compile_cached(): assert compile_expression("x + 1") is compile_expression("x + 1")
+def test_compiled_names(): assert compile_expression("a * x^2 + b + pi").names == ("a", "b", "x")
+def test_compiled_call(): assert compile_expression("x ** 2 + y")({"x": 3, "y": 1}) == 10
+def test_no_eval_attribute(): r = evaluate("(1).__class__"); assert not r.is_valid and "Attribute" in r.error
+def test_no_strings(): assert not evaluate("'a' * 3").is_valid
+def test_no_lambda(): assert not evaluate("(lambda: 1)()").is_valid
+def test_unknown_function(): r = evaluate("system(1)"); assert not r.is_valid and "system" in r.error
+def test_unbound_variable(): r = evaluate("x + 1"); assert not r.is_valid and "'x'" in r.error
+def test_variable_overrides_constant(): assert evaluate("e * 2", {"e": 3}).result == 6
+def test_unary_minus(): assert evaluate("-x + -3", {"x": 2}).result == -5
+def test_unsupported_unary(): r = evaluate("~x", {"x": 2}); assert not r.is_valid and "Invert" in r.error
+def test_huge_power_overflows(): r = evaluate("9 ** 9 ** 9"); assert not r.is_valid
+def test_nested_huge_power_fails_fast():
+    import time
+    start = time.perf_counter()
+    assert not evaluate("((9**999)**999)**999").is_valid
+    assert not evaluate("(2**60000)**2").is_valid
+    assert time.perf_counter() - start < 5
+def test_large_exact_power_kept(): assert evaluate("2 ** 5000 // 2 ** 4999").result == 2
+def test_huge_factorial(): assert not evaluate("factorial(10 ** 6)").is_valid
+def test_multi_arg_functions(): assert evaluate("min(3, x, 2) + log(8, 2) + atan2(0, 1)", {"x": 1}).result == 4
+
+def test_array_matches_scalar():
+    expr = "a * x^2 - sqrt(abs(x)) / (1 + y % 3) + floor(x) + max(x, y) + factorial(y)"
+    x, y = np.linspace(-5, 5, 101), np.arange(101) % 7
+    out = evaluate_array(expr, {"x": x, "y": y, "a": 2.5})
+    assert out.shape == (101,) and out.dtype == np.float64
+    assert np.allclose(out, [evaluate(expr, {"x": xi, "y": int(yi), "a": 2.5}).result for xi, yi in zip(x, y)])
+
+def test_array_ieee_semantics():
+    out = evaluate_array("1 / x + sqrt(x)", {"x": [-1.0, 0.0, 4.0]})
+    assert np.isnan(out[0]) and np.isinf(out[1]) and out[2] == 2.25
+
+def test_array_broadcast_and_size():
+    assert evaluate_array("pi * 2", {}, size=3).tolist() == [2 * math.pi] * 3
+    assert evaluate_array("x + k", {"x": [1, 2], "k": 10, "unused": [0]}).tolist() == [11, 12]
+    assert evaluate_array("1", {"x": [1, 2, 3]}).tolist() == [1.0, 1.0, 1.0]
+    assert evaluate_array("k * 2", {"k": 5, "unused": [0, 0]}).tolist() == [10.0, 10.0]
+
+def test_array_errors():
+    with pytest.raises(NameError): evaluate_array("x + y", {"x": [1]})
+    with pytest.raises(ValueError): evaluate_array("__import__('os')", {})
@@ -2,7 +2,8 @@ import logging
 from typing import Any, Dict, Optional
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.runnables import RunnableSequence
 
@@ -1,42 +1,93 @@
-"""URL shortener — create short URL hashes and track mappings."""
+"""URL shortener — create short URL codes and track mappings.
+
+Codes come from a counter, not a hash: id n maps to `_encode_id(n, length)`, a bijection
+of [0, 62**length) scrambled so consecutive ids don't give neighbouring codes. There are
+no collisions to retry. Mappings live in a pluggable backend (see agent.store), and hot
+codes are served from an LRU in front of it.
+"""
 from __future__ import annotations
-import hashlib, string
+import re, string, threading
 from dataclasses import dataclass, field
+from functools import lru_cache
+
+from agent.store import Backend, open_backend
 
 BASE62 = string.ascii_letters + string.digits
+_MULT, _OFFSET = 0x5DEECE66D, 0x2B992DDFA23  # _MULT is coprime to 62, so n -> n*_MULT+_OFFSET is a permutation mod 62**k
+CACHE_SIZE = 65536
+_PAIRS = [lo + hi for hi in BASE62 for lo in BASE62]  # two code chars per divmod, low digit first
+_URL = re.compile(r'^https?://[^\s]+$')
 
 @dataclass
 class ShortURLResult:
     original: str = ""; short_code: str = ""; full_short: str = ""; is_valid: bool = True; error: str = ""
     def to_dict(self) -> dict: return {"original": self.original, "short_code": self.short_code}
 
+def _encode_id(n: int, length: int = 6) -> str:
+    space = 62 ** length
+    while n >= space: length += 1; space *= 62  # space exhausted at this length: codes get one char longer
+    x = (n * _MULT + _OFFSET) % space
+    chars = []
+    for _ in range(length // 2): x, r = divmod(x, 3844); chars.append(_PAIRS[r])
+    if length % 2: chars.append(BASE62[x])
+    return "".join(chars)
+
+def _short(url: str, code: str) -> ShortURLResult:
+    return ShortURLResult(original=url, short_code=code, full_short=f"https://short.ly/{code}")
+
 class URLStore:
-    def __init__(self): self._map: dict[str, str] = {}; self._reverse: dict[str, str] = {}
+    """Short codes over a backend (in-memory by default, or `open_backend(path)` / a Backend for persistence).
+
+    `cache_size` bounds the hot-code LRU in front of `resolve`; by default only stores that go to disk get one.
+    """
+    def __init__(self, backend: Backend | str | None = None, cache_size: int | None = None):
+        self.backend = backend if isinstance(backend, Backend) else open_backend(backend)
+        if cache_size is None: cache_size = 0 if self.backend.in_memory else CACHE_SIZE
+        self._write = threading.Lock()
+        self._cached = lru_cache(maxsize=cache_size)(self._lookup) if cache_size else self._lookup
+
+    def _lookup(self, code: str) -> str:
+        url = self.backend.lookup(code)
+        if url is None: raise KeyError(code)  # raising keeps misses out of the LRU
+        return url
+
     def shorten(self, url: str, length: int = 6) -> ShortURLResult:
-        if not url.startswith(("http://", "https://")): return ShortURLResult(original=url, is_valid=False, error="Invalid URL")
-        if url in self._reverse: return ShortURLResult(original=url, short_code=self._reverse[url], full_short=f"https://short.ly/{self._reverse[url]}")
-        code = _generate_code(url, length)
-        while code in self._map: code = _generate_code(url + code, length)
-        self._map[code] = url; self._reverse[url] = code
-        return ShortURLResult(original=url, short_code=code, full_short=f"https://short.ly/{code}")
-    def resolve(self, code: str) -> str: return self._map.get(code, "")
-    def stats(self) -> dict: return {"total_urls": len(self._map)}
-
-def _generate_code(url: str, length: int = 6) -> str:
-    h = hashlib.sha256(url.encode()).hexdigest()
-    num = int(h[:12], 16)
-    chars = []
-    while num and len(chars) < length:
-        chars.append(BASE62[num % 62]); num //= 62
-    return "".join(chars).ljust(length, "a")
+        return self.shorten_many([url], length)[0]
+
+    def shorten_many(self, urls: list[str], length: int = 6) -> list[ShortURLResult]:
+        """Shorten a batch: known URLs are reused, new ones are inserted in one backend write."""
+        results: list[ShortURLResult | None] = [None] * len(urls); new: dict[str, list[int]] = {}
+        with self._write:
+            for i, url in enumerate(urls):
+                if not _URL.match(url): results[i] = ShortURLResult(original=url, is_valid=False, error="Invalid URL"); continue
+                if url in new: new[url].append(i); continue
+                code = self.backend.find(url)
+                if code is None: new[url] = [i]
+                else: results[i] = _short(url, code)
+            if new:
+                codes = self.backend.insert(list(new), lambda n: _encode_id(n, length))
+                for (url, slots), code in zip(new.items(), codes):
+                    for i in slots: results[i] = _short(url, code)
+        return results
+
+    def resolve(self, code: str) -> str:
+        try: return self._cached(code)
+        except KeyError: return ""
+
+    def stats(self) -> dict:
+        out = {"total_urls": len(self.backend), "backend": self.backend.name}
+        if hasattr(self._cached, "cache_info"):
+            info = self._cached.cache_info(); out["cache"] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+        return out
+
+    def close(self) -> None: self.backend.close()
 
 def is_valid_url(url: str) -> bool:
-    import re
-    return bool(re.match(r'^https?://[^\s]+$', url))
+    return bool(_URL.match(url))
 
 def bulk_shorten(urls: list[str], store: URLStore = None) -> list[ShortURLResult]:
     if not store: store = URLStore()
-    return [store.shorten(u) for u in urls]
+    return store.shorten_many(urls)
 
 def format_result_markdown(r: ShortURLResult) -> str:
     if not r.is_valid: return f"## URL Shortener ❌\n**Error:** {r.error}"
@@ -0,0 +1,142 @@
+"""Storage backends for URLStore — in-memory, SQLite (WAL) and append-only log.
+
+A backend maps integer ids to (code, url) rows. URLStore picks the codes; a backend
+only has to hand out consecutive ids atomically with the insert (`insert`) and answer
+the two lookups. Backends are safe to share between threads; each file-backed store
+expects a single writing process.
+"""
+from __future__ import annotations
+import os, sqlite3, threading
+from abc import ABC, abstractmethod
+from typing import Callable
+
+
+class Backend(ABC):
+    """Base class: a code <-> url table with a monotonically increasing id counter."""
+    name = "base"
+    in_memory = False  # lookups are plain dict hits, so an LRU in front would only add overhead
+
+    @abstractmethod
+    def lookup(self, code: str) -> str | None: ...
+    @abstractmethod
+    def find(self, url: str) -> str | None: ...
+    @abstractmethod
+    def insert(self, urls: list[str], make_code: Callable[[int], str]) -> list[str]:
+        """Store `urls` under the next len(urls) ids, coded with `make_code(id)`; returns the codes."""
+    @abstractmethod
+    def __len__(self) -> int: ...
+    def close(self) -> None: pass
+
+
+class MemoryBackend(Backend):
+    name = "memory"
+    in_memory = True
+
+    def __init__(self):
+        self._map: dict[str, str] = {}; self._reverse: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, code: str) -> str | None: return self._map.get(code)
+    def find(self, url: str) -> str | None: return self._reverse.get(url)
+    def __len__(self) -> int: return len(self._map)
+
+    def insert(self, urls: list[str], make_code: Callable[[int], str]) -> list[str]:
+        with self._lock:
+            codes = [make_code(i) for i in range(len(self._map), len(self._map) + len(urls))]
+            self._map.update(zip(codes, urls)); self._reverse.update(zip(urls, codes))
+        return codes
+
+
+class SQLiteBackend(Backend):
+    """One table in a WAL-mode database: readers never block on the writer. Connections are per thread."""
+    name = "sqlite"
+    SCHEMA = "CREATE TABLE IF NOT EXISTS urls (id INTEGER PRIMARY KEY, code TEXT NOT NULL UNIQUE, url TEXT NOT NULL UNIQUE)"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local(); self._lock = threading.Lock(); self._conns: list[sqlite3.Connection] = []
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(self.SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; WAL keeps the file consistent
+            self._local.conn = conn
+            with self._lock: self._conns.append(conn)
+        return conn
+
+    def lookup(self, code: str) -> str | None:
+        row = self._conn().execute("SELECT url FROM urls WHERE code = ?", (code,)).fetchone()
+        return row[0] if row else None
+
+    def find(self, url: str) -> str | None:
+        row = self._conn().execute("SELECT code FROM urls WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def insert(self, urls: list[str], make_code: Callable[[int], str]) -> list[str]:
+        conn = self._conn()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                start = conn.execute("SELECT COALESCE(MAX(id) + 1, 0) FROM urls").fetchone()[0]
+                rows = [(start + i, make_code(start + i), url) for i, url in enumerate(urls)]
+                conn.executemany("INSERT INTO urls (id, code, url) VALUES (?, ?, ?)", rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK"); raise
+        return [code for _, code, _ in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._conns: conn.close()
+            self._conns.clear()
+        self._local = threading.local()
+
+
+class LogBackend(Backend):
+    """Append-only `code<TAB>url` lines, replayed into dicts on open. A torn final line is dropped."""
+    name = "log"
+    in_memory = True
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path, self.fsync = path, fsync
+        self._map: dict[str, str] = {}; self._reverse: dict[str, str] = {}
+        self._lock = threading.Lock()
+        good = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f: data = f.read()
+            good = data.rfind(b"\n") + 1
+            for line in data[:good].decode("utf-8").splitlines():
+                code, _, url = line.partition("\t")
+                self._map[code] = url; self._reverse[url] = code
+        self._file = open(path, "ab")
+        if self._file.tell() != good: self._file.truncate(good)
+
+    def lookup(self, code: str) -> str | None: return self._map.get(code)
+    def find(self, url: str) -> str | None: return self._reverse.get(url)
+    def __len__(self) -> int: return len(self._map)
+
+    def insert(self, urls: list[str], make_code: Callable[[int], str]) -> list[str]:
+        if any(c in url for url in urls for c in "\t\r\n"): raise ValueError("URLs in a log store cannot contain tabs or newlines")
+        with self._lock:
+            codes = [make_code(i) for i in range(len(self._map), len(self._map) + len(urls))]
+            self._file.write("".join(f"{c}\t{u}\n" for c, u in zip(codes, urls)).encode("utf-8"))
+            self._file.flush()
+            if self.fsync: os.fsync(self._file.fileno())
+            self._map.update(zip(codes, urls)); self._reverse.update(zip(urls, codes))
+        return codes
+
+    def close(self) -> None: self._file.close()
+
+
+def open_backend(path: str | None = None) -> Backend:
+    """Memory for None/":memory:", an append-only log for *.log, otherwise SQLite."""
+    if path in (None, ":memory:"): return MemoryBackend()
+    if str(path).endswith(".log"): return LogBackend(path)
+    return SQLiteBackend(path)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark: bulk_shorten throughput and resolves/sec under threaded load, per backend, with and without the hot-code LRU."""
+import argparse, hashlib, os, random, sys, tempfile, threading, time  # pragma: no cover
+sys.path.append(os.path.dirname(__file__))  # pragma: no cover
+from agent.shortener import BASE62, ShortURLResult, URLStore, bulk_shorten  # pragma: no cover
+
+class OldURLStore:  # pragma: no cover
+    """The dict store with SHA-256 codes and collision re-hashing that URLStore replaced."""
+    def __init__(self): self._map, self._reverse = {}, {}  # pragma: no cover
+    def shorten(self, url, length=6):  # pragma: no cover
+        if not url.startswith(("http://", "https://")): return ShortURLResult(original=url, is_valid=False, error="Invalid URL")  # pragma: no cover
+        if url in self._reverse: return ShortURLResult(original=url, short_code=self._reverse[url], full_short=f"https://short.ly/{self._reverse[url]}")  # pragma: no cover
+        code = self._code(url, length)  # pragma: no cover
+        while code in self._map: code = self._code(url + code, length)  # pragma: no cover
+        self._map[code] = url; self._reverse[url] = code  # pragma: no cover
+        return ShortURLResult(original=url, short_code=code, full_short=f"https://short.ly/{code}")  # pragma: no cover
+    @staticmethod  # pragma: no cover
+    def _code(url, length):  # pragma: no cover
+        num, chars = int(hashlib.sha256(url.encode()).hexdigest()[:12], 16), []  # pragma: no cover
+        while num and len(chars) < length: chars.append(BASE62[num % 62]); num //= 62  # pragma: no cover
+        return "".join(chars).ljust(length, "a")  # pragma: no cover
+
+def resolve_load(store: URLStore, codes: list[str], threads: int, per_thread: int) -> float:  # pragma: no cover
+    """Resolves/sec with `threads` threads each resolving Zipf-ish hot codes (plus 5% misses)."""
+    weights = [1 / (i + 1) for i in range(len(codes))]  # pragma: no cover
+    plans = [random.Random(t).choices(codes, weights, k=per_thread) for t in range(threads)]  # pragma: no cover
+    for plan in plans:  # pragma: no cover
+        for i in range(0, per_thread, 20): plan[i] = "-miss-"  # pragma: no cover
+    def run(plan):  # pragma: no cover
+        for code in plan: store.resolve(code)  # pragma: no cover
+    workers = [threading.Thread(target=run, args=(plan,)) for plan in plans]  # pragma: no cover
+    t0 = time.perf_counter()  # pragma: no cover
+    for w in workers: w.start()  # pragma: no cover
+    for w in workers: w.join()  # pragma: no cover
+    return threads * per_thread / (time.perf_counter() - t0)  # pragma: no cover
+
+def main():  # pragma: no cover
+    p = argparse.ArgumentParser(description="Benchmark URL store backends")  # pragma: no cover
+    p.add_argument("--urls", type=int, default=200_000)  # pragma: no cover
+    p.add_argument("--threads", type=int, default=8)  # pragma: no cover
+    p.add_argument("--resolves", type=int, default=50_000, help="Resolves per thread")  # pragma: no cover
+    args = p.parse_args()  # pragma: no cover
+    urls = [f"https://example.com/item/{i}?ref={i * 7919 % 1000}" for i in range(args.urls)]  # pragma: no cover
+    print(f"📊 {args.urls:,} URLs; {args.threads} threads x {args.resolves:,} resolves (Zipf hot codes, 5% misses)")  # pragma: no cover
+    t0 = time.perf_counter(); old = OldURLStore()  # pragma: no cover
+    for u in urls: old.shorten(u)  # pragma: no cover
+    print(f"  {'old dict + sha256':<18} bulk {args.urls / (time.perf_counter() - t0):>10,.0f} URLs/s")  # pragma: no cover
+    with tempfile.TemporaryDirectory() as d:  # pragma: no cover
+        store, sample = URLStore(os.path.join(d, "single.db")), urls[:2000]  # pragma: no cover
+        t0 = time.perf_counter()  # pragma: no cover
+        for u in sample: store.shorten(u)  # pragma: no cover
+        print(f"  {'sqlite, per URL':<18} bulk {len(sample) / (time.perf_counter() - t0):>10,.0f} URLs/s  (one transaction per shorten())")  # pragma: no cover
+        store.close()  # pragma: no cover
+        for label, path in (("memory", None), ("sqlite (WAL)", os.path.join(d, "u.db")), ("append-only log", os.path.join(d, "u.log"))):  # pragma: no cover
+            store = URLStore(path)  # pragma: no cover
+            t0 = time.perf_counter(); results = bulk_shorten(urls, store); bulk = args.urls / (time.perf_counter() - t0)  # pragma: no cover
+            codes = [r.short_code for r in results]  # pragma: no cover
+            cold = resolve_load(URLStore(store.backend, cache_size=0), codes, args.threads, args.resolves)  # pragma: no cover
+            hot = resolve_load(URLStore(store.backend, cache_size=65536), codes, args.threads, args.resolves)  # pragma: no cover
+            if path: store.close(); t0 = time.perf_counter(); URLStore(path).close(); reopen = f", reopen {time.perf_counter() - t0:.2f} s"  # pragma: no cover
+            else: reopen = ""  # pragma: no cover
+            print(f"  {label:<18} bulk {bulk:>10,.0f} URLs/s, resolve {cold:>9,.0f}/s no cache, {hot:>9,.0f}/s with LRU{reopen}")  # pragma: no cover
+
+if __name__ == "__main__": main()  # pragma: no cover
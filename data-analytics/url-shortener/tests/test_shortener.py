@@ -18,3 +18,17 @@ def test_bulk_valid(): results = bulk_shorten(["https://a.com"]); assert results
 def test_code_length(): s = URLStore(); r = s.shorten("https://x.com/long/path"); assert len(r.short_code) >= 6
 def test_format(): md = format_result_markdown(URLStore().shorten("https://x.com")); assert "URL Shortener" in md
 def test_to_dict(): d = URLStore().shorten("https://x.com").to_dict(); assert "short_code" in d
+
+from agent.shortener import _encode_id
+def test_codes_are_a_bijection(): assert len({_encode_id(i, 3) for i in range(62 ** 3)}) == 62 ** 3
+def test_code_grows_when_space_runs_out(): assert len(_encode_id(62 ** 3, 3)) == 4
+def test_bulk_dedups_in_batch():
+    s = URLStore(); r = bulk_shorten(["https://a.com", "https://b.com", "https://a.com", "nope"], s)
+    assert r[0].short_code == r[2].short_code != r[1].short_code and not r[3].is_valid and s.stats()["total_urls"] == 2
+def test_bulk_reuses_existing(): s = URLStore(); c = s.shorten("https://a.com").short_code; assert bulk_shorten(["https://a.com"], s)[0].short_code == c
+def test_rejects_whitespace(): assert not URLStore().shorten("https://a b.com").is_valid
+def test_resolve_cache(): s = URLStore(cache_size=16); c = s.shorten("https://a.com").short_code; s.resolve(c); s.resolve(c); assert s.stats()["cache"]["hits"] == 1
+def test_miss_not_cached():
+    s = URLStore(cache_size=16); assert s.resolve(_encode_id(0)) == ""
+    assert s.resolve(s.shorten("https://a.com").short_code) == "https://a.com"
+def test_no_cache_in_memory(): s = URLStore(); c = s.shorten("https://a.com").short_code; assert s.resolve(c) == "https://a.com" and "cache" not in s.stats()
@@ -0,0 +1,73 @@
+"""Tests for the URL store backends."""
+import sys, os, threading, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from agent.store import Backend, MemoryBackend, SQLiteBackend, LogBackend, open_backend
+from agent.shortener import URLStore, bulk_shorten
+
+@pytest.fixture(params=["memory", "sqlite", "log"])
+def path(request, tmp_path):
+    return {"memory": None, "sqlite": str(tmp_path / "urls.db"), "log": str(tmp_path / "urls.log")}[request.param]
+
+def test_open_backend(tmp_path):
+    assert isinstance(open_backend(), MemoryBackend) and isinstance(open_backend(str(tmp_path / "x.log")), LogBackend)
+    assert isinstance(open_backend(str(tmp_path / "x.db")), SQLiteBackend)
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError): Backend()
+    class Partial(Backend):
+        def lookup(self, code): return None
+    with pytest.raises(TypeError): Partial()  # find, insert and __len__ still missing
+
+def test_roundtrip(path):
+    s = URLStore(path); urls = [f"https://example.com/{i}" for i in range(500)]
+    codes = [r.short_code for r in bulk_shorten(urls, s)]
+    assert len(set(codes)) == 500 and all(s.resolve(c) == u for c, u in zip(codes, urls))
+    assert s.backend.find(urls[7]) == codes[7] and s.stats()["total_urls"] == 500
+    s.close()
+
+def test_survives_restart(path):
+    if path is None: pytest.skip("memory store is not persistent")
+    s = URLStore(path); a = s.shorten("https://a.com").short_code; bulk_shorten(["https://b.com", "https://c.com"], s); s.close()
+    s = URLStore(path)
+    assert s.resolve(a) == "https://a.com" and s.shorten("https://a.com").short_code == a
+    d = s.shorten("https://d.com").short_code
+    assert len({a, d, s.backend.find("https://b.com"), s.backend.find("https://c.com")}) == 4 and s.stats()["total_urls"] == 4
+    s.close()
+
+def test_log_drops_torn_line(tmp_path):
+    path = str(tmp_path / "urls.log")
+    s = URLStore(path); code = s.shorten("https://a.com").short_code; s.close()
+    with open(path, "ab") as f: f.write(b"XXXXXX\thttps://half")
+    s = URLStore(path); assert s.resolve("XXXXXX") == "" and s.stats()["total_urls"] == 1
+    s.shorten("https://b.com"); s.close()
+    assert open(path).read().splitlines()[0] == f"{code}\thttps://a.com" and len(open(path).read().splitlines()) == 2
+
+def test_lru_only_for_disk_backends(tmp_path):
+    assert "cache" in URLStore(str(tmp_path / "u.db")).stats() and "cache" not in URLStore(str(tmp_path / "u.log")).stats()
+
+def test_sqlite_insert_rolls_back_on_error(tmp_path):
+    b = SQLiteBackend(str(tmp_path / "u.db")); b.insert(["https://a.com"], str)
+    def make_code(i):
+        if i == 2: raise RuntimeError("no code")
+        return str(i)
+    with pytest.raises(RuntimeError): b.insert(["https://b.com", "https://c.com"], make_code)
+    assert len(b) == 1 and b.insert(["https://d.com"], str) == ["1"]
+
+def test_log_rejects_control_chars(tmp_path):
+    with pytest.raises(ValueError): LogBackend(str(tmp_path / "u.log")).insert(["https://a\tb"], str)
+
+def test_concurrent_writers_and_readers(path):
+    s = URLStore(path); errors, codes = [], {}
+    def writer(k):
+        try:
+            for r in bulk_shorten([f"https://w{k}.com/{i}" for i in range(100)], s): codes[r.original] = r.short_code
+        except Exception as e: errors.append(e)  # pragma: no cover
+    def reader():
+        try:
+            for _ in range(300): assert s.resolve("nothere") == ""
+        except Exception as e: errors.append(e)  # pragma: no cover
+    threads = [threading.Thread(target=writer, args=(k,)) for k in range(4)] + [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert not errors and len(set(codes.values())) == 400 and all(s.resolve(c) == u for u, c in codes.items())
+    s.close()
@@ -10,7 +10,8 @@ if parent_dir not in sys.path:
 import logging
 from typing import Optional
 from langchain_core.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.output_parsers import StrOutputParser
 
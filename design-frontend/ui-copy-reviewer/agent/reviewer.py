@@ -4,8 +4,9 @@ import sys
 # Ensure parent directory is in path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from langchain_openai import ChatOpenAI
-from langchain_community.llms import FakeListLLM
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
+FakeListLLM = lazy_import("langchain_community.llms", "FakeListLLM")
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
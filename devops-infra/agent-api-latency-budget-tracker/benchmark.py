@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the old log path (readlines, one parse_access_logs pass per endpoint, sort per
+evaluate) vs. the single streaming pass (path trie + quantile sketches + burn-rate windows),
+with time, peak memory and the p99s each one reports.
+"""
+import argparse  # pragma: no cover
+import json  # pragma: no cover
+import os  # pragma: no cover
+import random  # pragma: no cover
+import resource  # pragma: no cover
+import subprocess  # pragma: no cover
+import sys  # pragma: no cover
+import tempfile  # pragma: no cover
+import time  # pragma: no cover
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))  # pragma: no cover
+
+def make_endpoints(count: int):  # pragma: no cover
+    return [{"name": f"Service {i}", "url": f"https://api.example.com/v1/service-{i}",  # pragma: no cover
+             "slo": {"p50": 100, "p95": 400, "p99": 1000}} for i in range(count)]
+
+def make_log(path: str, lines: int, endpoints):  # pragma: no cover
+    rng = random.Random(7)  # pragma: no cover
+    t = 1_700_000_000.0  # pragma: no cover
+    with open(path, "w") as f:  # pragma: no cover
+        for start in range(0, lines, 10_000):  # pragma: no cover
+            block = []  # pragma: no cover
+            for _ in range(min(10_000, lines - start)):  # pragma: no cover
+                t += 0.01  # pragma: no cover
+                ep = rng.randrange(len(endpoints) + 5)  # a few paths no endpoint is configured for  # pragma: no cover
+                path = f"/v1/service-{ep}/items/{rng.randint(1, 5000)}"  # pragma: no cover
+                status = 500 if rng.random() < 0.005 else 200  # pragma: no cover
+                block.append(json.dumps({"path": path, "latency_ms": round(rng.lognormvariate(4, 0.8), 2),  # pragma: no cover
+                                         "status": status, "timestamp": round(t, 2)}))
+            f.write("\n".join(block) + "\n")  # pragma: no cover
+
+def old_run(path: str, endpoints):  # pragma: no cover
+    """The previous main.py log path."""
+    from lib.log_parser import parse_access_logs  # pragma: no cover
+    with open(path) as f:  # pragma: no cover
+        log_lines = f.readlines()  # pragma: no cover
+    p99 = {}  # pragma: no cover
+    for ep in endpoints:  # pragma: no cover
+        url_path = ep["url"].split("://")[-1].split("/", 1)[-1]  # pragma: no cover
+        latencies = parse_access_logs(log_lines, endpoint_path=url_path)  # pragma: no cover
+        latencies.sort()  # pragma: no cover
+        violations = sum(1 for l in latencies if l > ep["slo"]["p99"])  # pragma: no cover
+        p99[ep["name"]] = (latencies[int(0.99 * (len(latencies) - 1))] if latencies else None, violations)  # pragma: no cover
+    return p99  # pragma: no cover
+
+def new_run(path: str, endpoints):  # pragma: no cover
+    from lib.budget import BudgetManager  # pragma: no cover
+    from lib.log_parser import PathTrie, stream_access_logs  # pragma: no cover
+    budget_mgr = BudgetManager({})  # pragma: no cover
+    stats = {ep["name"]: budget_mgr.new_stats(ep["slo"]) for ep in endpoints}  # pragma: no cover
+    trie = PathTrie.from_endpoints(endpoints)  # pragma: no cover
+    with open(path) as f:  # pragma: no cover
+        for name, latency, ts in stream_access_logs(f, trie):  # pragma: no cover
+            stats[name].add(latency, ts)  # pragma: no cover
+    p99 = {}  # pragma: no cover
+    for ep in endpoints:  # pragma: no cover
+        report = budget_mgr.evaluate_stats(stats[ep["name"]], 1.0)  # pragma: no cover
+        p99[ep["name"]] = (report["percentiles"]["p99"]["actual_ms"], report["violations"])  # pragma: no cover
+    return p99  # pragma: no cover
+
+def exact_run(path: str, endpoints):  # pragma: no cover
+    """Same routing as new_run, but every latency kept and sorted: the reference for the sketch's accuracy."""
+    from lib.log_parser import PathTrie, stream_access_logs  # pragma: no cover
+    latencies = {ep["name"]: [] for ep in endpoints}  # pragma: no cover
+    with open(path) as f:  # pragma: no cover
+        for name, latency, ts in stream_access_logs(f, PathTrie.from_endpoints(endpoints)):  # pragma: no cover
+            latencies[name].append(latency)  # pragma: no cover
+    p99 = {}  # pragma: no cover
+    for ep in endpoints:  # pragma: no cover
+        values = sorted(latencies[ep["name"]])  # pragma: no cover
+        p99[ep["name"]] = (values[int(0.99 * (len(values) - 1))], sum(1 for l in values if l > ep["slo"]["p99"]))  # pragma: no cover
+    return p99  # pragma: no cover
+
+MODES = {"old": old_run, "new": new_run, "exact": exact_run}  # pragma: no cover
+
+def run_mode(mode: str, path: str, endpoints: int):  # pragma: no cover
+    eps = make_endpoints(endpoints)  # pragma: no cover
+    start = time.perf_counter()  # pragma: no cover
+    p99 = MODES[mode](path, eps)  # pragma: no cover
+    print(json.dumps({"seconds": time.perf_counter() - start,  # pragma: no cover
+                      "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, "p99": p99}))
+
+def main():  # pragma: no cover
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])  # pragma: no cover
+    p.add_argument("--lines", type=int, default=1_000_000)  # pragma: no cover
+    p.add_argument("--endpoints", type=int, default=20)  # pragma: no cover
+    p.add_argument("--skip-old", action="store_true")  # pragma: no cover
+    p.add_argument("--mode", choices=list(MODES), help=argparse.SUPPRESS)  # one measurement, in a fresh process  # pragma: no cover
+    p.add_argument("--log", help=argparse.SUPPRESS)  # pragma: no cover
+    args = p.parse_args()  # pragma: no cover
+    if args.mode:  # pragma: no cover
+        return run_mode(args.mode, args.log, args.endpoints)  # pragma: no cover
+
+    with tempfile.TemporaryDirectory() as d:  # pragma: no cover
+        log = os.path.join(d, "access.log")  # pragma: no cover
+        make_log(log, args.lines, make_endpoints(args.endpoints))  # pragma: no cover
+        print(f"📊 {args.lines:,} lines ({os.path.getsize(log) / 2**20:.0f} MiB), {args.endpoints} endpoints")  # pragma: no cover
+        runs = {}  # pragma: no cover
+        for mode in ("new", "exact") if args.skip_old else ("old", "new", "exact"):  # pragma: no cover
+            out = subprocess.run([sys.executable, __file__, "--mode", mode, "--log", log, "--endpoints", str(args.endpoints)],  # pragma: no cover
+                                 check=True, capture_output=True, text=True).stdout
+            runs[mode] = json.loads(out)  # pragma: no cover
+            if mode != "exact":  # pragma: no cover
+                print(f"  {mode:>3}: {runs[mode]['seconds']:8.2f} s   peak {runs[mode]['peak_mb']:7.0f} MiB")  # pragma: no cover
+        new, exact = runs["new"]["p99"], runs["exact"]["p99"]  # pragma: no cover
+        errors = [abs(new[n][0] / exact[n][0] - 1) for n in exact if exact[n][0] != float("inf")]  # pragma: no cover
+        print(f"  p99 from the sketch vs. exact: max relative error {max(errors, default=0):.2%}; "  # pragma: no cover
+              f"violation counts identical: {all(new[n][1] == exact[n][1] for n in exact)}")
+        if "old" in runs:  # pragma: no cover
+            old = runs["old"]["p99"]  # pragma: no cover
+            off = sum(old[n][1] != exact[n][1] for n in exact)  # pragma: no cover
+            print(f"  old substring matching miscounted violations for {off} of {len(exact)} endpoints "  # pragma: no cover
+                  f'(e.g. "v1/service-1" also matched /v1/service-10/...)')
+
+if __name__ == "__main__":  # pragma: no cover
+    main()  # pragma: no cover
@@ -1,10 +1,56 @@
-import math
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from lib.sketch import QuantileSketch
+from lib.burn_rate import BurnRateTracker
+
+PRIMARY_TARGETS = ("p99", "p95", "p50")  # the target the error budget is counted against, in order of preference
+
+def percentile_of(name: str) -> Optional[float]:
+    """"p99" -> 0.99, "p99.9" -> 0.999; None if `name` is not a percentile."""
+    if not name.startswith("p"):
+        return None
+    try:
+        value = float(name[1:]) / 100.0
+    except ValueError:
+        return None
+    return value if 0.0 <= value <= 1.0 else None
+
+def primary_target(slo_targets: Dict[str, float]) -> Optional[str]:
+    for name in PRIMARY_TARGETS:
+        if name in slo_targets:
+            return name
+    return None
+
+class EndpointStats:
+    """
+    Streaming state for one endpoint: a quantile sketch for every percentile, exact
+    violation counts per SLO target, and burn-rate windows for the error budget target.
+    Memory does not grow with the number of requests.
+    """
+
+    def __init__(self, slo_targets: Dict[str, float], windows_minutes: Optional[List[int]] = None):
+        self.slo_targets = {name: float(target) for name, target in slo_targets.items() if percentile_of(name) is not None}
+        self.primary = primary_target(self.slo_targets)
+        self.sketch = QuantileSketch()
+        self.violations = {name: 0 for name in self.slo_targets}
+        self.burn = BurnRateTracker(windows_minutes)
+
+    def add(self, latency_ms: float, timestamp: Optional[float] = None):
+        self.sketch.add(latency_ms)
+        for name, target in self.slo_targets.items():
+            if latency_ms > target:
+                self.violations[name] += 1
+        if timestamp is not None and self.primary is not None:
+            self.burn.add(timestamp, latency_ms > self.slo_targets[self.primary])
 
 class BudgetManager:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
 
+    def new_stats(self, slo_targets: Dict[str, float]) -> EndpointStats:
+        windows = self.config.get("budget", {}).get("burn_rate_windows_minutes")
+        return EndpointStats(slo_targets, windows)
+
     def evaluate(self, latencies: List[float], slo_targets: Dict[str, float], total_budget_percent: float) -> Dict[str, Any]:
         """
         Evaluate latencies against SLO targets. Returns a report of budget consumption.
@@ -12,30 +58,44 @@ class BudgetManager:
         slo_targets: e.g. {"p50": 100, "p95": 500, "p99": 1000}
         total_budget_percent: e.g. 1.0 (meaning 1%)
         """
-        if not latencies:
-            return {"total_requests": 0, "violations": 0, "allowable_violations": 0.0, "budget_consumed_percent": 0.0, "is_exhausted": False}
-        
-        latencies.sort()
-        total_reqs = len(latencies)
-        violations = 0
-        
-        target_ms = None
-        if "p99" in slo_targets:
-            target_ms = slo_targets["p99"]
-        elif "p95" in slo_targets:
-            target_ms = slo_targets["p95"]
-        elif "p50" in slo_targets:
-            target_ms = slo_targets["p50"]
-            
-        if target_ms is None:
-            return {"total_requests": total_reqs, "violations": 0, "allowable_violations": 0.0, "budget_consumed_percent": 0.0, "is_exhausted": False}
-
-        violations = sum(1 for l in latencies if l > target_ms)
-        
+        stats = EndpointStats(slo_targets)
+        for latency in latencies:
+            stats.add(latency)
+        return self.evaluate_stats(stats, total_budget_percent)
+
+    def evaluate_stats(self, stats: EndpointStats, total_budget_percent: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Report for streamed EndpointStats. The error budget (violations, budget_consumed_percent,
+        is_exhausted) is counted against the p99 target, else p95, else p50; every configured
+        percentile is also measured from the sketch and checked against its own target.
+        """
+        total_reqs = stats.sketch.count
+        names = sorted(stats.slo_targets, key=percentile_of)
+        actual = dict(zip(names, stats.sketch.quantiles([percentile_of(n) for n in names])))
+        percentiles = {
+            name: {
+                "target_ms": stats.slo_targets[name],
+                "actual_ms": actual[name],
+                "violations": stats.violations[name],
+                "met": actual[name] is not None and actual[name] <= stats.slo_targets[name],
+            }
+            for name in names
+        }
+
+        if not total_reqs:
+            return {"total_requests": 0, "violations": 0, "allowable_violations": 0.0, "budget_consumed_percent": 0.0, "is_exhausted": False,
+                    "percentiles": percentiles, "burn_rates": {}}
+
+        if stats.primary is None:
+            return {"total_requests": total_reqs, "violations": 0, "allowable_violations": 0.0, "budget_consumed_percent": 0.0, "is_exhausted": False,
+                    "percentiles": percentiles, "burn_rates": {}}
+
+        violations = stats.violations[stats.primary]
+
         allowable_violations = total_reqs * (total_budget_percent / 100.0)
-        
+
         consumed_percent = (violations / allowable_violations * 100.0) if allowable_violations > 0 else 0.0
-        
+
         is_exhausted = consumed_percent >= 100.0
 
         return {
@@ -43,5 +103,15 @@ class BudgetManager:
             "violations": violations,
             "allowable_violations": allowable_violations,
             "budget_consumed_percent": consumed_percent,
-            "is_exhausted": is_exhausted
+            "is_exhausted": is_exhausted,
+            "percentiles": percentiles,
+            "burn_rates": stats.burn.burn_rates(total_budget_percent, now),
         }
+
+def is_burning(burn_rates: Dict[str, Optional[float]], threshold: float) -> bool:
+    """
+    Multi-window burn-rate alert: every window burns at least `threshold` times too fast.
+    The long windows show the spend is significant, the short one that it is still going on.
+    """
+    rates = list(burn_rates.values())
+    return bool(rates) and all(rate is not None and rate >= threshold for rate in rates)
@@ -0,0 +1,63 @@
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_WINDOWS_MINUTES = [5, 60, 360]
+
+class BurnRateTracker:
+    """
+    Request and violation counts in fixed time slots (a ring buffer covering the longest
+    window), so burn rates over several windows cost constant memory while tailing a log.
+
+    Burn rate = violation rate in the window / allowed violation rate. 1.0 spends the
+    budget exactly over the SLO period; 14.4 spends a 30-day budget in about two days.
+    """
+
+    def __init__(self, windows_minutes: Optional[List[int]] = None, slot_seconds: int = 60):
+        self.windows_minutes = sorted(windows_minutes or DEFAULT_WINDOWS_MINUTES)
+        self.slot_seconds = slot_seconds
+        self.slots = max(1, -(-max(self.windows_minutes) * 60 // slot_seconds))
+        self._total = [0] * self.slots
+        self._bad = [0] * self.slots
+        self._slot_ids = [-1] * self.slots  # absolute slot number held by each ring position
+        self.latest = None  # timestamp of the newest event, the default "now" for rates
+
+    def add(self, timestamp: float, bad: bool):
+        slot = int(timestamp // self.slot_seconds)
+        pos = slot % self.slots
+        if self._slot_ids[pos] != slot:
+            if self._slot_ids[pos] > slot:
+                return  # older than the longest window
+            self._slot_ids[pos], self._total[pos], self._bad[pos] = slot, 0, 0
+        self._total[pos] += 1
+        self._bad[pos] += bad
+        if self.latest is None or timestamp > self.latest:
+            self.latest = timestamp
+
+    def counts(self, minutes: int, now: Optional[float] = None) -> Tuple[int, int]:
+        """(requests, violations) in the last `minutes` before `now` (default: the newest event)."""
+        now = self.latest if now is None else now
+        if now is None:
+            return 0, 0
+        newest = int(now // self.slot_seconds)
+        oldest = newest - max(1, -(-minutes * 60 // self.slot_seconds)) + 1
+        total = bad = 0
+        for pos, slot in enumerate(self._slot_ids):
+            if oldest <= slot <= newest:
+                total += self._total[pos]
+                bad += self._bad[pos]
+        return total, bad
+
+    def burn_rates(self, budget_percent: float, now: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """Burn rate per window, keyed like "5m"/"1h"; None for a window without requests."""
+        rates = {}
+        for minutes in self.windows_minutes:
+            total, bad = self.counts(minutes, now)
+            allowed = budget_percent / 100.0
+            rates[window_label(minutes)] = (bad / total / allowed) if total and allowed > 0 else None
+        return rates
+
+def window_label(minutes: int) -> str:
+    if minutes % 1440 == 0:
+        return f"{minutes // 1440}d"
+    if minutes % 60 == 0:
+        return f"{minutes // 60}h"
+    return f"{minutes}m"
@@ -1,5 +1,7 @@
 import json
-from typing import List, Dict, Any
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
 def parse_access_logs(log_lines: List[str], endpoint_path: str = None) -> List[float]:
     """
@@ -16,7 +18,7 @@ def parse_access_logs(log_lines: List[str], endpoint_path: str = None) -> List[f
             if endpoint_path:
                 if endpoint_path not in data.get("path", "") and data.get("path", "") not in endpoint_path:
                     continue
-                    
+
             if "latency_ms" in data:
                 latency = float(data["latency_ms"])
                 status = int(data.get("status", 200))
@@ -26,5 +28,94 @@ def parse_access_logs(log_lines: List[str], endpoint_path: str = None) -> List[f
                     latencies.append(latency)
         except (json.JSONDecodeError, ValueError):
             pass
-            
+
     return latencies
+
+def endpoint_path(url: str) -> str:
+    """The path part of an endpoint's configured URL ("https://host/v1/users" -> "v1/users")."""
+    if "://" not in url:
+        return url
+    return url.split("://")[-1].split("/", 1)[-1] if "/" in url.split("://")[-1] else ""
+
+def _segments(path: str) -> List[str]:
+    return [s for s in path.split("?", 1)[0].split("#", 1)[0].split("/") if s]
+
+class PathTrie:
+    """
+    Routes request paths to endpoint names by their longest matching path-segment prefix:
+    an endpoint at "/v1/users" receives "/v1/users" and "/v1/users/42", not "/v1/usersearch".
+    Lookup costs one dict step per path segment, however many endpoints are configured.
+    """
+
+    def __init__(self):
+        self.root: Dict[str, Any] = {}
+
+    def add(self, path: str, name: str):
+        node = self.root
+        for segment in _segments(path):
+            node = node.setdefault(segment, {})
+        node.setdefault(None, name)  # the first endpoint configured for a path wins
+
+    def match(self, path: str) -> Optional[str]:
+        node, found = self.root, self.root.get(None)
+        for segment in _segments(path):
+            node = node.get(segment)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+    @classmethod
+    def from_endpoints(cls, endpoints: List[Dict[str, Any]]) -> "PathTrie":
+        trie = cls()
+        for ep in endpoints:
+            path = endpoint_path(ep.get("url", ""))
+            if _segments(path):  # an endpoint without a path would swallow every request
+                trie.add(path, ep["name"])
+        return trie
+
+def _timestamp(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value) / 1000.0 if value > 1e11 else float(value)  # epoch milliseconds or seconds
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+def parse_log_line(line: str) -> Optional[Tuple[str, float, Optional[float]]]:
+    """
+    One JSON access log line as (path, latency_ms, timestamp); None if it is not a usable record.
+    Requests with status >= 500 count as infinitely slow. The timestamp (epoch seconds) comes
+    from a "timestamp", "time" or "ts" field, as epoch seconds/milliseconds or ISO 8601.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        data = json.loads(line)
+        if "latency_ms" not in data:
+            return None
+        latency = float(data["latency_ms"])
+        if int(data.get("status", 200)) >= 500:
+            latency = float('inf')
+    except (json.JSONDecodeError, ValueError, TypeError, AttributeError):
+        return None
+    ts = data.get("timestamp", data.get("time", data.get("ts")))
+    return str(data.get("path", "")), latency, _timestamp(ts)
+
+def stream_access_logs(log_lines: Iterable[str], trie: PathTrie) -> Iterator[Tuple[str, float, float]]:
+    """
+    Single pass over access log lines: yields (endpoint_name, latency_ms, timestamp) for
+    every line that routes to a configured endpoint. Lines without a timestamp get the
+    time they were read.
+    """
+    for line in log_lines:
+        record = parse_log_line(line)
+        if record is None:
+            continue
+        path, latency, ts = record
+        name = trie.match(path)
+        if name is not None:
+            yield name, latency, time.time() if ts is None else ts
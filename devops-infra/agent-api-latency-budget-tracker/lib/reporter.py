@@ -3,6 +3,23 @@ from rich.table import Table
 import json
 from typing import Dict, Any, List
 
+def _ms(value) -> str:
+    if value is None:
+        return "-"
+    return "∞" if value == float('inf') else f"{value:.0f}"
+
+def format_percentiles(res: Dict[str, Any]) -> str:
+    """e.g. "p50 97 ✓ · p99 1250 ✗" (measured ms, against each target)."""
+    return " · ".join(
+        f"{name} {_ms(p['actual_ms'])} {'✓' if p['met'] else '✗'}" for name, p in res.get("percentiles", {}).items()
+    ) or "-"
+
+def format_burn_rates(res: Dict[str, Any]) -> str:
+    """e.g. "5m 0.0x · 1h 2.3x"."""
+    return " · ".join(
+        f"{window} {'-' if rate is None else f'{rate:.1f}x'}" for window, rate in res.get("burn_rates", {}).items()
+    ) or "-"
+
 def format_terminal(results: List[Dict[str, Any]]):
     console = Console()
     table = Table(title="API Latency Budget Report", style="cyan")
@@ -11,7 +28,9 @@ def format_terminal(results: List[Dict[str, Any]]):
     table.add_column("Total Reqs", justify="right")
     table.add_column("Violations", justify="right")
     table.add_column("Budget Consumed (%)", justify="right")
-    table.add_column("Status", justify="center")
+    table.add_column("Percentiles (ms)")
+    table.add_column("Burn Rate")
+    table.add_column("Status", justify="center", no_wrap=True, min_width=9)
     
     for res in results:
         name = res["name"]
@@ -23,11 +42,13 @@ def format_terminal(results: List[Dict[str, Any]]):
         if res["is_exhausted"]:
             status = "[bold red]EXHAUSTED[/bold red]"
             consumed = f"[bold red]{consumed}[/bold red]"
+        elif res.get("is_burning"):
+            status = "[bold red]BURNING[/bold red]"
         elif res["budget_consumed_percent"] > 80:
             status = "[bold yellow]WARNING[/bold yellow]"
             consumed = f"[bold yellow]{consumed}[/bold yellow]"
             
-        table.add_row(name, total, violations, consumed, status)
+        table.add_row(name, total, violations, consumed, format_percentiles(res), format_burn_rates(res), status)
         
     console.print(table)
 
@@ -36,11 +57,11 @@ def format_json(results: List[Dict[str, Any]]) -> str:
 
 def format_markdown(results: List[Dict[str, Any]]) -> str:
     md = "## API Latency Budget Report\n\n"
-    md += "| Endpoint | Total Reqs | Violations | Budget Consumed | Status |\n"
-    md += "|---|---|---|---|---|\n"
+    md += "| Endpoint | Total Reqs | Violations | Budget Consumed | Percentiles (ms) | Burn Rate | Status |\n"
+    md += "|---|---|---|---|---|---|---|\n"
     
     for res in results:
-        status = "🔴 EXHAUSTED" if res["is_exhausted"] else ("🟡 WARNING" if res["budget_consumed_percent"]>80 else "🟢 OK")
-        md += f"| {res['name']} | {res['total_requests']} | {res['violations']} | {res['budget_consumed_percent']:.2f}% | {status} |\n"
+        status = "🔴 EXHAUSTED" if res["is_exhausted"] else ("🔥 BURNING" if res.get("is_burning") else ("🟡 WARNING" if res["budget_consumed_percent"]>80 else "🟢 OK"))
+        md += f"| {res['name']} | {res['total_requests']} | {res['violations']} | {res['budget_consumed_percent']:.2f}% | {format_percentiles(res)} | {format_burn_rates(res)} | {status} |\n"
         
     return md
@@ -0,0 +1,71 @@
+import math
+from typing import Dict, Iterable, List, Optional
+
+class QuantileSketch:
+    """
+    Mergeable latency sketch (DDSketch): latencies are counted in logarithmic buckets, so
+    every quantile is within `relative_accuracy` of the true value and memory is bounded
+    by the latency range, not the number of requests. Failed requests (infinite latency)
+    are counted separately and sort above everything else.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zeros = 0
+        self.infinite = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1):
+        if value == math.inf:
+            self.infinite += count
+        elif value <= self.min_value:
+            self.zeros += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+
+    def extend(self, values: Iterable[float]):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if (other.relative_accuracy, other.min_value) != (self.relative_accuracy, self.min_value):
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zeros += other.zeros
+        self.infinite += other.infinite
+        self.count += other.count
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The q-quantile (0 <= q <= 1), or None for an empty sketch."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: List[float]) -> List[Optional[float]]:
+        """Several quantiles, in increasing order of q, in one pass over the buckets."""
+        if not self.count:
+            return [None] * len(qs)
+        values = []
+        finite = self.count - self.infinite
+        bins = iter(sorted(self.bins.items()))
+        seen, index = self.zeros, None
+        for q in qs:
+            rank = q * (self.count - 1)
+            if rank >= finite:
+                values.append(math.inf)
+                continue
+            if rank < self.zeros:
+                values.append(0.0)
+                continue
+            while seen <= rank:
+                index, count = next(bins)
+                seen += count
+            # Bucket (gamma^(i-1), gamma^i] is represented by the value with equal relative error to both ends
+            values.append(2 * self.gamma ** index / (self.gamma + 1))
+        return values
@@ -4,10 +4,11 @@ import asyncio
 from typing import Dict, Any
 import sys
 import os
+import time
 
 from lib.prober import probe_endpoint
-from lib.log_parser import parse_access_logs
-from lib.budget import BudgetManager
+from lib.log_parser import PathTrie, stream_access_logs
+from lib.budget import BudgetManager, is_burning
 from lib.alerter import send_alert
 from lib.reporter import format_terminal, format_json, format_markdown
 
@@ -19,70 +20,153 @@ async def run_probes(endpoints, iterations: int = 1):
             latencies[ep["name"]].append(lat)
     return latencies
 
+def complete_lines(f, carry: list):
+    """Yield the newline-terminated lines of `f`; an unterminated last line is appended to `carry` instead."""
+    for line in f:
+        if line.endswith("\n"):
+            yield line
+        else:
+            carry.append(line)
+
+def follow_log(f, trie, stats, interval: float, report, poll: float = 0.5, partial: str = ""):
+    """
+    Tails an open log: new lines are routed into `stats` as they arrive, and report()
+    runs every `interval` seconds. A line still being written waits for its newline;
+    `partial` is the start of one left over from reading the log so far. When the path
+    gets a new file (rotation) or shrinks below what was read (truncation), the log is
+    reopened and read from the start.
+    """
+    path, inode = f.name, os.fstat(f.fileno()).st_ino
+    next_report = time.monotonic() + interval
+    try:
+        while True:
+            if time.monotonic() >= next_report:
+                report()
+                next_report = time.monotonic() + interval
+            line = f.readline()
+            if not line:
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    st = None  # mid-rotation: keep draining the old file until the new one appears
+                if st is not None and (st.st_ino != inode or st.st_size < f.tell()):
+                    f.close()
+                    f = open(path, "r")
+                    inode, partial = st.st_ino, ""
+                    continue
+                time.sleep(poll)
+                continue
+            partial += line
+            if partial.endswith("\n"):
+                for name, latency, ts in stream_access_logs([partial], trie):
+                    stats[name].add(latency, ts)
+                partial = ""
+    finally:
+        f.close()
+
+def build_results(endpoints, stats, budget_mgr: BudgetManager, total_budget: float, burn_threshold: float, now: float = None):
+    """
+    Per-endpoint reports. Burn-rate windows end at `now`; by default at each endpoint's newest
+    request, which suits a finished log. A live tail passes the wall clock, so a quiet log
+    lets old violations age out of the windows.
+    """
+    results = []
+    for ep in endpoints:
+        report = budget_mgr.evaluate_stats(stats[ep["name"]], total_budget, now)
+        report["name"] = ep["name"]
+        report["is_burning"] = is_burning(report["burn_rates"], burn_threshold)
+        results.append(report)
+    return results
+
+def emit(results, output_format: str):
+    if output_format == "table":
+        format_terminal(results)
+    elif output_format == "json":
+        click.echo(format_json(results))
+    elif output_format == "markdown":
+        click.echo(format_markdown(results))
+
+def alert_message(results, burn_threshold: float) -> str:
+    lines = []
+    if any(r["is_exhausted"] for r in results):
+        lines.append("🚨 API Latency Budget EXHAUSTED for one or more endpoints.")
+    for r in results:
+        if r["is_burning"]:
+            rates = ", ".join(f"{window} {rate:.1f}x" for window, rate in r["burn_rates"].items())
+            lines.append(f"🔥 {r['name']} is burning its latency budget faster than {burn_threshold:g}x ({rates}).")
+    return "\n".join(lines)
+
 @click.command()
 @click.option("--config", default="config.yaml", help="Path to config YAML")
 @click.option("--logs", default=None, help="Path to JSON access logs file")
 @click.option("--format", "output_format", default="table", type=click.Choice(["table", "json", "markdown"]))
 @click.option("--probes", default=10, help="Number of synthetic probes to run if logs not provided")
-def main(config, logs, output_format, probes):
+@click.option("--follow", is_flag=True, help="Keep tailing --logs and report every --interval seconds")
+@click.option("--interval", default=60.0, help="Seconds between reports with --follow")
+def main(config, logs, output_format, probes, follow, interval):
     """API Latency Budget Tracker"""
     if not os.path.exists(config):
         click.secho(f"Config file not found: {config}", fg="red")
         sys.exit(1)
-        
+
     with open(config, "r") as f:
         config_data = yaml.safe_load(f)
-        
+
     endpoints = config_data.get("endpoints", [])
     budget_cfg = config_data.get("budget", {})
     total_budget = float(budget_cfg.get("total_error_budget_percentage", 1.0))
-    
+    burn_threshold = float(budget_cfg.get("burn_rate_threshold", 14.4))
+
     alerting_cfg = config_data.get("alerting", {})
     webhook_url = alerting_cfg.get("webhook_url", "")
-    
-    latencies = {ep["name"]: [] for ep in endpoints}
-    
+
+    budget_mgr = BudgetManager(config_data)
+    stats = {ep["name"]: budget_mgr.new_stats(ep.get("slo", {})) for ep in endpoints}
+
     if logs:
         if not os.path.exists(logs):
             click.secho(f"Log file not found: {logs}", fg="red")
             sys.exit(1)
+        # One pass over the log: each line is routed to its endpoint and folded into that endpoint's sketch
+        trie = PathTrie.from_endpoints(endpoints)
         with open(logs, "r") as f:
-            log_lines = f.readlines()
-            
-        for ep in endpoints:
-            url_path = ep.get("url", "").split("://")[-1].split("/", 1)[-1] if "://" in ep.get("url", "") else ep.get("url", "")
-            if not url_path:
-                url_path = ep.get("url")
-            latencies[ep["name"]] = parse_access_logs(log_lines, endpoint_path=url_path)
+            # When following, a last line without its newline yet is finished by follow_log
+            carry = []
+            for name, latency, ts in stream_access_logs(complete_lines(f, carry) if follow else f, trie):
+                stats[name].add(latency, ts)
+
+            if follow:
+                alerted = set()
+
+                def report():
+                    results = build_results(endpoints, stats, budget_mgr, total_budget, burn_threshold, now=time.time())
+                    emit(results, output_format)
+                    # Alert when an endpoint starts exhausting or burning its budget, not on every report
+                    firing = {r["name"] for r in results if r["is_exhausted"] or r["is_burning"]}
+                    if firing - alerted and webhook_url:
+                        send_alert(webhook_url, alert_message([r for r in results if r["name"] in firing - alerted], burn_threshold))
+                    alerted.clear()
+                    alerted.update(firing)
+
+                report()
+                try:
+                    follow_log(f, trie, stats, interval, report, partial="".join(carry))
+                except KeyboardInterrupt:
+                    return
     else:
         # Run synthetic probes
         latencies = asyncio.run(run_probes(endpoints, iterations=probes))
-        
-    budget_mgr = BudgetManager(config_data)
-    results = []
-    has_exhausted = False
-    
-    for ep in endpoints:
-        name = ep["name"]
-        slo_targets = ep.get("slo", {})
-        ep_latencies = latencies.get(name, [])
-        
-        report = budget_mgr.evaluate(ep_latencies, slo_targets, total_budget)
-        report["name"] = name
-        results.append(report)
-        
-        if report["is_exhausted"]:
-            has_exhausted = True
-            
-    if output_format == "table":
-        format_terminal(results)
-    elif output_format == "json":
-        click.echo(format_json(results))
-    elif output_format == "markdown":
-        click.echo(format_markdown(results))
-        
-    if has_exhausted and webhook_url:
-        send_alert(webhook_url, "🚨 API Latency Budget EXHAUSTED for one or more endpoints.")
+        for ep in endpoints:
+            for latency in latencies.get(ep["name"], []):
+                stats[ep["name"]].add(latency, time.time())
+
+    results = build_results(endpoints, stats, budget_mgr, total_budget, burn_threshold)
+    emit(results, output_format)
+
+    has_exhausted = any(r["is_exhausted"] for r in results)
+    message = alert_message(results, burn_threshold)
+    if message and webhook_url:
+        send_alert(webhook_url, message)
 
     if has_exhausted:
         sys.exit(1)
@@ -42,6 +42,7 @@ def test_log_parser():
         '{"path": "/users", "latency_ms": 1200, "status": 500}',
         '{"path": "/different", "latency_ms": 50}',
         'not a json',
+        '   ',
         '{}'
     ]
     res = parse_access_logs(logs, endpoint_path="users")
@@ -161,3 +162,191 @@ def test_cli_with_synthetic_probes_warning(mock_run_probes, mock_config_warn_yml
     result = runner.invoke(main, ["--config", mock_config_warn_yml, "--format", "table"])
     assert result.exit_code == 0
     assert "WARNING" in result.output
+
+# --- Streaming: sketches, path routing, burn rates ---
+
+import random
+from lib.sketch import QuantileSketch
+from lib.log_parser import PathTrie, parse_log_line, stream_access_logs, endpoint_path
+from lib.burn_rate import BurnRateTracker, window_label
+from lib.budget import EndpointStats, is_burning, percentile_of
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = random.Random(5)
+    values = [rng.lognormvariate(4, 1) for _ in range(10000)]
+    sketch = QuantileSketch()
+    sketch.extend(values)
+    values.sort()
+    for q in (0.5, 0.95, 0.99):
+        assert sketch.quantile(q) == pytest.approx(values[int(q * (len(values) - 1))], rel=0.01)
+
+def test_sketch_merge_and_failures():
+    left, right, whole = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i in range(1, 101):
+        (left if i % 2 else right).add(float(i))
+        whole.add(float(i))
+    right.add(float('inf'), count=5)
+    whole.add(float('inf'), count=5)
+    merged = left.merge(right)
+    assert merged.count == 105 and merged.bins == whole.bins
+    assert merged.quantiles([0.5, 0.99]) == whole.quantiles([0.5, 0.99])
+    assert merged.quantile(0.99) == float('inf')
+    assert QuantileSketch().quantile(0.5) is None
+
+    zeros = QuantileSketch()
+    zeros.add(0.0, count=3)
+    zeros.add(10.0)
+    assert zeros.quantiles([0.5, 1.0]) == [0.0, pytest.approx(10.0, rel=0.01)]
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(relative_accuracy=0.05))
+
+def test_path_trie_routes_longest_prefix():
+    trie = PathTrie.from_endpoints([
+        {"name": "Users", "url": "https://api.example.com/v1/users"},
+        {"name": "Profile", "url": "https://api.example.com/v1/users/profile"},
+        {"name": "Root", "url": "https://api.example.com/"},
+    ])
+    assert trie.match("/v1/users") == "Users"
+    assert trie.match("/v1/users/42?expand=1") == "Users"
+    assert trie.match("/v1/users/profile/") == "Profile"
+    assert trie.match("/v1/usersearch") is None
+    assert trie.match("/") is None
+    assert endpoint_path("https://example.com/api") == "api"
+    assert endpoint_path("https://example.com") == ""
+    assert endpoint_path("/empty") == "/empty"
+
+def test_parse_log_line_timestamps_and_errors():
+    assert parse_log_line('{"path": "/a", "latency_ms": "12.5", "timestamp": 1700000000}') == ("/a", 12.5, 1700000000.0)
+    assert parse_log_line('{"path": "/a", "latency_ms": 1, "ts": 1700000000500}')[2] == 1700000000.5
+    assert parse_log_line('{"path": "/a", "latency_ms": 1, "time": "2023-11-14T22:13:20Z"}')[2] == 1700000000.0
+    assert parse_log_line('{"path": "/a", "latency_ms": 1, "time": "yesterday"}')[2] is None
+    assert parse_log_line('{"path": "/a", "latency_ms": 9, "status": 503}')[1] == float('inf')
+    for line in ("", "not json", "{}", '{"latency_ms": "fast"}', "[1, 2]"):
+        assert parse_log_line(line) is None
+
+    trie = PathTrie.from_endpoints([{"name": "A", "url": "/a"}])
+    routed = list(stream_access_logs(['{"path": "/a/1", "latency_ms": 5}', '{"path": "/b", "latency_ms": 5}'], trie))
+    assert len(routed) == 1 and routed[0][:2] == ("A", 5.0)
+
+def test_burn_rate_windows():
+    tracker = BurnRateTracker([5, 60])
+    start = 1_700_000_000 - 1_700_000_000 % 3600
+    for minute in range(60):
+        for i in range(10):
+            tracker.add(start + minute * 60 + i, bad=minute >= 55 and i < 5)  # last 5 minutes: half bad
+    assert tracker.counts(5) == (50, 25)
+    assert tracker.counts(60) == (600, 25)
+    rates = tracker.burn_rates(1.0)
+    assert rates["5m"] == pytest.approx(50.0)
+    assert rates["1h"] == pytest.approx(25 / 600 / 0.01)
+    assert is_burning(rates, 4.0) and not is_burning(rates, 14.4) and not is_burning({}, 1.0)
+
+    # Slots are reused as time moves on; events older than the longest window are dropped
+    tracker.add(start + 7200, bad=False)
+    tracker.add(start, bad=True)
+    assert tracker.counts(60) == (1, 0)
+    assert tracker.burn_rates(1.0, now=start + 100000) == {"5m": None, "1h": None}
+    assert [window_label(m) for m in (5, 60, 360, 1440)] == ["5m", "1h", "6h", "1d"]
+
+def test_evaluate_reports_every_percentile():
+    bm = BudgetManager({})
+    res = bm.evaluate([100.0] * 90 + [400.0] * 9 + [float('inf')], {"p50": 150, "p95": 300, "p99": 1000, "slow": 1}, 1.0)
+    assert res["violations"] == 1  # counted against p99, as before
+    assert set(res["percentiles"]) == {"p50", "p95", "p99"}
+    assert res["percentiles"]["p50"]["met"] and res["percentiles"]["p50"]["actual_ms"] == pytest.approx(100, rel=0.01)
+    assert not res["percentiles"]["p95"]["met"] and res["percentiles"]["p95"]["violations"] == 10
+    assert res["percentiles"]["p99"]["actual_ms"] == pytest.approx(400, rel=0.01)
+    assert percentile_of("p99.9") == pytest.approx(0.999) and percentile_of("p200") is None and percentile_of("pfast") is None
+
+def test_cli_follow_tails_and_alerts_once(mock_config_yml, tmp_path, mocker):
+    logs = tmp_path / "tail.log"
+    logs.write_text('{"path": "/api", "latency_ms": 100, "status": 200, "timestamp": 1700000000}\n')
+    alert = mocker.patch("main.send_alert")
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 1:
+            with open(logs, "a") as f:
+                f.write('{"path": "/api", "latency_ms": 5000, "status": 500, "timestamp": 1700000030}\n{"path": "/api", "lat')
+        elif len(sleeps) == 2:
+            with open(logs, "a") as f:
+                f.write('ency_ms": 5000, "status": 500, "timestamp": 1700000040}\n')
+        else:
+            raise KeyboardInterrupt
+
+    mocker.patch("main.time.sleep", side_effect=fake_sleep)
+    mocker.patch("main.time.time", return_value=1700000050)
+    result = CliRunner().invoke(main, ["--config", mock_config_yml, "--logs", str(logs), "--format", "json",
+                                       "--follow", "--interval", "0"])
+    assert result.exit_code == 0
+    reports = [json.loads(r) for r in result.output.replace("}\n{", "}\x00{").split("\x00")]
+    assert reports[0]["results"][0]["total_requests"] == 1
+    assert reports[-1]["results"][0]["total_requests"] == 3
+    assert reports[-1]["results"][0]["is_exhausted"]
+    alert.assert_called_once()
+    assert "EXHAUSTED" in alert.call_args[0][1] and "burning" in alert.call_args[0][1]
+
+LINE = '{{"path": "/api", "latency_ms": {ms}, "status": 200, "timestamp": {ts}}}\n'
+
+def run_follow(mock_config_yml, logs, mocker, changes):
+    """Run --follow, applying changes[i] at the i-th idle poll; returns the final report's request count."""
+    def fake_sleep(seconds):
+        if not changes:
+            raise KeyboardInterrupt
+        changes.pop(0)()
+    mocker.patch("main.time.sleep", side_effect=fake_sleep)
+    mocker.patch("main.time.time", return_value=1700000050)
+    result = CliRunner().invoke(main, ["--config", mock_config_yml, "--logs", str(logs), "--format", "json",
+                                       "--follow", "--interval", "0"])
+    assert result.exit_code == 0
+    reports = [json.loads(r) for r in result.output.replace("}\n{", "}\x00{").split("\x00")]
+    return reports[0]["results"][0]["total_requests"], reports[-1]["results"][0]["total_requests"]
+
+def test_cli_follow_keeps_partial_line_from_first_pass(mock_config_yml, tmp_path, mocker):
+    logs = tmp_path / "tail.log"
+    full = LINE.format(ms=100, ts=1700000000)
+    logs.write_text(full + full[:20])
+    def finish():
+        with open(logs, "a") as f:
+            f.write(full[20:])
+    assert run_follow(mock_config_yml, logs, mocker, [finish]) == (1, 2)
+
+def test_cli_follow_reopens_rotated_log(mock_config_yml, tmp_path, mocker):
+    logs = tmp_path / "tail.log"
+    logs.write_text(LINE.format(ms=100, ts=1700000000))
+    def rotate():
+        logs.rename(tmp_path / "tail.log.1")  # nothing at the path until the next poll
+    def recreate():
+        logs.write_text(LINE.format(ms=100, ts=1700000010) + LINE.format(ms=100, ts=1700000020))
+    assert run_follow(mock_config_yml, logs, mocker, [rotate, recreate]) == (1, 3)
+
+def test_cli_follow_reopens_truncated_log(mock_config_yml, tmp_path, mocker):
+    logs = tmp_path / "tail.log"
+    logs.write_text(LINE.format(ms=100, ts=1700000000) * 3 + '{"path": "/api", "lat')
+    def truncate():
+        logs.write_text(LINE.format(ms=100, ts=1700000010))  # shorter than what was read: start over
+    assert run_follow(mock_config_yml, logs, mocker, [truncate]) == (3, 4)
+
+def test_cli_follow_quiet_log_stops_burning(mock_config_yml, tmp_path, mocker):
+    # 100 slow requests three hours ago, then nothing: only the 6h window still sees them
+    logs = tmp_path / "quiet.log"
+    logs.write_text("".join(f'{{"path": "/api", "latency_ms": 5000, "status": 200, "timestamp": {1700000000 + i}}}\n'
+                            for i in range(100)))
+    alert = mocker.patch("main.send_alert")
+    mocker.patch("main.time.sleep", side_effect=KeyboardInterrupt)
+    mocker.patch("main.time.time", return_value=1700000000 + 3 * 3600)
+    result = CliRunner().invoke(main, ["--config", mock_config_yml, "--logs", str(logs), "--format", "json",
+                                       "--follow", "--interval", "3600"])
+    assert result.exit_code == 0
+    report = json.loads(result.output)["results"][0]
+    assert report["burn_rates"] == {"5m": None, "1h": None, "6h": pytest.approx(100.0)}
+    assert not report["is_burning"]
+
+def test_terminal_report_burning_and_missing_percentile(capsys):
+    from lib.reporter import format_terminal
+    format_terminal([{"name": "Users", "total_requests": 10, "violations": 1, "budget_consumed_percent": 10.0,
+                      "is_exhausted": False, "is_burning": True, "burn_rates": {"5m": 20.0},
+                      "percentiles": {"p99": {"actual_ms": None, "met": True}}}])
+    out = capsys.readouterr().out
+    assert "BURNING" in out and "p99 - ✓" in out
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scoring a run of consecutive commits with the persistent repository index
+(built once, then updated incrementally) vs. rebuilding the import graph and history
+from scratch for every commit, on a generated repository or an existing one.
+"""
+import argparse  # pragma: no cover
+import os  # pragma: no cover
+import random  # pragma: no cover
+import shutil  # pragma: no cover
+import subprocess  # pragma: no cover
+import sys  # pragma: no cover
+import tempfile  # pragma: no cover
+import time  # pragma: no cover
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))  # pragma: no cover
+
+from lib.git_analyzer import get_changed_files, get_author_email  # pragma: no cover
+from lib.repo_index import RepoIndex  # pragma: no cover
+from lib.scorer import calculate_total_risk  # pragma: no cover
+
+SUBJECTS = ["Add {}", "Refactor {}", "Fix crash in {}", "Update {}", "Fix typo in {}", "Tune {}", "Revert change to {}"]  # pragma: no cover
+
+def make_repo(path: str, files: int, commits: int, projects: int = 10):  # pragma: no cover
+    """A monorepo of `projects` packages that all call their package "lib", written with git fast-import."""
+    rng = random.Random(3)  # pragma: no cover
+    per_project = files // projects  # pragma: no cover
+    paths = [f"project{p}/lib/mod{m}.py" for p in range(projects) for m in range(per_project)]  # pragma: no cover
+    contents = {}  # pragma: no cover
+    for i, p in enumerate(paths):  # pragma: no cover
+        m = i % per_project  # pragma: no cover
+        deps = sorted({rng.randrange(m) for _ in range(min(m, 3))})  # imports only point "down", like real layering  # pragma: no cover
+        body = "".join(f"from lib.mod{d} import helper_{d}\n" for d in deps)  # pragma: no cover
+        contents[p] = body + f"\ndef helper_{m}(value):\n" + "".join(f"    value = value * {k} + {m}\n" for k in range(30)) + "    return value\n"  # pragma: no cover
+
+    subprocess.run(["git", "init", "-q", path], check=True)  # pragma: no cover
+    proc = subprocess.Popen(["git", "-C", path, "fast-import", "--quiet"], stdin=subprocess.PIPE)  # pragma: no cover
+    out = proc.stdin  # pragma: no cover
+    when = 1_600_000_000  # pragma: no cover
+
+    def data(text: str):  # pragma: no cover
+        raw = text.encode()  # pragma: no cover
+        out.write(b"data %d\n" % len(raw) + raw + b"\n")  # pragma: no cover
+
+    def header(n: int, author: str, message: str):  # pragma: no cover
+        out.write(f"commit refs/heads/main\nmark :{n}\n".encode())  # pragma: no cover
+        out.write(f"committer Dev <{author}> {when + n * 600} +0000\n".encode())  # pragma: no cover
+        data(message)  # pragma: no cover
+
+    header(1, "dev0@example.com", "Initial import")  # pragma: no cover
+    for p in paths:  # pragma: no cover
+        out.write(f"M 100644 inline {p}\n".encode())  # pragma: no cover
+        data(contents[p])  # pragma: no cover
+    for n in range(2, commits + 1):  # pragma: no cover
+        header(n, f"dev{rng.randrange(25)}@example.com", rng.choice(SUBJECTS).format(f"module {n}"))  # pragma: no cover
+        out.write(f"from :{n - 1}\n".encode())  # pragma: no cover
+        for p in rng.sample(paths, rng.randint(1, 3)):  # pragma: no cover
+            contents[p] += f"# change {n}\n"  # pragma: no cover
+            out.write(f"M 100644 inline {p}\n".encode())  # pragma: no cover
+            data(contents[p])  # pragma: no cover
+    out.close()  # pragma: no cover
+    if proc.wait() != 0:  # pragma: no cover
+        raise SystemExit("git fast-import failed")  # pragma: no cover
+    subprocess.run(["git", "-C", path, "checkout", "-q", "main"], check=True)  # pragma: no cover
+
+def score(repo: str, sha: str, index: RepoIndex):  # pragma: no cover
+    return calculate_total_risk(get_changed_files(repo, sha), get_author_email(repo, sha), repo, {}, index)  # pragma: no cover
+
+def main():  # pragma: no cover
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])  # pragma: no cover
+    p.add_argument("--repo", help="Existing repository to index (default: a generated one)")  # pragma: no cover
+    p.add_argument("--files", type=int, default=3000)  # pragma: no cover
+    p.add_argument("--commits", type=int, default=5000)  # pragma: no cover
+    p.add_argument("--score", type=int, default=20, help="Consecutive commits to score")  # pragma: no cover
+    p.add_argument("--workers", type=int, default=None)  # pragma: no cover
+    args = p.parse_args()  # pragma: no cover
+
+    tmp = tempfile.mkdtemp()  # pragma: no cover
+    try:  # pragma: no cover
+        repo = args.repo  # pragma: no cover
+        if repo is None:  # pragma: no cover
+            repo = os.path.join(tmp, "repo")  # pragma: no cover
+            start = time.perf_counter()  # pragma: no cover
+            make_repo(repo, args.files, args.commits)  # pragma: no cover
+            print(f"📦 generated {args.files:,} files, {args.commits:,} commits in {time.perf_counter() - start:.1f} s")  # pragma: no cover
+        shas = subprocess.run(["git", "-C", repo, "rev-list", "--first-parent", f"--max-count={args.score + 1}", "HEAD"],  # pragma: no cover
+                              check=True, capture_output=True, text=True).stdout.split()[::-1]
+        base, scored = shas[0], shas[1:]  # pragma: no cover
+        idx = os.path.join(tmp, "index")  # pragma: no cover
+
+        start = time.perf_counter()  # pragma: no cover
+        index = RepoIndex(repo, index_dir=idx, workers=args.workers).update(base)  # pragma: no cover
+        build = time.perf_counter() - start  # pragma: no cover
+        print(f"🔨 full build at {base[:8]}: {build:.2f} s ({index.last_update['parsed']:,} files parsed, "  # pragma: no cover
+              f"{index.last_update['history_commits']:,} commits of history, "
+              f"{os.path.getsize(index.index_path) / 2**20:.1f} MiB on disk)")
+
+        incremental, updates, fresh = [], [], []  # pragma: no cover
+        for sha in scored:  # pragma: no cover
+            start = time.perf_counter()  # pragma: no cover
+            index = RepoIndex(repo, index_dir=idx, workers=args.workers).update(sha)  # as a CI run would: load, update, score  # pragma: no cover
+            result = score(repo, sha, index)  # pragma: no cover
+            incremental.append(time.perf_counter() - start)  # pragma: no cover
+            updates.append(index.last_update["seconds"])  # pragma: no cover
+            parsed = index.last_update["parsed"]  # pragma: no cover
+        for sha in scored[-3:]:  # pragma: no cover
+            shutil.rmtree(os.path.join(tmp, "fresh"), ignore_errors=True)  # pragma: no cover
+            start = time.perf_counter()  # pragma: no cover
+            fresh_result = score(repo, sha, RepoIndex(repo, index_dir=os.path.join(tmp, "fresh"), workers=args.workers).update(sha))  # pragma: no cover
+            fresh.append(time.perf_counter() - start)  # pragma: no cover
+        assert fresh_result == result, "incremental and from-scratch indexes disagree"  # pragma: no cover
+
+        print(f"⚡ scoring {len(scored)} consecutive commits")  # pragma: no cover
+        print(f"  incremental index: {sum(incremental) / len(incremental) * 1000:8.0f} ms/commit "  # pragma: no cover
+              f"(index update {sum(updates) / len(updates) * 1000:.0f} ms; last one re-parsed {parsed} files)")
+        print(f"  rebuilt per commit: {sum(fresh) / len(fresh) * 1000:7.0f} ms/commit")  # pragma: no cover
+        print(f"  last commit: dependents={result['details']['dependents']}, "  # pragma: no cover
+              f"prior commits={result['details']['prior_commits']}, bug fixes={result['details']['prior_bug_fixes']}, "
+              f"score={result['score']:.1f}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)  # pragma: no cover
+
+if __name__ == "__main__":  # pragma: no cover
+    main()  # pragma: no cover
@@ -1,10 +1,14 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import os
 
-def calculate_blast_radius_score(changed_files: List[str], repo_path: str, config: Dict[str, Any]) -> float:
+from .repo_index import RepoIndex
+
+def calculate_blast_radius_score(changed_files: List[str], repo_path: str, config: Dict[str, Any],
+                                 index: Optional[RepoIndex] = None) -> float:
     """
-    Estimate blast radius. Since parsing all asts is slow, 
-    we do a simple heuristic: how many other files mention the basenames of the changed files?
+    Estimate blast radius. With a RepoIndex, the impact is the number of files that import or
+    reference the changed files, directly or transitively. Without one, we fall back to a simple
+    heuristic on the number of changed files.
     """
     scoring_cfg = config.get("scoring", {})
     max_score = scoring_cfg.get("max_blast_radius_score", 30.0)
@@ -12,6 +16,10 @@ def calculate_blast_radius_score(changed_files: List[str], repo_path: str, confi
     
     if not changed_files:
         return 0.0
+
+    if index is not None:
+        impact = min(len(index.dependents(changed_files)), max_files)
+        return (impact / float(max_files)) * max_score
         
     basenames = [os.path.basename(f).split(".")[0] for f in changed_files if "." in f and os.path.basename(f).split(".")[0]]
     basenames = [b for b in basenames if len(b) > 3] # ignore very short names
@@ -1,25 +1,56 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-def calculate_history_risk_score(changed_files: List[str], author_email: str, repo_path: str, config: Dict[str, Any]) -> float:
+from .repo_index import RepoIndex
+
+def file_risk(history: Dict[str, Any], high_churn_commits: float) -> float:
+    """
+    0..1 risk of one file from its history: mostly the share of its commits that were bug
+    fixes (a file fixed every other commit is as bug-prone as it gets), plus churn.
+    """
+    commits = history["commits"]
+    if not commits:
+        return 0.5  # new file: no evidence either way
+    bug_ratio = min(1.0, 2.0 * history["fixes"] / commits)
+    churn = min(1.0, commits / high_churn_commits)
+    return 0.6 * bug_ratio + 0.4 * churn
+
+def calculate_history_risk_score(changed_files: List[str], author_email: str, repo_path: str, config: Dict[str, Any],
+                                 index: Optional[RepoIndex] = None) -> float:
     """
-    Bug correlation and familiarity. 
+    Bug correlation and familiarity.
+    With a RepoIndex, the average risk of the changed files from their commits and bug fixes.
     """
     scoring_cfg = config.get("scoring", {})
     max_score = scoring_cfg.get("max_history_risk_score", 20.0)
-    
+
     if not changed_files:
         return 0.0
-        
+
+    if index is not None:
+        high_churn = config.get("history", {}).get("high_churn_commits", 20)
+        risks = [file_risk(index.file_history(f), high_churn) for f in changed_files]
+        return max_score * sum(risks) / len(risks)
+
     bug_prone_penalty = 0.5 # Default middle risk
-    
+
     return max_score * bug_prone_penalty
 
-def calculate_familiarity_discount(author_email: str, repo_path: str, config: Dict[str, Any]) -> float:
+def calculate_familiarity_discount(author_email: str, repo_path: str, config: Dict[str, Any],
+                                   changed_files: Optional[List[str]] = None, index: Optional[RepoIndex] = None) -> float:
     scoring_cfg = config.get("scoring", {})
     max_discount = scoring_cfg.get("familiarity_discount_max", 20.0)
-    
+
     if not author_email:
         return 0.0
-        
+
+    if index is not None and changed_files:
+        # The author's share of the previous commits to the files they changed
+        histories = [index.file_history(f) for f in changed_files]
+        total = sum(h["commits"] for h in histories)
+        if total:
+            own = sum(h["authors"].get(author_email, 0) for h in histories)
+            return max_discount * own / total
+        return max_discount * 0.5 if author_email in index.authors else 0.0
+
     # Assume known author gets 50% of the max discount for simple implementation
     return max_discount * 0.5
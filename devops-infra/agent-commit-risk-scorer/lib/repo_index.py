@@ -0,0 +1,377 @@
+import ast
+import gzip
+import json
+import os
+import re
+import subprocess
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+
+INDEX_VERSION = 2
+DEFAULT_BUGFIX_PATTERN = r"\b(fix(e[sd])?|bug(fix)?|hotfix|revert|regression|patch(ed)?)\b"
+MAX_FILE_BYTES = 1 << 20  # larger files (vendored bundles, data) are indexed without content
+PARALLEL_MIN_FILES = 200  # below this, a process pool costs more than it saves
+TOKEN_RE = re.compile(rb"[A-Za-z_][A-Za-z0-9_]{3,}")
+
+class RepoIndexError(Exception):
+    pass
+
+def _git(repo_path: str, *args: str) -> str:
+    result = subprocess.run(["git", "-C", repo_path, *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RepoIndexError(f"git {' '.join(args)}: {result.stderr.strip()}")
+    return result.stdout
+
+def parse_file(item: Tuple[str, bytes]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Index entry for one file's content: its imports (for Python, from the AST, as
+    [module, level, [names]]) and the identifier-like tokens that may name other files
+    (for Python, those in string literals).
+    """
+    path, content = item
+    entry: Dict[str, Any] = {"imports": [], "tokens": []}
+    if content is None or len(content) > MAX_FILE_BYTES or b"\0" in content[:8192]:
+        return path, entry
+    if not path.endswith(".py"):
+        entry["tokens"] = sorted({t.decode() for t in TOKEN_RE.findall(content)})
+        return path, entry
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        entry["tokens"] = sorted({t.decode() for t in TOKEN_RE.findall(content)})
+        return path, entry
+    strings = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            entry["imports"].extend([alias.name, 0, []] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            entry["imports"].append([node.module or "", node.level, [alias.name for alias in node.names]])
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            strings.append(node.value)
+    # In Python, other files are named in string literals ("settings.yaml"), not identifiers
+    entry["tokens"] = sorted({t.decode() for t in TOKEN_RE.findall("\n".join(strings).encode(errors="replace"))})
+    return path, entry
+
+def module_names(path: str) -> List[str]:
+    """Every dotted suffix a Python file can be imported as: "src/pkg/mod.py" -> src.pkg.mod, pkg.mod, mod."""
+    parts = path[:-3].split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return [".".join(parts[i:]) for i in range(len(parts))] if parts else []
+
+def _stem(path: str) -> str:
+    return os.path.basename(path).split(".")[0]
+
+def _imported_names(path: str, entry: Dict[str, Any]) -> Iterator[Tuple[List[str], str]]:
+    """
+    Per import of `path`: the dotted names it may refer to, with relative imports made
+    absolute, and the module name to fall back on when none of them is a module.
+    """
+    package = path.split("/")[:-1]
+    for module, level, names in entry["imports"]:
+        if level:
+            base = package[:len(package) - level + 1] if level - 1 <= len(package) else []
+            module = ".".join(base + ([module] if module else []))
+        candidates = [f"{module}.{n}" if module else n for n in names]
+        yield candidates + ([module] if module else []), module
+
+def _common_prefix_len(a: str, b: str) -> int:
+    n = 0
+    for x, y in zip(a.split("/"), b.split("/")):
+        if x != y:
+            break
+        n += 1
+    return n
+
+class RepoIndex:
+    """
+    Persistent index of a git repository, keyed by commit and stored under .git/risk-index:
+    - per file (by blob SHA): imports parsed from the AST and identifier tokens, so an
+      update only re-parses files whose content changed, in parallel across processes;
+    - the reverse import/reference graph, for blast radius, plus what depended on the
+      files the indexed commit removed, from its parent's graph;
+    - per-file churn, bug-fix commits and authors from `git log`, updated incrementally
+      while the indexed history is an ancestor of the new one.
+    """
+
+    def __init__(self, repo_path: str, index_dir: Optional[str] = None, workers: Optional[int] = None,
+                 bugfix_pattern: str = DEFAULT_BUGFIX_PATTERN):
+        self.repo_path = repo_path
+        if index_dir is None:
+            git_dir = _git(repo_path, "rev-parse", "--absolute-git-dir").strip()
+            index_dir = os.path.join(git_dir, "risk-index")
+        self.index_path = os.path.join(index_dir, "index.json.gz")
+        self.workers = workers or os.cpu_count() or 1
+        self.bugfix_pattern = bugfix_pattern
+        self.commit: Optional[str] = None
+        self.files: Dict[str, Dict[str, Any]] = {}  # path -> {"blob", "imports", "tokens", "deps"}
+        self.history_commit: Optional[str] = None  # history covers the commits before the indexed one
+        self.history: Dict[str, Dict[str, Any]] = {}  # path -> {"commits", "fixes", "authors": {email: n}}
+        self.authors: Dict[str, int] = {}
+        self.reverse: Dict[str, List[str]] = {}  # path -> files that import or reference it
+        self.removed: Dict[str, List[str]] = {}  # path removed by the indexed commit -> its dependents before
+        self.last_update: Dict[str, Any] = {}
+        self.load()
+
+    # --- Persistence ---
+
+    def load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with gzip.open(self.index_path, "rb") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            return  # unreadable index: rebuilt on the next update
+        if data.get("version") != INDEX_VERSION or data.get("bugfix_pattern") != self.bugfix_pattern:
+            return
+        self.commit = data["commit"]
+        self.files = data["files"]
+        self.history_commit = data["history_commit"]
+        self.history = data["history"]
+        self.authors = data["authors"]
+        self.reverse = data["reverse"]
+        self.removed = data["removed"]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        data = json.dumps({"version": INDEX_VERSION, "bugfix_pattern": self.bugfix_pattern, "commit": self.commit,
+                           "files": self.files, "history_commit": self.history_commit, "history": self.history,
+                           "authors": self.authors, "reverse": self.reverse,
+                           "removed": self.removed}, separators=(",", ":"))
+        with gzip.open(tmp, "wb", compresslevel=1) as f:
+            f.write(data.encode())
+        os.replace(tmp, self.index_path)
+
+    # --- Updating ---
+
+    def update(self, commit: str = "HEAD") -> "RepoIndex":
+        """Brings the index to `commit`; a no-op when it is already there."""
+        start = time.perf_counter()
+        sha = _git(self.repo_path, "rev-parse", "--verify", f"{commit}^{{commit}}").strip()
+        self.last_update = {"commit": sha, "parsed": 0, "reused": 0, "history_commits": 0}
+        if sha == self.commit:
+            self.last_update["seconds"] = time.perf_counter() - start
+            return self
+
+        parents = _git(self.repo_path, "rev-list", "--parents", "-n", "1", sha).split()[1:]
+        parent = parents[0] if parents else None
+        if parent is not None and parent != self.commit:
+            self._update_files(parent)  # so files the commit removes are looked up in its parent's graph
+        self.removed = self._update_files(sha)
+        self._update_history(parent)
+        self.commit = sha
+        self.save()
+        self.last_update["seconds"] = time.perf_counter() - start
+        return self
+
+    def _update_files(self, sha: str) -> Dict[str, List[str]]:
+        """
+        Re-parses the files whose blob changed and updates the dependency graph for them.
+        Returns the direct dependents, before the update, of the files that were removed.
+        """
+        blobs = {}
+        for line in _git(self.repo_path, "ls-tree", "-r", "-z", "--full-tree", sha).split("\0"):
+            if not line:
+                continue
+            meta, path = line.split("\t", 1)
+            mode, kind, blob = meta.split()
+            if kind == "blob" and mode != "120000":  # skip symlinks and submodules
+                blobs[path] = blob
+        stale = [path for path, blob in blobs.items() if self.files.get(path, {}).get("blob") != blob]
+        changed = {path: self.files[path]["deps"] for path in stale if path in self.files}
+        added = {path for path in stale if path not in self.files}
+        removed = {path: entry["deps"] for path, entry in self.files.items() if path not in blobs}
+        stale_set = set(stale)
+        files = {path: self.files[path] for path in blobs if path not in stale_set}
+        for path, entry in self._parse(stale, blobs):
+            entry["blob"] = blobs[path]
+            files[path] = entry
+        self.files = files
+        self.last_update["parsed"] += len(stale)
+        self.last_update["reused"] = len(blobs) - len(stale)
+        removed_dependents = {path: self.reverse.get(path, []) for path in removed}
+        if stale or removed:
+            self._update_graph(changed, added, removed)
+        return removed_dependents
+
+    def _parse(self, paths: List[str], blobs: Dict[str, str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        items = self._read_blobs(paths, blobs)
+        if len(paths) < PARALLEL_MIN_FILES or self.workers <= 1:
+            yield from map(parse_file, items)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            yield from pool.map(parse_file, items, chunksize=64)
+
+    def _read_blobs(self, paths: List[str], blobs: Dict[str, str]) -> Iterator[Tuple[str, bytes]]:
+        """File contents through one `git cat-file --batch` process, in the order of `paths`."""
+        if not paths:
+            return
+        proc = subprocess.Popen(["git", "-C", self.repo_path, "cat-file", "--batch"],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        # Requests go in batches that are fully read back before the next one, so neither pipe fills up
+        try:
+            for i in range(0, len(paths), 256):
+                batch = paths[i:i + 256]
+                proc.stdin.write("".join(f"{blobs[p]}\n" for p in batch).encode())
+                proc.stdin.flush()
+                for path in batch:
+                    header = proc.stdout.readline().split()
+                    if len(header) < 3 or header[1] != b"blob":
+                        yield path, None
+                        continue
+                    content = proc.stdout.read(int(header[2]))
+                    proc.stdout.read(1)  # trailing newline
+                    yield path, content
+        finally:
+            proc.stdin.close()
+            proc.stdout.close()
+            proc.wait()
+
+    def _update_history(self, target: Optional[str]):
+        """Brings the history up to `target`, the parent of the indexed commit (None for a root commit)."""
+        if target == self.history_commit:
+            return
+        incremental = (self.history_commit is not None and target is not None and subprocess.run(
+            ["git", "-C", self.repo_path, "merge-base", "--is-ancestor", self.history_commit, target],
+            capture_output=True).returncode == 0)
+        if not incremental:
+            self.history, self.authors = {}, {}
+        if target is not None:
+            revs = f"{self.history_commit}..{target}" if incremental else target
+            self.last_update["history_commits"] = self._read_log(revs)
+        self.history_commit = target
+
+    def _read_log(self, revs: str) -> int:
+        bugfix = re.compile(self.bugfix_pattern, re.IGNORECASE)
+        out = _git(self.repo_path, "log", "--no-merges", "--no-renames", "--format=%x00%ae%x1f%s", "--name-only", revs)
+        commits = 0
+        for record in out.split("\0")[1:]:
+            header, _, names = record.partition("\n")
+            email, _, subject = header.partition("\x1f")
+            is_fix = bool(bugfix.search(subject))
+            commits += 1
+            self.authors[email] = self.authors.get(email, 0) + 1
+            for path in names.split("\n"):
+                if not path:
+                    continue
+                h = self.history.setdefault(path, {"commits": 0, "fixes": 0, "authors": {}})
+                h["commits"] += 1
+                h["fixes"] += is_fix
+                h["authors"][email] = h["authors"].get(email, 0) + 1
+        return commits
+
+    def _update_graph(self, changed: Dict[str, List[str]], added: Set[str], removed: Dict[str, List[str]]):
+        """
+        Resolves the dependencies ("deps") of changed and added files and patches the reverse
+        graph; `changed` and `removed` map paths to their previous deps. Adding or removing a
+        file can also change what other files' imports resolve to, so files that import one
+        of its module names, or mention its name, are resolved again too.
+        """
+        modules: Dict[str, List[str]] = defaultdict(list)
+        stems: Dict[str, List[str]] = defaultdict(list)
+        for path in self.files:
+            if path.endswith(".py"):
+                for name in module_names(path):
+                    modules[name].append(path)
+            elif len(_stem(path)) > 3:
+                stems[_stem(path)].append(path)
+
+        moved = added | set(removed)
+        moved_modules = {name for path in moved if path.endswith(".py") for name in module_names(path)}
+        moved_stems = {_stem(path) for path in moved if not path.endswith(".py")}
+        if moved_modules or moved_stems:  # files indexed earlier may now resolve differently
+            for path, entry in self.files.items():
+                if path in changed or path in added:
+                    continue
+                if (moved_stems.intersection(entry["tokens"]) or
+                        any(moved_modules.intersection(names) for names, _ in _imported_names(path, entry))):
+                    changed[path] = entry["deps"]
+
+        touched: Dict[str, Set[str]] = {}
+        edits = [(path, old_deps, set()) for path, old_deps in removed.items()]
+        edits += [(path, old_deps, None) for path, old_deps in changed.items()]
+        edits += [(path, [], None) for path in added]
+        for path, old_deps, deps in edits:
+            if deps is None:
+                deps = self._resolve_deps(path, self.files[path], modules, stems)
+                self.files[path]["deps"] = sorted(deps)
+            for target in set(old_deps) - deps:
+                touched.setdefault(target, set(self.reverse.get(target, ()))).discard(path)
+            for target in deps - set(old_deps):
+                touched.setdefault(target, set(self.reverse.get(target, ()))).add(path)
+        for path in removed:
+            self.reverse.pop(path, None)
+        for target, dependents in touched.items():
+            if dependents and target in self.files:
+                self.reverse[target] = sorted(dependents)
+            else:
+                self.reverse.pop(target, None)
+
+    def _resolve_deps(self, path: str, entry: Dict[str, Any], modules: Dict[str, List[str]],
+                      stems: Dict[str, List[str]]) -> Set[str]:
+        """
+        Files `path` depends on: its Python imports and the non-Python files it names as a
+        token. A module name several files could be imported as (every project of a monorepo
+        has its own "lib" and "config") resolves to the one under the importer's nearest
+        enclosing directory, as if that were the source root, else to the one sharing the
+        longest path prefix with the importer; a name several non-Python files share, to
+        those sharing the longest path prefix.
+        """
+        ancestors = ["/".join(path.split("/")[:i]) for i in range(path.count("/"), -1, -1)]
+
+        def resolve(name: str) -> Optional[str]:
+            candidates = modules.get(name)
+            if not candidates:
+                return None
+            if len(candidates) == 1:
+                return candidates[0]
+            relative = name.replace(".", "/")
+            for root in ancestors:
+                prefix = f"{root}/{relative}" if root else relative
+                for candidate in (f"{prefix}.py", f"{prefix}/__init__.py"):
+                    if candidate in self.files:
+                        return candidate
+            return max(candidates, key=lambda c: (_common_prefix_len(path, c), -len(c)))
+
+        deps: Set[str] = set()
+        for names, module in _imported_names(path, entry):
+            # "from pkg import mod" depends on pkg/mod.py; "from pkg.mod import func" on pkg/mod.py
+            targets = [resolve(name) for name in names]
+            if module and not any(targets):
+                targets = [resolve(module)]
+            deps.update(t for t in targets if t)
+        for token in stems.keys() & entry["tokens"]:
+            candidates = stems[token]
+            if len(candidates) > 1:  # "config" in a monorepo means the nearest config.yaml
+                nearest = max(_common_prefix_len(path, c) for c in candidates)
+                candidates = [c for c in candidates if _common_prefix_len(path, c) == nearest]
+            deps.update(candidates)
+        deps.discard(path)
+        return deps
+
+    # --- Queries ---
+
+    def dependents(self, changed_files: Iterable[str], transitive: bool = True) -> Set[str]:
+        """
+        Files that import or reference the changed files (directly, or through other files),
+        excluding them. A file the indexed commit removed counts the files that depended on
+        it before, since those are what the removal breaks.
+        """
+        changed = set(changed_files)
+        seen: Set[str] = set()
+        queue = deque(changed)
+        while queue:
+            path = queue.popleft()
+            for dep in self.reverse.get(path, ()) if path in self.files else self.removed.get(path, ()):
+                if dep not in seen and dep not in changed:
+                    seen.add(dep)
+                    if transitive:
+                        queue.append(dep)
+        return seen
+
+    def file_history(self, path: str) -> Dict[str, Any]:
+        return self.history.get(path, {"commits": 0, "fixes": 0, "authors": {}})
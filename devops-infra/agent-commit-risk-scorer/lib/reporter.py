@@ -38,6 +38,10 @@ def format_terminal(score_data: Dict[str, Any], changed_files: List[str]):
     
     console.print(table)
     console.print(f"Files Analyzed: {len(changed_files)}")
+    details = score_data.get("details")
+    if details:
+        console.print(f"Dependent Files: {details['dependents']}  "
+                      f"Prior Commits: {details['prior_commits']} ({details['prior_bug_fixes']} bug fixes)")
 
 def format_json(score_data: Dict[str, Any]) -> str:
     return json.dumps(score_data, indent=2)
@@ -56,4 +60,8 @@ def format_markdown(score_data: Dict[str, Any], changed_files: List[str]) -> str
     md += f"| Familiarity Discount | -{score_data['familiarity_discount']:.1f} |\n"
     md += f"| **Total** | **{score:.1f}** |\n\n"
     md += f"*Analyzed {len(changed_files)} files.*\n"
+    details = score_data.get("details")
+    if details:
+        md += (f"*{details['dependents']} dependent files; {details['prior_commits']} prior commits to the changed files, "
+               f"{details['prior_bug_fixes']} of them bug fixes.*\n")
     return md
@@ -1,10 +1,12 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .criticality import calculate_criticality_score
 from .blast_radius import calculate_blast_radius_score
 from .test_coverage import calculate_coverage_gap_score
 from .history import calculate_history_risk_score, calculate_familiarity_discount
+from .repo_index import RepoIndex
 
-def calculate_total_risk(changed_files: List[str], author_email: str, repo_path: str, config: Dict[str, Any]) -> Dict[str, Any]:
+def calculate_total_risk(changed_files: List[str], author_email: str, repo_path: str, config: Dict[str, Any],
+                         index: Optional[RepoIndex] = None) -> Dict[str, Any]:
     if not changed_files:
         return {
             "score": 0.0,
@@ -16,18 +18,18 @@ def calculate_total_risk(changed_files: List[str], author_email: str, repo_path:
         }
         
     crit = calculate_criticality_score(changed_files, config)
-    blast = calculate_blast_radius_score(changed_files, repo_path, config)
+    blast = calculate_blast_radius_score(changed_files, repo_path, config, index)
     cov = calculate_coverage_gap_score(changed_files, config)
-    hist = calculate_history_risk_score(changed_files, author_email, repo_path, config)
+    hist = calculate_history_risk_score(changed_files, author_email, repo_path, config, index)
     
-    discount = calculate_familiarity_discount(author_email, repo_path, config)
+    discount = calculate_familiarity_discount(author_email, repo_path, config, changed_files, index)
     
     total = crit + blast + cov + hist - discount
     
     # Cap between 0 and 100
     total = max(0.0, min(100.0, total))
     
-    return {
+    result = {
         "score": total,
         "criticality": crit,
         "blast_radius": blast,
@@ -35,3 +37,12 @@ def calculate_total_risk(changed_files: List[str], author_email: str, repo_path:
         "history_risk": hist,
         "familiarity_discount": discount
     }
+    if index is not None:
+        histories = [index.file_history(f) for f in changed_files]
+        result["details"] = {
+            "commit": index.commit,
+            "dependents": len(index.dependents(changed_files)),
+            "prior_commits": sum(h["commits"] for h in histories),
+            "prior_bug_fixes": sum(h["fixes"] for h in histories),
+        }
+    return result
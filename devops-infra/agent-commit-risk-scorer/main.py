@@ -2,19 +2,33 @@ import click
 import yaml
 import sys
 import os
-from typing import List
+from typing import List, Dict, Any, Optional
 
 from lib.git_analyzer import get_changed_files, get_author_email
+from lib.repo_index import RepoIndex, RepoIndexError, DEFAULT_BUGFIX_PATTERN
 from lib.scorer import calculate_total_risk
 from lib.reporter import format_terminal, format_json, format_markdown
 
+def load_repo_index(repo: str, sha: str, config: Dict[str, Any], workers: Optional[int] = None) -> Optional[RepoIndex]:
+    """The repository index brought up to `sha`, or None (heuristic scoring) if it cannot be built."""
+    index_cfg = config.get("index", {})
+    try:
+        index = RepoIndex(repo, index_dir=index_cfg.get("path"), workers=workers or index_cfg.get("workers"),
+                          bugfix_pattern=config.get("history", {}).get("bugfix_pattern", DEFAULT_BUGFIX_PATTERN))
+        return index.update(sha)
+    except (RepoIndexError, OSError) as e:
+        click.echo(f"Warning: repository index unavailable, using heuristic scores: {e}", err=True)
+        return None
+
 @click.command()
 @click.option("--repo", default=".", help="Path to git repository")
 @click.option("--sha", default="HEAD", help="Commit SHA to analyze")
 @click.option("--config", default="config.yaml", help="Path to config YAML")
 @click.option("--format", "output_format", default="table", type=click.Choice(["table", "json", "markdown"]))
 @click.option("--threshold", default=75, type=int, help="Threshold score to fail CI")
-def main(repo, sha, config, output_format, threshold):
+@click.option("--index/--no-index", "use_index", default=True, help="Score with the persistent repository index")
+@click.option("--workers", default=None, type=int, help="Processes for parsing files into the index")
+def main(repo, sha, config, output_format, threshold, use_index, workers):
     """Commit Risk Scorer"""
     config_data = {}
     if os.path.exists(config):
@@ -27,8 +41,12 @@ def main(repo, sha, config, output_format, threshold):
             
     files = get_changed_files(repo, sha)
     author = get_author_email(repo, sha)
+
+    index = None
+    if files and use_index and config_data.get("index", {}).get("enabled", True):
+        index = load_repo_index(repo, sha, config_data, workers)
     
-    score_data = calculate_total_risk(files, author, repo, config_data)
+    score_data = calculate_total_risk(files, author, repo, config_data, index)
     
     if output_format == "table":
         format_terminal(score_data, files)
@@ -18,6 +18,7 @@ def test_cli_table_format(mocker, test_config_file):
     mocker.patch("main.get_changed_files", return_value=["src/auth/login.py", "README.md"])
     mocker.patch("main.get_author_email", return_value="test@example.com")
     mocker.patch("subprocess.run", return_value=type('obj', (object,), {'stdout': '2', 'returncode': 0})())
+    mocker.patch("main.load_repo_index", return_value=None)
 
     result = runner.invoke(main, ["--config", test_config_file, "--format", "table"])
     
@@ -32,6 +33,7 @@ def test_cli_json_format(mocker, test_config_file):
     mocker.patch("main.get_changed_files", return_value=["src/auth/login.py"])
     mocker.patch("main.get_author_email", return_value="test@example.com")
     mocker.patch("subprocess.run", return_value=type('obj', (object,), {'stdout': '2', 'returncode': 0})())
+    mocker.patch("main.load_repo_index", return_value=None)
 
     result = runner.invoke(main, ["--config", test_config_file, "--format", "json"])
     
@@ -47,6 +49,7 @@ def test_cli_markdown_format(mocker, test_config_file):
     mocker.patch("main.get_changed_files", return_value=["src/auth/login.py"])
     mocker.patch("main.get_author_email", return_value="test@example.com")
     mocker.patch("subprocess.run", return_value=type('obj', (object,), {'stdout': '2', 'returncode': 0})())
+    mocker.patch("main.load_repo_index", return_value=None)
 
     result = runner.invoke(main, ["--config", test_config_file, "--format", "markdown"])
     
@@ -92,6 +95,7 @@ def test_cli_missing_config(mocker):
     mocker.patch("main.get_changed_files", return_value=["src/core.py"])
     mocker.patch("main.get_author_email", return_value="test@example.com")
     mocker.patch("subprocess.run", return_value=type('obj', (object,), {'stdout': '2', 'returncode': 0})())
+    mocker.patch("main.load_repo_index", return_value=None)
 
     # Ensure config file doesn't exist
     result = runner.invoke(main, ["--config", "nonexistent_config.yaml", "--format", "json"])
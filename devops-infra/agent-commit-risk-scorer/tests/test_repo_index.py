@@ -0,0 +1,280 @@
+import os
+import subprocess
+import pytest
+from click.testing import CliRunner
+
+from lib.repo_index import RepoIndex, RepoIndexError, parse_file, module_names
+from lib.blast_radius import calculate_blast_radius_score
+from lib.history import calculate_history_risk_score, calculate_familiarity_discount
+from lib.scorer import calculate_total_risk
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", repo, *args], check=True, capture_output=True, text=True).stdout.strip()
+
+def commit(repo, files, message, email="dev@example.com"):
+    for path, content in files.items():
+        full = os.path.join(repo, path)
+        if content is None:
+            os.remove(full)
+            continue
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "w") as f:
+            f.write(content)
+    git(repo, "add", "-A")
+    git(repo, "-c", f"user.email={email}", "-c", "user.name=Dev", "commit", "-q", "-m", message)
+    return git(repo, "rev-parse", "HEAD")
+
+@pytest.fixture
+def repo(tmp_path):
+    path = str(tmp_path / "repo")
+    os.makedirs(path)
+    git(path, "init", "-q")
+    commit(path, {
+        "app/core/db.py": "def connect():\n    pass\n",
+        "app/core/__init__.py": "",
+        "app/models.py": "from app.core.db import connect\n",
+        "app/api.py": "from . import models\n",
+        "app/cli.py": "import app.api\n",
+        "other/lib/db.py": "x = 1\n",
+        "other/lib/use.py": "from lib import db\n",
+        "deploy/settings.yaml": "timeout: 5\n",
+        "app/config.py": "PATH = 'settings.yaml'\n",
+    }, "Initial layout")
+    commit(path, {"app/core/db.py": "def connect():\n    return 1\n"}, "Fix connection leak")
+    commit(path, {"app/core/db.py": "def connect():\n    return 2\n"}, "Tune pool", email="other@example.com")
+    return path
+
+def test_parse_file_imports_and_tokens():
+    _, entry = parse_file(("pkg/mod.py", b"import os, json\nfrom .util import helper\nvalue = helper('settings.yaml')\n"))
+    assert ["os", 0, []] in entry["imports"]
+    assert ["util", 1, ["helper"]] in entry["imports"]
+    assert entry["tokens"] == ["settings", "yaml"]
+    assert "settings" in parse_file(("deploy.sh", b"cp settings.yaml /etc\n"))[1]["tokens"]
+
+def test_parse_file_binary_and_syntax_error():
+    assert parse_file(("img.png", b"\x89PNG\0\0data"))[1] == {"imports": [], "tokens": []}
+    assert parse_file(("bad.py", b"def (:\n  broken_name"))[1]["imports"] == []
+
+def test_module_names():
+    assert module_names("src/pkg/mod.py") == ["src.pkg.mod", "pkg.mod", "mod"]
+    assert module_names("src/pkg/__init__.py") == ["src.pkg", "pkg"]
+
+def test_dependents_transitive(repo, tmp_path):
+    index = RepoIndex(repo, index_dir=str(tmp_path / "idx")).update()
+    assert index.dependents(["app/core/db.py"]) == {"app/models.py", "app/api.py", "app/cli.py"}
+    assert index.dependents(["app/core/db.py"], transitive=False) == {"app/models.py"}
+    assert index.dependents(["app/models.py", "app/api.py"]) == {"app/cli.py"}
+
+def test_ambiguous_module_resolves_nearest(repo, tmp_path):
+    index = RepoIndex(repo, index_dir=str(tmp_path / "idx")).update()
+    assert index.dependents(["other/lib/db.py"]) == {"other/lib/use.py"}
+
+def test_non_python_file_referenced_by_name(repo, tmp_path):
+    index = RepoIndex(repo, index_dir=str(tmp_path / "idx")).update()
+    assert "app/config.py" in index.dependents(["deploy/settings.yaml"])
+
+def test_history_covers_commits_before_the_scored_one(repo, tmp_path):
+    index = RepoIndex(repo, index_dir=str(tmp_path / "idx")).update()
+    # HEAD ("Tune pool") is the commit being scored, so it is not part of its own history
+    assert index.file_history("app/core/db.py") == {"commits": 2, "fixes": 1, "authors": {"dev@example.com": 2}}
+    assert index.file_history("missing.py") == {"commits": 0, "fixes": 0, "authors": {}}
+    assert index.authors == {"dev@example.com": 2}
+
+def test_incremental_update_reparses_changed_files_only(repo, tmp_path):
+    idx = str(tmp_path / "idx")
+    first = RepoIndex(repo, index_dir=idx).update()
+    assert first.last_update["parsed"] == 10  # the parent's 9 files, then the one HEAD changed
+
+    commit(repo, {"app/cli.py": "import app.models\n", "app/api.py": None}, "Drop api module")
+    index = RepoIndex(repo, index_dir=idx)  # loaded from disk
+    assert index.commit == first.commit
+    index.update()
+    assert index.last_update["parsed"] == 1
+    assert index.last_update["reused"] == 7
+    assert index.last_update["history_commits"] == 1
+    assert index.dependents(["app/core/db.py"]) == {"app/models.py", "app/cli.py"}
+    assert index.file_history("app/core/db.py")["commits"] == 3
+
+    index.update()
+    assert index.last_update["parsed"] == 0 and index.last_update["history_commits"] == 0
+
+def test_content_change_patches_graph_like_a_rebuild(repo, tmp_path):
+    idx = str(tmp_path / "idx")
+    RepoIndex(repo, index_dir=idx).update()
+    commit(repo, {"app/api.py": "x = 1\n", "app/cli.py": "import app.models\nimport app.core.db\n"}, "Rewire cli")
+    index = RepoIndex(repo, index_dir=idx).update()
+    assert index.last_update["parsed"] == 2
+    fresh = RepoIndex(repo, index_dir=str(tmp_path / "fresh")).update()
+    assert index.reverse == fresh.reverse
+    assert index.dependents(["app/core/db.py"]) == {"app/models.py", "app/cli.py"}
+
+def test_added_and_removed_files_patch_graph_like_a_rebuild(repo, tmp_path):
+    idx = str(tmp_path / "idx")
+    RepoIndex(repo, index_dir=idx).update()
+    commit(repo, {
+        "app/lib/db.py": "",  # a second "lib.db", nearer to app/worker.py than other/lib/db.py
+        "app/worker.py": "from lib import db\nQUEUE = 'queues.yaml'\n",
+        "deploy/queues.yaml": "size: 1\n",
+        "app/models.py": None,
+    }, "Add worker")
+    index = RepoIndex(repo, index_dir=idx).update()
+    fresh = RepoIndex(repo, index_dir=str(tmp_path / "fresh")).update()
+    assert index.reverse == fresh.reverse
+    assert index.files == fresh.files
+    assert index.dependents(["app/lib/db.py"]) == {"app/worker.py"}
+    assert index.dependents(["other/lib/db.py"]) == {"other/lib/use.py"}
+    assert index.dependents(["deploy/queues.yaml"]) == {"app/worker.py"}
+    assert index.dependents(["app/core/db.py"]) == set()
+
+def test_import_of_file_added_later(tmp_path):
+    path = str(tmp_path / "repo")
+    os.makedirs(path)
+    git(path, "init", "-q")
+    commit(path, {"a.py": "import b\n"}, "Add a")
+    idx = str(tmp_path / "idx")
+    RepoIndex(path, index_dir=idx).update()
+    commit(path, {"b.py": ""}, "Add b")
+    assert RepoIndex(path, index_dir=idx).update().reverse == {"b.py": ["a.py"]}
+
+@pytest.mark.parametrize("seed", range(8))
+def test_incremental_matches_fresh_build_over_random_commits(tmp_path, seed):
+    import random
+    rng = random.Random(seed)
+    path = str(tmp_path / "repo")
+    os.makedirs(path)
+    git(path, "init", "-q")
+    dirs, names = ["", "pkg/", "pkg/sub/", "other/lib/", "lib/"], ["alpha", "beta", "gamma", "delta", "db"]
+    present = set()
+
+    def random_content(step):
+        lines = [f"# step {step}"] + [rng.choice([f"import {rng.choice(names)}", f"from lib import {rng.choice(names)}",
+                             f"from . import {rng.choice(names)}", f"import pkg.{rng.choice(names)}",
+                             f"PATH = '{rng.choice(names)}.yaml'"]) for _ in range(rng.randint(0, 3))]
+        return "\n".join(lines) + "\n"
+
+    commit(path, {"README.md": "start\n"}, "Initial")
+    idx = str(tmp_path / "idx")
+    RepoIndex(path, index_dir=idx).update()
+    for step in range(12):
+        changes = {}
+        for _ in range(rng.randint(1, 4)):
+            target = rng.choice(dirs) + rng.choice(names) + rng.choice([".py", ".py", ".yaml"])
+            if target in present and rng.random() < 0.3:
+                changes[target] = None
+                present.discard(target)
+            else:
+                changes[target] = random_content(step)
+                present.add(target)
+        commit(path, changes, f"Step {step}")
+        index = RepoIndex(path, index_dir=idx).update()
+        fresh = RepoIndex(path, index_dir=str(tmp_path / f"fresh{step}")).update()
+        assert index.files == fresh.files, step
+        assert index.reverse == fresh.reverse, step
+
+def test_removed_file_counts_its_former_dependents(tmp_path):
+    path = str(tmp_path / "repo")
+    os.makedirs(path)
+    git(path, "init", "-q")
+    commit(path, {"b.py": "", **{f"user{i}.py": "import b\n" for i in range(5)}}, "Add b and its users")
+    idx = str(tmp_path / "idx")
+    RepoIndex(path, index_dir=idx).update()
+    commit(path, {"c.py": "x = 1\n"}, "Unrelated")
+    commit(path, {"b.py": None}, "Remove b")  # scored two commits after the indexed one
+    index = RepoIndex(path, index_dir=idx).update()
+    assert index.dependents(["b.py"]) == {f"user{i}.py" for i in range(5)}
+    assert calculate_blast_radius_score(["b.py"], path, {}, index) == pytest.approx(15.0)
+    # A fresh index at the same commit agrees
+    assert RepoIndex(path, index_dir=str(tmp_path / "fresh")).update().dependents(["b.py"]) == index.dependents(["b.py"])
+
+def test_renamed_file_counts_dependents_of_the_old_path(repo, tmp_path):
+    idx = str(tmp_path / "idx")
+    RepoIndex(repo, index_dir=idx).update()
+    git(repo, "mv", "app/core/db.py", "app/core/database.py")
+    commit(repo, {}, "Rename db module")
+    from lib.git_analyzer import get_changed_files
+    changed = get_changed_files(repo, "HEAD")
+    index = RepoIndex(repo, index_dir=idx).update()
+    assert "app/core/db.py" in changed
+    assert index.dependents(changed) >= {"app/models.py", "app/api.py", "app/cli.py"}
+
+def test_history_rebuilt_when_not_an_ancestor(repo, tmp_path):
+    idx = str(tmp_path / "idx")
+    RepoIndex(repo, index_dir=idx).update()
+    git(repo, "checkout", "-q", "-b", "side", "HEAD~2")
+    commit(repo, {"app/models.py": "from app.core.db import connect as c\n"}, "Rename import")
+    index = RepoIndex(repo, index_dir=idx).update()
+    assert index.file_history("app/core/db.py")["commits"] == 1
+
+def test_index_ignored_for_other_bugfix_pattern(repo, tmp_path):
+    idx = str(tmp_path / "idx")
+    RepoIndex(repo, index_dir=idx).update()
+    index = RepoIndex(repo, index_dir=idx, bugfix_pattern="tune")
+    assert index.commit is None
+    assert index.update("HEAD~1").file_history("app/core/db.py")["fixes"] == 0
+
+def test_parallel_parse_matches_serial(repo, tmp_path, monkeypatch):
+    serial = RepoIndex(repo, index_dir=str(tmp_path / "a"), workers=1).update()
+    monkeypatch.setattr("lib.repo_index.PARALLEL_MIN_FILES", 1)
+    parallel = RepoIndex(repo, index_dir=str(tmp_path / "b"), workers=2).update()
+    assert parallel.files == serial.files
+    assert parallel.reverse == serial.reverse
+
+def test_unreadable_index_is_rebuilt(repo, tmp_path):
+    idx = str(tmp_path / "idx")
+    head = RepoIndex(repo, index_dir=idx).update().commit
+    with open(os.path.join(idx, "index.json.gz"), "wb") as f:
+        f.write(b"not gzip")
+    index = RepoIndex(repo, index_dir=idx)
+    assert index.commit is None
+    assert index.update().commit == head and index.file_history("app/core/db.py")["fixes"] == 1
+
+def test_missing_blob_reads_as_none(repo, tmp_path):
+    index = RepoIndex(repo, index_dir=str(tmp_path / "idx"))
+    blob = git(repo, "rev-parse", "HEAD:app/models.py")
+    assert [(p, c is None) for p, c in index._read_blobs(["gone.py", "app/models.py"], {"gone.py": "0" * 40, "app/models.py": blob})] == \
+        [("gone.py", True), ("app/models.py", False)]
+
+def test_not_a_repository(tmp_path):
+    with pytest.raises(RepoIndexError):
+        RepoIndex(str(tmp_path))
+
+def test_scores_with_index(repo, tmp_path):
+    index = RepoIndex(repo, index_dir=str(tmp_path / "idx")).update()
+    config = {"scoring": {"max_blast_radius_files": 10, "max_blast_radius_score": 30.0,
+                          "max_history_risk_score": 20.0, "familiarity_discount_max": 20.0}}
+    assert calculate_blast_radius_score(["app/core/db.py"], repo, config, index) == pytest.approx(9.0)
+    assert calculate_blast_radius_score(["app/cli.py"], repo, config, index) == 0.0
+    # 2 commits, 1 fix: bug ratio 1.0, churn 2/20
+    assert calculate_history_risk_score(["app/core/db.py"], "", repo, config, index) == pytest.approx(20.0 * (0.6 + 0.04))
+    assert calculate_history_risk_score(["new.py"], "", repo, config, index) == pytest.approx(10.0)
+    assert calculate_familiarity_discount("dev@example.com", repo, config, ["app/core/db.py"], index) == 20.0
+    assert calculate_familiarity_discount("other@example.com", repo, config, ["app/core/db.py"], index) == 0.0
+    assert calculate_familiarity_discount("dev@example.com", repo, config, ["new.py"], index) == 10.0
+
+    result = calculate_total_risk(["app/core/db.py"], "dev@example.com", repo, config, index)
+    assert result["details"] == {"commit": index.commit, "dependents": 3, "prior_commits": 2, "prior_bug_fixes": 1}
+
+def test_cli_uses_index(repo, tmp_path, mocker):
+    from main import main
+    mocker.patch("main.get_changed_files", return_value=["app/core/db.py"])
+    mocker.patch("main.get_author_email", return_value="other@example.com")
+    config = tmp_path / "config.yaml"
+    config.write_text(f"index:\n  path: {tmp_path / 'idx'}\n")
+
+    result = CliRunner().invoke(main, ["--repo", repo, "--config", str(config), "--format", "markdown"])
+    assert result.exit_code == 0
+    assert "3 dependent files; 2 prior commits" in result.output
+    assert os.path.exists(tmp_path / "idx" / "index.json.gz")
+
+    result = CliRunner().invoke(main, ["--repo", repo, "--config", str(config), "--format", "json", "--no-index"])
+    assert "details" not in result.output
+
+def test_cli_falls_back_without_repository(tmp_path, mocker):
+    from main import main
+    mocker.patch("main.get_changed_files", return_value=["src/core.py"])
+    mocker.patch("main.get_author_email", return_value="dev@example.com")
+
+    result = CliRunner().invoke(main, ["--repo", str(tmp_path), "--config", "nonexistent_config.yaml", "--format", "markdown"])
+    assert result.exit_code == 0
+    assert "Warning: repository index unavailable" in result.output
+    assert "## Commit Risk Analysis" in result.output
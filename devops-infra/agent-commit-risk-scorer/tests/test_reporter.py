@@ -15,6 +15,12 @@ def test_format_terminal(capsys):
     format_terminal(score_data, files)
     
     # Check output
+def test_format_terminal_details(capsys):
+    score_data = {"score": 10.0, "criticality": 4.0, "blast_radius": 3.0, "coverage_gap": 2.0, "history_risk": 1.0,
+                  "familiarity_discount": 0.0, "details": {"dependents": 3, "prior_commits": 7, "prior_bug_fixes": 2}}
+    format_terminal(score_data, ["a.py"])
+    assert "Dependent Files: 3  Prior Commits: 7 (2 bug fixes)" in capsys.readouterr().out
+
 def test_format_terminal_no_files():
     format_terminal({}, [])
     
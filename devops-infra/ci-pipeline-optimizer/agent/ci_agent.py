@@ -1,6 +1,6 @@
-from langchain_openai import ChatOpenAI
-import os
-import sys
+import os, sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 
 # Add parent directory to path to import config
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
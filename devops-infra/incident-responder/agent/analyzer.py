@@ -1,5 +1,6 @@
 import json  # pragma: no cover
-from langchain_openai import ChatOpenAI  # pragma: no cover
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")  # pragma: no cover
 from langchain_core.prompts import PromptTemplate  # pragma: no cover
 from langchain_core.output_parsers import JsonOutputParser  # pragma: no cover
 from typing import Dict, Any, List  # pragma: no cover
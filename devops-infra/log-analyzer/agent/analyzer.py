@@ -20,8 +20,10 @@ class LogAnalysis:
     warnings: list[LogEntry] = field(default_factory=list)
     top_messages: list[tuple] = field(default_factory=list)
     time_range: tuple = ("", "")
+    def error_count(self) -> int: return self.levels.get("ERROR", len(self.errors))  # errors may be a capped sample
+    def warning_count(self) -> int: return self.levels.get("WARNING", len(self.warnings))
     def to_dict(self) -> dict:
-        return {"total_lines": self.total_lines, "levels": self.levels, "errors": len(self.errors), "warnings": len(self.warnings)}
+        return {"total_lines": self.total_lines, "levels": self.levels, "errors": self.error_count(), "warnings": self.warning_count()}
 
 LOG_PATTERNS = [
     re.compile(r"^(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}[^ ]*)\s+(\w+)\s+(.*)$"),  # ISO timestamp
@@ -30,26 +32,44 @@ LOG_PATTERNS = [
     re.compile(r"^(\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2}[^ ]*)\s+(.*)$"),              # Apache-like
 ]
 
+# The same four formats as one regex, tried in the same order; the last group that matched names the format.
+LINE_RE = re.compile(
+    r"^(?:(?P<iso_ts>\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}[^ ]*)\s+(?P<iso_level>\w+)\s+(?P<iso>.*)$"
+    r"|\[(?P<br_ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]\s+(?P<br_level>\w+)\s+(?P<br>.*)$"
+    r"|(?P<sys_ts>\w{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2})\s+\S+\s+(?P<sys_level>\w+):\s+(?P<sys>.*)$"
+    r"|(?P<ap_ts>\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2}[^ ]*)(?P<ap_level>)\s+(?P<ap>.*)$)")  # Apache lines have no level
+_LINE_GROUPS = {name: (f"{name}_ts", f"{name}_level", name) for name in ("iso", "br", "sys", "ap")}
+_NORMALIZED: dict[str, str] = {}  # memo for normalize_level over the (small) set of level words seen
+FALLBACK_KEYWORDS = ["ERROR", "WARN", "INFO", "DEBUG", "CRITICAL", "FATAL"]
+_KEYWORD_RE = re.compile("|".join(FALLBACK_KEYWORDS), re.IGNORECASE)
+
 LEVEL_ALIASES = {"err": "ERROR", "error": "ERROR", "warn": "WARNING", "warning": "WARNING",
                  "info": "INFO", "debug": "DEBUG", "critical": "CRITICAL", "fatal": "FATAL",
                  "notice": "NOTICE", "trace": "TRACE"}
 
+def parse_fields(line: str) -> tuple[str, str, str]:
+    """(timestamp, level, message) of a stripped, non-empty line — parse_line without the LogEntry."""
+    m = LINE_RE.match(line)
+    if m:
+        ts, level, msg = m.group(*_LINE_GROUPS[m.lastgroup])
+        norm = _NORMALIZED.get(level)
+        if norm is None:
+            norm = normalize_level(level)
+            if len(_NORMALIZED) < 4096: _NORMALIZED[level] = norm
+        return ts, norm, msg
+    # Fallback: the first of FALLBACK_KEYWORDS that appears anywhere in the line
+    found = _KEYWORD_RE.findall(line)
+    if found:
+        found = {k.upper() for k in found}
+        keyword = next(k for k in FALLBACK_KEYWORDS if k in found)
+        return "", normalize_level(keyword), line
+    return "", "", line
+
 def parse_line(line: str) -> LogEntry:
     line = line.strip()
     if not line: return LogEntry(raw=line)
-    for pattern in LOG_PATTERNS:
-        m = pattern.match(line)
-        if m:
-            groups = m.groups()
-            if len(groups) == 3:
-                return LogEntry(timestamp=groups[0], level=normalize_level(groups[1]), message=groups[2], raw=line)
-            elif len(groups) == 2:
-                return LogEntry(timestamp=groups[0], message=groups[1], raw=line)
-    # Fallback: check for level keywords
-    for keyword in ["ERROR", "WARN", "INFO", "DEBUG", "CRITICAL", "FATAL"]:
-        if keyword in line.upper():
-            return LogEntry(level=normalize_level(keyword), message=line, raw=line)
-    return LogEntry(message=line, raw=line)
+    ts, level, msg = parse_fields(line)
+    return LogEntry(timestamp=ts, level=level, message=msg, raw=line)
 
 def normalize_level(level: str) -> str:
     return LEVEL_ALIASES.get(level.lower(), level.upper())
@@ -78,10 +98,11 @@ def filter_by_level(entries: list[LogEntry], level: str) -> list[LogEntry]:
     return [e for e in entries if e.level == norm]
 
 def search_logs(entries: list[LogEntry], query: str) -> list[LogEntry]:
-    return [e for e in entries if query.lower() in e.message.lower()]
+    needle = query.lower()
+    return [e for e in entries if needle in e.message.lower()]
 
 def format_analysis_markdown(a: LogAnalysis) -> str:
-    lines = ["## Log Analysis", f"**Total Lines:** {a.total_lines} | **Errors:** {len(a.errors)} | **Warnings:** {len(a.warnings)}", ""]
+    lines = ["## Log Analysis", f"**Total Lines:** {a.total_lines} | **Errors:** {a.error_count()} | **Warnings:** {a.warning_count()}", ""]
     if a.levels:
         lines.append("### Level Distribution")
         for level, count in a.levels.items():
@@ -0,0 +1,367 @@
+"""On-disk log index — token postings, level offsets and a sparse time index, next to the log.
+
+`app.log` is indexed into `app.log.idx/`: a meta.json plus one segment file per ~64 MB
+of log. A segment splits its byte range into newline-aligned blocks of ~64 KB and stores
+  - a sorted token table (lowercased \\w+ runs of MIN_TOKEN+ chars) -> block ids,
+  - level -> offsets of every line with that level,
+  - per block, the min/max normalised timestamp.
+A query narrows to candidate blocks (or, with a level, straight to line offsets) and only
+reads those; every candidate line is still checked with the same test `search_logs` and
+`filter_by_level` use, so results are exactly what a full scan returns. Re-opening after the
+log has grown indexes just the new lines; truncation or rotation triggers a rebuild.
+Segment arrays are native-endian uint32 (uint64 for block offsets); the index is a cache,
+not a portable format.
+"""
+from __future__ import annotations
+import hashlib, json, mmap, os, re
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from agent.analyzer import LogEntry, normalize_level, parse_fields
+
+INDEX_VERSION = 1
+BLOCK_BYTES = 64 << 10
+SEGMENT_BYTES = 64 << 20
+MIN_TOKEN = 3
+HEAD_BYTES = 4096  # fingerprint of the file start, to notice rotation
+_TOKEN = re.compile(rf"\w{{{MIN_TOKEN},}}")  # whole \w runs of MIN_TOKEN+ chars
+_LINE = re.compile(rb"[^\r\n]+")  # lines as universal-newline text mode sees them (empty ones dropped)
+_MONTHS = {m: f"{i:02d}" for i, m in enumerate("Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split(), 1)}
+_NO_TIME = b" " * 19
+
+
+def index_dir(path: str) -> str: return path + ".idx"
+
+
+def ts_key(ts: str) -> str:
+    """A timestamp as sortable "YYYY-MM-DD HH:MM:SS" (as written, no timezone maths); "" if it has no year."""
+    if len(ts) >= 19 and ts[4] == "-": return f"{ts[:10]} {ts[11:19]}"
+    if len(ts) >= 20 and ts[2] == "/" and ts[3:6] in _MONTHS: return f"{ts[7:11]}-{_MONTHS[ts[3:6]]}-{ts[:2]} {ts[12:20]}"
+    return ""
+
+
+def _query_tokens(query: str) -> list[tuple[str, bytes]]:
+    """(role, token) pairs a matching line must contain: interior runs exactly, edge runs as suffix/prefix/substring."""
+    q, out = query.lower(), []
+    for m in _TOKEN.finditer(q):
+        at_start, at_end = m.start() == 0, m.end() == len(q)
+        role = "contains" if at_start and at_end else "suffix" if at_start else "prefix" if at_end else "exact"
+        out.append((role, m.group().encode("utf-8")))
+    return out
+
+
+class Query:
+    """The per-line test: the same conditions as search_logs / filter_by_level, plus a [since, until) window."""
+    def __init__(self, query: str = "", level: str | None = None, since: str | None = None, until: str | None = None):
+        self.text, self.needle = query, query.lower()
+        self.raw_needle = self.needle.encode("utf-8")
+        self.level = normalize_level(level) if level else None
+        self.since, self.until = (since or "").replace("T", " "), (until or "").replace("T", " ")
+        self.timed = bool(self.since or self.until)
+        tokens = _query_tokens(query)
+        # suffix / contains lookups scan a segment's whole token table; only use them when nothing cheaper narrows
+        self.tokens = [t for t in tokens if t[0] in ("exact", "prefix")] or tokens
+
+    def match(self, raw: bytes) -> LogEntry | None:
+        # an ASCII line lowercases the same as bytes or str, so it can be rejected before decoding and parsing
+        if self.raw_needle and raw.isascii() and self.raw_needle not in raw.lower(): return None
+        line = raw.decode("utf-8", errors="replace").strip()
+        if not line: return None
+        ts, level, msg = parse_fields(line)
+        if self.level and level != self.level: return None
+        if self.needle and self.needle not in msg.lower(): return None
+        if self.timed:
+            key = ts_key(ts)
+            if not key or key < self.since or (self.until and key >= self.until): return None
+        return LogEntry(timestamp=ts, level=level, message=msg, raw=line)
+
+
+def _lines(data: bytes, needle: bytes = b"") -> Iterator[bytes]:
+    """Non-empty lines of `data`; with a lowercased needle and ASCII data, only lines that contain it."""
+    if not needle or not data.isascii():
+        for m in _LINE.finditer(data): yield m.group()
+        return
+    low = data.lower(); pos = low.find(needle)
+    while pos >= 0:
+        m = _LINE.match(data, max(low.rfind(b"\n", 0, pos), low.rfind(b"\r", 0, pos)) + 1)
+        if m: yield m.group()
+        pos = low.find(needle, max(m.end() if m else 0, pos + 1))
+
+
+# ─── Building ───────────────────────────────────────────────────────
+
+def _complete_end(path: str, size: int) -> int:
+    """Offset just past the last newline — only complete lines get indexed."""
+    with open(path, "rb") as f:
+        pos = size
+        while pos > 0:
+            step = min(BLOCK_BYTES, pos); f.seek(pos - step)
+            i = f.read(step).rfind(b"\n")
+            if i >= 0: return pos - step + i + 1
+            pos -= step
+    return 0
+
+
+def _split(path: str, start: int, end: int, size: int) -> list[int]:
+    """Newline-aligned cut points from start to end, about `size` bytes apart."""
+    cuts = [start]
+    with open(path, "rb") as f:
+        while cuts[-1] + size < end:
+            f.seek(cuts[-1] + size); f.readline()
+            if f.tell() >= end: break
+            cuts.append(f.tell())
+    return cuts + [end]
+
+
+def _build_segment(path: str, start: int, end: int, out: str) -> dict:
+    """Index [start, end) of the log into the segment file `out`; returns its meta entry."""
+    block_offsets = _split(path, start, end, BLOCK_BYTES)
+    postings: dict[str, object] = {}  # token -> block id, or array of ids once seen in a second block
+    levels: dict[str, array] = {}
+    tmin, tmax = bytearray(), bytearray()
+    with open(path, "rb") as f:
+        f.seek(start)
+        for b in range(len(block_offsets) - 1):
+            data = f.read(block_offsets[b + 1] - block_offsets[b])
+            for tok in set(_TOKEN.findall(data.decode("utf-8", errors="replace").lower())):
+                ids = postings.get(tok)
+                if ids is None: postings[tok] = b
+                elif type(ids) is int: postings[tok] = array("I", (ids, b))
+                else: ids.append(b)
+            stamps, base = set(), block_offsets[b] - start
+            for m in _LINE.finditer(data):
+                line = m.group().decode("utf-8", errors="replace").strip()
+                if not line: continue
+                ts, level, _ = parse_fields(line)
+                if level:
+                    offs = levels.get(level)
+                    if offs is None: offs = levels[level] = array("I")
+                    offs.append(base + m.start())
+                if ts: stamps.add(ts)
+            keys = [k for k in map(ts_key, stamps) if k]
+            tmin += min(keys).encode() if keys else _NO_TIME; tmax += max(keys).encode() if keys else _NO_TIME
+    tokens = sorted(t.encode("utf-8") for t in postings)
+    blob, tok_off, post_off, post = bytearray(), array("I", [0]), array("I", [0]), array("I")
+    for t in tokens:
+        blob += t + b"\n"; tok_off.append(len(blob))
+        ids = postings[t.decode("utf-8")]
+        if type(ids) is int: post.append(ids)
+        else: post.extend(ids)
+        post_off.append(len(post))
+    sections = {"blocks": array("Q", block_offsets).tobytes(), "tokens": bytes(blob), "tok_off": tok_off.tobytes(),
+                "post_off": post_off.tobytes(), "postings": post.tobytes(), "tmin": bytes(tmin), "tmax": bytes(tmax)}
+    sections.update({f"level:{lv}": offs.tobytes() for lv, offs in levels.items()})
+    layout, pos = {}, 0
+    with open(out, "wb") as f:
+        for name, data in sections.items():
+            f.write(data); layout[name] = [pos, len(data)]; pos += len(data)
+    return {"file": os.path.basename(out), "start": start, "end": end, "blocks": len(block_offsets) - 1,
+            "tokens": len(tokens), "levels": {lv: len(o) for lv, o in levels.items()}, "sections": layout}
+
+
+# ─── Reading ────────────────────────────────────────────────────────
+
+class Segment:
+    """One mmapped segment file; sections are zero-copy views into it."""
+    def __init__(self, directory: str, meta: dict):
+        self.meta, self.start, self.end, self.nblocks = meta, meta["start"], meta["end"], meta["blocks"]
+        self._file = open(os.path.join(directory, meta["file"]), "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []; self._levels: dict[str, memoryview | None] = {}
+        self.blocks = self._section("blocks", "Q"); self.tokens = self._section("tokens")
+        self.tok_off = self._section("tok_off", "I"); self.post_off = self._section("post_off", "I")
+        self.postings = self._section("postings", "I"); self.tmin = self._section("tmin"); self.tmax = self._section("tmax")
+
+    def _section(self, name: str, fmt: str | None = None) -> memoryview:
+        pos, size = self.meta["sections"][name]
+        view = memoryview(self._mm)[pos:pos + size]
+        view = view.cast(fmt) if fmt else view
+        self._views.append(view)
+        return view
+
+    def close(self) -> None:
+        for v in self._views: v.release()
+        self._views.clear()
+        self._mm.close()
+        self._file.close()
+
+    def _token(self, i: int) -> bytes: return bytes(self.tokens[self.tok_off[i]:self.tok_off[i + 1] - 1])
+
+    def _bisect(self, key: bytes) -> int:
+        lo, hi = 0, len(self.tok_off) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._token(mid) < key: lo = mid + 1
+            else: hi = mid
+        return lo
+
+    def _token_ids(self, role: str, tok: bytes) -> range | set[int]:
+        if role == "exact":
+            i = self._bisect(tok)
+            return range(i, i + 1) if i < len(self.tok_off) - 1 and self._token(i) == tok else range(0)
+        if role == "prefix":
+            return range(self._bisect(tok), self._bisect(tok + b"\xff"))  # 0xff never occurs in UTF-8
+        base, size = self.meta["sections"]["tokens"]  # suffix / contains: find it in the token blob
+        ids, pos = set(), self._mm.find(tok, base, base + size)
+        while pos >= 0:
+            rel = pos - base; i = bisect_right(self.tok_off, rel) - 1
+            if role == "contains" or rel + len(tok) == self.tok_off[i + 1] - 1: ids.add(i)
+            pos = self._mm.find(tok, pos + 1, base + size)
+        return ids
+
+    def candidate_blocks(self, query: Query) -> set[int] | None:
+        """Local block ids that can hold a match; None when nothing narrows the search."""
+        blocks = None
+        for role, tok in query.tokens:
+            found: set[int] = set()
+            for i in self._token_ids(role, tok): found.update(self.postings[self.post_off[i]:self.post_off[i + 1]])
+            blocks = found if blocks is None else blocks & found
+            if not blocks: return set()
+        if query.timed:
+            since, until = query.since.encode(), query.until.encode()
+            timed = set()
+            for b in range(self.nblocks) if blocks is None else blocks:
+                lo, hi = bytes(self.tmin[b * 19:b * 19 + 19]), bytes(self.tmax[b * 19:b * 19 + 19])
+                if lo == _NO_TIME or hi.rstrip() < since or (until and lo.rstrip() >= until): continue
+                timed.add(b)
+            blocks = timed
+        return blocks
+
+    def level_offsets(self, level: str) -> memoryview | None:
+        if level not in self._levels:
+            name = f"level:{level}"
+            self._levels[level] = self._section(name, "I") if name in self.meta["sections"] else None
+        return self._levels[level]
+
+
+# ─── Index ──────────────────────────────────────────────────────────
+
+def _head_hash(path: str, size: int) -> str:
+    with open(path, "rb") as f: return hashlib.sha1(f.read(min(size, HEAD_BYTES))).hexdigest()
+
+
+def scan(path: str, query: Query, start: int = 0, end: int | None = None) -> Iterator[LogEntry]:
+    """Matches in [start, end) of the log by reading every line — the no-index path."""
+    with open(path, "rb") as f:
+        f.seek(start); left = (os.fstat(f.fileno()).st_size if end is None else end) - start
+        carry = b""
+        while left > 0:
+            data = f.read(min(BLOCK_BYTES * 16, left))
+            if not data: break
+            left -= len(data); data = carry + data
+            cut = max(data.rfind(b"\n"), data.rfind(b"\r")) + 1 if left > 0 else len(data)
+            data, carry = data[:cut], data[cut:]
+            for raw in _lines(data, query.raw_needle):
+                e = query.match(raw)
+                if e: yield e
+        for raw in _lines(carry, query.raw_needle):
+            e = query.match(raw)
+            if e: yield e
+
+
+class LogIndex:
+    """The index of one log file; opening it brings the index up to date (see module docstring)."""
+    def __init__(self, path: str, update: bool = True, workers: int = 1):
+        self.path, self.dir = path, index_dir(path)
+        self.meta: dict = {}; self.segments: list[Segment] = []
+        self._log = None; self._mm = None
+        if update: self.update(workers)
+        else: self._load()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+    def _load(self) -> None:
+        self._close_segments()
+        try:
+            with open(os.path.join(self.dir, "meta.json")) as f: self.meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.meta = {}
+        if self.meta.get("version") != INDEX_VERSION: self.meta = {}
+        self.segments = [Segment(self.dir, m) for m in self.meta.get("segments", [])]
+
+    def _close_segments(self) -> None:
+        for seg in self.segments: seg.close()
+        self.segments = []
+        if self._mm is not None: self._mm.close(); self._log.close(); self._mm = self._log = None
+
+    def close(self) -> None: self._close_segments()
+
+    def update(self, workers: int = 1) -> int:
+        """Index lines appended since the last update (or everything, if the log was replaced); returns bytes indexed."""
+        self._load()
+        size = os.path.getsize(self.path)
+        meta, segs = self.meta, list(self.meta.get("segments", []))
+        fresh = (not meta or meta.get("size", 0) > size
+                 or meta.get("head") != _head_hash(self.path, min(meta.get("head_len", 0), size)))
+        if fresh: segs = []
+        end = _complete_end(self.path, size)
+        resume = segs[-1]["end"] if segs else 0
+        if end <= resume and not fresh: return 0
+        if segs and segs[-1]["end"] - segs[-1]["start"] < SEGMENT_BYTES // 2:
+            resume = segs.pop()["start"]  # re-cut a small trailing segment instead of piling up tiny ones
+        cuts = _split(self.path, resume, end, SEGMENT_BYTES) if end > resume else [resume]
+        jobs = [(self.path, a, b, os.path.join(self.dir, f"seg-{a:012d}-{b:012d}.bin")) for a, b in zip(cuts, cuts[1:])]
+        os.makedirs(self.dir, exist_ok=True)
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool: segs += pool.map(_build_segment, *zip(*jobs))
+        else:
+            segs += [_build_segment(*job) for job in jobs]
+        head_len = min(end, HEAD_BYTES)
+        new_meta = {"version": INDEX_VERSION, "size": end, "head_len": head_len, "head": _head_hash(self.path, head_len),
+                    "block_bytes": BLOCK_BYTES, "segments": segs}
+        self._close_segments()
+        tmp = os.path.join(self.dir, "meta.json.tmp")
+        with open(tmp, "w") as f: json.dump(new_meta, f)
+        os.replace(tmp, os.path.join(self.dir, "meta.json"))
+        keep = {s["file"] for s in segs} | {"meta.json"}
+        for name in os.listdir(self.dir):
+            if name not in keep: os.remove(os.path.join(self.dir, name))
+        self._load()
+        return end - resume
+
+    def _log_map(self):
+        if self._mm is None:
+            self._log = open(self.path, "rb")
+            self._mm = mmap.mmap(self._log.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def search(self, query: str = "", level: str | None = None, since: str | None = None, until: str | None = None) -> Iterator[LogEntry]:
+        """Matching lines in file order; the same results as scanning the whole log.
+
+        Exhaust or close() the iterator before closing the index — a suspended one holds views of the mmapped log.
+        """
+        q = Query(query, level, since, until)
+        for seg in self.segments: yield from self._search_segment(seg, q)
+        indexed = self.meta.get("size", 0)
+        if os.path.getsize(self.path) > indexed: yield from scan(self.path, q, indexed)  # not indexed yet
+
+    def _search_segment(self, seg: Segment, q: Query) -> Iterator[LogEntry]:
+        blocks = seg.candidate_blocks(q)
+        if blocks is not None and not blocks: return
+        mm = self._log_map()
+        if q.level:
+            offs = seg.level_offsets(q.level)
+            if offs is None: return
+            ranges = [(0, len(offs))] if blocks is None else [
+                (bisect_left(offs, seg.blocks[b] - seg.start), bisect_left(offs, seg.blocks[b + 1] - seg.start)) for b in sorted(blocks)]
+            for lo, hi in ranges:
+                for i in range(lo, hi):
+                    e = q.match(_LINE.match(mm, seg.start + offs[i]).group())
+                    if e: yield e
+            return
+        for b in range(seg.nblocks) if blocks is None else sorted(blocks):
+            for raw in _lines(mm[seg.blocks[b]:seg.blocks[b + 1]], q.raw_needle):
+                e = q.match(raw)
+                if e: yield e
+
+    def stats(self) -> dict:
+        levels: dict[str, int] = {}
+        for s in self.meta.get("segments", []):
+            for lv, n in s["levels"].items(): levels[lv] = levels.get(lv, 0) + n
+        files = [os.path.join(self.dir, n) for n in os.listdir(self.dir)] if os.path.isdir(self.dir) else []
+        return {"indexed_bytes": self.meta.get("size", 0), "segments": len(self.segments),
+                "blocks": sum(s.nblocks for s in self.segments), "index_bytes": sum(map(os.path.getsize, files)),
+                "levels": dict(sorted(levels.items(), key=lambda kv: -kv[1]))}
@@ -0,0 +1,220 @@
+"""Streaming log analysis — lazy readers, bounded aggregation, parallel files and follow mode.
+
+Nothing here holds a whole log in memory: files (plain or gzip) are read in blocks of
+lines, each block is parsed and folded into an `Aggregator` (exact level counts, a
+bounded `TopK` of messages, the first few errors/warnings), and aggregators from
+several files — or byte ranges of one big plain file — merge in order. The result is
+the same LogAnalysis `analyze_logs` returns, except that errors/warnings are samples.
+"""
+from __future__ import annotations
+import gzip, heapq, io, os, sys, time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+
+from agent.analyzer import LogAnalysis, LogEntry, normalize_level, parse_fields
+
+BLOCK_BYTES = 1 << 20     # read granularity
+RANGE_BYTES = 64 << 20    # plain files above this are split into byte ranges for the process pool
+TOP_CAPACITY = 10_000     # distinct messages TopK tracks
+SAMPLE = 5                # errors / warnings kept as LogEntry
+
+
+# ─── Readers ────────────────────────────────────────────────────────
+
+def is_gzip(path: str) -> bool:
+    with open(path, "rb") as f: return f.read(2) == b"\x1f\x8b"
+
+
+def open_text(path: str) -> io.TextIOBase:
+    """A text stream over a plain or gzip file ("-" = stdin); undecodable bytes are replaced."""
+    if path == "-": return sys.stdin
+    if is_gzip(path): return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def read_blocks(path: str) -> Iterator[list[str]]:
+    """Lists of lines (about BLOCK_BYTES each) from a whole file."""
+    f = open_text(path)
+    try:
+        while True:
+            lines = f.readlines(BLOCK_BYTES)
+            if not lines: return
+            yield lines
+    finally:
+        if f is not sys.stdin: f.close()
+
+
+def read_range(path: str, start: int, end: int) -> Iterator[list[str]]:
+    """Lines that *start* in [start, end) of a plain file, so adjacent ranges never split or repeat a line."""
+    with open(path, "rb") as f:
+        if start:
+            f.seek(start - 1)
+            if f.read(1) != b"\n": f.readline()  # this partial line belongs to the previous range
+        pos = f.tell()
+        while pos < end:
+            data = f.read(min(BLOCK_BYTES, end - pos))
+            if not data: break
+            pos += len(data)
+            if not data.endswith(b"\n"):
+                tail = f.readline()  # finish the last line, even past `end`
+                data += tail; pos += len(tail)
+            # split like universal-newline text mode (\n, \r\n, \r), not str.splitlines (which also splits on \f, \u2028, ...)
+            yield data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+
+def split_file(path: str, range_bytes: int = RANGE_BYTES) -> list[tuple[str, int | None, int | None]]:
+    """Jobs for one file: byte ranges of a large plain file, else the whole file as (path, None, None)."""
+    if path == "-" or is_gzip(path): return [(path, None, None)]
+    size = os.path.getsize(path)
+    if size <= range_bytes: return [(path, None, None)]
+    return [(path, s, min(s + range_bytes, size)) for s in range(0, size, range_bytes)]
+
+
+# ─── Aggregation ────────────────────────────────────────────────────
+
+class TopK:
+    """Approximate most-common counter in bounded memory.
+
+    Holds at most 2 x `capacity` keys; on overflow the least frequent half is dropped and
+    the largest count dropped is added to `error`. A key can be dropped again at every
+    later overflow, losing at most that overflow's largest dropped count each time, so the
+    sum is the bound: a reported count is a lower bound and the true count is at most
+    count + error. Keys never dropped are exact (error stays 0 while the stream has fewer
+    than 2 x capacity distinct keys).
+    """
+    def __init__(self, capacity: int = TOP_CAPACITY):
+        self.capacity = capacity; self.counts = Counter(); self.error = 0
+
+    def update(self, keys: Iterable) -> None:
+        self.counts.update(keys)
+        if len(self.counts) > 2 * self.capacity: self._prune()
+
+    def _prune(self) -> None:
+        keep = heapq.nlargest(self.capacity + 1, self.counts.items(), key=lambda kv: kv[1])
+        self.error += keep.pop()[1]  # the largest count that gets dropped this time
+        self.counts = Counter(dict(keep))
+
+    def merge(self, other: "TopK") -> None:
+        self.counts.update(other.counts); self.error += other.error
+        if len(self.counts) > 2 * self.capacity: self._prune()
+
+    def most_common(self, n: int) -> list[tuple]: return self.counts.most_common(n)
+
+
+class Aggregator:
+    """Folds parsed lines into counts; picklable and mergeable, so partial results can come from other processes."""
+    def __init__(self, level: str | None = None, capacity: int = TOP_CAPACITY, sample: int = SAMPLE):
+        self.level = normalize_level(level) if level else None
+        self.sample = sample
+        self.total = 0; self.levels = Counter(); self.top = TopK(capacity)
+        self.errors: list[LogEntry] = []; self.warnings: list[LogEntry] = []
+        self.first_ts = ""; self.last_ts = ""
+
+    def add_lines(self, lines: Iterable[str]) -> None:
+        only, sample = self.level, self.sample
+        levels, messages, last_ts = [], [], ""
+        for raw in lines:
+            line = raw.strip()
+            if not line: continue
+            ts, level, msg = parse_fields(line)
+            if only is not None and level != only: continue
+            self.total += 1
+            if level:
+                levels.append(level)
+                if level == "ERROR" and len(self.errors) < sample: self.errors.append(LogEntry(ts, level, msg, raw=line))
+                elif level == "WARNING" and len(self.warnings) < sample: self.warnings.append(LogEntry(ts, level, msg, raw=line))
+            if msg: messages.append(msg[:80])
+            if ts:
+                if not self.first_ts: self.first_ts = ts
+                last_ts = ts
+        if last_ts: self.last_ts = last_ts
+        self.levels.update(levels); self.top.update(messages)
+
+    def merge(self, other: "Aggregator") -> "Aggregator":
+        """Fold in the aggregate of input that came *after* this one."""
+        self.total += other.total; self.levels.update(other.levels); self.top.merge(other.top)
+        self.errors = (self.errors + other.errors)[:self.sample]; self.warnings = (self.warnings + other.warnings)[:self.sample]
+        self.first_ts = self.first_ts or other.first_ts; self.last_ts = other.last_ts or self.last_ts
+        return self
+
+    def result(self, top: int = 10) -> LogAnalysis:
+        return LogAnalysis(total_lines=self.total, levels=dict(self.levels.most_common()), errors=list(self.errors),
+                           warnings=list(self.warnings), top_messages=self.top.most_common(top),
+                           time_range=(self.first_ts, self.last_ts) if self.first_ts else ("", ""))
+
+
+# ─── Drivers ────────────────────────────────────────────────────────
+
+def _run_job(job: tuple, level: str | None, capacity: int) -> Aggregator:
+    path, start, end = job
+    agg = Aggregator(level, capacity)
+    for lines in (read_blocks(path) if start is None else read_range(path, start, end)): agg.add_lines(lines)
+    return agg
+
+
+def analyze_stream(lines: Iterable[str], level: str | None = None, capacity: int = TOP_CAPACITY) -> LogAnalysis:
+    """Analyze any iterable of lines in bounded memory."""
+    agg = Aggregator(level, capacity); block = []
+    for line in lines:
+        block.append(line)
+        if len(block) >= 10_000: agg.add_lines(block); block = []
+    agg.add_lines(block)
+    return agg.result()
+
+
+def analyze_files(paths: list[str], level: str | None = None, workers: int | None = 1,
+                  capacity: int = TOP_CAPACITY, range_bytes: int = RANGE_BYTES) -> LogAnalysis:
+    """Analyze files in order as if concatenated; with workers > 1, files and byte ranges run in a process pool."""
+    jobs = [job for path in paths for job in split_file(path, range_bytes)]
+    workers = workers or os.cpu_count() or 1
+    total = Aggregator(level, capacity)
+    if workers <= 1 or len(jobs) < 2 or "-" in paths:
+        for job in jobs: total.merge(_run_job(job, level, capacity))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            for part in pool.map(_run_job, jobs, [level] * len(jobs), [capacity] * len(jobs)): total.merge(part)
+    return total.result()
+
+
+class _Tail:
+    """One followed file; reopened when the path gets a new file (rotation) or shrinks below what was read (truncation)."""
+    def __init__(self, path: str, from_start: bool):
+        self.path = path; self.f = open(path, "rb")
+        if not from_start: self.f.seek(0, os.SEEK_END)
+        self.ino, self.partial = os.fstat(self.f.fileno()).st_ino, b""
+
+    def poll(self) -> list[str] | None:
+        """Complete lines from the next block; [] right after a reopen, None when nothing changed."""
+        chunk = self.f.read(BLOCK_BYTES)
+        if chunk:
+            lines = (self.partial + chunk).split(b"\n"); self.partial = lines.pop()
+            return [line.decode("utf-8", errors="replace") for line in lines]
+        try: st = os.stat(self.path)
+        except FileNotFoundError: return None  # mid-rotation; keep draining the old file
+        if st.st_ino != self.ino or st.st_size < self.f.tell():
+            self.f.close(); self.f = open(self.path, "rb"); self.ino, self.partial = st.st_ino, b""
+            return []
+        return None
+
+    def close(self) -> None: self.f.close()
+
+
+def follow(paths, interval: float = 0.5, from_start: bool = False, stop=None) -> Iterator[str]:
+    """Yield lines appended to one path or a list of them, like `tail -F`: survives truncation and rotation.
+
+    Files are polled in turn, one block each, so a busy file cannot starve the others.
+    `stop` is an optional callable; following ends once it returns True.
+    """
+    tails: list[_Tail] = []
+    try:
+        for path in [paths] if isinstance(paths, str) else paths: tails.append(_Tail(path, from_start))
+        while not (stop and stop()):
+            idle = True
+            for tail in tails:
+                lines = tail.poll()
+                if lines is not None:
+                    idle = False; yield from lines
+            if idle: time.sleep(interval)
+    finally:
+        for tail in tails: tail.close()
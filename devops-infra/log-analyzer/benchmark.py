@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark: read-everything parse_logs/analyze_logs vs. the streaming engine, with time and peak memory per mode.
+
+With --index: build time and size of the on-disk index, and query latency through it vs. a full scan.
+"""
+import argparse, gzip, itertools, json, os, random, resource, subprocess, sys, tempfile, time  # pragma: no cover
+sys.path.append(os.path.dirname(__file__))  # pragma: no cover
+
+LEVELS = ["INFO"] * 12 + ["DEBUG"] * 4 + ["WARNING", "WARNING", "ERROR", "CRITICAL"]  # pragma: no cover
+
+def make_log(path: str, mb: int):  # pragma: no cover
+    rng = random.Random(7); size, t = 0, 1_700_000_000  # pragma: no cover
+    with open(path, "w") as f:  # pragma: no cover
+        while size < mb << 20:  # pragma: no cover
+            block = []  # pragma: no cover
+            for _ in range(10_000):  # pragma: no cover
+                t += rng.random() * 0.01  # pragma: no cover
+                ts = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t))  # pragma: no cover
+                block.append(f"{ts}.{int(t * 1000) % 1000:03d}Z {rng.choice(LEVELS)} {rng.choice(['GET', 'POST'])} /api/v1/items/{rng.randint(1, 5000)} "  # pragma: no cover
+                             f"status={rng.choice([200, 200, 200, 404, 500])} user={rng.randint(1, 10 ** 6)} took={rng.randint(1, 900)}ms\n")
+            data = "".join(block); f.write(data); size += len(data)  # pragma: no cover
+
+def run(mode: str, paths: list[str], jobs: int):  # pragma: no cover
+    t0 = time.perf_counter()  # pragma: no cover
+    if mode == "old":  # pragma: no cover
+        from agent.analyzer import parse_logs, analyze_logs  # pragma: no cover
+        text = "".join(open(p).read() for p in paths)  # pragma: no cover
+        a = analyze_logs(parse_logs(text))  # pragma: no cover
+    else:
+        from agent.stream import analyze_files  # pragma: no cover
+        a = analyze_files(paths, workers=jobs if mode == "parallel" else 1)  # pragma: no cover
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # pragma: no cover
+    if mode == "parallel": peak += resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024  # pragma: no cover
+    print(json.dumps({"seconds": time.perf_counter() - t0, "peak_mb": peak, "lines": a.total_lines, "errors": a.to_dict()["errors"]}))  # pragma: no cover
+
+QUERIES = [("rare id", dict(query="user=424242 ")), ("item path", dict(query="/api/v1/items/4242 ")),  # pragma: no cover
+           ("level=error", dict(level="error")), ("10 min window", dict(since="{mid}", until="{mid10}")),
+           ("500s, error, 1 h", dict(query="status=500", level="error", since="{mid}", until="{mid60}"))]
+
+def run_index(path: str, jobs: int, scan_all: bool):  # pragma: no cover
+    from agent.index import LogIndex, Query, scan  # pragma: no cover
+    t0 = time.perf_counter()  # pragma: no cover
+    with LogIndex(path, workers=jobs) as idx: st = idx.stats()  # pragma: no cover
+    print(f"  build: {time.perf_counter() - t0:.1f} s, {st['segments']} segments, index {st['index_bytes'] / 2 ** 20:,.0f} MB "  # pragma: no cover
+          f"({st['index_bytes'] / st['indexed_bytes']:.1%} of the log)")
+    with open(path, "rb") as f:  # pragma: no cover
+        f.seek(os.path.getsize(path) // 2); f.readline(); mid = f.readline()[:16].decode().replace("T", " ")  # pragma: no cover
+    at = lambda minutes: time.strftime("%Y-%m-%d %H:%M", time.gmtime(time.mktime(time.strptime(mid, "%Y-%m-%d %H:%M")) + minutes * 60))  # pragma: no cover
+    print(f"  {'query':<18} {'first 100':>10} {'all hits':>10} {'hits':>11}")  # pragma: no cover
+    with LogIndex(path, update=False) as idx:  # pragma: no cover
+        for label, kw in QUERIES:  # pragma: no cover
+            kw = {k: v.format(mid=mid, mid10=at(10), mid60=at(60)) for k, v in kw.items()}  # pragma: no cover
+            t0 = time.perf_counter(); hits = idx.search(**kw); first = list(itertools.islice(hits, 100)); t1 = time.perf_counter()  # pragma: no cover
+            n = len(first) + sum(1 for _ in hits); t2 = time.perf_counter()  # pragma: no cover
+            print(f"  {label:<18} {(t1 - t0) * 1000:8.1f}ms {t2 - t0:9.2f}s {n:>11,}")  # pragma: no cover
+    for label, kw in QUERIES if scan_all else QUERIES[:1]:  # pragma: no cover
+        kw = {k: v.format(mid=mid, mid10=at(10), mid60=at(60)) for k, v in kw.items()}  # pragma: no cover
+        t0 = time.perf_counter(); n = sum(1 for _ in scan(path, Query(**kw)))  # pragma: no cover
+        print(f"  full scan, {label:<18} {time.perf_counter() - t0:9.2f}s {n:>11,}")  # pragma: no cover
+
+def main():  # pragma: no cover
+    p = argparse.ArgumentParser(description="Benchmark streaming log analysis")  # pragma: no cover
+    p.add_argument("--mb", type=int, default=200, help="Size of the generated log")  # pragma: no cover
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)  # pragma: no cover
+    p.add_argument("--index", action="store_true", help="Benchmark the on-disk index instead")  # pragma: no cover
+    p.add_argument("--scan-all", action="store_true", help="With --index: full-scan every query, not just the first")  # pragma: no cover
+    p.add_argument("--run", nargs="+", help=argparse.SUPPRESS)  # pragma: no cover
+    args = p.parse_args()  # pragma: no cover
+    if args.run: return run(args.run[0], args.run[1:], args.jobs)  # pragma: no cover
+    with tempfile.TemporaryDirectory() as d:  # pragma: no cover
+        path = os.path.join(d, "app.log"); make_log(path, args.mb)  # pragma: no cover
+        if args.index:  # pragma: no cover
+            print(f"📊 {os.path.getsize(path) / 2 ** 30:,.2f} GB log, {os.cpu_count()} CPU(s)")  # pragma: no cover
+            return run_index(path, args.jobs, args.scan_all)  # pragma: no cover
+        with open(path, "rb") as src, gzip.open(path + ".gz", "wb", compresslevel=1) as dst:  # pragma: no cover
+            while chunk := src.read(1 << 20): dst.write(chunk)  # pragma: no cover
+        print(f"📊 {os.path.getsize(path) / 2 ** 20:,.0f} MB log, {os.cpu_count()} CPU(s)")  # pragma: no cover
+        for label, mode, target in (("read all + parse_logs (old)", "old", path), ("streaming, 1 process", "stream", path),  # pragma: no cover
+                                    ("streaming, gzip input", "stream", path + ".gz"), (f"streaming, -j {args.jobs}", "parallel", path)):
+            out = subprocess.run([sys.executable, __file__, "-j", str(args.jobs), "--run", mode, target], capture_output=True, text=True, check=True)  # pragma: no cover
+            r = json.loads(out.stdout)  # pragma: no cover
+            print(f"  {label:<28} {r['seconds']:7.2f} s  peak {r['peak_mb']:7,.0f} MB  ({r['lines']:,} lines, {r['errors']:,} errors)")  # pragma: no cover
+
+if __name__ == "__main__": main()  # pragma: no cover
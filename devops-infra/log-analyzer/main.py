@@ -1,15 +1,50 @@
 #!/usr/bin/env python3
 import argparse, sys, os
 sys.path.append(os.path.dirname(__file__))
-from agent.analyzer import parse_logs, analyze_logs, filter_by_level, format_analysis_markdown
+from agent.analyzer import format_analysis_markdown
+from agent.stream import Aggregator, analyze_files, follow
+from agent.index import LogIndex, Query, scan
 def cmd_analyze(args):
-    text = sys.stdin.read() if args.file == "-" else open(args.file).read()
-    entries = parse_logs(text)
-    if args.level: entries = filter_by_level(entries, args.level)
-    a = analyze_logs(entries)
+    files = [args.file] if isinstance(args.file, str) else (args.file or ["-"])
+    if getattr(args, "follow", False): return cmd_follow(files, args.level)
+    a = analyze_files(files, level=args.level, workers=getattr(args, "jobs", 1))
     print(format_analysis_markdown(a))
+def cmd_follow(paths, level=None, **kw):
+    """Print matching lines as they are appended to any of the files; the summary of everything seen is printed on Ctrl-C."""
+    paths = [paths] if isinstance(paths, str) else list(paths)
+    if "-" in paths: sys.exit("--follow needs files, not stdin")
+    agg = Aggregator(level)
+    try:
+        for line in follow(paths, **kw):
+            seen = agg.total; agg.add_lines([line])
+            if agg.total > seen: print(line, flush=True)
+    except KeyboardInterrupt: pass
+    print(format_analysis_markdown(agg.result()))
+def cmd_search(args):
+    """Print matching raw lines; uses (and refreshes) the on-disk index unless --no-index."""
+    q = Query(args.query, args.level, args.since, args.until)
+    with LogIndex(args.file, update=not args.no_index, workers=args.jobs or os.cpu_count() or 1) as idx:
+        hits = scan(args.file, q) if args.no_index else idx.search(args.query, args.level, args.since, args.until)
+        try:
+            for n, e in enumerate(hits):
+                if args.limit and n >= args.limit: break
+                print(e.raw)
+        finally: hits.close()  # a suspended search still holds views of the mmapped log
+def cmd_index(args):
+    with LogIndex(args.file, update=False) as idx:
+        added = idx.update(args.jobs or os.cpu_count() or 1); st = idx.stats()
+    print(f"Indexed {added:,} new bytes — {st['indexed_bytes']:,} bytes in {st['segments']} segments, index {st['index_bytes']:,} bytes")
 def main():
     p = argparse.ArgumentParser(description="Log Analyzer"); s = p.add_subparsers(dest="command", required=True)
-    a = s.add_parser("analyze"); a.add_argument("file", nargs="?", default="-"); a.add_argument("--level"); a.set_defaults(func=cmd_analyze)
+    a = s.add_parser("analyze"); a.add_argument("file", nargs="*", default=["-"], help="Log files, plain or .gz (default: stdin)"); a.add_argument("--level")
+    a.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes for multiple/large files (0 = one per CPU)")
+    a.add_argument("-f", "--follow", action="store_true", help="Tail the files, printing matching lines as they arrive"); a.set_defaults(func=cmd_analyze)
+    q = s.add_parser("search", help="Find lines through the on-disk index (built/updated next to the log)")
+    q.add_argument("file"); q.add_argument("query", nargs="?", default=""); q.add_argument("--level")
+    q.add_argument("--since", help="Inclusive start, e.g. 2024-01-15T10:00"); q.add_argument("--until", help="Exclusive end")
+    q.add_argument("--limit", type=int, default=0); q.add_argument("--no-index", action="store_true", help="Scan the whole file instead")
+    q.add_argument("-j", "--jobs", type=int, default=1); q.set_defaults(func=cmd_search)
+    i = s.add_parser("index", help="Build or update the index of a log file"); i.add_argument("file")
+    i.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes (0 = one per CPU)"); i.set_defaults(func=cmd_index)
     args = p.parse_args(); args.func(args)
 if __name__ == "__main__": main()
@@ -0,0 +1,141 @@
+"""Tests for the on-disk log index."""
+import sys, os, random, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from agent.analyzer import parse_logs, filter_by_level, search_logs
+from agent import index
+from agent.index import LogIndex, Query, index_dir, scan, ts_key, _query_tokens
+
+def make_log(n=4000, seed=7):
+    rng = random.Random(seed); out = []
+    for i in range(n):
+        r = rng.random()
+        ts = f"2024-01-{15 + i // 1000:02d}T{i // 60 % 24:02d}:{i % 60:02d}:00Z"
+        if r < 0.6: out.append(f"{ts} {rng.choice(['INFO', 'ERROR', 'warn', 'DEBUG'])} req-{rng.randint(0, 500)} user=ü{rng.randint(0, 9)} done")
+        elif r < 0.7: out.append(f"[2024-01-1{rng.randint(5, 8)} 10:30:00] WARNING disk {rng.randint(0, 99)}% full")
+        elif r < 0.75: out.append("   ")
+        elif r < 0.8: out.append(f"{rng.randint(10, 28)}/Jan/2024:10:00:00 +0000 GET /api/{rng.randint(0, 20)} 200")
+        elif r < 0.85: out.append("Jan 15 10:00:00 host sshd[12]: Failed password")
+        else: out.append(f"unstructured Error number {rng.randint(0, 300)}")
+    return "\n".join(out) + "\n"
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(index, "BLOCK_BYTES", 2048); monkeypatch.setattr(index, "SEGMENT_BYTES", 64 << 10)
+
+@pytest.fixture
+def log(tmp_path):
+    text = make_log(); path = tmp_path / "app.log"; path.write_text(text); return text, str(path)
+
+def expected(text, query="", level=None):
+    entries = parse_logs(text)
+    return [vars(e) for e in search_logs(filter_by_level(entries, level) if level else entries, query)]
+
+def found(idx, *a, **kw): return [vars(e) for e in idx.search(*a, **kw)]
+
+QUERIES = ["", "req-42 ", "req-4", "-42", "user=ü3", "ERROR", "disk 5", "full", "Failed password", "/api/1", "nothing here", "e"]
+
+@pytest.mark.parametrize("level", [None, "error", "warn", "info", "debug", "critical"])
+def test_matches_full_scan(log, level):
+    text, path = log
+    with LogIndex(path) as idx:
+        assert idx.stats()["segments"] > 1 and idx.stats()["blocks"] > 10
+        for q in QUERIES: assert found(idx, q, level=level) == expected(text, q, level), q
+
+def test_scan_matches_full_scan(log):
+    text, path = log
+    for q in QUERIES[:5]: assert [vars(e) for e in scan(path, Query(q))] == expected(text, q)
+
+def test_scan_past_end_of_file_keeps_partial_last_line(tmp_path):
+    text = "2024-01-15T10:00:00Z ERROR boom\n2024-01-15T10:00:01Z ERROR tail without newline"
+    path = tmp_path / "x.log"; path.write_text(text)
+    assert [vars(e) for e in scan(str(path), Query("tail"), 0, len(text) + 100)] == expected(text, "tail") != []
+
+def test_complete_end_skips_long_partial_line(tmp_path):
+    path = tmp_path / "x.log"; path.write_text("done\n" + "x" * 5000)  # the partial line spans several blocks
+    assert index._complete_end(str(path), 5005) == 5
+    path.write_text("x" * 5000)
+    assert index._complete_end(str(path), 5000) == 0
+
+def test_query_tokens():
+    assert _query_tokens("req-42 done") == [("suffix", b"req"), ("prefix", b"done")]
+    assert _query_tokens("a timeout in db") == [("exact", b"timeout")]
+    assert _query_tokens("Timeout") == [("contains", b"timeout")]
+    assert _query_tokens("ab") == []
+
+def test_narrows_to_candidate_blocks(log):
+    _, path = log
+    with LogIndex(path) as idx:
+        seg = idx.segments[0]
+        assert seg.candidate_blocks(Query("nothing here")) == set()
+        assert seg.candidate_blocks(Query("")) is None
+        assert 0 < len(seg.candidate_blocks(Query("req-417 "))) < seg.nblocks
+
+def test_ts_key():
+    assert ts_key("2024-01-15T10:30:00Z") == ts_key("2024-01-15 10:30:00") == "2024-01-15 10:30:00"
+    assert ts_key("15/Jan/2024:10:30:00 +0000") == "2024-01-15 10:30:00"
+    assert ts_key("Jan 15 10:30:00") == ""
+
+def test_time_window(log):
+    text, path = log
+    want = [vars(e) for e in parse_logs(text) if ts_key(e.timestamp) and "2024-01-16 05" <= ts_key(e.timestamp) < "2024-01-17"]
+    with LogIndex(path) as idx:
+        assert found(idx, since="2024-01-16T05", until="2024-01-17") == want
+        assert found(idx, "done", level="error", since="2024-01-16T05", until="2024-01-17") == \
+            [e for e in want if e["level"] == "ERROR" and "done" in e["message"]]
+        assert found(idx, since="2030-01-01") == []
+
+def test_incremental_append(log):
+    text, path = log
+    with LogIndex(path): pass
+    more = make_log(500, seed=8)
+    with open(path, "a") as f: f.write(more + "2024-02-01T00:00:00Z ERROR partial line without newl")
+    with LogIndex(path, update=False) as idx:  # stale index: the tail is scanned
+        assert found(idx, "req-1", level="error") == expected(open(path).read(), "req-1", "error")
+    with LogIndex(path) as idx:
+        assert idx.stats()["indexed_bytes"] == len((text + more).encode())
+        segs = {s["file"] for s in idx.meta["segments"]}
+        assert set(os.listdir(index_dir(path))) == segs | {"meta.json"}
+        full = open(path).read()
+        for q in QUERIES: assert found(idx, q, level="error") == expected(full, q, "error"), q
+        assert found(idx, "partial line") == expected(full, "partial line") != []
+
+def test_small_trailing_segment_is_recut(tmp_path):
+    path, first, more = tmp_path / "small.log", make_log(100), make_log(100, seed=8)
+    path.write_text(first)
+    with LogIndex(str(path)) as idx: assert len(idx.meta["segments"]) == 1
+    with open(path, "a") as f: f.write(more)
+    with LogIndex(str(path)) as idx:
+        assert [(s["start"], s["end"]) for s in idx.meta["segments"]] == [(0, len((first + more).encode()))]
+        assert set(os.listdir(index_dir(str(path)))) == {idx.meta["segments"][0]["file"], "meta.json"}
+        assert found(idx, "req-4") == expected(first + more, "req-4")
+
+def test_rotation_rebuilds(log):
+    _, path = log
+    with LogIndex(path): pass
+    text = make_log(300, seed=9)
+    with open(path, "w") as f: f.write(text)
+    with LogIndex(path) as idx:
+        assert idx.stats()["indexed_bytes"] == len(text.encode())
+        assert found(idx, "req-4", level="info") == expected(text, "req-4", "info")
+
+def test_up_to_date_is_noop(log):
+    _, path = log
+    with LogIndex(path) as idx: assert idx.update() == 0
+
+def test_parallel_build_matches(log):
+    text, path = log
+    with LogIndex(path, workers=2) as idx: assert found(idx, "user=ü3", level="warn") == expected(text, "user=ü3", "warn")
+
+def test_empty_and_crlf(tmp_path):
+    path = tmp_path / "x.log"; path.write_bytes(b"")
+    with LogIndex(str(path)) as idx: assert found(idx) == []
+    path.write_bytes(b"2024-01-15T10:00:00Z ERROR boom\r\n2024-01-15T10:00:01Z INFO ok\r\n")
+    with LogIndex(str(path)) as idx:
+        assert found(idx, "boom", level="error") == expected("2024-01-15T10:00:00Z ERROR boom\n2024-01-15T10:00:01Z INFO ok\n", "boom", "error")
+
+def test_lines_prefilter():
+    data = b"a FOO b\r\nfoo foo\n\nbar\rxfoox\nno\n"
+    assert list(index._lines(data)) == [b"a FOO b", b"foo foo", b"bar", b"xfoox", b"no"]
+    assert list(index._lines(data, b"foo")) == [b"a FOO b", b"foo foo", b"xfoox"]
+    assert list(index._lines(data, b"\nbar")) == []
+    assert list(index._lines("ü foo\nbar".encode(), b"foo")) == ["ü foo".encode(), b"bar"]  # non-ASCII: no narrowing
@@ -39,3 +39,14 @@ def test_main_entry_point(tmp_path):
         with patch("builtins.print"):
             with patch.dict("sys.modules", {"__main__": None}):
                 runpy.run_module("main", run_name="__main__", alter_sys=True)
+
+def test_main_search_and_index(tmp_path, capsys):
+    f = tmp_path / "app.log"
+    f.write_text("2024-01-01 10:00:00 INFO Started\n2024-01-01 10:01:00 ERROR Connection failed\n2024-01-02 10:01:00 ERROR Disk failed\n")
+    with patch("sys.argv", ["main.py", "index", str(f)]): main()
+    assert "in 1 segments" in capsys.readouterr().out and os.path.isdir(str(f) + ".idx")
+    for extra in ([], ["--no-index"]):
+        with patch("sys.argv", ["main.py", "search", str(f), "failed", "--level", "error", "--until", "2024-01-02"] + extra): main()
+        assert capsys.readouterr().out == "2024-01-01 10:01:00 ERROR Connection failed\n"
+    with patch("sys.argv", ["main.py", "search", str(f), "--limit", "1"]): main()
+    assert capsys.readouterr().out == "2024-01-01 10:00:00 INFO Started\n"
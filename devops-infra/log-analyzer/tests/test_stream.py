@@ -0,0 +1,142 @@
+"""Tests for the streaming analysis engine."""
+import sys, os, gzip, random, threading, time, pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unittest.mock import patch
+from agent.analyzer import parse_logs, analyze_logs, filter_by_level, format_analysis_markdown
+from agent.stream import TopK, Aggregator, analyze_files, analyze_stream, read_range, split_file, follow, _Tail
+
+def make_log(n=3000, seed=1):
+    rng = random.Random(seed); out = []
+    for i in range(n):
+        r = rng.random()
+        if r < 0.7: out.append(f"2024-01-15T10:{i // 60 % 60:02d}:{i % 60:02d}Z {rng.choice(['INFO', 'ERROR', 'warn', 'DEBUG', 'err'])} request {rng.randint(0, 40)} done")
+        elif r < 0.8: out.append(f"[2024-01-15 10:30:00] WARNING disk {rng.randint(0, 5)}% ü")
+        elif r < 0.85: out.append("")
+        elif r < 0.9: out.append("01/Jan/2024:10:00:00+0000 GET /api 200")
+        else: out.append(f"unstructured Error number {rng.randint(0, 3)}")
+    return "\n".join(out) + "\n"
+
+def same(a, b):
+    key = lambda x: (x.total_lines, x.levels, list(x.levels), x.top_messages, x.time_range, x.to_dict(),
+                     [vars(e) for e in x.errors[:5]], [vars(e) for e in x.warnings[:5]])
+    return key(a) == key(b)
+
+@pytest.fixture
+def log(tmp_path):
+    text = make_log(); path = tmp_path / "app.log"; path.write_text(text); return text, str(path)
+
+def test_matches_analyze_logs(log):
+    text, path = log
+    assert same(analyze_files([path]), analyze_logs(parse_logs(text)))
+    assert same(analyze_stream(text.splitlines()), analyze_logs(parse_logs(text)))
+
+def test_level_filter(log):
+    text, path = log
+    assert same(analyze_files([path], level="error"), analyze_logs(filter_by_level(parse_logs(text), "error")))
+
+@pytest.mark.parametrize("range_bytes", [1, 97, 4096])
+def test_byte_ranges_cover_every_line_once(log, range_bytes):
+    text, path = log
+    jobs = split_file(path, range_bytes)
+    lines = [l for _, s, e in jobs for block in read_range(path, s, e) for l in block if l]
+    assert lines == [l for l in text.split("\n") if l]
+    assert same(analyze_files([path], range_bytes=range_bytes * 10), analyze_logs(parse_logs(text)))
+
+def test_gzip_and_multiple_files_in_parallel(log, tmp_path):
+    text, path = log
+    gz = tmp_path / "old.log.gz"
+    with gzip.open(gz, "wt") as f: f.write(make_log(seed=2))
+    expected = analyze_logs(parse_logs(make_log(seed=2) + text))
+    assert same(analyze_files([str(gz), path], workers=2, range_bytes=5000), expected)
+
+def test_crlf_and_form_feed(tmp_path):
+    path = tmp_path / "w.log"; path.write_bytes(b"2024-01-15T10:00:00Z INFO a\x0cb\r\n2024-01-15T10:00:01Z ERROR c\r\n")
+    expected = analyze_logs(parse_logs(open(path).read()))
+    assert same(analyze_files([str(path)], range_bytes=10), expected) and analyze_files([str(path)]).levels == {"INFO": 1, "ERROR": 1}
+
+def test_errors_are_sampled_but_counted(tmp_path):
+    path = tmp_path / "e.log"; path.write_text("".join(f"2024-01-15T10:00:00Z ERROR e{i}\n" for i in range(50)))
+    a = analyze_files([str(path)])
+    assert len(a.errors) == 5 and a.to_dict()["errors"] == 50 and "**Errors:** 50" in format_analysis_markdown(a)
+
+def test_topk_exact_below_capacity():
+    t = TopK(capacity=10); t.update(["a"] * 5 + ["b"] * 3 + list("cdefgh"))
+    assert t.most_common(2) == [("a", 5), ("b", 3)] and t.error == 0
+
+def test_topk_bounded_with_error():
+    t = TopK(capacity=5); rng = random.Random(0)
+    for _ in range(50): t.update(["hot"] * 20 + [f"noise{rng.randint(0, 10 ** 6)}" for _ in range(20)])
+    assert len(t.counts) <= 10 and t.most_common(1)[0] == ("hot", 1000) and t.error >= 1
+
+def test_aggregator_merge_order():
+    a, b = Aggregator(), Aggregator()
+    a.add_lines(["2024-01-15T10:00:00Z INFO x"]); b.add_lines(["2024-01-15T11:00:00Z INFO y"])
+    assert a.merge(b).result().time_range == ("2024-01-15T10:00:00Z", "2024-01-15T11:00:00Z")
+
+def test_topk_error_bounds_keys_dropped_repeatedly():
+    t = TopK(capacity=1)
+    t.update(["x"] * 3 + ["hot"] * 5 + ["y"])  # x (3) is dropped...
+    t.update(["x"] * 3 + ["hot"] * 5 + ["z"])  # ...and dropped again (3 more)
+    t.update(["x"])
+    assert t.counts["x"] == 1 and t.counts["x"] + t.error >= 7  # the true count of x is 7
+
+def test_follow_several_files(tmp_path):
+    a, b = tmp_path / "a.log", tmp_path / "b.log"; a.write_text("old a\n"); b.write_text("")
+    got = []
+    def writer():
+        time.sleep(0.1)
+        with open(b, "a") as f: f.write("from b\n")
+        with open(a, "a") as f: f.write("from a\n")
+        time.sleep(0.1); b.write_text("b2\n")  # shorter than before: truncated
+    threading.Thread(target=writer).start()
+    for line in follow([str(a), str(b)], interval=0.02, stop=lambda: len(got) >= 3):
+        got.append(line)
+    assert sorted(got) == ["b2", "from a", "from b"]
+
+def test_follow_appends_and_rotation(tmp_path):
+    path = tmp_path / "live.log"; path.write_text("old line\n")
+    got = []
+    def writer():
+        time.sleep(0.1)
+        with open(path, "a") as f: f.write("first\nsec"); f.flush(); time.sleep(0.1); f.write("ond\n")
+        time.sleep(0.1); os.rename(path, tmp_path / "live.log.1"); path.write_text("rotated\n")
+    threading.Thread(target=writer).start()
+    for line in follow(str(path), interval=0.02, stop=lambda: len(got) >= 3):
+        got.append(line)
+        if len(got) >= 3: break
+    assert got == ["first", "second", "rotated"]
+
+def test_tail_drains_old_file_while_path_is_missing(tmp_path):
+    path = tmp_path / "live.log"; path.write_text("a\n")
+    tail = _Tail(str(path), from_start=True)
+    assert tail.poll() == ["a"]
+    with open(path, "a") as f: f.write("last\n")
+    os.rename(path, tmp_path / "live.log.1")
+    assert tail.poll() == ["last"] and tail.poll() is None  # nothing at the path yet
+    path.write_text("new\n")
+    assert tail.poll() == [] and tail.poll() == ["new"]
+    tail.close()
+
+def test_main_follow(tmp_path, capsys):
+    from main import cmd_follow
+    path = tmp_path / "live.log"; path.write_text("")
+    lines = iter(["2024-01-15T10:00:00Z INFO skip", "2024-01-15T10:00:01Z ERROR boom"])
+    def fake_follow(p, **kw):
+        yield from lines
+        raise KeyboardInterrupt
+    with patch("main.follow", fake_follow): cmd_follow(str(path), "error")
+    out = capsys.readouterr().out
+    assert out.startswith("2024-01-15T10:00:01Z ERROR boom\n") and "**Errors:** 1" in out
+
+def test_main_follow_every_file(tmp_path):
+    from main import main
+    paths = [str(tmp_path / "a.log"), str(tmp_path / "b.log")]
+    with patch("main.follow", return_value=iter(())) as fake, patch("sys.argv", ["main", "analyze", *paths, "-f"]): main()
+    assert fake.call_args.args[0] == paths
+    with patch("sys.argv", ["main", "analyze", "-f"]), pytest.raises(SystemExit, match="not stdin"): main()
+
+def test_main_multiple_files(log, capsys):
+    from main import main
+    text, path = log
+    with patch("sys.argv", ["main", "analyze", path, path, "-j", "2"]): main()
+    assert f"**Total Lines:** {2 * len(parse_logs(text))}" in capsys.readouterr().out
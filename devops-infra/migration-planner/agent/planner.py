@@ -3,7 +3,8 @@ import json
 from typing import Optional, List
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_google_genai import ChatGoogleGenerativeAI
 from agent.models import MigrationPlan, BreakingChange, DataIntegrityCheck
 from config import config
@@ -0,0 +1,240 @@
+"""
+Asynchronous probing engine.
+
+One monitoring cycle checks every endpoint concurrently instead of one at a time:
+- Each host gets its own small httpx.AsyncClient pool, so connections to a host
+  are reused across that host's endpoints.
+- A global semaphore bounds the checks in flight; a per-host semaphore keeps one
+  host from receiving the whole burst at once.
+- SSL expiry is looked up with one TLS handshake per host and cached for a TTL,
+  instead of a handshake per URL per cycle.
+- LLM diagnosis and alerting run on DiagnosisQueue worker threads, off the
+  critical path of the cycle.
+"""
+import asyncio
+import queue
+import ssl
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import httpx
+
+DEFAULT_CONCURRENCY = 100
+DEFAULT_PER_HOST = 10
+DEFAULT_TIMEOUT = 10
+SSL_TIMEOUT = 5
+SSL_CACHE_TTL = 3600
+SSL_WARNING_DAYS = 30
+
+
+@dataclass
+class CheckResult:
+    endpoint: str
+    status_code: int
+    response_time: float
+    error: str = None
+    ssl_expiry_days: int = None
+    ssl_error: str = None
+
+    @property
+    def is_down(self):
+        return self.status_code == 0 or self.status_code >= 400
+
+    @property
+    def is_ssl_warning(self):
+        return self.ssl_expiry_days is not None and self.ssl_expiry_days < SSL_WARNING_DAYS
+
+    @property
+    def error_message(self):
+        """The HTTP error and the SSL error combined, as stored in MonitorResult.error_message."""
+        if not self.ssl_error:
+            return self.error
+        if self.error:
+            return f"{self.error} | SSL Error: {self.ssl_error}"
+        return f"SSL Error: {self.ssl_error}"
+
+    def to_row(self):
+        """Keyword arguments for storage.add_results."""
+        return {
+            "endpoint": self.endpoint,
+            "status_code": self.status_code,
+            "response_time": self.response_time,
+            "error_message": self.error_message,
+            "ssl_expiry_days": self.ssl_expiry_days,
+        }
+
+
+def host_key(url):
+    """(host, port) of a URL; the unit for connection limits and the SSL cache."""
+    parts = urlsplit(url if "//" in url else f"//{url}")
+    return parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80)
+
+
+class SSLCache:
+    """
+    Certificate expiry per (host, port).
+
+    A miss costs one TLS handshake; concurrent lookups of the same host share it.
+    Successful lookups are kept for `ttl` seconds and days-to-expiry is computed
+    at read time, so a cached entry never goes stale by more than the TTL.
+    Failed lookups are not cached, so the next cycle retries them.
+    """
+
+    def __init__(self, ttl=SSL_CACHE_TTL, timeout=SSL_TIMEOUT, context=None):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.context = context or ssl.create_default_context()
+        self.handshakes = 0
+        self._expiry = {}  # (host, port) -> (fetched_at, notAfter as epoch seconds)
+        self._pending = {}  # (host, port) -> Future of an in-flight handshake
+
+    async def get(self, host, port=443):
+        """
+        Returns:
+            days_to_expiry (int): Days until the certificate expires, or None on error.
+            error_message (str): Error message if any.
+        """
+        key = (host, port)
+        cached = self._expiry.get(key)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return self._days(cached[1]), None
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = asyncio.ensure_future(self._fetch(host, port))
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        expires, error = await asyncio.shield(pending)
+        if error:
+            return None, error
+        return self._days(expires), None
+
+    async def _fetch(self, host, port):
+        self.handshakes += 1
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=self.context, server_hostname=host), self.timeout
+            )
+        except asyncio.TimeoutError:
+            return None, f"TLS handshake with {host}:{port} timed out"
+        except Exception as e:
+            return None, str(e) or type(e).__name__
+        try:
+            expires = ssl.cert_time_to_seconds(writer.get_extra_info("peercert")["notAfter"])
+        except Exception as e:
+            return None, str(e) or type(e).__name__
+        finally:
+            writer.close()
+        self._expiry[(host, port)] = (time.monotonic(), expires)
+        return expires, None
+
+    @staticmethod
+    def _days(expires):
+        return int((expires - time.time()) // 86400)
+
+    def clear(self):
+        self._expiry.clear()
+
+
+class ProbeEngine:
+    """
+    Runs monitoring cycles. Keep one instance for the life of the monitor so the
+    SSL cache carries over from cycle to cycle.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT,
+                 ssl_cache=None, ssl_context=None, transport=None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ssl_context = ssl_context or httpx.create_ssl_context()  # shared, so a client per host stays cheap
+        self.ssl_cache = ssl_cache or SSLCache(context=ssl_context)
+        self.transport = transport  # an httpx transport; tests and the benchmark harness swap it
+
+    def run_cycle(self, endpoints):
+        """Check every endpoint once; returns CheckResults in the order of `endpoints`."""
+        return asyncio.run(self.check_all(endpoints))
+
+    async def check_all(self, endpoints):
+        in_flight = asyncio.Semaphore(self.concurrency)
+        hosts = {}  # (host, port) -> (client, semaphore)
+        for url in endpoints:
+            key = host_key(url)
+            if key not in hosts:
+                hosts[key] = (self._client(), asyncio.Semaphore(self.per_host))
+        try:
+            return await asyncio.gather(*(self.check(url, in_flight, *hosts[host_key(url)]) for url in endpoints))
+        finally:
+            await asyncio.gather(*(client.aclose() for client, _ in hosts.values()))
+
+    def _client(self):
+        # One small pool per host: connections are reused across that host's endpoints, and
+        # httpcore's pool scheduling (which scans every queued request x connection) stays cheap.
+        limits = httpx.Limits(max_connections=self.per_host, max_keepalive_connections=self.per_host)
+        return httpx.AsyncClient(timeout=self.timeout, limits=limits, follow_redirects=True,
+                                 verify=self.ssl_context, transport=self.transport)
+
+    async def check(self, url, in_flight, client, host_slots):
+        ssl_days = ssl_error = None
+        async with in_flight:
+            async with host_slots:
+                status_code, response_time, error = await self._get(client, url)
+            if url.lower().startswith("https://"):
+                ssl_days, ssl_error = await self.ssl_cache.get(*host_key(url))
+        return CheckResult(url, status_code, response_time, error, ssl_days, ssl_error)
+
+    @staticmethod
+    async def _get(client, url):
+        """Same contract as monitor.check_endpoint: (status_code, response_time, error_message)."""
+        start_time = time.perf_counter()
+        try:
+            response = await client.get(url)
+            return response.status_code, time.perf_counter() - start_time, None
+        except Exception as e:
+            return 0, time.perf_counter() - start_time, str(e) or type(e).__name__
+
+
+class DiagnosisQueue:
+    """
+    Runs `handler(*item)` for submitted items on worker threads.
+
+    Used for the slow, blocking follow-ups of a failed check (LLM diagnosis,
+    email/webhook alerts) so they never hold up the next cycle. Handler errors
+    are printed and do not stop the worker.
+    """
+
+    def __init__(self, handler, workers=2):
+        self.handler = handler
+        self._queue = queue.Queue()
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(max(1, workers))]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, *item):
+        self._queue.put(item)
+
+    def pending(self):
+        return self._queue.unfinished_tasks
+
+    def join(self):
+        """Block until everything submitted so far has been handled."""
+        self._queue.join()
+
+    def close(self):
+        """Finish the queued work, then stop the workers."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self.handler(*item)
+            except Exception as e:
+                print(f"Diagnosis worker error: {e}")
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,392 @@
+"""
+Time-series rollups and retention for monitor results.
+
+Raw checks are downsampled into minute, hour and day tables. Each rollup row holds, for
+one endpoint and one bucket, the check count, failures, latency sum/max, p50/p95/p99 and
+a mergeable LatencySketch, so coarser rollups are built from finer ones and any range can
+be answered without the raw rows:
+- `rollup()` is incremental: a watermark per resolution (monitor_rollup_state) records
+  how far it has rolled up, and only complete buckets are written.
+- `apply_retention()` deletes raw rows and fine rollups past their retention, but never
+  anything the next level has not rolled up yet. Day rollups are kept forever.
+- `get_uptime_stats()` and `get_latency_series()` split a time range into the coarsest
+  rolled-up buckets that fit it, and fall back to finer levels and raw rows only at
+  the edges and for the not yet rolled up tail. Past the retention of the finer levels,
+  ranges are answered at the finest resolution still kept.
+"""
+from datetime import datetime, timedelta
+import sys
+import os
+
+from sqlalchemy import Column, String, Integer, Float, DateTime, LargeBinary, Index, select, delete, insert, func
+from sqlalchemy.orm import declared_attr
+
+# Add the parent directory to sys.path to allow importing config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from config import RAW_RETENTION_DAYS, MINUTE_RETENTION_DAYS, HOUR_RETENTION_DAYS
+except ImportError:  # pragma: no cover
+    RAW_RETENTION_DAYS = 7  # pragma: no cover
+    MINUTE_RETENTION_DAYS = 2  # pragma: no cover
+    HOUR_RETENTION_DAYS = 90  # pragma: no cover
+
+from agent import storage
+from agent.storage import Base, MonitorResult
+from agent.sketch import LatencySketch
+
+RESOLUTIONS = ("minute", "hour", "day")  # finest first
+STEP = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1), "day": timedelta(days=1)}
+CHUNK = {"minute": timedelta(days=1), "hour": timedelta(days=7), "day": timedelta(days=90)}  # commit at least this often
+ROLLUP_DELAY = timedelta(seconds=60)  # a minute is rolled up once it ended this long ago
+INSERT_BATCH = 5000
+
+
+class RollupMixin:
+    endpoint = Column(String, primary_key=True)
+    bucket = Column(DateTime, primary_key=True)  # bucket start, UTC
+    count = Column(Integer, nullable=False)
+    failures = Column(Integer, nullable=False)
+    latency_sum = Column(Float, nullable=False)
+    latency_max = Column(Float, nullable=True)
+    p50 = Column(Float, nullable=True)
+    p95 = Column(Float, nullable=True)
+    p99 = Column(Float, nullable=True)
+    sketch = Column(LargeBinary, nullable=False)
+
+    @declared_attr
+    def __table_args__(cls):
+        # The primary key serves per-endpoint range scans and the bucket index all-endpoint ranges and
+        # retention; WITHOUT ROWID stores rows in the primary key itself instead of in a second copy
+        return (Index(f"ix_{cls.__tablename__}_bucket", "bucket"), {"sqlite_with_rowid": False})
+
+
+class MinuteRollup(RollupMixin, Base):
+    __tablename__ = 'monitor_rollup_minute'
+
+
+class HourRollup(RollupMixin, Base):
+    __tablename__ = 'monitor_rollup_hour'
+
+
+class DayRollup(RollupMixin, Base):
+    __tablename__ = 'monitor_rollup_day'
+
+
+class RollupState(Base):
+    __tablename__ = 'monitor_rollup_state'
+
+    resolution = Column(String, primary_key=True)
+    rolled_until = Column(DateTime, nullable=False)  # every bucket before this is rolled up
+
+
+ROLLUP_TABLES = {"minute": MinuteRollup, "hour": HourRollup, "day": DayRollup}
+
+Base.metadata.create_all(storage.engine)
+
+
+def floor_time(ts, resolution):
+    if resolution == "minute":
+        return ts.replace(second=0, microsecond=0)
+    if resolution == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ceil_time(ts, resolution):
+    floor = floor_time(ts, resolution)
+    return floor if floor == ts else floor + STEP[resolution]
+
+
+class Bucket:
+    """Running aggregate of checks (or of finer rollups) for one endpoint/bucket, or for a whole query."""
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.latency_sum = 0.0
+        self.latency_max = None
+        self.sketch = LatencySketch()
+
+    def add_check(self, status_code, response_time):
+        self.count += 1
+        if not status_code or status_code >= 400:
+            self.failures += 1
+        if response_time is not None:
+            self.latency_sum += response_time
+            self.latency_max = response_time if self.latency_max is None else max(self.latency_max, response_time)
+            self.sketch.add(response_time)
+
+    def add_rollup(self, row):
+        self.count += row.count
+        self.failures += row.failures
+        self.latency_sum += row.latency_sum
+        if row.latency_max is not None:
+            self.latency_max = row.latency_max if self.latency_max is None else max(self.latency_max, row.latency_max)
+        self.sketch.merge(LatencySketch.from_bytes(row.sketch))
+
+    def to_row(self, endpoint, bucket):
+        p50, p95, p99 = self.sketch.quantiles(0.5, 0.95, 0.99)
+        return {
+            "endpoint": endpoint, "bucket": bucket, "count": self.count, "failures": self.failures,
+            "latency_sum": self.latency_sum, "latency_max": self.latency_max,
+            "p50": p50, "p95": p95, "p99": p99, "sketch": self.sketch.to_bytes(),
+        }
+
+    def summary(self):
+        """count, failures, uptime (percent), and avg/max/p50/p95/p99 latency in seconds; None where there is no data."""
+        measured = self.sketch.count
+        p50, p95, p99 = self.sketch.quantiles(0.5, 0.95, 0.99)
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "uptime": 100.0 * (self.count - self.failures) / self.count if self.count else None,
+            "avg": self.latency_sum / measured if measured else None,
+            "max": self.latency_max,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+        }
+
+
+# ─── Reading sources ────────────────────────────────────────────────
+
+def _raw_rows(session, start, end, endpoint=None):
+    """(endpoint, timestamp, status_code, response_time) in [start, end), in time order."""
+    stmt = select(MonitorResult.endpoint, MonitorResult.timestamp, MonitorResult.status_code, MonitorResult.response_time)
+    stmt = stmt.where(MonitorResult.timestamp >= start, MonitorResult.timestamp < end)
+    if endpoint is not None:
+        stmt = stmt.where(MonitorResult.endpoint == endpoint)
+    return session.execute(stmt.order_by(MonitorResult.timestamp).execution_options(yield_per=INSERT_BATCH))
+
+
+def _rollup_rows(session, resolution, start, end, endpoint=None):
+    """Rollup rows with bucket in [start, end), in time order."""
+    table = ROLLUP_TABLES[resolution].__table__  # plain rows: no ORM identity map for read-once data
+    stmt = select(table).where(table.c.bucket >= start, table.c.bucket < end)
+    if endpoint is not None:
+        stmt = stmt.where(table.c.endpoint == endpoint)
+    return session.execute(stmt.order_by(table.c.bucket).execution_options(yield_per=INSERT_BATCH))
+
+
+def _aggregate(session, source, start, end, resolution):
+    """
+    Yields (endpoint, bucket) -> Bucket groups for one complete `resolution` bucket at a time,
+    built from `source` ("raw" or a finer resolution) over [start, end).
+    """
+    current, groups = None, {}
+    if source == "raw":
+        items = ((r.endpoint, r.timestamp, r) for r in _raw_rows(session, start, end))
+    else:
+        items = ((r.endpoint, r.bucket, r) for r in _rollup_rows(session, source, start, end))
+    for endpoint, ts, row in items:
+        bucket = floor_time(ts, resolution)
+        if bucket != current:
+            if groups:
+                yield groups
+            current, groups = bucket, {}
+        agg = groups.get((endpoint, bucket))
+        if agg is None:
+            agg = groups[(endpoint, bucket)] = Bucket()
+        if source == "raw":
+            agg.add_check(row.status_code, row.response_time)
+        else:
+            agg.add_rollup(row)
+    if groups:
+        yield groups
+
+
+def _load_state(session):
+    return {s.resolution: s.rolled_until for s in session.query(RollupState)}
+
+
+# ─── Maintenance ────────────────────────────────────────────────────
+
+def rollup(now=None):
+    """
+    Rolls complete buckets up: raw -> minute -> hour -> day. Incremental and safe to
+    run at any time; a backlog is processed in chunks, each committed with its watermark.
+    Returns:
+        written (dict): Rollup rows written per resolution.
+    """
+    now = now or datetime.utcnow()
+    session = storage.Session()
+    written = dict.fromkeys(RESOLUTIONS, 0)
+    try:
+        state = _load_state(session)
+        covered = floor_time(now - ROLLUP_DELAY, "minute")  # what the finer level covers; raw is complete up to here
+        source = "raw"
+        for resolution in RESOLUTIONS:
+            model = ROLLUP_TABLES[resolution]
+            end = floor_time(covered, resolution)
+            start = state.get(resolution)
+            if start is None:
+                first = _first_time(session, source)
+                start = floor_time(first, resolution) if first else end
+            while start < end:
+                chunk_end = min(end, floor_time(start + CHUNK[resolution], resolution))
+                batch = []
+                for groups in _aggregate(session, source, start, chunk_end, resolution):
+                    batch.extend(agg.to_row(endpoint, bucket) for (endpoint, bucket), agg in groups.items())
+                    if len(batch) >= INSERT_BATCH:
+                        session.execute(insert(model.__table__), batch)
+                        written[resolution] += len(batch)
+                        batch = []
+                if batch:
+                    session.execute(insert(model.__table__), batch)
+                    written[resolution] += len(batch)
+                session.merge(RollupState(resolution=resolution, rolled_until=chunk_end))
+                session.commit()
+                start = chunk_end
+            if resolution not in state:
+                # Nothing to roll up yet; start the watermark here so queries and retention can rely on it
+                session.merge(RollupState(resolution=resolution, rolled_until=start))
+                session.commit()
+            state[resolution] = covered = start
+            source = resolution
+        return written
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _first_time(session, source):
+    if source == "raw":
+        return session.scalar(select(func.min(MonitorResult.timestamp)))
+    return session.scalar(select(func.min(ROLLUP_TABLES[source].bucket)))
+
+
+def apply_retention(now=None, raw_days=None, minute_days=None, hour_days=None):
+    """
+    Deletes raw rows, minute and hour rollups older than their retention (in days; None
+    uses the configured value, a negative value keeps forever). Rows newer than the next
+    level's watermark are kept regardless, so nothing is lost before it is rolled up.
+    Returns:
+        deleted (dict): Rows deleted per table.
+    """
+    now = now or datetime.utcnow()
+    plan = (
+        (MonitorResult, MonitorResult.timestamp, RAW_RETENTION_DAYS if raw_days is None else raw_days, "minute"),
+        (MinuteRollup, MinuteRollup.bucket, MINUTE_RETENTION_DAYS if minute_days is None else minute_days, "hour"),
+        (HourRollup, HourRollup.bucket, HOUR_RETENTION_DAYS if hour_days is None else hour_days, "day"),
+    )
+    session = storage.Session()
+    deleted = {}
+    try:
+        state = _load_state(session)
+        for model, column, days, covered_by in plan:
+            if days < 0 or covered_by not in state:
+                continue
+            cutoff = min(now - timedelta(days=days), state[covered_by])
+            deleted[model.__tablename__] = session.execute(delete(model).where(column < cutoff)).rowcount
+        session.commit()
+        return deleted
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def maintain(now=None):
+    """Rollup followed by retention; what the monitor's maintenance job runs."""
+    written = rollup(now)
+    deleted = apply_retention(now)
+    return written, deleted
+
+
+# ─── Queries ────────────────────────────────────────────────────────
+
+def _coverage(session):
+    """What the planner works from: rollup watermarks, and the oldest row still kept per source."""
+    oldest = {source: _first_time(session, source) for source in ("raw",) + RESOLUTIONS}
+    return _load_state(session), {source: ts for source, ts in oldest.items() if ts is not None}
+
+
+def _plan(start, end, coverage, levels):
+    """
+    Splits [start, end) into (source, from, to) spans: the coarsest of `levels` (coarsest
+    first) that is rolled up and aligned covers the middle, finer levels the edges, and
+    raw rows whatever is left (sub-minute edges, the tail not rolled up yet).
+
+    An edge older than everything the finer sources still keep cannot be answered exactly
+    any more; it snaps outward to the whole bucket containing it.
+    """
+    if start >= end:
+        return []
+    if not levels:
+        return [("raw", start, end)]
+    state, oldest = coverage
+    resolution, finer = levels[0], levels[1:]
+    rolled, kept_from = state.get(resolution), oldest.get(resolution)
+    if rolled is None or kept_from is None:
+        return _plan(start, end, coverage, finer)
+    finer_from = min((oldest[s] for s in ("raw",) + RESOLUTIONS[:RESOLUTIONS.index(resolution)] if s in oldest),
+                     default=datetime.max)
+    a = floor_time(start, resolution) if start < finer_from else ceil_time(start, resolution)
+    b = ceil_time(end, resolution) if end < finer_from else floor_time(end, resolution)
+    a, b = max(a, kept_from), min(b, rolled)
+    if a >= b:
+        return _plan(start, end, coverage, finer)
+    return _plan(start, a, coverage, finer) + [(resolution, a, b)] + _plan(b, end, coverage, finer)
+
+
+def _collect(session, spans, endpoint=None, group_by=None):
+    """Aggregates planned spans into one Bucket, or into {bucket start: Bucket} with `group_by`."""
+    groups = {}
+    for source, a, b in spans:
+        if source == "raw":
+            for r in _raw_rows(session, a, b, endpoint):
+                key = floor_time(r.timestamp, group_by) if group_by else None
+                groups.setdefault(key, Bucket()).add_check(r.status_code, r.response_time)
+        else:
+            for r in _rollup_rows(session, source, a, b, endpoint):
+                key = floor_time(r.bucket, group_by) if group_by else None
+                groups.setdefault(key, Bucket()).add_rollup(r)
+    return groups if group_by else groups.get(None, Bucket())
+
+
+def get_uptime_stats(endpoint=None, start=None, end=None):
+    """
+    Uptime and latency of one endpoint (or all) over [start, end); defaults to the last 24 hours.
+    Returns:
+        stats (dict): See Bucket.summary.
+    """
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=1)
+    session = storage.Session()
+    try:
+        spans = _plan(start, end, _coverage(session), RESOLUTIONS[::-1])
+        return _collect(session, spans, endpoint).summary()
+    finally:
+        session.close()
+
+
+def series_resolution(span):
+    """The bucket size for a chart of `span`: about 60-1500 points."""
+    if span <= timedelta(hours=6):
+        return "minute"
+    if span <= timedelta(days=45):
+        return "hour"
+    return "day"
+
+
+def get_latency_series(endpoint=None, start=None, end=None, resolution=None):
+    """
+    Per-bucket uptime and latency for charts; `resolution` defaults to series_resolution(end - start).
+    Returns:
+        series (list): One dict per bucket with data, oldest first: bucket plus the Bucket.summary fields.
+    """
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=1)
+    resolution = resolution or series_resolution(end - start)
+    levels = RESOLUTIONS[:RESOLUTIONS.index(resolution) + 1][::-1]  # never coarser than the buckets asked for
+    session = storage.Session()
+    try:
+        spans = _plan(floor_time(start, resolution), end, _coverage(session), levels)
+        groups = _collect(session, spans, endpoint, group_by=resolution)
+        return [{"bucket": bucket, **groups[bucket].summary()} for bucket in sorted(groups)]
+    finally:
+        session.close()
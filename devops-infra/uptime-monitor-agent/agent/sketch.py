@@ -0,0 +1,83 @@
+"""
+Mergeable latency sketch.
+
+Latencies are counted in logarithmically spaced buckets (the DDSketch scheme), so any
+quantile comes back within RELATIVE_ACCURACY of the true value, and two sketches
+merge exactly by adding bucket counts. That is what lets minute rollups combine into
+hour and day rollups without keeping the raw response times.
+"""
+import math
+import struct
+
+RELATIVE_ACCURACY = 0.01
+MIN_LATENCY = 1e-6  # seconds; anything at or below counts as zero
+
+# Serialized as: accuracy, zero count, number of buckets, then the bucket indexes and their counts
+_HEADER = "<dII"
+_HEADER_SIZE = struct.calcsize(_HEADER)
+
+
+class LatencySketch:
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}  # bucket index -> count
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value, count=1):
+        if value is None:
+            return
+        if value <= MIN_LATENCY:
+            self.zeros += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """The q-quantile (0 <= q <= 1), or None for an empty sketch."""
+        return self.quantiles(q)[0]
+
+    def quantiles(self, *qs):
+        """Several quantiles (in increasing order of q) in one pass over the buckets."""
+        if not self.count:
+            return [None] * len(qs)
+        values, seen, bins = [], self.zeros, iter(sorted(self.bins.items()))
+        index = None
+        for q in qs:
+            rank = q * (self.count - 1)
+            if rank < self.zeros:
+                values.append(0.0)
+                continue
+            while seen <= rank:
+                index, count = next(bins)
+                seen += count
+            # The bucket (gamma^(i-1), gamma^i] is represented by the value with equal relative error to both ends
+            values.append(2 * self.gamma ** index / (self.gamma + 1))
+        return values
+
+    def to_bytes(self):
+        pairs = sorted(self.bins.items())
+        header = struct.pack(_HEADER, self.relative_accuracy, self.zeros, len(pairs))
+        return header + struct.pack(f"<{len(pairs)}i{len(pairs)}I", *(i for i, _ in pairs), *(c for _, c in pairs))
+
+    @classmethod
+    def from_bytes(cls, data):
+        accuracy, zeros, n = struct.unpack_from(_HEADER, data)
+        sketch = cls(accuracy)
+        values = struct.unpack_from(f"<{n}i{n}I", data, _HEADER_SIZE)
+        sketch.bins = dict(zip(values[:n], values[n:]))
+        sketch.zeros = zeros
+        sketch.count = zeros + sum(values[n:])
+        return sketch
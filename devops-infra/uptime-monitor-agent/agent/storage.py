@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Index
 from sqlalchemy.orm import sessionmaker, declarative_base
 from datetime import datetime
 import sys
@@ -27,12 +27,22 @@ class MonitorResult(Base):
     ssl_expiry_days = Column(Integer, nullable=True)
     ai_diagnosis = Column(String, nullable=True)
 
+    __table_args__ = (
+        # Per-endpoint history and rollups read (endpoint, time ranges); the dashboard reads the latest rows overall
+        Index("ix_monitor_results_endpoint_timestamp", "endpoint", "timestamp"),
+        Index("ix_monitor_results_timestamp", "timestamp"),
+    )
+
 # Create an SQLite engine
 engine = create_engine(DATABASE_URL, echo=False)
 
 # Create tables
 Base.metadata.create_all(engine)
 
+# create_all skips tables that already exist, so databases from older versions get their indexes here
+for index in MonitorResult.__table__.indexes:
+    index.create(engine, checkfirst=True)
+
 # Session factory
 Session = sessionmaker(bind=engine)
 
@@ -55,6 +65,39 @@ def add_result(endpoint, status_code, response_time, error_message=None, ssl_exp
     finally:
         session.close()
 
+def add_results(results):
+    """
+    Inserts a whole cycle of results in one transaction.
+    Returns:
+        ids (list): The new row ids, in order; empty if the insert failed.
+    """
+    session = Session()
+    try:
+        rows = [MonitorResult(**result) for result in results]
+        session.add_all(rows)
+        session.flush()  # assigns the ids; read them before commit expires the rows
+        ids = [row.id for row in rows]
+        session.commit()
+        return ids
+    except Exception as e:
+        session.rollback()
+        print(f"Error adding results: {e}")
+        return []
+    finally:
+        session.close()
+
+def set_diagnosis(result_id, ai_diagnosis):
+    """Attaches an AI diagnosis to a stored result; diagnoses arrive after the cycle's insert."""
+    session = Session()
+    try:
+        session.query(MonitorResult).filter_by(id=result_id).update({"ai_diagnosis": ai_diagnosis})
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"Error saving diagnosis: {e}")
+    finally:
+        session.close()
+
 def get_latest_results(limit=10):
     session = Session()
     try:
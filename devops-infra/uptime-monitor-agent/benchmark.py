@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one monitoring cycle over many local mock endpoints, the old one-at-a-time
+loop vs. the async engine (main.monitor_job). With --history, the storage side instead:
+dashboard queries over months of checks, raw table scans vs. indexes and rollups.
+
+The harness serves every endpoint from a local asyncio server spread over several
+loopback addresses (one "host" each), over HTTPS when the openssl CLI can make a
+throwaway certificate. Each request takes --latency seconds; every --fail-every-th
+endpoint answers 500 and costs a simulated --llm-second AI diagnosis. Results go to
+a temporary SQLite database.
+
+--history DAYS fills a temporary database with one check per minute per endpoint for
+DAYS days in the old schema (no indexes), times the dashboard queries on it, then adds
+the indexes, rolls the backlog up, applies retention and times the same queries again.
+"""
+import argparse  # pragma: no cover
+import asyncio  # pragma: no cover
+import contextlib  # pragma: no cover
+import io  # pragma: no cover
+import os  # pragma: no cover
+import shutil  # pragma: no cover
+import socket  # pragma: no cover
+import ssl  # pragma: no cover
+import subprocess  # pragma: no cover
+import sys  # pragma: no cover
+import tempfile  # pragma: no cover
+import threading  # pragma: no cover
+import time  # pragma: no cover
+from unittest.mock import patch  # pragma: no cover
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))  # pragma: no cover
+
+from datetime import datetime, timedelta  # pragma: no cover
+
+from sqlalchemy import create_engine, insert, select, text  # pragma: no cover
+from sqlalchemy.orm import sessionmaker  # pragma: no cover
+
+
+class MockEndpoints:  # pragma: no cover
+    """HTTP/1.1 keep-alive server on 127.0.0.1..127.0.0.N, answering after `latency` seconds."""
+
+    def __init__(self, hosts, port, latency, tls_context=None):  # pragma: no cover
+        self.hosts = [f"127.0.0.{i + 1}" for i in range(hosts)]  # pragma: no cover
+        self.port, self.latency, self.tls_context = port, latency, tls_context  # pragma: no cover
+        self.requests = self.connections = 0  # pragma: no cover
+        self._loop = asyncio.new_event_loop()  # pragma: no cover
+        self._ready = threading.Event()  # pragma: no cover
+        self._thread = threading.Thread(target=self._run, daemon=True)  # pragma: no cover
+
+    def __enter__(self):  # pragma: no cover
+        self._thread.start()  # pragma: no cover
+        self._ready.wait()  # pragma: no cover
+        return self  # pragma: no cover
+
+    def __exit__(self, *exc):  # pragma: no cover
+        self._loop.call_soon_threadsafe(self._loop.stop)  # pragma: no cover
+        self._thread.join()  # pragma: no cover
+
+    def _run(self):  # pragma: no cover
+        asyncio.set_event_loop(self._loop)  # pragma: no cover
+        server = self._loop.run_until_complete(  # pragma: no cover
+            asyncio.start_server(self._serve, self.hosts, self.port, ssl=self.tls_context, backlog=1024)
+        )
+        self._ready.set()  # pragma: no cover
+        self._loop.run_forever()  # pragma: no cover
+        server.close()  # pragma: no cover
+
+    async def _serve(self, reader, writer):  # pragma: no cover
+        self.connections += 1  # pragma: no cover
+        try:  # pragma: no cover
+            while True:  # pragma: no cover
+                request_line = await reader.readline()  # pragma: no cover
+                if not request_line:  # pragma: no cover
+                    break  # pragma: no cover
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):  # pragma: no cover
+                    pass  # pragma: no cover
+                self.requests += 1  # pragma: no cover
+                await asyncio.sleep(self.latency)  # pragma: no cover
+                path = request_line.split()[1]  # pragma: no cover
+                status = b"500 Internal Server Error" if b"/fail" in path else b"200 OK"  # pragma: no cover
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\nok")  # pragma: no cover
+                await writer.drain()  # pragma: no cover
+        except (ConnectionError, ssl.SSLError):  # pragma: no cover
+            pass  # pragma: no cover
+        finally:
+            writer.close()  # pragma: no cover
+
+    def urls(self, count, scheme, fail_every):  # pragma: no cover
+        return [  # pragma: no cover
+            f"{scheme}://{self.hosts[i % len(self.hosts)]}:{self.port}/{'fail' if fail_every and i % fail_every == 0 else 'ok'}/{i}"
+            for i in range(count)
+        ]
+
+
+def make_certificate(directory, hosts):  # pragma: no cover
+    """A self-signed certificate for the loopback addresses, or None without the openssl CLI."""
+    if not shutil.which("openssl"):  # pragma: no cover
+        return None  # pragma: no cover
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")  # pragma: no cover
+    san = ",".join(f"IP:{h}" for h in hosts)  # pragma: no cover
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "90", "-subj", "/CN=localhost",  # pragma: no cover
+                    "-addext", f"subjectAltName={san}", "-keyout", key, "-out", cert],
+                   check=True, capture_output=True)
+    return cert, key  # pragma: no cover
+
+
+def old_cycle(endpoints, port):  # pragma: no cover
+    """The pre-engine monitor_job loop: check, SSL handshake, LLM diagnosis and one commit per endpoint."""
+    from agent.monitor import check_endpoint, check_ssl_expiry  # pragma: no cover
+    from agent.storage import add_result  # pragma: no cover
+    import main  # pragma: no cover
+
+    connect = socket.create_connection  # pragma: no cover
+    with patch("agent.monitor.socket.create_connection", lambda address, timeout: connect((address[0], port), timeout)):  # pragma: no cover
+        for url in endpoints:  # pragma: no cover
+            status_code, response_time, error = check_endpoint(url)  # pragma: no cover
+            ssl_days, ssl_error = check_ssl_expiry(url) if url.startswith("https") else (None, None)  # pragma: no cover
+            ai_diagnosis = None  # pragma: no cover
+            if status_code == 0 or status_code >= 400:  # pragma: no cover
+                ai_diagnosis = main.analyze_failure(url, status_code, response_time, error)  # pragma: no cover
+                main.send_alert(url, error, ai_diagnosis)  # pragma: no cover
+            add_result(url, status_code, response_time, error, ssl_days, ai_diagnosis)  # pragma: no cover
+
+
+def fill_history(db, endpoints, days, now):  # pragma: no cover
+    """One check per minute per endpoint over `days` days; every 50th fails, latencies vary by endpoint."""
+    from agent.storage import MonitorResult  # pragma: no cover
+
+    rows, start = [], now - timedelta(days=days)  # pragma: no cover
+    with db.begin() as conn:  # pragma: no cover
+        for minute in range(days * 1440):  # pragma: no cover
+            ts = start + timedelta(minutes=minute)  # pragma: no cover
+            for e, url in enumerate(endpoints):  # pragma: no cover
+                tick = minute + e  # pragma: no cover
+                rows.append({"endpoint": url, "timestamp": ts, "status_code": 500 if tick % 50 == 0 else 200,  # pragma: no cover
+                             "response_time": 0.05 + 0.01 * (e % 10) + (tick % 97) / 1000})
+            if len(rows) >= 50000:  # pragma: no cover
+                conn.execute(insert(MonitorResult), rows)  # pragma: no cover
+                rows = []  # pragma: no cover
+        if rows:  # pragma: no cover
+            conn.execute(insert(MonitorResult), rows)  # pragma: no cover
+
+
+def raw_uptime(session, endpoint, start, end):  # pragma: no cover
+    """What computing uptime and p95 took before rollups: every raw check in the window."""
+    from agent.storage import MonitorResult  # pragma: no cover
+
+    rows = session.execute(select(MonitorResult.status_code, MonitorResult.response_time).where(  # pragma: no cover
+        MonitorResult.endpoint == endpoint, MonitorResult.timestamp >= start, MonitorResult.timestamp < end)).all()
+    latencies = sorted(r.response_time for r in rows if r.response_time is not None)  # pragma: no cover
+    up = sum(1 for r in rows if r.status_code and r.status_code < 400)  # pragma: no cover
+    return 100.0 * up / len(rows), latencies[int(0.95 * (len(latencies) - 1))]  # pragma: no cover
+
+
+def timed(fn, *args):  # pragma: no cover
+    start = time.perf_counter()  # pragma: no cover
+    fn(*args)  # pragma: no cover
+    return time.perf_counter() - start  # pragma: no cover
+
+
+def run_history_benchmark(args):  # pragma: no cover
+    import agent.storage as storage  # pragma: no cover
+    from agent import rollups  # pragma: no cover
+
+    with tempfile.TemporaryDirectory() as d:  # pragma: no cover
+        path = os.path.join(d, "uptime.db")  # pragma: no cover
+        db = create_engine(f"sqlite:///{path}")  # pragma: no cover
+        storage.Base.metadata.create_all(db)  # pragma: no cover
+        with db.begin() as conn:  # the schema before this change: no indexes on monitor_results  # pragma: no cover
+            for index in storage.MonitorResult.__table__.indexes:  # pragma: no cover
+                conn.execute(text(f"DROP INDEX {index.name}"))  # pragma: no cover
+        endpoints = [f"https://service-{i}.example.com/health" for i in range(args.history_endpoints)]  # pragma: no cover
+        now = datetime.utcnow().replace(second=0, microsecond=0)  # pragma: no cover
+
+        start = time.perf_counter()  # pragma: no cover
+        fill_history(db, endpoints, args.history, now)  # pragma: no cover
+        print(f"📊 {args.history} days x {len(endpoints)} endpoints, one check a minute: "  # pragma: no cover
+              f"{args.history * 1440 * len(endpoints):,} rows, {os.path.getsize(path) / 2**20:,.0f} MiB "
+              f"(generated in {time.perf_counter() - start:.0f} s)")
+
+        session = sessionmaker(bind=db)()  # pragma: no cover
+        latest = lambda: session.query(storage.MonitorResult).order_by(storage.MonitorResult.timestamp.desc()).limit(1000).all()  # pragma: no cover
+        day_ago, month_ago = now - timedelta(days=1), now - timedelta(days=min(30, args.history))  # pragma: no cover
+        one = endpoints[0]  # pragma: no cover
+
+        print("  before: raw table, no indexes")  # pragma: no cover
+        print(f"    latest 1000 checks (dashboard)      {timed(latest):8.3f} s")  # pragma: no cover
+        print(f"    24 h uptime + p95, one endpoint      {timed(raw_uptime, session, one, day_ago, now):8.3f} s")  # pragma: no cover
+        print(f"    24 h uptime + p95, every endpoint    "  # pragma: no cover
+              f"{timed(lambda: [raw_uptime(session, e, day_ago, now) for e in endpoints]):8.3f} s")
+        print(f"    30 d uptime + p95, one endpoint      {timed(raw_uptime, session, one, month_ago, now):8.3f} s")  # pragma: no cover
+        session.close()  # pragma: no cover
+
+        with patch.object(storage, "Session", sessionmaker(bind=db)):  # pragma: no cover
+            start = time.perf_counter()  # pragma: no cover
+            for index in storage.MonitorResult.__table__.indexes:  # pragma: no cover
+                index.create(db, checkfirst=True)  # pragma: no cover
+            rollups.Base.metadata.create_all(db)  # pragma: no cover
+            indexed = time.perf_counter() - start  # pragma: no cover
+            start = time.perf_counter()  # pragma: no cover
+            written = rollups.rollup(now)  # pragma: no cover
+            rolled = time.perf_counter() - start  # pragma: no cover
+            start = time.perf_counter()  # pragma: no cover
+            deleted = rollups.apply_retention(now)  # pragma: no cover
+            retained = time.perf_counter() - start  # pragma: no cover
+            with db.connect() as conn:  # pragma: no cover
+                conn.execute(text("VACUUM"))  # pragma: no cover
+                kept = {t: conn.execute(text(f"SELECT count(*) FROM {t}")).scalar()  # pragma: no cover
+                        for t in ("monitor_results", *(m.__tablename__ for m in rollups.ROLLUP_TABLES.values()))}
+            print(f"  migration: indexes {indexed:.1f} s, rollup backlog {rolled:.1f} s "  # pragma: no cover
+                  f"({', '.join(f'{n:,} {r}' for r, n in written.items())} rows), retention {retained:.1f} s "
+                  f"({sum(deleted.values()):,} rows deleted); {os.path.getsize(path) / 2**20:,.0f} MiB after VACUUM")
+            print(f"  rows kept: {', '.join(f'{n:,} {t}' for t, n in kept.items())}")  # pragma: no cover
+
+            session = storage.Session()  # pragma: no cover
+            print("  after: indexes, rollups, retention")  # pragma: no cover
+            print(f"    latest 1000 checks (dashboard)      {timed(latest):8.3f} s")  # pragma: no cover
+            print(f"    24 h uptime + p95, one endpoint      {timed(rollups.get_uptime_stats, one, day_ago, now):8.3f} s")  # pragma: no cover
+            print(f"    24 h uptime + p95, every endpoint    "  # pragma: no cover
+                  f"{timed(lambda: [rollups.get_uptime_stats(e, day_ago, now) for e in endpoints]):8.3f} s")
+            print(f"    30 d uptime + p95, one endpoint      {timed(rollups.get_uptime_stats, one, month_ago, now):8.3f} s")  # pragma: no cover
+            print(f"    rollup run with nothing new         {timed(rollups.maintain, now):8.3f} s")  # pragma: no cover
+            session.close()  # pragma: no cover
+
+
+def run_benchmark():  # pragma: no cover
+    p = argparse.ArgumentParser(description="Benchmark one monitoring cycle against local mock endpoints")  # pragma: no cover
+    p.add_argument("--endpoints", type=int, default=1000)  # pragma: no cover
+    p.add_argument("--hosts", type=int, default=20, help="Distinct loopback hosts the endpoints are spread over")  # pragma: no cover
+    p.add_argument("--latency", type=float, default=0.05, help="Seconds each mock request takes")  # pragma: no cover
+    p.add_argument("--fail-every", type=int, default=50, help="Every Nth endpoint answers 500")  # pragma: no cover
+    p.add_argument("--llm", type=float, default=2.0, help="Seconds a simulated AI diagnosis takes")  # pragma: no cover
+    p.add_argument("--port", type=int, default=18443)  # pragma: no cover
+    p.add_argument("--skip-old", action="store_true", help="Only run the async engine")  # pragma: no cover
+    p.add_argument("--history", type=int, metavar="DAYS", help="Benchmark storage queries over DAYS days of checks instead")  # pragma: no cover
+    p.add_argument("--history-endpoints", type=int, default=50)  # pragma: no cover
+    args = p.parse_args()  # pragma: no cover
+    if args.history:  # pragma: no cover
+        return run_history_benchmark(args)  # pragma: no cover
+
+    with tempfile.TemporaryDirectory() as d:  # pragma: no cover
+        hosts = [f"127.0.0.{i + 1}" for i in range(args.hosts)]  # pragma: no cover
+        cert = make_certificate(d, hosts)  # pragma: no cover
+        server_context = client_context = None  # pragma: no cover
+        if cert:  # pragma: no cover
+            server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)  # pragma: no cover
+            server_context.load_cert_chain(*cert)  # pragma: no cover
+            client_context = ssl.create_default_context(cafile=cert[0])  # pragma: no cover
+            os.environ["REQUESTS_CA_BUNDLE"] = os.environ["SSL_CERT_FILE"] = cert[0]  # trust it in the old code path  # pragma: no cover
+        scheme = "https" if cert else "http"  # pragma: no cover
+
+        import main  # pragma: no cover
+        import agent.storage as storage  # pragma: no cover
+        from agent.engine import ProbeEngine, SSLCache, DiagnosisQueue  # pragma: no cover
+
+        db = create_engine(f"sqlite:///{os.path.join(d, 'uptime.db')}")  # pragma: no cover
+        storage.Base.metadata.create_all(db)  # pragma: no cover
+        slow_diagnosis = lambda *a: time.sleep(args.llm) or "Simulated diagnosis."  # pragma: no cover
+
+        with MockEndpoints(args.hosts, args.port, args.latency, server_context) as server, \
+                patch.object(storage, "Session", sessionmaker(bind=db)), \
+                patch.object(main, "analyze_failure", slow_diagnosis), patch.object(main, "send_alert", lambda *a: None):
+            endpoints = server.urls(args.endpoints, scheme, args.fail_every)  # pragma: no cover
+            failures = sum("/fail/" in u for u in endpoints)  # pragma: no cover
+            print(f"📊 {len(endpoints)} {scheme} endpoints on {args.hosts} hosts, {args.latency * 1000:.0f} ms each, "  # pragma: no cover
+                  f"{failures} failing ({args.llm:.1f} s diagnosis each), {os.cpu_count()} CPU(s)")
+
+            if not args.skip_old:  # pragma: no cover
+                requests_before, connections_before = server.requests, server.connections  # pragma: no cover
+                start = time.perf_counter()  # pragma: no cover
+                old_cycle(endpoints, args.port)  # pragma: no cover
+                print(f"  one at a time (old)       {time.perf_counter() - start:8.2f} s   "  # pragma: no cover
+                      f"{server.connections - connections_before:5} connections for {server.requests - requests_before} requests")
+
+            cache = SSLCache(context=client_context)  # pragma: no cover
+            engine = ProbeEngine(ssl_context=client_context, ssl_cache=cache)  # pragma: no cover
+            for label in ("async engine, cold cache", "async engine, warm cache"):  # pragma: no cover
+                requests_before, connections_before, handshakes_before = server.requests, server.connections, cache.handshakes  # pragma: no cover
+                diagnoses = DiagnosisQueue(main.handle_failure, workers=2)  # pragma: no cover
+                with patch.object(main, "probe_engine", engine), patch.object(main, "diagnosis_queue", diagnoses), \
+                        patch.object(main, "MONITOR_ENDPOINTS", endpoints), contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()  # pragma: no cover
+                    main.monitor_job()  # pragma: no cover
+                    cycle = time.perf_counter() - start  # pragma: no cover
+                    diagnoses.close()  # pragma: no cover
+                    drained = time.perf_counter() - start  # pragma: no cover
+                print(f"  {label:<25} {cycle:8.2f} s   {server.connections - connections_before:5} connections for "  # pragma: no cover
+                      f"{server.requests - requests_before} requests, {cache.handshakes - handshakes_before} SSL handshakes; "
+                      f"diagnoses done at {drained:.2f} s")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    run_benchmark()  # pragma: no cover
@@ -8,6 +8,12 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MONITOR_ENDPOINTS = os.getenv("MONITOR_ENDPOINTS", "").split(",")
 MONITOR_INTERVAL = int(os.getenv("MONITOR_INTERVAL", 60))
 
+# Probing Config
+MONITOR_CONCURRENCY = int(os.getenv("MONITOR_CONCURRENCY", 100))  # checks in flight at once
+MONITOR_PER_HOST = int(os.getenv("MONITOR_PER_HOST", 10))  # checks in flight per host
+SSL_CACHE_TTL = int(os.getenv("SSL_CACHE_TTL", 3600))  # seconds an SSL expiry lookup is reused
+DIAGNOSIS_WORKERS = int(os.getenv("DIAGNOSIS_WORKERS", 2))  # threads running AI diagnosis and alerts
+
 # Email Config
 EMAIL_SENDER = os.getenv("EMAIL_SENDER")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
@@ -20,3 +26,9 @@ WEBHOOK_URL = os.getenv("WEBHOOK_URL")
 
 # Database Config
 DATABASE_URL = "sqlite:///uptime.db"
+
+# Rollups & Retention Config
+ROLLUP_INTERVAL = int(os.getenv("ROLLUP_INTERVAL", 300))  # seconds between rollup/retention runs
+RAW_RETENTION_DAYS = int(os.getenv("RAW_RETENTION_DAYS", 7))  # raw checks, with their errors and diagnoses; -1 keeps forever
+MINUTE_RETENTION_DAYS = int(os.getenv("MINUTE_RETENTION_DAYS", 2))  # minute rollups, for short charts
+HOUR_RETENTION_DAYS = int(os.getenv("HOUR_RETENTION_DAYS", 90))  # hour rollups; day rollups are kept forever
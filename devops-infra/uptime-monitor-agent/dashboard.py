@@ -3,11 +3,13 @@ import pandas as pd
 import sys
 import os
 import time
+from datetime import datetime, timedelta
 
 # Add parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from agent.storage import get_latest_results, get_results_by_endpoint, MonitorResult, engine
+from agent.rollups import get_uptime_stats
 from sqlalchemy.orm import sessionmaker
 
 # Set page config
@@ -115,6 +117,27 @@ for i, endpoint in enumerate(unique_endpoints):
             delta_color=delta_color
         )
 
+# Uptime & latency percentiles, read from the rollup tables instead of scanning raw checks
+st.header("Uptime & Latency (Last 24 Hours)")
+window_end = datetime.utcnow()
+uptime_rows = []
+for endpoint in unique_endpoints:
+    stats = get_uptime_stats(endpoint, window_end - timedelta(days=1), window_end)
+    if stats["count"]:
+        uptime_rows.append({
+            "Endpoint": endpoint,
+            "Checks": stats["count"],
+            "Uptime %": round(stats["uptime"], 3),
+            "p50 (s)": stats["p50"],
+            "p95 (s)": stats["p95"],
+            "p99 (s)": stats["p99"]
+        })
+
+if uptime_rows:
+    st.dataframe(pd.DataFrame(uptime_rows), hide_index=True)
+else:
+    st.info("No checks in the last 24 hours.")
+
 # Charts & History
 st.header("Response Time History")
 
@@ -129,7 +152,7 @@ if not failures.empty:
     for _, row in failures.iterrows():
         with st.expander(f"🔴 {row['endpoint']} at {row['timestamp']} (Status: {row['status_code']})"):
             st.write(f"**Error:** {row['error_message']}")
-            if row['ai_diagnosis']:
+            if pd.notna(row['ai_diagnosis']) and row['ai_diagnosis']:  # missing values come back as NaN
                 st.markdown(f"**🤖 AI Diagnosis:**\n\n{row['ai_diagnosis']}")
             else:
                 st.info("No AI diagnosis available.")
@@ -7,15 +7,47 @@ from colorama import init, Fore, Style
 # Add current directory to sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config import MONITOR_ENDPOINTS, MONITOR_INTERVAL
-from agent.monitor import check_endpoint, check_ssl_expiry
-from agent.storage import add_result
+from config import (
+    MONITOR_ENDPOINTS, MONITOR_INTERVAL, MONITOR_CONCURRENCY, MONITOR_PER_HOST, SSL_CACHE_TTL, DIAGNOSIS_WORKERS,
+    ROLLUP_INTERVAL
+)
+from agent.engine import ProbeEngine, SSLCache, DiagnosisQueue
+from agent.storage import add_results, set_diagnosis
+from agent.rollups import maintain
 from agent.analysis import analyze_failure
 from agent.alert import send_alert
 
 # Initialize colorama
 init()
 
+# One engine for the life of the process, so the SSL expiry cache carries over between cycles
+probe_engine = ProbeEngine(
+    concurrency=MONITOR_CONCURRENCY,
+    per_host=MONITOR_PER_HOST,
+    ssl_cache=SSLCache(ttl=SSL_CACHE_TTL)
+)
+
+# Started on first use, so importing main doesn't spawn threads
+diagnosis_queue = None
+
+def get_diagnosis_queue():
+    global diagnosis_queue
+    if diagnosis_queue is None:
+        diagnosis_queue = DiagnosisQueue(handle_failure, workers=DIAGNOSIS_WORKERS)
+    return diagnosis_queue
+
+def handle_failure(result, result_id):
+    """Runs on a diagnosis worker: AI diagnosis and alert for a down endpoint, or an SSL expiry alert."""
+    if result.is_down:
+        ai_diagnosis = analyze_failure(result.endpoint, result.status_code, result.response_time, result.error_message)
+        if result_id is not None:
+            set_diagnosis(result_id, ai_diagnosis)
+        print(f"  Diagnosis for {result.endpoint}: {ai_diagnosis[:100]}...")
+        send_alert(result.endpoint, result.error_message, ai_diagnosis)
+    else:
+        ssl_msg = f"SSL Certificate expires in {result.ssl_expiry_days} days."
+        send_alert(result.endpoint, ssl_msg, "Renew certificate.")
+
 def monitor_job():
     print(f"\n{Fore.CYAN}--- Starting Monitoring Cycle ---{Style.RESET_ALL}")
 
@@ -24,69 +56,52 @@ def monitor_job():
         print(f"{Fore.YELLOW}No endpoints configured to monitor.{Style.RESET_ALL}")
         return
 
-    for url in endpoints:
-        print(f"Checking {url}...", end=" ", flush=True)
-
-        # Check HTTP
-        status_code, response_time, error = check_endpoint(url)
-
-        # Check SSL
-        ssl_days, ssl_error = check_ssl_expiry(url)
-
-        # Log to DB
-        # We need to decide what to store as error_message.
-        # If HTTP fails, use that error. If SSL fails, append?
-
-        final_error = error
-        if ssl_error:
-            if final_error:
-                final_error += f" | SSL Error: {ssl_error}"
-            else:
-                final_error = f"SSL Error: {ssl_error}"
-
-        # Determine status
-        is_down = status_code == 0 or (status_code >= 400)
-        is_ssl_warning = ssl_days is not None and ssl_days < 30
-
-        ai_diagnosis = None
-
-        if is_down:
-            print(f"{Fore.RED}DOWN{Style.RESET_ALL} ({status_code}) - {response_time:.2f}s")
-            # Analyze failure
-            print(f"  {Fore.YELLOW}Analyzing failure...{Style.RESET_ALL}")
-            ai_diagnosis = analyze_failure(url, status_code, response_time, final_error)
-            print(f"  Diagnosis: {ai_diagnosis[:100]}...")
-
-            # Send Alert
-            print(f"  {Fore.MAGENTA}Sending alert...{Style.RESET_ALL}")
-            send_alert(url, final_error, ai_diagnosis)
-
-        elif is_ssl_warning:
-             print(f"{Fore.YELLOW}SSL WARNING{Style.RESET_ALL} (Expires in {ssl_days} days)")
-             # Maybe alert on SSL warning too?
-             # For now, let's just log it. The instructions say "Detect SSL certificate expiry".
-             # Alerting on SSL expiry is good practice.
-             ssl_msg = f"SSL Certificate expires in {ssl_days} days."
-             send_alert(url, ssl_msg, "Renew certificate.")
+    # Probe everything concurrently, then store the whole cycle in one transaction
+    start_time = time.perf_counter()
+    results = probe_engine.run_cycle(endpoints)
+    ids = add_results([result.to_row() for result in results])
+    if len(ids) != len(results):
+        ids = [None] * len(results)
+
+    # Diagnosis and alerts are slow (LLM, SMTP); hand them to the workers instead of waiting here
+    queue = get_diagnosis_queue()
+    down = 0
+    for result, result_id in zip(results, ids):
+        print(f"Checking {result.endpoint}...", end=" ")
+        if result.is_down:
+            down += 1
+            print(f"{Fore.RED}DOWN{Style.RESET_ALL} ({result.status_code}) - {result.response_time:.2f}s")
+            print(f"  {Fore.YELLOW}Queued for diagnosis and alert{Style.RESET_ALL}")
+            queue.submit(result, result_id)
+        elif result.is_ssl_warning:
+            print(f"{Fore.YELLOW}SSL WARNING{Style.RESET_ALL} (Expires in {result.ssl_expiry_days} days)")
+            queue.submit(result, result_id)
         else:
-            print(f"{Fore.GREEN}UP{Style.RESET_ALL} ({status_code}) - {response_time:.2f}s")
-
-        # Save to DB
-        add_result(
-            endpoint=url,
-            status_code=status_code,
-            response_time=response_time,
-            error_message=final_error,
-            ssl_expiry_days=ssl_days,
-            ai_diagnosis=ai_diagnosis
-        )
+            print(f"{Fore.GREEN}UP{Style.RESET_ALL} ({result.status_code}) - {result.response_time:.2f}s")
+
+    elapsed = time.perf_counter() - start_time
+    print(f"{Fore.CYAN}Checked {len(results)} endpoints in {elapsed:.2f}s ({down} down){Style.RESET_ALL}")
+
+def maintenance_job():
+    """Rolls new checks up into the minute/hour/day tables, then prunes rows past their retention."""
+    start_time = time.perf_counter()
+    try:
+        written, deleted = maintain()
+    except Exception as e:
+        print(f"{Fore.RED}Rollup maintenance failed: {e}{Style.RESET_ALL}")
+        return
+    elapsed = time.perf_counter() - start_time
+    rolled = ", ".join(f"{count} {resolution}" for resolution, count in written.items())
+    print(f"{Fore.CYAN}Rollups: {rolled} rows written, {sum(deleted.values())} expired rows deleted in {elapsed:.2f}s{Style.RESET_ALL}")
 
 def main():
     print(f"{Fore.GREEN}Uptime Monitor Agent Started{Style.RESET_ALL}")
     print(f"Monitoring {len(MONITOR_ENDPOINTS)} endpoints every {MONITOR_INTERVAL} seconds.")
 
     scheduler = BlockingScheduler()
-    scheduler.add_job(monitor_job, 'interval', seconds=MONITOR_INTERVAL)
+    # A slow cycle is skipped rather than run on top of the next one
+    scheduler.add_job(monitor_job, 'interval', seconds=MONITOR_INTERVAL, max_instances=1, coalesce=True)
+    scheduler.add_job(maintenance_job, 'interval', seconds=ROLLUP_INTERVAL, max_instances=1, coalesce=True)
 
     try:
         # Run once immediately
@@ -94,6 +109,9 @@ def main():
         scheduler.start()
     except (KeyboardInterrupt, SystemExit):
         print(f"\n{Fore.RED}Stopping monitor...{Style.RESET_ALL}")
+        if diagnosis_queue is not None:
+            print(f"Waiting for {diagnosis_queue.pending()} queued diagnoses...")
+            diagnosis_queue.close()
 
 if __name__ == "__main__":
     main()
@@ -2,11 +2,12 @@ import pytest
 import sys
 import os
 import time
+from datetime import datetime, timedelta
 from unittest.mock import Mock, MagicMock, patch
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from agent.storage import add_result, Base, engine, Session
+from agent.storage import add_result, Base, engine, Session, MonitorResult
 
 @pytest.fixture(autouse=True)
 def setup_db():
@@ -58,6 +59,17 @@ def test_dashboard_full(monkeypatch):
     mock_st, _, _ = run_dashboard_with_mock(monkeypatch)
     import dashboard
     assert mock_st.header.called
+    mock_st.info.assert_any_call("No AI diagnosis available.")
+    assert all("nan" not in str(c) for c in mock_st.markdown.call_args_list)
+
+def test_dashboard_no_recent_checks(monkeypatch):
+    add_result("http://test.com", 200, 0.1, None, 50, None)
+    session = Session()
+    session.query(MonitorResult).update({MonitorResult.timestamp: datetime.utcnow() - timedelta(days=3)})
+    session.commit(); session.close()
+    mock_st, _, _ = run_dashboard_with_mock(monkeypatch)
+    import dashboard
+    mock_st.info.assert_any_call("No checks in the last 24 hours.")
 
 def test_dashboard_all_up(monkeypatch):
     add_result("http://test.com", 200, 0.1, None, None, None)
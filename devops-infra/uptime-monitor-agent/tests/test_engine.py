@@ -0,0 +1,181 @@
+import pytest
+import asyncio
+import sys
+import os
+import ssl
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.engine import CheckResult, ProbeEngine, SSLCache, DiagnosisQueue, host_key
+
+def make_transport(delay=0.0, stats=None):
+    """An httpx transport answering by path: /fail -> 500, /boom -> connection error, else 200."""
+    stats = stats if stats is not None else {}
+    stats.update(in_flight=0, max=0, per_host={}, max_host={})
+    lock = threading.Lock()
+
+    async def handler(request):
+        host = request.url.host
+        with lock:
+            stats["in_flight"] += 1
+            stats["max"] = max(stats["max"], stats["in_flight"])
+            stats["per_host"][host] = stats["per_host"].get(host, 0) + 1
+            stats["max_host"][host] = max(stats["max_host"].get(host, 0), stats["per_host"][host])
+        try:
+            await asyncio.sleep(delay)
+            if request.url.path == "/boom":
+                raise httpx.ConnectError("Connection refused")
+            return httpx.Response(500 if request.url.path == "/fail" else 200)
+        finally:
+            with lock:
+                stats["in_flight"] -= 1
+                stats["per_host"][host] -= 1
+
+    return httpx.MockTransport(handler)
+
+class FakeSSLCache(SSLCache):
+    def __init__(self, days=90, error=None, **kwargs):
+        super().__init__(**kwargs)
+        self.days, self.error = days, error
+
+    async def _fetch(self, host, port):
+        self.handshakes += 1
+        await asyncio.sleep(0.01)
+        if self.error:
+            return None, self.error
+        expires = time.time() + self.days * 86400 + 3600
+        self._expiry[(host, port)] = (time.monotonic(), expires)
+        return expires, None
+
+def test_check_result_fields():
+    assert CheckResult("u", 0, 0.1).is_down
+    assert CheckResult("u", 404, 0.1).is_down
+    assert not CheckResult("u", 200, 0.1).is_down
+    assert CheckResult("u", 200, 0.1, ssl_expiry_days=5).is_ssl_warning
+    assert not CheckResult("u", 200, 0.1, ssl_expiry_days=None).is_ssl_warning
+    assert CheckResult("u", 500, 0.1, "HTTP Error", ssl_error="Bad").error_message == "HTTP Error | SSL Error: Bad"
+    assert CheckResult("u", 200, 0.1, None, ssl_error="Bad").error_message == "SSL Error: Bad"
+    assert CheckResult("u", 500, 0.1, "HTTP Error").to_row() == {
+        "endpoint": "u", "status_code": 500, "response_time": 0.1, "error_message": "HTTP Error", "ssl_expiry_days": None
+    }
+
+def test_host_key():
+    assert host_key("https://example.com/a") == ("example.com", 443)
+    assert host_key("http://example.com:8080/a") == ("example.com", 8080)
+    assert host_key("http://Example.com") == ("example.com", 80)
+
+def test_run_cycle_results_in_order():
+    engine = ProbeEngine(transport=make_transport(), ssl_cache=FakeSSLCache(days=10))
+    urls = ["http://a.test/ok", "http://a.test/fail", "http://b.test/boom", "https://c.test/ok"]
+    results = engine.run_cycle(urls)
+
+    assert [r.endpoint for r in results] == urls
+    assert [r.status_code for r in results] == [200, 500, 0, 200]
+    assert results[2].error == "Connection refused"
+    assert results[0].ssl_expiry_days is None  # plain HTTP has no certificate to check
+    assert results[3].ssl_expiry_days == 10 and results[3].is_ssl_warning
+    assert all(r.response_time >= 0 for r in results)
+
+def test_concurrency_is_bounded():
+    stats = {}
+    engine = ProbeEngine(concurrency=8, per_host=3, transport=make_transport(delay=0.02, stats=stats))
+    urls = [f"http://host{i % 4}.test/{i}" for i in range(60)]
+    start = time.perf_counter()
+    results = engine.run_cycle(urls)
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 60 and all(r.status_code == 200 for r in results)
+    assert 1 < stats["max"] <= 8
+    assert max(stats["max_host"].values()) <= 3
+    assert elapsed < 60 * 0.02  # well under one-at-a-time
+
+def test_ssl_cache_one_handshake_per_host_across_cycles():
+    cache = FakeSSLCache(days=90)
+    engine = ProbeEngine(transport=make_transport(), ssl_cache=cache)
+    urls = [f"https://host{i % 3}.test/{i}" for i in range(30)]
+    for _ in range(2):
+        results = engine.run_cycle(urls)
+        assert all(r.ssl_expiry_days == 90 and r.ssl_error is None for r in results)
+    assert cache.handshakes == 3
+
+def test_ssl_cache_ttl_and_errors():
+    cache = FakeSSLCache(days=90, ttl=0)
+    asyncio.run(cache.get("a.test"))
+    asyncio.run(cache.get("a.test"))
+    assert cache.handshakes == 2  # expired immediately
+
+    failing = FakeSSLCache(error="certificate verify failed")
+    engine = ProbeEngine(transport=make_transport(), ssl_cache=failing)
+    for _ in range(2):
+        result, = engine.run_cycle(["https://bad.test/"])
+        assert result.ssl_expiry_days is None and result.error_message == "SSL Error: certificate verify failed"
+    assert failing.handshakes == 2  # failures are retried next cycle
+
+def test_ssl_cache_real_handshake_errors():
+    cache = SSLCache(timeout=1)
+    with patch('agent.engine.asyncio.open_connection', side_effect=ssl.SSLError("handshake failure")):
+        days, error = asyncio.run(cache.get("example.com"))
+    assert days is None and "handshake failure" in error
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(5)
+    cache = SSLCache(timeout=0.05)
+    with patch('agent.engine.asyncio.open_connection', hang):
+        days, error = asyncio.run(cache.get("example.com", 8443))
+    assert days is None and error == "TLS handshake with example.com:8443 timed out"
+
+def test_ssl_cache_reads_peer_certificate():
+    class Writer:
+        closed = False
+        def get_extra_info(self, name):
+            return {"notAfter": time.strftime("%b %d %H:%M:%S %Y GMT", time.gmtime(time.time() + 40.5 * 86400))}
+        def close(self):
+            self.closed = True
+    writer = Writer()
+
+    async def connect(*args, **kwargs):
+        return None, writer
+    cache = SSLCache()
+    with patch('agent.engine.asyncio.open_connection', connect):
+        assert asyncio.run(cache.get("example.com")) == (40, None)
+        assert asyncio.run(cache.get("example.com")) == (40, None)
+    assert cache.handshakes == 1 and writer.closed
+    cache.clear()
+    assert cache._expiry == {}
+
+def test_ssl_cache_without_peer_certificate():
+    class Writer:
+        closed = False
+        def get_extra_info(self, name):
+            return None  # e.g. an unverified context hands back no certificate
+        def close(self):
+            self.closed = True
+    writer = Writer()
+
+    async def connect(*args, **kwargs):
+        return None, writer
+    with patch('agent.engine.asyncio.open_connection', connect):
+        days, error = asyncio.run(SSLCache().get("example.com"))
+    assert days is None and "not subscriptable" in error and writer.closed
+
+def test_diagnosis_queue_runs_off_thread():
+    seen, caller = [], threading.get_ident()
+
+    def handler(name, value):
+        if name == "bad":
+            raise ValueError("LLM Error")
+        seen.append((name, value, threading.get_ident() != caller))
+
+    diagnoses = DiagnosisQueue(handler, workers=2)
+    diagnoses.submit("bad", 0)
+    for i in range(5):
+        diagnoses.submit("ok", i)
+    diagnoses.join()
+    assert sorted(seen) == [("ok", i, True) for i in range(5)]
+    assert diagnoses.pending() == 0
+    diagnoses.close()
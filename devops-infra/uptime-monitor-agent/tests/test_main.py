@@ -7,70 +7,85 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from main import monitor_job, main
 
-@patch('main.check_endpoint')
-@patch('main.check_ssl_expiry')
-@patch('main.add_result')
-@patch('main.analyze_failure')
-@patch('main.send_alert')
+from agent.engine import CheckResult
+import main as main_module
+
+@patch('main.get_diagnosis_queue')
+@patch('main.add_results')
+@patch('main.probe_engine')
 @patch('main.MONITOR_ENDPOINTS', ['http://example.com'])
-def test_monitor_job(mock_send_alert, mock_analyze, mock_add_result, mock_check_ssl, mock_check_endpoint):
-    mock_check_endpoint.return_value = (200, 0.5, None)
-    mock_check_ssl.return_value = (100, None)
+def test_monitor_job(mock_engine, mock_add_results, mock_get_queue):
+    mock_engine.run_cycle.return_value = [CheckResult('http://example.com', 200, 0.5, None, 100, None)]
+    mock_add_results.return_value = [1]
 
     monitor_job()
 
-    mock_check_endpoint.assert_called_with('http://example.com')
-    mock_check_ssl.assert_called_with('http://example.com')
-    mock_add_result.assert_called_once()
-    mock_send_alert.assert_not_called()
-
-@patch('main.check_endpoint')
-@patch('main.check_ssl_expiry')
-@patch('main.add_result')
-@patch('main.analyze_failure')
-@patch('main.send_alert')
-@patch('main.MONITOR_ENDPOINTS', ['http://example.com'])
-def test_monitor_job_down(mock_send_alert, mock_analyze, mock_add_result, mock_check_ssl, mock_check_endpoint):
-    mock_check_endpoint.return_value = (500, 0.1, "Internal Server Error")
-    mock_check_ssl.return_value = (100, None)
-    mock_analyze.return_value = "Diagnosis"
+    mock_engine.run_cycle.assert_called_once_with(['http://example.com'])
+    mock_add_results.assert_called_once()
+    assert mock_add_results.call_args[0][0][0]['status_code'] == 200
+    mock_get_queue.return_value.submit.assert_not_called()
+
+@patch('main.get_diagnosis_queue')
+@patch('main.add_results')
+@patch('main.probe_engine')
+@patch('main.MONITOR_ENDPOINTS', ['http://example.com', 'https://ssl.example.com', 'https://ok.example.com'])
+def test_monitor_job_down_and_ssl_warning(mock_engine, mock_add_results, mock_get_queue):
+    down = CheckResult('http://example.com', 500, 0.1, "Internal Server Error")
+    expiring = CheckResult('https://ssl.example.com', 200, 0.1, None, 10, None)
+    up = CheckResult('https://ok.example.com', 200, 0.1, None, 100, None)
+    mock_engine.run_cycle.return_value = [down, expiring, up]
+    mock_add_results.return_value = [7, 8, 9]
 
     monitor_job()
 
-    mock_analyze.assert_called_with('http://example.com', 500, 0.1, "Internal Server Error")
-    mock_send_alert.assert_called_with('http://example.com', "Internal Server Error", "Diagnosis")
-    mock_add_result.assert_called_once()
-
-@patch('main.check_endpoint')
-@patch('main.check_ssl_expiry')
-@patch('main.add_result')
-@patch('main.analyze_failure')
-@patch('main.send_alert')
-@patch('main.MONITOR_ENDPOINTS', ['http://example.com'])
-def test_monitor_job_ssl_warning_and_errors(mock_send_alert, mock_analyze, mock_add_result, mock_check_ssl, mock_check_endpoint):
-    mock_analyze.return_value = "Mocked Analysis"
+    mock_add_results.assert_called_once()
+    submitted = [c.args for c in mock_get_queue.return_value.submit.call_args_list]
+    assert submitted == [(down, 7), (expiring, 8)]
 
-    # Test SSL error combination with HTTP error
-    mock_check_endpoint.return_value = (500, 0.1, "HTTP Error")
-    mock_check_ssl.return_value = (None, "SSL Err")
-    monitor_job()
-    
-    # Test SSL error without HTTP error
-    mock_check_endpoint.return_value = (200, 0.1, None)
-    mock_check_ssl.return_value = (None, "SSL Cert Invalid")
+    # A failed insert still queues the failures, without row ids
+    mock_add_results.return_value = []
+    mock_get_queue.return_value.submit.reset_mock()
     monitor_job()
+    assert [c.args for c in mock_get_queue.return_value.submit.call_args_list] == [(down, None), (expiring, None)]
 
-    # Test SSL expiration warning
-    mock_check_endpoint.return_value = (200, 0.1, None)
-    mock_check_ssl.return_value = (10, None)
-    monitor_job()
-    assert mock_send_alert.called
+@patch('main.set_diagnosis')
+@patch('main.send_alert')
+@patch('main.analyze_failure')
+def test_handle_failure(mock_analyze, mock_send_alert, mock_set_diagnosis):
+    mock_analyze.return_value = "Diagnosis"
+    down = CheckResult('http://example.com', 0, 0.1, "HTTP Error", None, "SSL Err")
+    main_module.handle_failure(down, 3)
+    mock_analyze.assert_called_with('http://example.com', 0, 0.1, "HTTP Error | SSL Error: SSL Err")
+    mock_set_diagnosis.assert_called_with(3, "Diagnosis")
+    mock_send_alert.assert_called_with('http://example.com', "HTTP Error | SSL Error: SSL Err", "Diagnosis")
+
+    mock_set_diagnosis.reset_mock()
+    main_module.handle_failure(CheckResult('https://example.com', 200, 0.1, None, 10, None), None)
+    mock_send_alert.assert_called_with('https://example.com', "SSL Certificate expires in 10 days.", "Renew certificate.")
+    mock_set_diagnosis.assert_not_called()
+
+def test_get_diagnosis_queue():
+    with patch('main.diagnosis_queue', None):
+        queue = main_module.get_diagnosis_queue()
+        assert main_module.get_diagnosis_queue() is queue
+        queue.close()
 
 @patch('main.MONITOR_ENDPOINTS', [])
-@patch('main.check_endpoint')
-def test_monitor_job_empty(mock_check_endpoint):
+@patch('main.probe_engine')
+def test_monitor_job_empty(mock_engine):
     monitor_job()
-    mock_check_endpoint.assert_not_called()
+    mock_engine.run_cycle.assert_not_called()
+
+@patch('main.maintain')
+def test_maintenance_job(mock_maintain, capsys):
+    mock_maintain.return_value = ({"minute": 120, "hour": 2, "day": 0}, {"monitor_results": 50})
+    main_module.maintenance_job()
+    mock_maintain.assert_called_once()
+    assert "120 minute, 2 hour, 0 day rows written, 50 expired rows deleted" in capsys.readouterr().out
+
+    mock_maintain.side_effect = Exception("database is locked")
+    main_module.maintenance_job()
+    assert "Rollup maintenance failed: database is locked" in capsys.readouterr().out
 
 @patch('main.BlockingScheduler')
 @patch('main.monitor_job')
@@ -85,6 +100,11 @@ def test_main_func(mock_monitor_job, mock_scheduler):
     instance.start.side_effect = KeyboardInterrupt
     main()
 
+    # Queued diagnoses are finished on shutdown
+    with patch('main.diagnosis_queue') as mock_queue:
+        main()
+        mock_queue.close.assert_called_once()
+
 from apscheduler.schedulers.blocking import BlockingScheduler
 
 @patch.object(BlockingScheduler, 'start')
@@ -0,0 +1,142 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent import rollups, storage
+from agent.rollups import (
+    rollup, apply_retention, maintain, get_uptime_stats, get_latency_series, series_resolution,
+    MinuteRollup, HourRollup, DayRollup, RollupState, Base
+)
+from agent.sketch import LatencySketch, RELATIVE_ACCURACY
+
+START = datetime(2024, 3, 1)
+END = START + timedelta(days=3, hours=12)  # checks every 30 s on two endpoints up to here
+
+@pytest.fixture
+def checks():
+    Base.metadata.create_all(storage.engine)
+    rows, ts, i = [], START, 0
+    while ts < END:
+        rows.append(SimpleNamespace(endpoint="https://a.example.com", timestamp=ts,
+                                    status_code=500 if i % 10 == 0 else 200, response_time=0.1 + (i % 50) / 100))
+        rows.append(SimpleNamespace(endpoint="https://b.example.com", timestamp=ts,
+                                    status_code=0 if i % 100 == 0 else 200, response_time=None if i % 100 == 0 else 0.05))
+        ts += timedelta(seconds=30)
+        i += 1
+    session = storage.Session()
+    session.add_all(storage.MonitorResult(**vars(r)) for r in rows)
+    session.commit()
+    session.close()
+    yield rows
+    Base.metadata.drop_all(storage.engine)
+
+def expected(rows, endpoint, start, end):
+    picked = [r for r in rows if r.endpoint == endpoint and start <= r.timestamp < end] if endpoint else \
+        [r for r in rows if start <= r.timestamp < end]
+    sketch = LatencySketch()
+    for r in picked:
+        sketch.add(r.response_time)
+    failures = sum(1 for r in picked if not r.status_code or r.status_code >= 400)
+    return len(picked), failures, sketch
+
+def count(model):
+    session = storage.Session()
+    try:
+        return session.query(model).count()
+    finally:
+        session.close()
+
+def test_rollup_is_incremental(checks):
+    written = rollup(now=END + timedelta(hours=1))
+    assert written == {"minute": 2 * 84 * 60, "hour": 2 * 84, "day": 2 * 3}
+
+    session = storage.Session()
+    state = {s.resolution: s.rolled_until for s in session.query(RollupState)}
+    minute = session.query(MinuteRollup).filter_by(endpoint="https://a.example.com", bucket=START).one()
+    session.close()
+    assert state == {"minute": END + timedelta(minutes=59), "hour": END, "day": START + timedelta(days=3)}
+    assert (minute.count, minute.failures) == (2, 1)
+    assert minute.latency_max == pytest.approx(0.11) and minute.p50 == pytest.approx(0.1, rel=RELATIVE_ACCURACY)
+
+    # Nothing new: nothing written; half a day later the last day is complete
+    assert rollup(now=END + timedelta(hours=1)) == {"minute": 0, "hour": 0, "day": 0}
+    assert rollup(now=START + timedelta(days=4, minutes=5)) == {"minute": 0, "hour": 0, "day": 2}
+
+def test_rollup_writes_in_batches(checks, monkeypatch):
+    monkeypatch.setattr(rollups, "INSERT_BATCH", 7)
+    assert rollup(now=END + timedelta(hours=1)) == {"minute": 2 * 84 * 60, "hour": 2 * 84, "day": 2 * 3}
+    assert count(MinuteRollup) == 2 * 84 * 60
+
+def test_failures_roll_back(checks, monkeypatch):
+    rollup(now=START + timedelta(hours=2))
+    before = count(MinuteRollup), count(HourRollup)
+    def broken(*args):
+        raise RuntimeError("database went away")
+    monkeypatch.setattr(rollups, "_aggregate", broken)
+    with pytest.raises(RuntimeError):
+        rollup(now=END + timedelta(hours=1))
+    assert (count(MinuteRollup), count(HourRollup)) == before
+    monkeypatch.setattr(rollups, "_load_state", broken)
+    with pytest.raises(RuntimeError):
+        apply_retention(now=END + timedelta(days=10), raw_days=0)
+    assert count(storage.MonitorResult) == len(checks)
+
+def test_rollup_skips_incomplete_minutes(checks):
+    rollup(now=START + timedelta(minutes=10, seconds=30))
+    assert count(MinuteRollup) == 2 * 9  # minute 9 ended only 30 s ago
+    assert count(HourRollup) == 0
+
+def test_uptime_stats_match_raw_checks(checks):
+    start, end = START + timedelta(hours=5, minutes=7, seconds=15), START + timedelta(days=2, hours=3, minutes=41)
+    before = get_uptime_stats("https://a.example.com", start, end)
+
+    maintain(now=END + timedelta(hours=1))
+    for endpoint in ("https://a.example.com", "https://b.example.com", None):
+        n, failures, sketch = expected(checks, endpoint, start, end)
+        stats = get_uptime_stats(endpoint, start, end)
+        assert (stats["count"], stats["failures"]) == (n, failures)
+        assert stats["uptime"] == pytest.approx(100.0 * (n - failures) / n)
+        assert (stats["p50"], stats["p95"], stats["p99"]) == (sketch.quantile(0.5), sketch.quantile(0.95), sketch.quantile(0.99))
+    assert get_uptime_stats("https://a.example.com", start, end) == pytest.approx(before)
+
+def test_retention_keeps_what_is_not_rolled_up(checks):
+    now = END + timedelta(days=10)
+    # Nothing rolled up yet: nothing may be deleted
+    assert apply_retention(now=now, raw_days=0) == {}
+    assert count(storage.MonitorResult) == len(checks)
+
+    rollup(now=END + timedelta(hours=1))
+    deleted = apply_retention(now=now, raw_days=0, minute_days=0, hour_days=0)
+    assert deleted["monitor_results"] == len(checks)  # every raw row is in a minute rollup
+    assert count(MinuteRollup) == 0  # ... and every minute in an hour rollup
+    assert count(HourRollup) == 2 * 12  # but the last half day has no day rollup yet
+    assert count(DayRollup) == 2 * 3
+
+    # Totals are still answered from the rollups
+    n, failures, _ = expected(checks, None, START, END)
+    stats = get_uptime_stats(None, START, END)
+    assert (stats["count"], stats["failures"]) == (n, failures)
+
+    # Only day rollups are left for the first three days: edges there snap out to whole days
+    n, failures, _ = expected(checks, "https://a.example.com", START, START + timedelta(days=3))
+    stats = get_uptime_stats("https://a.example.com", START + timedelta(hours=1, minutes=30), START + timedelta(days=2, hours=5))
+    assert (stats["count"], stats["failures"]) == (n, failures)
+
+def test_latency_series(checks):
+    assert series_resolution(timedelta(hours=1)) == "minute"
+    assert series_resolution(timedelta(days=7)) == "hour"
+    assert series_resolution(timedelta(days=90)) == "day"
+
+    rollup(now=START + timedelta(days=1, hours=6))
+    # Hourly buckets: the first day from hour rollups, the rest from minute rollups and raw rows
+    series = get_latency_series("https://b.example.com", START + timedelta(hours=20), END)
+    assert [p["bucket"] for p in series] == [START + timedelta(hours=h) for h in range(20, 84)]
+    assert all(p["count"] == 120 for p in series)
+    assert series[0]["p50"] == pytest.approx(0.05, rel=RELATIVE_ACCURACY)
+
+    daily = get_latency_series(None, START, END, resolution="day")
+    assert [p["count"] for p in daily] == [2 * 2880, 2 * 2880, 2 * 2880, 2 * 1440]
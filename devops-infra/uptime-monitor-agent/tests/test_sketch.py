@@ -0,0 +1,49 @@
+import pytest
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.sketch import LatencySketch, RELATIVE_ACCURACY
+
+def exact_quantile(values, q):
+    values = sorted(values)
+    return values[int(q * (len(values) - 1))]
+
+def test_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-2, 1) for _ in range(5000)]
+    sketch = LatencySketch()
+    for v in values:
+        sketch.add(v)
+    assert sketch.count == 5000
+    for q in (0.0, 0.5, 0.95, 0.99, 1.0):
+        assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=RELATIVE_ACCURACY)
+
+def test_empty_zero_and_none():
+    sketch = LatencySketch()
+    assert sketch.quantile(0.5) is None
+    sketch.add(None)
+    assert sketch.count == 0
+    sketch.add(0.0, count=3)
+    sketch.add(1.0)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(1.0, rel=RELATIVE_ACCURACY)
+
+def test_merge_equals_single_sketch_and_round_trips():
+    rng = random.Random(3)
+    values = [rng.uniform(0.01, 2.0) for _ in range(2000)]
+    whole, left, right = LatencySketch(), LatencySketch(), LatencySketch()
+    for i, v in enumerate(values):
+        whole.add(v)
+        (left if i % 2 else right).add(v)
+    left.add(0.0)
+    whole.add(0.0)
+
+    merged = LatencySketch.from_bytes(left.to_bytes()).merge(LatencySketch.from_bytes(right.to_bytes()))
+    assert merged.bins == whole.bins and merged.zeros == whole.zeros and merged.count == whole.count
+    assert merged.quantile(0.99) == whole.quantile(0.99)
+
+    with pytest.raises(ValueError):
+        merged.merge(LatencySketch(relative_accuracy=0.05))
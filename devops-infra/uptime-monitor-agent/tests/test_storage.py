@@ -10,7 +10,7 @@ with patch.dict('sys.modules', {'config': None}):
     import importlib
     importlib.reload(agent.storage)
 
-from agent.storage import add_result, get_latest_results, get_results_by_endpoint, Session, Base, engine
+from agent.storage import add_result, add_results, set_diagnosis, get_latest_results, get_results_by_endpoint, Session, Base, engine
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -46,3 +46,23 @@ def test_get_results_by_endpoint(db_session):
 
     assert len(get_results_by_endpoint(endpoint1)) == 2
     assert len(get_results_by_endpoint("https://google.com")) == 1
+
+def test_add_results_batch_and_set_diagnosis(db_session):
+    ids = add_results([
+        {"endpoint": "https://example.com", "status_code": 200, "response_time": 0.5},
+        {"endpoint": "https://google.com", "status_code": 500, "response_time": 0.1, "error_message": "Internal Server Error"},
+    ])
+    assert len(ids) == 2 and ids[0] != ids[1]
+    assert len(get_latest_results()) == 2
+
+    set_diagnosis(ids[1], "Check the upstream service.")
+    assert get_results_by_endpoint("https://google.com")[0].ai_diagnosis == "Check the upstream service."
+    assert get_results_by_endpoint("https://example.com")[0].ai_diagnosis is None
+
+    # Failures roll back and report no ids
+    with patch('agent.storage.Session') as mock_session_maker:
+        mock_sess = mock_session_maker.return_value
+        mock_sess.commit.side_effect = Exception("DB Error")
+        assert add_results([{"endpoint": "x", "status_code": 200, "response_time": 0.1}]) == []
+        set_diagnosis(1, "x")
+        assert mock_sess.rollback.call_count == 2
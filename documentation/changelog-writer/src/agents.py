@@ -1,6 +1,7 @@
 from crewai import Agent
-from langchain_openai import ChatOpenAI
 import os
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 
 class ChangelogAgents:
     def __init__(self):
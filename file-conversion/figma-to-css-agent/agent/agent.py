@@ -1,6 +1,6 @@
 import os
-import sys
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 try:
     from langchain.agents import create_openai_tools_agent, AgentExecutor
 except ImportError:  # pragma: no cover
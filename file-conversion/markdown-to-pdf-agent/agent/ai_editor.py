@@ -1,7 +1,7 @@
-from langchain_openai import ChatOpenAI
+import os, sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.messages import SystemMessage, HumanMessage
-import os
-import sys
 
 # Add parent directory to path if running directly (for testing)
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -1,6 +1,8 @@
 from typing import Dict, Any, Optional
 import yaml
-from langchain_openai import ChatOpenAI
+import os, sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
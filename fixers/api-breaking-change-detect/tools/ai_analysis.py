@@ -1,8 +1,9 @@
 from typing import List, Optional
-from langchain_openai import ChatOpenAI
+import os
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
-import os
 from .diff_engine import APIChange
 
 class ImpactAnalysis(BaseModel):
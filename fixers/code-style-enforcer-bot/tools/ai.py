@@ -1,7 +1,8 @@
-from langchain_openai import ChatOpenAI
+import os
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import PromptTemplate
 from langchain_core.messages import HumanMessage
-import os
 from utils.config import config
 
 class AIHelper:
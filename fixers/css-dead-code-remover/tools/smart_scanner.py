@@ -1,7 +1,9 @@
 import os
 import logging
 from typing import Set, List
-from langchain_openai import ChatOpenAI
+import sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
@@ -1,6 +1,7 @@
 """Q&A chain for document question-answering."""
 
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from config import MODEL_NAME, TEMPERATURE
@@ -1,8 +1,9 @@
 """Vector store management — FAISS for document embedding and retrieval."""
 
 import os
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
+from lazy_import import lazy_import
+OpenAIEmbeddings = lazy_import("langchain_openai", "OpenAIEmbeddings")
+FAISS = lazy_import("langchain_community.vectorstores", "FAISS")
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 from config import CHUNK_SIZE, CHUNK_OVERLAP, EMBEDDING_MODEL
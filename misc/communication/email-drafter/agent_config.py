@@ -2,7 +2,8 @@ import os
 from typing import Optional, Type
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -1,5 +1,6 @@
 import os
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe_agent
 
 def create_agent(df, model_name="gpt-4o"):
@@ -1,4 +1,5 @@
-from langchain_community.tools import DuckDuckGoSearchRun
+from lazy_import import lazy_import
+DuckDuckGoSearchRun = lazy_import("langchain_community.tools", "DuckDuckGoSearchRun")
 from bs4 import BeautifulSoup
 import requests
 import logging
@@ -1,9 +1,10 @@
 import os
 import pandas as pd
 from sqlalchemy import create_engine, text
-from langchain_community.utilities import SQLDatabase
-from langchain_community.agent_toolkits import create_sql_agent
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+SQLDatabase = lazy_import("langchain_community.utilities", "SQLDatabase")
+create_sql_agent = lazy_import("langchain_community.agent_toolkits", "create_sql_agent")
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 try:
     from langchain.chains import create_sql_query_chain
 except ImportError:  # pragma: no cover
@@ -1,6 +1,7 @@
 import os
 from crewai import Agent, Task
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from textwrap import dedent
 
 class TestGeneratorAgents:
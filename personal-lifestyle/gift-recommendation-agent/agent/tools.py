@@ -1,4 +1,5 @@
-from langchain_community.tools import DuckDuckGoSearchResults
+from lazy_import import lazy_import
+DuckDuckGoSearchResults = lazy_import("langchain_community.tools", "DuckDuckGoSearchResults")
 from langchain_core.tools import Tool
 import json
 
@@ -1,6 +1,8 @@
 import os
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+import sys
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 try:
     from langchain.agents import AgentExecutor, create_tool_calling_agent
 except ImportError:
@@ -1,5 +1,6 @@
 from typing import List, Optional
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from .models import WeeklyPlan, ShoppingList, Recipe, DailyPlan, Ingredient
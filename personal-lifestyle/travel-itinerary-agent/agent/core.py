@@ -4,7 +4,8 @@ import sys
 # Ensure the parent directory is in sys.path to allow imports if run directly
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.messages import HumanMessage
 from langgraph.prebuilt import create_react_agent
 
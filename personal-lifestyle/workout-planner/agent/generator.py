@@ -1,4 +1,5 @@
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from agent.models import WorkoutPlan, UserProfile
 from prompts.workout_prompts import get_workout_prompt
 from config import OPENAI_API_KEY, MODEL_NAME
@@ -1,6 +1,7 @@
 import os
 from typing import List, Dict
-from langchain_openai import ChatOpenAI
+from lazy_import import lazy_import
+ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 from langchain_core.prompts import PromptTemplate
 from agent.parsers import Dependency
 from agent.scanner import Vulnerability